@@ -20,7 +20,8 @@ def create_app():
     CORS(
         app,
         supports_credentials=True,
-        origins=["http://localhost:5173", "http://127.0.0.1:5173"]
+        origins=["http://localhost:5173", "http://127.0.0.1:5173"],
+        expose_headers=["X-Next-Cursor"],  # Recommendation pagination
     )
 
     app.config.from_object(Config)
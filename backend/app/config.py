@@ -32,6 +32,46 @@ class Config:
     JWT_REFRESH_TOKEN_EXPIRATION_DAYS = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRATION_DAYS", "7"))
     JWT_REFRESH_TOKEN_EXTENDED_DAYS = int(os.getenv("JWT_REFRESH_TOKEN_EXTENDED_DAYS", "30"))  # "Remember me" duration
 
+    # === Session Cache Settings ===
+    SESSION_CACHE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_TTL_SECONDS", "60"))  # Bounds staleness after revocations on other nodes
+    SESSION_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_NEGATIVE_TTL_SECONDS", "30"))  # Unknown/invalid token hashes
+    SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "100000"))
+    SESSION_CACHE_REDIS_URL = os.getenv("SESSION_CACHE_REDIS_URL")  # Share the cache across nodes (requires redis)
+
+    # === Rate Limit Settings ===
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True") == "True"
+    RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")  # Share counters across nodes (requires redis)
+    RATE_LIMIT_LOGIN_PER_MINUTE = int(os.getenv("RATE_LIMIT_LOGIN_PER_MINUTE", "10"))  # Per client address
+    RATE_LIMIT_LOOKUP_PER_MINUTE = int(os.getenv("RATE_LIMIT_LOOKUP_PER_MINUTE", "30"))  # Per client address
+    RATE_LIMIT_SEARCH_PER_MINUTE = int(os.getenv("RATE_LIMIT_SEARCH_PER_MINUTE", "120"))  # Per user, or client address
+    RATE_LIMIT_KEYWORD_GENERATION_PER_HOUR = int(os.getenv("RATE_LIMIT_KEYWORD_GENERATION_PER_HOUR", "3"))  # Per user
+
+    # === Recommendation Settings ===
+    RECOMMEND_REFRESH_DELAY_SECONDS = float(os.getenv("RECOMMEND_REFRESH_DELAY_SECONDS", "5"))  # Edits within this window collapse into one run
+    RECOMMEND_REFRESH_MAX_WORKERS = int(os.getenv("RECOMMEND_REFRESH_MAX_WORKERS", "2"))
+    RECOMMEND_CACHE_TTL_SECONDS = int(os.getenv("RECOMMEND_CACHE_TTL_SECONDS", "300"))  # Bounds staleness after scheduler runs
+    RECOMMEND_ENGINE = os.getenv("RECOMMEND_ENGINE", "sql")  # "sql" (stored procedures), "sharded" (parallel stored procedures) or "sparse" (requires numpy/scipy)
+    RECOMMEND_SHARD_COUNT = int(os.getenv("RECOMMEND_SHARD_COUNT", "32"))
+    RECOMMEND_SHARD_WORKERS = int(os.getenv("RECOMMEND_SHARD_WORKERS", str(os.cpu_count() or 4)))  # One DB connection per worker
+    RECOMMEND_REBUILD_ENGINE = os.getenv("RECOMMEND_REBUILD_ENGINE", "sharded")  # Engine of the scheduled weekly rebuild; "sharded" keeps every transaction short
+
+    # === Scheduler Settings ===
+    SCHEDULER_JOBS = [job.strip() for job in os.getenv("SCHEDULER_JOBS", "").split(",") if job.strip()]  # Jobs this node schedules; empty = all
+    SCHEDULER_JITTER_SECONDS = float(os.getenv("SCHEDULER_JITTER_SECONDS", "300"))  # Random delay added to each scheduled run
+
+    # === Keyword Generation Job Settings ===
+    KEYWORD_JOB_BATCH_SIZE = int(os.getenv("KEYWORD_JOB_BATCH_SIZE", "16"))  # Jobs the model worker generates together
+    KEYWORD_JOB_POLL_SECONDS = float(os.getenv("KEYWORD_JOB_POLL_SECONDS", "0.5"))  # How often the worker and waiting requests check jobs
+    KEYWORD_JOB_WAIT_SECONDS = float(os.getenv("KEYWORD_JOB_WAIT_SECONDS", "60"))  # How long GET generate-keyword and event streams wait for a result
+    KEYWORD_JOB_STALE_SECONDS = int(os.getenv("KEYWORD_JOB_STALE_SECONDS", "300"))  # Running jobs older than this are claimed again
+    KEYWORD_JOB_MAX_ATTEMPTS = int(os.getenv("KEYWORD_JOB_MAX_ATTEMPTS", "3"))
+    KEYWORD_JOB_RETENTION_HOURS = int(os.getenv("KEYWORD_JOB_RETENTION_HOURS", "24"))  # Finished jobs can be read this long
+
+    # === Keyword Engine Settings ===
+    KEYWORD_ENGINE = os.getenv("KEYWORD_ENGINE", "qwen").strip().lower()  # qwen (queued for the model worker) or statistical (inline, no model)
+    KEYWORD_CORPUS_SIZE = int(os.getenv("KEYWORD_CORPUS_SIZE", "5000"))  # Biographies the statistical engine is fit on
+    KEYWORD_CORPUS_TTL_SECONDS = int(os.getenv("KEYWORD_CORPUS_TTL_SECONDS", "3600"))  # How long the keyword vocabulary (and statistical fit) is reused before reading the corpus again
+
 
     # === Validation ===
     if not all([DB_HOST, DB_PORT, DB_USER, DB_PASS, DB_NAME]):
@@ -4,6 +4,7 @@ Author(s): Aidan Bell, Clayton Durepos
 
 from backend.app.db.transaction_context import TransactionContext
 
+import json
 from datetime import datetime, date
 
 #TODO: Do not use a single file for all procedures. Split into multiple files.
@@ -316,6 +317,186 @@ def sql_create_faculty_generates_keyword(
     return results[0] if results else []
 
 
+def sql_clean_faculty_generates_keyword(
+    transaction_context: TransactionContext,
+    cutoff_datetime: datetime,
+) -> int:
+    """
+    Delete keyword generation records older than a cutoff.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        cutoff_datetime (datetime): Records generated before this datetime are deleted.
+
+    Returns:
+        int: Number of records deleted.
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("clean_faculty_generates_keyword", (cutoff_datetime,))
+    stored_results = list(cursor.stored_results())
+    if stored_results:
+        row = stored_results[0].fetchone()
+        if row:
+            return row.get("deleted_count") or 0
+    return 0
+
+
+# ============================================================================
+# KEYWORD GENERATION JOB DB LAYER FUNCTIONS
+# ============================================================================
+def sql_create_keyword_generation_job(
+    transaction_context: TransactionContext,
+    job_id: str,
+    faculty_id: str,
+) -> None:
+    """
+    Queue a keyword generation job.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        job_id (str): UUID for the job.
+        faculty_id (str): The UUID of the faculty member whose biography is used.
+
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("create_keyword_generation_job", (job_id, faculty_id))
+
+
+def sql_read_keyword_generation_job(
+    transaction_context: TransactionContext,
+    job_id: str,
+) -> dict | None:
+    """
+    Read a keyword generation job.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        job_id (str): UUID of the job.
+
+    Returns:
+        dict | None: The job with job_id, faculty_id, status, attempts, keywords
+            (list, or None until complete), error, created_at, started_at,
+            finished_at and queue_position, or None if it doesn't exist.
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("read_keyword_generation_job", (job_id,))
+    job = None
+    for result in cursor.stored_results():
+        row = result.fetchone()
+        if row:
+            job = row
+    if job and job.get("keywords") is not None:
+        job["keywords"] = json.loads(job["keywords"])
+    return job
+
+
+def sql_claim_keyword_generation_jobs(
+    transaction_context: TransactionContext,
+    claim_id: str,
+    limit: int,
+    stale_seconds: int,
+    max_attempts: int,
+) -> list[dict]:
+    """
+    Claim the oldest queued keyword generation jobs for one worker batch.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        claim_id (str): UUID identifying the batch.
+        limit (int): Maximum number of jobs to claim.
+        stale_seconds (int): Running jobs older than this are claimed again.
+        max_attempts (int): Abandoned jobs attempted this many times fail instead.
+
+    Returns:
+        list[dict]: Claimed jobs with job_id, faculty_id and biography, oldest first.
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc(
+        "claim_keyword_generation_jobs", (claim_id, limit, stale_seconds, max_attempts)
+    )
+    stored_results = list(cursor.stored_results())
+    if stored_results:
+        return stored_results[0].fetchall()
+    return []
+
+
+def sql_update_keyword_generation_job(
+    transaction_context: TransactionContext,
+    job_id: str,
+    claim_id: str,
+    status: str,
+    keywords: list[str] | None = None,
+    error: str | None = None,
+) -> None:
+    """
+    Record the outcome of a claimed keyword generation job, or its keywords so far.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        job_id (str): UUID of the job.
+        claim_id (str): Claim the job was returned under.
+        status (str): 'complete' or 'failed', or 'running' to record partial keywords.
+        keywords (list[str] | None): Generated keywords.
+        error (str | None): Error message for failed jobs.
+
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc(
+        "update_keyword_generation_job",
+        (job_id, claim_id, status, json.dumps(keywords) if keywords is not None else None, error),
+    )
+
+
+def sql_clean_keyword_generation_job(
+    transaction_context: TransactionContext,
+    cutoff_datetime: datetime,
+) -> int:
+    """
+    Delete keyword generation jobs that finished, or were left queued, before a cutoff.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        cutoff_datetime (datetime): Jobs finished or queued before this datetime are deleted.
+
+    Returns:
+        int: Number of jobs deleted.
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("clean_keyword_generation_job", (cutoff_datetime,))
+    stored_results = list(cursor.stored_results())
+    if stored_results:
+        row = stored_results[0].fetchone()
+        if row:
+            return row.get("deleted_count") or 0
+    return 0
+
+
+def sql_read_keyword_corpus(
+    transaction_context: TransactionContext,
+    limit: int,
+) -> tuple[list[str], list[str]]:
+    """
+    Read the keyword vocabulary and what the statistical keyword engine is fit on.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        limit (int): Maximum number of biographies to read.
+
+    Returns:
+        tuple[list[str], list[str]]: (every keyword name, up to limit faculty biographies).
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("read_keyword_corpus", (limit,))
+    results = [r.fetchall() for r in cursor.stored_results()]
+    keywords = [row["name"] for row in results[0]] if results else []
+    documents = [row["document"] for row in results[1]] if len(results) > 1 else []
+    return keywords, documents
+
+
 # ============================================================================
 # RECOMMENDATION DB LAYER FUNCTIONS
 # ============================================================================
@@ -359,6 +540,38 @@ def sql_generate_all_recommendations(
         pass
 
 
+def sql_generate_incremental_recommendations(
+    transaction_context: TransactionContext,
+) -> dict:
+    """
+    Regenerate recommendations only for faculty affected by recent changes.
+    
+    Reads recommendation_change_log (populated by triggers on the keyword,
+    publication, grant, department and credentials tables), regenerates the
+    changed faculty and every faculty whose recommendations point at them,
+    then clears the processed log entries.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+    
+    Returns:
+        dict: Contains changed_count (faculty whose inputs changed) and
+              regenerated_count (faculty whose recommendations were rebuilt).
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("generate_incremental_recommendations")
+    summary = {"changed_count": 0, "regenerated_count": 0}
+    try:
+        stored_results = list(cursor.stored_results())
+        for result in stored_results:
+            rows = result.fetchall()
+            if rows:
+                summary = rows[0]
+    except:
+        pass
+    return summary
+
+
 def sql_generate_recommendations_for_faculty(
     transaction_context: TransactionContext,
     faculty_id: str,
@@ -367,7 +580,7 @@ def sql_generate_recommendations_for_faculty(
     Generate recommendations for a single faculty member.
     
     Called immediately after signup to provide instant recommendations
-    without waiting for the 12-hour event.
+    without waiting for the 12-hour scheduled run.
     
     Args:
         transaction_context (TransactionContext): A transaction context object.
@@ -387,16 +600,129 @@ def sql_generate_recommendations_for_faculty(
         pass
 
 
+def sql_read_recommendation_rebuild_state(
+    transaction_context: TransactionContext,
+) -> dict:
+    """
+    Allocate the generation epoch of a full rebuild and read the newest change
+    log entry it will cover.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+    
+    Returns:
+        dict: Contains epoch and max_change_id (None if the change log is empty).
+    """
+    cursor = transaction_context.cursor
+    cursor.execute(
+        "SELECT next_recommendation_epoch() AS epoch, "
+        "(SELECT MAX(change_id) FROM recommendation_change_log) AS max_change_id"
+    )
+    return cursor.fetchone()
+
+
+def sql_generate_recommendation_pairs(
+    transaction_context: TransactionContext,
+    epoch: int,
+    faculty_id: str | None = None,
+) -> None:
+    """
+    Write recommended pairs with all of their reasons, stamped with epoch,
+    without scoring them.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+        epoch (int): Generation epoch of the calling run.
+        faculty_id (str | None): Source faculty member to generate for.
+            Generates for every registered user when None.
+    
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("generate_recommendation_pairs", (faculty_id, epoch))
+    # Consume any result set
+    try:
+        stored_results = list(cursor.stored_results())
+        for result in stored_results:
+            result.fetchall()
+    except:
+        pass
+
+
+def sql_score_recommendations(
+    transaction_context: TransactionContext,
+    faculty_id: str | None = None,
+) -> None:
+    """
+    Score recommendations and keep only the top K per source faculty member.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+        faculty_id (str | None): Source faculty member to score. Scores every
+            source when None.
+    
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("score_recommendations", (faculty_id,))
+    # Consume any result set
+    try:
+        stored_results = list(cursor.stored_results())
+        for result in stored_results:
+            result.fetchall()
+    except:
+        pass
+
+
+def sql_refresh_recommendation_display(
+    transaction_context: TransactionContext,
+    faculty_id: str | None = None,
+) -> None:
+    """
+    Rebuild the denormalized faculty_recommendation_display rows read by
+    read_recommendations_for_faculty.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+        faculty_id (str | None): Source faculty member to rebuild. Rebuilds every
+            source when None.
+    
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("refresh_recommendation_display", (faculty_id,))
+    # Consume any result set
+    try:
+        stored_results = list(cursor.stored_results())
+        for result in stored_results:
+            result.fetchall()
+    except:
+        pass
+
+
 def sql_read_recommendations_for_faculty(
     transaction_context: TransactionContext,
     faculty_id: str,
+    limit: int | None = None,
+    recommendation_type: str | None = None,
+    after: tuple[float, int, str] | None = None,
+    compact: bool = False,
 ) -> list[dict]:
     """
-    Get personalized recommendations for a specific faculty member.
+    Get personalized recommendations for a specific faculty member, highest score first.
     
     Args:
         transaction_context (TransactionContext): A transaction context object.
         faculty_id (str): UUID of the faculty member to get recommendations for.
+        limit (int | None): Maximum number of rows to return. Defaults to
+            recommendation_top_k().
+        recommendation_type (str | None): Only return rows with this primary type.
+        after (tuple | None): (match_score, type_rank, faculty_id) of the last row
+            of the previous page; only rows after it are returned.
+        compact (bool): Return biography as None.
     
     Returns:
         list[dict]: List of recommended faculty with match details.
@@ -407,16 +733,309 @@ def sql_read_recommendations_for_faculty(
             - department_name: Primary department
             - match_score: Score for ranking (0.0 to 1.0)
             - recommendation_type: ENUM value (e.g., 'shared_keyword')
+            - type_rank: Priority of recommendation_type (1 = highest)
+            - recommendation_reasons: Comma-separated reasons in priority order
             - recommendation_text: Human-readable text (e.g., "Similar research interests")
     """
+    after_score, after_type_rank, after_faculty_id = after or (None, None, None)
     cursor = transaction_context.cursor
-    cursor.callproc("read_recommendations_for_faculty", (faculty_id,))
+    cursor.callproc(
+        "read_recommendations_for_faculty",
+        (
+            faculty_id,
+            limit,
+            recommendation_type,
+            after_score,
+            after_type_rank,
+            after_faculty_id,
+            compact,
+        ),
+    )
     stored_results = list(cursor.stored_results())
     if stored_results:
         return stored_results[0].fetchall()
     return []
 
 
+def sql_start_recommendation_run(
+    transaction_context: TransactionContext,
+    run_id: str,
+    shard_count: int,
+) -> None:
+    """
+    Record a new sharded regeneration run and its pending shards.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+        run_id (str): UUID for the run.
+        shard_count (int): Number of shards source faculty are split into.
+    
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("start_recommendation_run", (run_id, shard_count))
+
+
+def sql_generate_recommendations_for_shard(
+    transaction_context: TransactionContext,
+    run_id: str,
+    shard_index: int,
+) -> dict:
+    """
+    Regenerate recommendations for one shard of a run and mark it complete.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+        run_id (str): UUID of the run.
+        shard_index (int): Shard to process.
+    
+    Returns:
+        dict: Contains shard_index and source_count.
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("generate_recommendations_for_shard", (run_id, shard_index))
+    summary = {"shard_index": shard_index, "source_count": 0}
+    try:
+        stored_results = list(cursor.stored_results())
+        for result in stored_results:
+            rows = result.fetchall()
+            if rows:
+                summary = rows[0]
+    except:
+        pass
+    return summary
+
+
+def sql_update_recommendation_run_shard(
+    transaction_context: TransactionContext,
+    run_id: str,
+    shard_index: int,
+    status: str,
+    error: str | None = None,
+) -> None:
+    """
+    Mark a shard as running or failed.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+        run_id (str): UUID of the run.
+        shard_index (int): Shard to update.
+        status (str): 'running' or 'failed'.
+        error (str | None): Error message for failed shards.
+    
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc(
+        "update_recommendation_run_shard",
+        (run_id, shard_index, status, error[:2048] if error else None),
+    )
+
+
+def sql_finish_recommendation_run(
+    transaction_context: TransactionContext,
+    run_id: str,
+) -> None:
+    """
+    Mark a run complete (clearing the change log it covered) or failed.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+        run_id (str): UUID of the run.
+    
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("finish_recommendation_run", (run_id,))
+
+
+def sql_read_recommendation_run(
+    transaction_context: TransactionContext,
+    run_id: str,
+) -> dict | None:
+    """
+    Read a sharded regeneration run with per-shard progress.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+        run_id (str): UUID of the run.
+    
+    Returns:
+        dict | None: The run (run_id, status, shard_count, started_at, finished_at,
+            completed_shards, source_count) with a "shards" list, or None if
+            the run doesn't exist.
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("read_recommendation_run", (run_id,))
+    results = [r.fetchall() for r in cursor.stored_results()]
+    if not results or not results[0]:
+        return None
+    run = dict(results[0][0])
+    run["shards"] = results[1] if len(results) > 1 else []
+    return run
+
+
+def sql_read_recommendation_inputs(
+    transaction_context: TransactionContext,
+) -> dict[str, list[dict]]:
+    """
+    Read the relationship tables used by the sparse recommendation engine.
+    
+    Keyword names are normalized with LOWER(TRIM(...)) and departments are read
+    as their stored department_key, matching the comparisons made by the
+    generate_recommendation_pairs procedure.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+    
+    Returns:
+        dict: Lists of row dicts keyed by:
+            - credentials: faculty_id of every registered user
+            - faculty_keyword: faculty_id, keyword
+            - publication_keyword: faculty_id, keyword (keywords of authored publications)
+            - faculty_grant: faculty_id, grant_id
+            - grant_keyword: grant_id, keyword
+            - faculty_department: faculty_id, department
+            - max_change_id: single row with the newest recommendation_change_log id
+            - top_k: single row with recommendation_top_k()
+            - epoch: single row with a new next_recommendation_epoch()
+    """
+    queries = {
+        "credentials": "SELECT faculty_id FROM credentials",
+        "faculty_keyword": (
+            "SELECT DISTINCT faculty_id, LOWER(TRIM(name)) AS keyword "
+            "FROM faculty_researches_keyword"
+        ),
+        "publication_keyword": (
+            "SELECT DISTINCT paf.faculty_id, LOWER(TRIM(pek.name)) AS keyword "
+            "FROM publication_authored_by_faculty paf "
+            "JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id"
+        ),
+        "faculty_grant": "SELECT DISTINCT faculty_id, grant_id FROM grants_granted_to_faculty",
+        "grant_keyword": (
+            "SELECT DISTINCT grant_id, LOWER(TRIM(name)) AS keyword "
+            "FROM grants_for_keyword"
+        ),
+        "faculty_department": (
+            "SELECT DISTINCT faculty_id, department_key AS department "
+            "FROM faculty_department"
+        ),
+        "max_change_id": "SELECT MAX(change_id) AS change_id FROM recommendation_change_log",
+        "top_k": "SELECT recommendation_top_k() AS top_k",
+        "epoch": "SELECT next_recommendation_epoch() AS epoch",
+    }
+    cursor = transaction_context.cursor
+    results = {}
+    for name, query in queries.items():
+        cursor.execute(query)
+        results[name] = cursor.fetchall()
+    return results
+
+
+def sql_prune_stale_recommendations(
+    transaction_context: TransactionContext,
+    epoch: int,
+    faculty_id: str | None = None,
+    limit: int | None = None,
+) -> int:
+    """
+    Delete recommendations from generation epochs older than epoch, in bounded batches.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+        epoch (int): Generation epoch of the run that just finished writing.
+        faculty_id (str | None): Source faculty member to limit pruning to.
+            Prunes every source when None.
+        limit (int | None): When pruning every source, delete at most this many
+            rows, so the caller can commit between batches. No limit when None.
+    
+    Returns:
+        int: Number of stale rows deleted.
+    """
+    cursor = transaction_context.cursor
+    result_args = cursor.callproc(
+        "prune_stale_recommendations",
+        (
+            epoch,
+            faculty_id,
+            limit,
+            0,  # OUT p_pruned_count (filled by procedure)
+        ),
+    )
+    if isinstance(result_args, dict):
+        return result_args.get("prune_stale_recommendations_arg4") or 0
+    return result_args[3] or 0
+
+
+def sql_upsert_faculty_recommendations(
+    transaction_context: TransactionContext,
+    recommendations: list[tuple[str, str, str, int, float]],
+    epoch: int,
+    batch_size: int = 5000,
+) -> None:
+    """
+    Bulk insert (source, target, recommendation_type, recommendation_reasons,
+    match_score) rows stamped with a generation epoch.
+    
+    Each pair is written once with every reason; rows from the same or an older
+    epoch take the new type and reasons, the same rule
+    generate_recommendation_pairs applies. The score is always replaced.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+        recommendations (list[tuple]): (source_faculty_id, target_faculty_id,
+            recommendation_type, recommendation_reasons, match_score) rows, with
+            recommendation_reasons as a bitmask in ENUM order.
+        epoch (int): Generation epoch from next_recommendation_epoch().
+        batch_size (int): Number of rows sent per multi-row INSERT.
+    
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    query = (
+        "INSERT INTO faculty_recommended_to_faculty "
+        "(source_faculty_id, target_faculty_id, recommendation_type, recommendation_reasons, "
+        "match_score, generation_epoch, created_at) "
+        "VALUES (%s, %s, %s, %s, %s, %s, NOW()) "
+        "ON DUPLICATE KEY UPDATE "
+        "recommendation_type = IF(generation_epoch <= VALUES(generation_epoch), "
+        "VALUES(recommendation_type), recommendation_type), "
+        "recommendation_reasons = IF(generation_epoch <= VALUES(generation_epoch), "
+        "VALUES(recommendation_reasons), recommendation_reasons), "
+        "match_score = VALUES(match_score), "
+        "generation_epoch = GREATEST(generation_epoch, VALUES(generation_epoch)), "
+        "updated_at = NOW()"
+    )
+    for start in range(0, len(recommendations), batch_size):
+        batch = [row + (epoch,) for row in recommendations[start:start + batch_size]]
+        cursor.executemany(query, batch)
+
+
+def sql_delete_recommendation_change_log(
+    transaction_context: TransactionContext,
+    max_change_id: int,
+) -> None:
+    """
+    Clear recommendation change log entries covered by a full rebuild.
+    
+    Args:
+        transaction_context (TransactionContext): A transaction context object.
+        max_change_id (int): Newest change_id that the rebuild accounted for.
+    
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.execute(
+        "DELETE FROM recommendation_change_log WHERE change_id <= %s",
+        (max_change_id,)
+    )
+
+
 # ============================================================================
 # AUTH DB LAYER FUNCTIONS
 # ============================================================================
@@ -503,6 +1122,68 @@ def sql_validate_login(
     return faculty_id, status_code
 
 
+def sql_login_and_create_session(
+    transaction_context: TransactionContext,
+    username: str,
+    password: str,
+    session_id: str,
+    token_hash: str,
+    expires_at: datetime,
+) -> tuple[str | None, int, dict | None]:
+    """
+    Validate login credentials, create the session and read the faculty profile in one call.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        username (str): Username to authenticate.
+        password (str): Plain text password.
+        session_id (str): UUID for the new session.
+        token_hash (str): SHA-256 hash of the new refresh token.
+        expires_at (datetime): Session expiration (UTC).
+
+    Returns:
+        tuple: (faculty_id, status_code, faculty)
+            - faculty_id: UUID of the faculty member if successful, None otherwise
+            - status_code: 0 = success, 1 = invalid password, 2 = username not found
+            - faculty: Faculty columns plus emails, phones, departments and titles
+              lists if successful, None otherwise
+    """
+    cursor = transaction_context.cursor
+    result_args = cursor.callproc(
+        "login_and_create_session",
+        (
+            username,
+            password,
+            session_id,
+            token_hash,
+            expires_at,
+            '',  # OUT p_faculty_id (filled by procedure)
+            0,   # OUT p_status_code (filled by procedure)
+        ),
+    )
+
+    faculty = None
+    for result in cursor.stored_results():
+        row = result.fetchone()
+        if row and row.get('faculty'):
+            faculty = json.loads(row['faculty'])
+
+    # Handle both dict and tuple/list return formats
+    if isinstance(result_args, dict):
+        faculty_id = result_args.get('login_and_create_session_arg6') or None
+        status_code = result_args.get('login_and_create_session_arg7')
+        if status_code is None:
+            status_code = -1
+    elif isinstance(result_args, (tuple, list)) and len(result_args) >= 7:
+        faculty_id = result_args[5] if result_args[5] else None
+        status_code = result_args[6] if result_args[6] is not None else -1
+    else:
+        faculty_id = None
+        status_code = -1
+
+    return faculty_id, status_code, faculty
+
+
 def sql_check_username_exists(
     transaction_context: TransactionContext,
     username: str,
@@ -1263,4 +1944,171 @@ def sql_read_faculty_complete_optimized(
     stored_results = list(cursor.stored_results())
     if stored_results:
         return stored_results[0].fetchone()
-    return None
\ No newline at end of file
+    return None
+
+
+def sql_clean_session(
+    transaction_context: TransactionContext,
+) -> int:
+    """
+    Delete expired sessions and revoked sessions older than 30 days.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+
+    Returns:
+        int: Number of sessions deleted.
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("clean_session")
+    stored_results = list(cursor.stored_results())
+    if stored_results:
+        row = stored_results[0].fetchone()
+        if row:
+            return row.get("deleted_count") or 0
+    return 0
+
+
+# ============================================================================
+# SCHEDULER DB LAYER FUNCTIONS
+# ============================================================================
+
+def sql_acquire_job_lock(
+    transaction_context: TransactionContext,
+    lock_name: str,
+) -> bool:
+    """
+    Try to take a MySQL advisory lock without waiting.
+
+    The lock belongs to the connection, not the transaction: it is held until
+    sql_release_job_lock is called on the same transaction context or the
+    connection closes, and is visible to every node using the same server.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        lock_name (str): Name of the lock (at most 64 characters).
+
+    Returns:
+        bool: True if the lock was acquired, False if another connection holds it.
+    """
+    cursor = transaction_context.cursor
+    cursor.execute("SELECT GET_LOCK(%s, 0) AS acquired", (lock_name,))
+    row = cursor.fetchone()
+    return bool(row and row["acquired"])
+
+
+def sql_release_job_lock(
+    transaction_context: TransactionContext,
+    lock_name: str,
+) -> None:
+    """
+    Release an advisory lock taken with sql_acquire_job_lock.
+
+    Args:
+        transaction_context (TransactionContext): The transaction context that acquired the lock.
+        lock_name (str): Name of the lock.
+
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.execute("SELECT RELEASE_LOCK(%s) AS released", (lock_name,))
+    cursor.fetchall()
+
+
+def sql_is_any_job_lock_held(
+    transaction_context: TransactionContext,
+    lock_names: list[str],
+) -> bool:
+    """
+    Check whether any connection holds one of the given advisory locks.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        lock_names (list[str]): Names of the locks.
+
+    Returns:
+        bool: True if at least one of the locks is held.
+    """
+    if not lock_names:
+        return False
+    cursor = transaction_context.cursor
+    held = ", ".join("IS_USED_LOCK(%s)" for _ in lock_names)
+    cursor.execute(f"SELECT COALESCE({held}) IS NOT NULL AS held", tuple(lock_names))
+    row = cursor.fetchone()
+    return bool(row and row["held"])
+
+
+def sql_create_scheduled_job_run(
+    transaction_context: TransactionContext,
+    run_id: str,
+    job_name: str,
+    host: str,
+    triggered_by: str,
+) -> None:
+    """
+    Record the start of a scheduler job run.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        run_id (str): UUID for the run.
+        job_name (str): Name of the job.
+        host (str): Host running the job.
+        triggered_by (str): 'schedule' or 'manual'.
+
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("create_scheduled_job_run", (run_id, job_name, host, triggered_by))
+
+
+def sql_update_scheduled_job_run(
+    transaction_context: TransactionContext,
+    run_id: str,
+    status: str,
+    duration_ms: int,
+    row_count: int | None = None,
+    error: str | None = None,
+) -> None:
+    """
+    Record the outcome of a scheduler job run.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        run_id (str): UUID of the run.
+        status (str): 'complete' or 'failed'.
+        duration_ms (int): Wall time of the job in milliseconds.
+        row_count (int | None): Rows the job affected, if it reports them.
+        error (str | None): Error message for failed runs.
+
+    Returns:
+        None
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("update_scheduled_job_run", (run_id, status, duration_ms, row_count, error))
+
+
+def sql_read_scheduled_job_runs(
+    transaction_context: TransactionContext,
+    job_name: str | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """
+    Read the most recent scheduler job runs, newest first.
+
+    Args:
+        transaction_context (TransactionContext): A transaction context object to use for the database connection.
+        job_name (str | None): Only return runs of this job.
+        limit (int | None): Maximum number of runs. Defaults to 20.
+
+    Returns:
+        list[dict]: Runs with run_id, job_name, host, triggered_by, status,
+            started_at, finished_at, duration_ms, row_count and error.
+    """
+    cursor = transaction_context.cursor
+    cursor.callproc("read_scheduled_job_runs", (job_name, limit))
+    stored_results = list(cursor.stored_results())
+    if stored_results:
+        return stored_results[0].fetchall()
+    return []
@@ -9,11 +9,10 @@ v11.25.2025
 from backend.app.services.auth import (
     register_credentials as register_credentials_service,
     check_username_available,
-    validate_login,
+    login_and_create_session,
     check_credentials_exist,
 )
 from backend.app.services.session import (
-    create_session,
     get_session_by_token_hash,
     hash_token,
     revoke_session,
@@ -21,6 +20,8 @@ from backend.app.services.session import (
 )
 from backend.app.services.search import search_faculty_service, search_existing_faculty_service
 from backend.app.utils.jwt import generate_access_token, generate_signup_token
+from backend.app.utils.rate_limit import rate_limit
+from backend.app.config import Config
 from flask import Blueprint, request, jsonify, make_response
 
 auth_bp = Blueprint("auth", __name__)
@@ -31,6 +32,7 @@ auth_bp = Blueprint("auth", __name__)
 # =============================================================================
 
 @auth_bp.route("/lookup-faculty", methods=["GET"])
+@rate_limit(Config.RATE_LIMIT_LOOKUP_PER_MINUTE, 60)
 def lookup_faculty():
     """
     Public endpoint for looking up faculty during signup.
@@ -112,6 +114,7 @@ def register():
 
 # Login verification
 @auth_bp.route("/login", methods=["POST"])
+@rate_limit(Config.RATE_LIMIT_LOGIN_PER_MINUTE, 60)
 def login():
     """
     Login with username and password.
@@ -139,18 +142,18 @@ def login():
         if not data.get("password"):
             return jsonify({"error": "password is required"}), 400
         
-        result = validate_login(data)
-        faculty_id = result["faculty_id"]
-        
         # Check for remember_me flag (defaults to False)
         remember_me = bool(data.get("remember_me", False))
         
+        # Validate credentials, create the session and read the profile in one call
+        result = login_and_create_session(data, remember_me)
+        faculty_id = result["faculty_id"]
+        refresh_token = result["refresh_token"]
+        expiration_days = result["expiration_days"]
+        
         # Generate access token (JWT)
         access_token = generate_access_token(faculty_id)
         
-        # Create session and generate refresh token
-        refresh_token, session_id, expiration_days = create_session(faculty_id, remember_me)
-        
         # Create response with access token in JSON body
         response = make_response(jsonify({
             "access_token": access_token,
@@ -1,24 +1,81 @@
 from backend.app.utils.jwt import require_auth
-from backend.app.services.rate_limit import generate_keyword_service
+from backend.app.utils.rate_limit import rate_limit
+from backend.app.config import Config
+from backend.app.services.rate_limit import (
+    generate_keyword_service,
+    submit_keyword_job_service,
+    get_keyword_job_service,
+    stream_keyword_job_events,
+)
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 
 rate_limit_bp = Blueprint("rate_limit", __name__)
 
 # House all rate limited endpoints here.
 
 
-@rate_limit_bp.route("/<string:faculty_id>/generate-keyword", methods=["GET"])
+def _generated_keywords(response) -> bool:
+    """Only generations use up the hourly limit: keywords returned (200) or a job accepted by POST (202)."""
+    return response.status_code == 200 or (request.method == "POST" and response.status_code == 202)
+
+
+@rate_limit_bp.route("/<string:faculty_id>/generate-keyword", methods=["GET", "POST"])
 @require_auth
+@rate_limit(
+    Config.RATE_LIMIT_KEYWORD_GENERATION_PER_HOUR, 60 * 60, key="faculty_id", count_if=_generated_keywords
+)
 def generate_keyword(faculty_id):
     """
     Generate keywords for a faculty member using their biography.
 
+    The work is done by the keyword model worker. POST queues the job and
+    returns it right away (202); GET waits for the keywords. With
+    KEYWORD_ENGINE=statistical both generate the keywords in the request.
+
     Args:
         faculty_id (str): The UUID of the faculty member.
 
     Returns:
         tuple: A tuple containing (jsonify response, status_code).
     """
+    if request.method == "POST":
+        return submit_keyword_job_service(faculty_id)
     response = generate_keyword_service(faculty_id)
     return response
+
+
+@rate_limit_bp.route("/<string:faculty_id>/generate-keyword/jobs/<string:job_id>", methods=["GET"])
+@require_auth
+def get_keyword_job(faculty_id, job_id):
+    """
+    Poll a keyword generation job.
+
+    Args:
+        faculty_id (str): The UUID of the faculty member.
+        job_id (str): The UUID of the job.
+
+    Returns:
+        tuple: A tuple containing (jsonify response, status_code).
+    """
+    return get_keyword_job_service(faculty_id, job_id)
+
+
+@rate_limit_bp.route("/<string:faculty_id>/generate-keyword/jobs/<string:job_id>/events", methods=["GET"])
+@require_auth
+def stream_keyword_job(faculty_id, job_id):
+    """
+    Follow a keyword generation job as server-sent events.
+
+    Args:
+        faculty_id (str): The UUID of the faculty member.
+        job_id (str): The UUID of the job.
+
+    Returns:
+        Response: A text/event-stream response.
+    """
+    return Response(
+        stream_with_context(stream_keyword_job_events(faculty_id, job_id)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
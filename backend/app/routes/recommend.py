@@ -7,9 +7,11 @@ Recommendation API endpoints
 """
 from backend.app.services.recommend import (
     generate_recommendations,
+    get_recommendation_run_progress,
     get_recommendations_for_faculty,
 )
-from flask import Blueprint, jsonify
+from backend.app.services.recommend_refresh import get_recommendation_refresh_status
+from flask import Blueprint, jsonify, request
 
 
 recommend_bp = Blueprint("recommend", __name__)
@@ -17,10 +19,45 @@ recommend_bp = Blueprint("recommend", __name__)
 
 @recommend_bp.route("/generate", methods=["POST"])
 def generate():
-    """Manually trigger recommendation generation."""
+    """
+    Manually trigger recommendation generation.
+    Regenerates only changed faculty by default; pass ?mode=full for a complete rebuild,
+    or ?resume=<run_id> to finish a failed sharded rebuild.
+    """
+    mode = request.args.get("mode", "incremental")
+    if mode not in ("incremental", "full"):
+        return jsonify({"error": "mode must be 'incremental' or 'full'"}), 400
+    resume_run_id = request.args.get("resume") or None
+
+    try:
+        summary = generate_recommendations(full=(mode == "full"), resume_run_id=resume_run_id)
+        return jsonify({"message": "Recommendations generated successfully", **summary}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@recommend_bp.route("/runs/<string:run_id>", methods=["GET"])
+def get_run(run_id):
+    """
+    Get the progress of a sharded regeneration run, including each shard's status.
+    """
     try:
-        generate_recommendations()
-        return jsonify({"message": "Recommendations generated successfully"}), 200
+        run = get_recommendation_run_progress(run_id)
+        if run is None:
+            return jsonify({"error": "Recommendation run not found"}), 404
+        return jsonify(run), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@recommend_bp.route("/<string:faculty_id>/status", methods=["GET"])
+def get_refresh_status(faculty_id):
+    """
+    Get the status of the background recommendation refresh for a faculty member.
+    Poll this after saving keywords or registering to know when new recommendations are ready.
+    """
+    try:
+        return jsonify(get_recommendation_refresh_status(faculty_id)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -28,25 +65,42 @@ def generate():
 @recommend_bp.route("/<string:faculty_id>", methods=["GET"])
 def get_recommendations(faculty_id):
     """
-    Get personalized recommendations for a faculty member.
-    Returns faculty details with recommendation_type and recommendation_text.
+    Get personalized recommendations for a faculty member, highest match_score first.
+    Returns faculty details with match_score, recommendation_type, recommendation_reasons
+    and recommendation_text.
+    
+    Query Parameters:
+        limit (int): Optional maximum number of recommendations to return
+        cursor (str): Optional X-Next-Cursor value from the previous page
+        type (str): Optional recommendation_type to filter on
+        compact (bool): Leave out biographies when "true"
+    
+    When more recommendations follow, the response carries an X-Next-Cursor header.
     """
     try:
-        recommendations = get_recommendations_for_faculty(faculty_id)
-        
-        result = []
-        for rec in recommendations:
-            result.append({
-                'faculty_id': rec.get('faculty_id'),
-                'first_name': rec.get('first_name'),
-                'last_name': rec.get('last_name'),
-                'biography': rec.get('biography'),
-                'institution_name': rec.get('institution_name'),
-                'department_name': rec.get('department_name'),
-                'recommendation_type': rec.get('recommendation_type'),
-                'recommendation_text': rec.get('recommendation_text'),
-            })
-        
-        return jsonify(result), 200
+        limit = int(request.args["limit"]) if "limit" in request.args else None
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if limit is not None and limit < 1:
+        return jsonify({"error": "limit must be at least 1"}), 400
+    recommendation_type = request.args.get("type") or None
+    cursor = request.args.get("cursor") or None
+    compact = request.args.get("compact", "false").lower() == "true"
+
+    try:
+        page = get_recommendations_for_faculty(
+            faculty_id,
+            limit,
+            recommendation_type=recommendation_type,
+            cursor=cursor,
+            compact=compact,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+    response = jsonify(page["recommendations"])
+    if page["next_cursor"] is not None:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return response, 200
@@ -9,6 +9,8 @@ from backend.app.services.search import (
     search_equipment_service,
 )
 from backend.app.utils.search_filters import get_valid_search_filters
+from backend.app.utils.rate_limit import rate_limit
+from backend.app.config import Config
 from flask import Blueprint, request, jsonify
 
 
@@ -17,6 +19,7 @@ search_bp = Blueprint("search", __name__)
 
 @search_bp.route("/faculty", methods=["GET"])
 @require_auth
+@rate_limit(Config.RATE_LIMIT_SEARCH_PER_MINUTE, 60, key="faculty_id")
 def search_faculty():
     """
     Search for faculty members based on query parameters.
@@ -45,6 +48,7 @@ def search_faculty():
 
 
 @search_bp.route("/keyword", methods=["GET"])
+@rate_limit(Config.RATE_LIMIT_SEARCH_PER_MINUTE, 60)
 def search_keywords():
     """
     Search keywords by prefix for autocomplete.
@@ -66,6 +70,7 @@ def search_keywords():
 
 
 @search_bp.route("/equipment", methods=["GET"])
+@rate_limit(Config.RATE_LIMIT_SEARCH_PER_MINUTE, 60)
 def search_equipment():
     """
     Search equipment by keywords, location, and availability.
@@ -6,19 +6,17 @@ Author(s): Clayton Durepos
 Authentication service layer
 Handles business logic for user authentication and credential management
 """
+import datetime
+import uuid
 from backend.app.db.transaction_context import start_transaction
 from backend.app.db.procedures import (
     sql_register_credentials,
-    sql_validate_login,
+    sql_login_and_create_session,
     sql_check_username_exists,
     sql_check_credentials_exist,
-    sql_read_faculty,
-    sql_read_faculty_email_by_faculty,
-    sql_read_faculty_phone_by_faculty,
-    sql_read_faculty_department_by_faculty,
-    sql_read_faculty_title_by_faculty,
 )
-from backend.app.services.recommend import generate_recommendations_for_user
+from backend.app.services.recommend_refresh import enqueue_recommendation_refresh
+from backend.app.services.session import generate_refresh_token, hash_token, session_expiration_days
 
 
 def register_credentials(data: dict):
@@ -28,8 +26,8 @@ def register_credentials(data: dict):
     Creates a credentials record with hashed password. The password hashing
     is handled by the database procedure using SHA-256.
     
-    After successful registration, generates personalized recommendations
-    for the new user so they have recommendations immediately available.
+    After successful registration, queues a background recommendation refresh
+    for the new user so they have recommendations shortly after signing up.
     
     Args:
         data: Dictionary containing:
@@ -38,7 +36,7 @@ def register_credentials(data: dict):
             - password (required): Plain text password (will be hashed by procedure)
     
     Returns:
-        dict: Contains success message
+        dict: Contains success message and recommendation_status
     
     Raises:
         Exception: If username already exists, credentials already exist for faculty,
@@ -56,80 +54,73 @@ def register_credentials(data: dict):
             )
             # Transaction commits automatically on success
         
-        # Generate recommendations for the new user (non-blocking)
+        # Queue recommendations for the new user (runs in the background)
         # This runs after the transaction commits so we have valid credentials
-        generate_recommendations_for_user(faculty_id)
-        
+        try:
+            refresh_status = enqueue_recommendation_refresh(faculty_id)["status"]
+        except Exception as e:
+            # Don't fail signup if recommendations can't be queued
+            print(f"Warning: Failed to queue recommendations for {faculty_id}: {str(e)}")
+            refresh_status = "failed"
+
         return {
-            "message": "Credentials registered successfully"
+            "message": "Credentials registered successfully",
+            "recommendation_status": refresh_status,
         }
     except Exception as e:
         # Transaction already rolled back by context manager
         raise e
 
 
-def validate_login(data: dict):
+def login_and_create_session(data: dict, remember_me: bool = False) -> dict:
     """
-    Service layer for validating user login credentials.
+    Service layer for logging a user in.
     
-    Validates username and password using the validate_login stored procedure.
-    If successful, returns faculty_id and fetches faculty data.
+    Validates the credentials, updates last_login, creates the refresh token
+    session and reads the faculty profile with one call to the
+    login_and_create_session stored procedure, on one connection.
     
     Args:
         data: Dictionary containing:
             - username (required): Username to authenticate
             - password (required): Plain text password
+        remember_me: If True, the session lasts 30 days instead of 7
     
     Returns:
-        dict: Contains faculty_id and faculty data if successful
+        dict: Contains faculty_id, faculty data (with emails, phones,
+              departments and titles), refresh_token (raw token for the
+              cookie), session_id and expiration_days
     
     Raises:
         Exception: If username or password is invalid
     """
     try:
+        refresh_token = generate_refresh_token()
+        session_id = str(uuid.uuid4())
+        expiration_days = session_expiration_days(remember_me)
+        expires_at = datetime.datetime.utcnow() + datetime.timedelta(days=expiration_days)
+
         with start_transaction() as transaction_context:
-            # Validate login credentials
-            faculty_id, status_code = sql_validate_login(
+            faculty_id, status_code, faculty = sql_login_and_create_session(
                 transaction_context,
                 data.get("username"),
                 data.get("password"),
+                session_id,
+                hash_token(refresh_token),
+                expires_at,
             )
             
             # Check status code
             if status_code == 0:
-                # Login successful - fetch complete faculty data
-                faculty_result = sql_read_faculty(transaction_context, faculty_id)
-                if not faculty_result:
+                if not faculty:
                     raise Exception("Faculty data not found after successful login")
                 
-                # Fetch emails
-                email_rows = sql_read_faculty_email_by_faculty(transaction_context, faculty_id)
-                emails = [row.get('email') for row in email_rows if row.get('email')]
-                
-                # Fetch phones
-                phone_rows = sql_read_faculty_phone_by_faculty(transaction_context, faculty_id)
-                phones = [row.get('phone_num') for row in phone_rows if row.get('phone_num')]
-                
-                # Fetch departments
-                dept_rows = sql_read_faculty_department_by_faculty(transaction_context, faculty_id)
-                departments = [row.get('department_name') for row in dept_rows if row.get('department_name')]
-                
-                # Fetch titles
-                title_rows = sql_read_faculty_title_by_faculty(transaction_context, faculty_id)
-                titles = [row.get('title') for row in title_rows if row.get('title')]
-                
-                # Combine all faculty data
-                complete_faculty = {
-                    **faculty_result,
-                    "emails": emails,
-                    "phones": phones,
-                    "departments": departments,
-                    "titles": titles,
-                }
-                
                 return {
                     "faculty_id": faculty_id,
-                    "faculty": complete_faculty
+                    "faculty": faculty,
+                    "refresh_token": refresh_token,
+                    "session_id": session_id,
+                    "expiration_days": expiration_days,
                 }
             elif status_code == 1:
                 raise Exception("Invalid password")
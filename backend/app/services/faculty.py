@@ -33,9 +33,9 @@ from backend.app.db.procedures import (
     sql_read_faculty_researches_keyword_by_faculty,
     sql_add_keyword_for_faculty,
     sql_delete_all_faculty_keywords,
-    sql_generate_recommendations_for_faculty,
 )
 from backend.app.services.institution import get_institution_id_by_name
+from backend.app.services.recommend_refresh import enqueue_recommendation_refresh
 
 
 def create_faculty(data: dict):
@@ -412,15 +412,16 @@ def update_faculty_keywords(faculty_id: str, keywords: list[str]) -> dict:
     """
     Service layer for replacing all keywords for a faculty member.
     
-    Validates keywords, removes duplicates (case-insensitive), and generates
-    recommendations after update.
+    Validates keywords, removes duplicates (case-insensitive), and queues a
+    background recommendation refresh once the keyword write commits.
     
     Args:
         faculty_id: UUID of the faculty member
         keywords: List of keyword strings to set
     
     Returns:
-        dict: Success message
+        dict: Success message and recommendation_status (poll
+              GET /api/recommend/<faculty_id>/status for progress)
     """
     # Validate and deduplicate keywords (preserve original casing, case-insensitive dedup)
     validated_keywords = []
@@ -440,11 +441,14 @@ def update_faculty_keywords(faculty_id: str, keywords: list[str]) -> dict:
         for keyword in validated_keywords:
             sql_add_keyword_for_faculty(ctx, faculty_id, keyword)
     
-    # Generate recommendations after update (separate transaction, non-blocking)
+    # Refresh recommendations in the background; repeated saves are coalesced
     try:
-        with start_transaction() as ctx:
-            sql_generate_recommendations_for_faculty(ctx, faculty_id)
+        refresh_status = enqueue_recommendation_refresh(faculty_id)["status"]
     except Exception as e:
-        print(f"Warning: Failed to generate recommendations after keyword update: {e}")
+        print(f"Warning: Failed to queue recommendations after keyword update: {e}")
+        refresh_status = "failed"
     
-    return {"message": "Keywords updated successfully"}
+    return {
+        "message": "Keywords updated successfully",
+        "recommendation_status": refresh_status,
+    }
@@ -0,0 +1,94 @@
+"""
+Author: Aidan Bell
+"""
+
+"""
+Keyword generation with the engine chosen by KEYWORD_ENGINE.
+
+Generated keywords are mapped onto the keyword vocabulary read from the
+database (see backend/models/keyword_canonicalizer.py), so faculty get the
+existing "Machine Learning" keyword rather than a new "machine-learning".
+Generated keywords are not added to the vocabulary, since they are only saved
+if the faculty member keeps them; saved keywords are picked up when the
+vocabulary is read again.
+The statistical engine is also fit on the vocabulary and a sample of
+biographies. Both are shared by the process and read again after
+KEYWORD_CORPUS_TTL_SECONDS, so requests only pay for generation.
+"""
+import threading
+import time
+from typing import Callable
+
+from backend.app.config import Config
+from backend.app.db.procedures import sql_read_keyword_corpus
+from backend.app.db.transaction_context import start_transaction
+from backend.models.keyword_canonicalizer import KeywordCanonicalizer, make_keyword_canonicalizer
+from backend.models.keywords import fit_keyword_corpus, generate_faculty_keywords_batch
+
+_corpus_lock = threading.Lock()
+_corpus_read_at = None
+_canonicalizer = None
+
+
+def _ensure_keyword_corpus() -> KeywordCanonicalizer | None:
+    """
+    Read the keyword vocabulary (and fit the statistical engine) if it has not
+    been, or the last read expired.
+
+    Returns:
+        KeywordCanonicalizer | None: The canonicalizer over the vocabulary, or
+            None if canonicalization is disabled or the vocabulary was never read.
+    """
+    global _corpus_read_at, _canonicalizer
+    with _corpus_lock:
+        if _corpus_read_at is not None and time.monotonic() - _corpus_read_at < Config.KEYWORD_CORPUS_TTL_SECONDS:
+            return _canonicalizer
+        statistical = Config.KEYWORD_ENGINE == "statistical"
+        try:
+            with start_transaction() as transaction_context:
+                # Only the statistical engine needs biographies
+                keywords, documents = sql_read_keyword_corpus(
+                    transaction_context, Config.KEYWORD_CORPUS_SIZE if statistical else 0
+                )
+            if statistical:
+                fit_keyword_corpus(documents, keywords, engine="statistical")
+            _canonicalizer = make_keyword_canonicalizer(keywords)
+        except Exception as e:
+            # Generation still works without the vocabulary (keywords are kept as generated); try again next time
+            print(f"Warning: Failed to read keyword corpus: {str(e)}")
+            return _canonicalizer
+        _corpus_read_at = time.monotonic()
+        return _canonicalizer
+
+
+def generate_faculty_keywords(
+    biographies: list[str],
+    on_keywords: Callable[[int, list[str]], None] | None = None,
+) -> list[list[str]]:
+    """
+    Generate keywords for faculty biographies with the configured engine.
+
+    Must be called from within a Flask application context.
+
+    Args:
+        biographies (list[str]): The biographies.
+        on_keywords: Called as on_keywords(biography_index, keywords) with the
+            keywords completed so far, while the model decodes them.
+
+    Returns:
+        list[list[str]]: Keywords for each biography, in input order, using
+            existing keyword names where they match.
+    """
+    canonicalizer = _ensure_keyword_corpus()
+    if canonicalizer is None:
+        return generate_faculty_keywords_batch(biographies, engine=Config.KEYWORD_ENGINE, on_keywords=on_keywords)
+
+    on_canonical_keywords = None
+    if on_keywords is not None:
+        def on_canonical_keywords(index: int, keywords: list[str]) -> None:
+            on_keywords(index, canonicalizer.canonicalize_many(keywords, learn=False))
+
+    keyword_lists = generate_faculty_keywords_batch(
+        biographies, engine=Config.KEYWORD_ENGINE, on_keywords=on_canonical_keywords
+    )
+    return [canonicalizer.canonicalize_many(keywords, learn=False) for keywords in keyword_lists]
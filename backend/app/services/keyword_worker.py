@@ -0,0 +1,223 @@
+"""
+Author: Clayton Durepos
+"""
+
+"""
+Keyword generation model worker.
+
+API requests only queue keyword generation jobs (see services/rate_limit.py).
+This worker, started with backend/run_keyword_worker.py, is the only process
+that loads the model: it claims queued jobs in batches, generates keywords for
+the whole batch with one batched model call and records each result. Keywords
+are also recorded on the running job as they decode, for clients following it;
+a separate thread writes them every KEYWORD_JOB_POLL_SECONDS so the decode loop
+never waits on the database.
+
+Jobs queued while a batch runs are claimed together by the next one, so
+concurrent requests share model calls. One worker runs per machine; it holds
+a host-scoped MySQL advisory lock while running. Workers on several machines
+can share the queue because each batch is claimed under its own claim_id.
+Each worker also holds one of KEYWORD_WORKER_SLOTS server-wide slot locks, so
+API processes can tell whether any worker is running (keyword_worker_running).
+"""
+import socket
+import threading
+import uuid
+from datetime import datetime
+
+from flask import current_app
+
+from backend.app.config import Config
+from backend.app.db.procedures import (
+    sql_acquire_job_lock,
+    sql_release_job_lock,
+    sql_is_any_job_lock_held,
+    sql_claim_keyword_generation_jobs,
+    sql_update_keyword_generation_job,
+    sql_create_faculty_generates_keyword,
+)
+from backend.app.db.transaction_context import start_transaction
+from backend.app.services.keyword_engine import generate_faculty_keywords
+
+
+# Server-wide locks a running worker holds one of, to announce itself
+KEYWORD_WORKER_SLOTS = 16
+
+
+def _worker_lock_name() -> str:
+    # Advisory locks are server-wide; scope them to this database and machine
+    return f"{Config.DB_NAME}.keyword_worker.{socket.gethostname()}"[:64]
+
+
+def _worker_slot_lock_names() -> list[str]:
+    return [f"keyword_worker_slot.{slot}.{Config.DB_NAME}"[:64] for slot in range(KEYWORD_WORKER_SLOTS)]
+
+
+def keyword_worker_running() -> bool:
+    """
+    Whether a keyword worker is running on any machine using this database.
+
+    Must be called from within a Flask application context.
+    """
+    with start_transaction() as transaction_context:
+        return sql_is_any_job_lock_held(transaction_context, _worker_slot_lock_names())
+
+
+class _ProgressWriter:
+    """
+    Records keywords decoded so far on running jobs from a background thread.
+
+    record() only buffers the latest keywords per job, so it is cheap enough to
+    call from inside the model's decode loop. The thread writes everything
+    buffered in one transaction every KEYWORD_JOB_POLL_SECONDS, which is as
+    often as clients read the job.
+    """
+
+    def __init__(self, jobs: list[dict], claim_id: str):
+        self._jobs = jobs
+        self._claim_id = claim_id
+        self._pending = {}  # Job index -> latest keywords
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(current_app._get_current_object(),), name="keyword-progress", daemon=True
+        )
+        self._thread.start()
+
+    def record(self, index: int, keywords: list[str]) -> None:
+        with self._lock:
+            self._pending[index] = keywords
+
+    def close(self) -> None:
+        """Stop the thread, dropping unwritten progress (the final results replace it)."""
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self, app) -> None:
+        with app.app_context():
+            while not self._stop_event.wait(Config.KEYWORD_JOB_POLL_SECONDS):
+                self._flush()
+
+    def _flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            with start_transaction() as transaction_context:
+                for index, keywords in pending.items():
+                    sql_update_keyword_generation_job(
+                        transaction_context, self._jobs[index]["job_id"], self._claim_id, "running", keywords
+                    )
+        except Exception as e:
+            print(f"Warning: Failed to record keyword progress: {str(e)}")
+
+
+def process_keyword_jobs(batch_size: int | None = None) -> int:
+    """
+    Claim one batch of queued keyword generation jobs and run it.
+
+    Must be called from within a Flask application context.
+
+    Args:
+        batch_size: Maximum jobs to claim. Defaults to KEYWORD_JOB_BATCH_SIZE.
+
+    Returns:
+        int: Number of jobs claimed (0 when the queue is empty).
+    """
+    claim_id = str(uuid.uuid4())
+    with start_transaction() as transaction_context:
+        jobs = sql_claim_keyword_generation_jobs(
+            transaction_context,
+            claim_id,
+            batch_size or Config.KEYWORD_JOB_BATCH_SIZE,
+            Config.KEYWORD_JOB_STALE_SECONDS,
+            Config.KEYWORD_JOB_MAX_ATTEMPTS,
+        )
+    if not jobs:
+        return 0
+
+    # Lets clients following the job show keywords while the batch decodes
+    progress = _ProgressWriter(jobs, claim_id)
+    try:
+        keyword_lists = generate_faculty_keywords(
+            [job["biography"] for job in jobs], on_keywords=progress.record
+        )
+        errors = []
+        for job, keywords in zip(jobs, keyword_lists):
+            if keywords:
+                errors.append(None)
+            elif not (job["biography"] or "").strip():
+                # The biography was removed after the job was queued
+                errors.append("User must have a biography to generate keywords.")
+            else:
+                errors.append("No keywords generated")
+    except Exception as e:
+        keyword_lists = [None] * len(jobs)
+        errors = [f"Error generating keywords: {str(e)}"] * len(jobs)
+    finally:
+        # No progress write may land after the final status below
+        progress.close()
+
+    with start_transaction() as transaction_context:
+        for job, keywords, error in zip(jobs, keyword_lists, errors):
+            if error is None:
+                # A log of successful generations
+                sql_create_faculty_generates_keyword(
+                    transaction_context, str(uuid.uuid4()), job["faculty_id"], datetime.now()
+                )
+            sql_update_keyword_generation_job(
+                transaction_context,
+                job["job_id"],
+                claim_id,
+                "failed" if error else "complete",
+                keywords if error is None else None,
+                error,
+            )
+
+    failed = sum(error is not None for error in errors)
+    print(f"Keyword jobs: {len(jobs) - failed} complete, {failed} failed")
+    return len(jobs)
+
+
+def run_keyword_worker(stop_event: threading.Event | None = None) -> bool:
+    """
+    Process keyword generation jobs until stop_event is set.
+
+    Polls the queue every KEYWORD_JOB_POLL_SECONDS while it is empty, and
+    claims the next batch straight away while it is not. Must be called from
+    within a Flask application context.
+
+    Args:
+        stop_event: Set to stop the worker after its current batch.
+
+    Returns:
+        bool: False if another worker already runs on this machine.
+    """
+    stop_event = stop_event or threading.Event()
+    lock_name = _worker_lock_name()
+    lock_context = start_transaction()
+    try:
+        if not sql_acquire_job_lock(lock_context, lock_name):
+            return False
+        # Beyond KEYWORD_WORKER_SLOTS workers, the others already announce that one runs
+        slot_lock_name = next(
+            (name for name in _worker_slot_lock_names() if sql_acquire_job_lock(lock_context, name)), None
+        )
+        try:
+            while not stop_event.is_set():
+                try:
+                    claimed = process_keyword_jobs()
+                except Exception as e:
+                    # Keep the worker alive; claimed jobs are retried once stale
+                    print(f"Warning: Keyword job batch failed: {str(e)}")
+                    claimed = 0
+                if not claimed:
+                    stop_event.wait(Config.KEYWORD_JOB_POLL_SECONDS)
+        finally:
+            if slot_lock_name:
+                sql_release_job_lock(lock_context, slot_lock_name)
+            sql_release_job_lock(lock_context, lock_name)
+    finally:
+        lock_context.close()
+    return True
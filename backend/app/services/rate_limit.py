@@ -3,88 +3,294 @@ Author: Aidan Bell
 """
 
 
+from backend.app.config import Config
 from backend.app.services.faculty import get_faculty
-from backend.models.qwen import generate_faculty_keywords_with_qwen
+from backend.app.services.keyword_engine import generate_faculty_keywords
+from backend.app.services.keyword_worker import keyword_worker_running
 from backend.app.db.transaction_context import start_transaction
-from backend.app.db.procedures import sql_create_faculty_generates_keyword
-from backend.app.db.procedures import sql_count_faculty_keyword_generations
+from backend.app.db.procedures import (
+    sql_create_keyword_generation_job,
+    sql_read_keyword_generation_job,
+    sql_create_faculty_generates_keyword,
+    sql_count_faculty_keyword_generations,
+)
 
+import json
+import time
 import uuid
-from flask import jsonify
 from datetime import datetime, timedelta
+from flask import jsonify
 
 # House all rate limited services here.
 
+# Job statuses after which a keyword generation job no longer changes
+FINISHED_JOB_STATUSES = ("complete", "failed")
+
+
+def _generation_limit_response(faculty_id: str):
+    """
+    Check the hourly keyword generation limit against faculty_generates_keyword.
+
+    The route's @rate_limit counters are per process unless RATE_LIMIT_REDIS_URL
+    is set; this count is shared by every worker and survives restarts. It runs
+    after the route's check, so requests already rejected there do no
+    database work.
+
+    Returns:
+        tuple | None: A 429 response if the faculty member has used up the
+            limit, otherwise None.
+    """
+    if not Config.RATE_LIMIT_ENABLED or Config.RATE_LIMIT_REDIS_URL:
+        return None
+    with start_transaction() as transaction_context:
+        generation_count = sql_count_faculty_keyword_generations(
+            transaction_context, faculty_id, datetime.now() - timedelta(hours=1)
+        )
+    limit = Config.RATE_LIMIT_KEYWORD_GENERATION_PER_HOUR
+    if generation_count >= limit:
+        return jsonify({"error": f"Rate limit exceeded. Maximum of {limit} requests per hour."}), 429
+    return None
+
+
+def _job_payload(job: dict) -> dict:
+    """The client-facing fields of a keyword generation job."""
+    payload = {"job_id": job["job_id"], "status": job["status"]}
+    if job["status"] == "queued":
+        payload["queue_position"] = job["queue_position"]
+    elif job["status"] == "running" and job["keywords"]:
+        # Keywords decoded so far; more follow until the job completes
+        payload["keywords"] = job["keywords"]
+    elif job["status"] == "complete":
+        payload["keywords"] = job["keywords"]
+    elif job["status"] == "failed":
+        payload["error"] = job["error"]
+    return payload
+
+
+def _read_job(job_id: str, faculty_id: str) -> dict | None:
+    """Read a job, treating jobs of other faculty members as missing."""
+    with start_transaction() as transaction_context:
+        job = sql_read_keyword_generation_job(transaction_context, job_id)
+    if job is None or job["faculty_id"] != faculty_id:
+        return None
+    return job
+
+
+def _watch_job(job_id: str, faculty_id: str, timeout_seconds: float):
+    """
+    Yield a job each time its status (or queue position) changes, until it
+    finishes or timeout_seconds pass. Reads the job every KEYWORD_JOB_POLL_SECONDS.
+    """
+    deadline = time.monotonic() + timeout_seconds
+    last_payload = None
+    while True:
+        job = _read_job(job_id, faculty_id)
+        if job is None:
+            return
+        payload = _job_payload(job)
+        if payload != last_payload:
+            last_payload = payload
+            yield job
+        if job["status"] in FINISHED_JOB_STATUSES or time.monotonic() >= deadline:
+            return
+        time.sleep(Config.KEYWORD_JOB_POLL_SECONDS)
+
+
+def submit_keyword_job(faculty_id: str) -> tuple[dict | None, str | None]:
+    """
+    Queue a keyword generation job for a faculty member's biography.
+
+    Args:
+        faculty_id (str): The UUID of the faculty member.
+
+    Returns:
+        tuple: (job, None) with the queued job, or (None, error message) if
+            the faculty member has no biography.
+    """
+    faculty = get_faculty(faculty_id)
+    if not faculty.get("biography"):
+        return None, "User must have a biography to generate keywords."
+
+    job_id = str(uuid.uuid4())
+    with start_transaction() as transaction_context:
+        sql_create_keyword_generation_job(transaction_context, job_id, faculty_id)
+        return sql_read_keyword_generation_job(transaction_context, job_id), None
+
+
+def _generates_inline() -> bool:
+    """
+    Whether keywords are generated in the request rather than queued: always
+    with the statistical engine, and with the model when no keyword worker
+    is running to answer the queue.
+    """
+    if Config.KEYWORD_ENGINE == "statistical":
+        return True
+    if keyword_worker_running():
+        return False
+    print("Warning: No keyword worker is running; generating keywords in the request")
+    return True
+
+
+def generate_keywords_inline(faculty_id: str) -> tuple[list[str] | None, str | None, int]:
+    """
+    Generate keywords for a faculty member's biography in this request.
+
+    Used with the statistical engine, which needs no model worker, and when
+    no model worker is running.
+
+    Args:
+        faculty_id (str): The UUID of the faculty member.
+
+    Returns:
+        tuple: (keywords, None, 200), or (None, error message, HTTP status code).
+    """
+    faculty = get_faculty(faculty_id)
+    if not faculty.get("biography"):
+        return None, "User must have a biography to generate keywords.", 400
+
+    keywords = generate_faculty_keywords([faculty["biography"]])[0]
+    if not keywords:
+        return None, "No keywords generated", 500
+
+    with start_transaction() as transaction_context:
+        # A log of successful generations
+        sql_create_faculty_generates_keyword(
+            transaction_context, str(uuid.uuid4()), faculty_id, datetime.now()
+        )
+    return keywords, None, 200
+
+
+def submit_keyword_job_service(faculty_id: str):
+    """
+    Queue keyword generation for a faculty member without waiting for it.
+
+    With KEYWORD_ENGINE=statistical, or when no keyword worker is running,
+    nothing is queued: the keywords are generated right away and returned as
+    a complete result (200).
+
+    Args:
+        faculty_id (str): The UUID of the faculty member.
+
+    Returns:
+        tuple: A tuple containing the JSON response (the job) and the HTTP status code.
+    """
+    try:
+        limited = _generation_limit_response(faculty_id)
+        if limited:
+            return limited
+
+        if _generates_inline():
+            keywords, error, status = generate_keywords_inline(faculty_id)
+            if error:
+                return jsonify({"error": error}), status
+            return jsonify({"status": "complete", "keywords": keywords}), 200
+
+        job, error = submit_keyword_job(faculty_id)
+        if error:
+            return jsonify({"error": error}), 400
+        return jsonify(_job_payload(job)), 202
+    except Exception as e:
+        return jsonify({"error": f"Error generating keywords: {str(e)}"}), 500
+
 
 def generate_keyword_service(faculty_id: str):
     """
     Generate keywords for a faculty member using their biography.
 
+    Queues a job for the model worker and waits up to KEYWORD_JOB_WAIT_SECONDS
+    for it. The request holds no transaction and loads no model while waiting.
+    With KEYWORD_ENGINE=statistical, or when no keyword worker is running to
+    answer the job, the keywords are generated in the request instead.
+
     Args:
         faculty_id (str): The UUID of the faculty member.
 
     Returns:
         tuple: A tuple containing the JSON response and the HTTP status code.
-
-    Raises:
-        ValueError: If the LLM fails to generate keywords.
+            202 with the job if it has not finished in time, so the client can
+            poll it.
     """
-    REQUESTS_PER_HOUR = 3
-
+    # Requests over the hourly limit are usually rejected by the route's
+    # @rate_limit before reaching this service; without Redis its counters are
+    # per process, so the shared count is checked here too.
     try:
-        with start_transaction() as transaction_context:
-            # Check rate limit (read-only operation)
-            count_faculty_keyword_generations = sql_count_faculty_keyword_generations(
-                transaction_context, faculty_id, datetime.now() - timedelta(hours=1)
-            )
-            if count_faculty_keyword_generations > REQUESTS_PER_HOUR:
-                # Early return: no DB changes made, commit is harmless
-                return (
-                    jsonify(
-                        {
-                            "error": f"Rate limit exceeded. Maximum of {REQUESTS_PER_HOUR} requests per hour."
-                        }
-                    ),
-                    429,
-                )
-
-            # Get faculty data (separate connection, not in transaction)
-            faculty = get_faculty(faculty_id)
-            biography = faculty["biography"]
-            if not biography:
-                # Early return: no DB changes made, commit is harmless
-                return (
-                    jsonify(
-                        {"error": "User must have a biography to generate keywords."}
-                    ),
-                    400,
-                )
-
-            # Create generation record BEFORE LLM call
-            # If LLM fails, exception will trigger automatic rollback
-            generation_id = str(uuid.uuid4())
-            sql_create_faculty_generates_keyword(
-                transaction_context, generation_id, faculty_id, datetime.now()
-            )
-
-            # Call LLM - if this fails, exception triggers rollback via context manager
-            # Alternatively, we could wrap this in a try/except and just return an error so the context manager doesn't rollback.
-            # This might be preferred if we want to consider the rate limit even if the LLM fails.
-            # NOTE: We do not unload the model here because we want to keep it loaded for the next request. If we have multiple 
-            # workers, we should carefully consider the memory implications.
-            keywords = generate_faculty_keywords_with_qwen(biography)
-            if not keywords:
-                # Raise exception to trigger rollback of generation record
-                raise ValueError("No keywords generated from LLM")
-
-            # Successfully generated keywords, context manager commits the generation record
+        limited = _generation_limit_response(faculty_id)
+        if limited:
+            return limited
+
+        if _generates_inline():
+            keywords, error, status = generate_keywords_inline(faculty_id)
+            if error:
+                return jsonify({"error": error}), status
             return jsonify({"keywords": keywords}), 200
 
+        job, error = submit_keyword_job(faculty_id)
+        if error:
+            return jsonify({"error": error}), 400
+
+        for job in _watch_job(job["job_id"], faculty_id, Config.KEYWORD_JOB_WAIT_SECONDS):
+            pass
+
+        if job["status"] == "complete":
+            return jsonify({"keywords": job["keywords"]}), 200
+        if job["status"] == "failed":
+            return jsonify({"error": job["error"]}), 500
+        return jsonify(_job_payload(job)), 202
+
     except Exception as e:
-        # Context manager already handled rollback (if needed)
         # Convert exception to JSON error response for API layer
         error_message = str(e)
         return (
             jsonify({"error": f"Error generating keywords: {error_message}"}),
             500,
         )
+
+
+def get_keyword_job_service(faculty_id: str, job_id: str):
+    """
+    Get the status, and once finished the result, of a keyword generation job.
+
+    Args:
+        faculty_id (str): The UUID of the faculty member the job belongs to.
+        job_id (str): The UUID of the job.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+    """
+    try:
+        job = _read_job(job_id, faculty_id)
+        if job is None:
+            return jsonify({"error": "Keyword generation job not found"}), 404
+        return jsonify(_job_payload(job)), 200
+    except Exception as e:
+        return jsonify({"error": f"Error reading keyword generation job: {str(e)}"}), 500
+
+
+def stream_keyword_job_events(faculty_id: str, job_id: str):
+    """
+    Server-sent events for a keyword generation job.
+
+    Sends a "status" event with the job each time it changes, then a final
+    "complete" or "failed" event. After KEYWORD_JOB_WAIT_SECONDS without a
+    result a "timeout" event ends the stream; clients may reconnect.
+
+    Args:
+        faculty_id (str): The UUID of the faculty member the job belongs to.
+        job_id (str): The UUID of the job.
+
+    Yields:
+        str: Event stream messages.
+    """
+    job = None
+    try:
+        for job in _watch_job(job_id, faculty_id, Config.KEYWORD_JOB_WAIT_SECONDS):
+            event = job["status"] if job["status"] in FINISHED_JOB_STATUSES else "status"
+            yield f"event: {event}\ndata: {json.dumps(_job_payload(job))}\n\n"
+    except Exception as e:
+        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+        return
+
+    if job is None:
+        yield f"event: error\ndata: {json.dumps({'error': 'Keyword generation job not found'})}\n\n"
+    elif job["status"] not in FINISHED_JOB_STATUSES:
+        yield f"event: timeout\ndata: {json.dumps(_job_payload(job))}\n\n"
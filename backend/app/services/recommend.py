@@ -5,19 +5,126 @@ Author: Clayton Durepos
 """
 Recommendation service for faculty collaboration suggestions.
 """
+import base64
+import threading
+import time
+
 from backend.app.db.procedures import (
-    sql_generate_all_recommendations,
+    sql_delete_recommendation_change_log,
+    sql_generate_incremental_recommendations,
+    sql_generate_recommendation_pairs,
     sql_generate_recommendations_for_faculty,
+    sql_prune_stale_recommendations,
+    sql_read_recommendation_rebuild_state,
     sql_read_recommendations_for_faculty,
+    sql_refresh_recommendation_display,
+    sql_score_recommendations,
 )
 from backend.app.db.transaction_context import start_transaction
+from backend.app.config import Config
+from backend.app.services.recommend_shards import get_recommendation_run, run_sharded_generation
+
+
+# Cache for recommendation responses:
+# faculty_id -> {(limit, type, cursor, compact): (expires_at, page)}
+# Cleared when recommendations are generated in this process; the TTL bounds
+# staleness after runs made elsewhere (e.g. the scheduler process).
+_recommendations_cache = {}
+_recommendations_cache_lock = threading.Lock()
+
+# Expired entries are swept once this many faculty members are cached
+RECOMMENDATIONS_CACHE_SWEEP_SIZE = 1000
+
+# Stale recommendation rows deleted per transaction by a full rebuild
+PRUNE_BATCH_SIZE = 5000
+
+
+def invalidate_recommendations_cache(faculty_id: str | None = None) -> None:
+    """
+    Drop cached recommendation responses.
+    
+    Args:
+        faculty_id: Faculty member whose recommendations were regenerated.
+                    Clears every cached response when None.
+    """
+    with _recommendations_cache_lock:
+        if faculty_id is None:
+            _recommendations_cache.clear()
+        else:
+            _recommendations_cache.pop(faculty_id, None)
+
+
+def prune_stale_recommendations(epoch: int) -> int:
+    """
+    Delete recommendations from generation epochs older than epoch, every source,
+    committing after each batch of PRUNE_BATCH_SIZE rows so no transaction
+    holds locks on a large part of faculty_recommended_to_faculty.
+    
+    Args:
+        epoch: Generation epoch of the run that just finished writing.
+    
+    Returns:
+        int: Number of stale rows deleted.
+    """
+    pruned_count = 0
+    while True:
+        with start_transaction() as transaction_context:
+            deleted = sql_prune_stale_recommendations(transaction_context, epoch, limit=PRUNE_BATCH_SIZE)
+        pruned_count += deleted
+        if deleted < PRUNE_BATCH_SIZE:
+            return pruned_count
+
+
+def _generate_all_recommendations(engine: str) -> dict:
+    """
+    Rebuild recommendations for every registered user with the sql or sparse engine.
+    
+    Runs in three steps: write every pair with a new epoch (one transaction),
+    prune rows from older epochs (one transaction per batch), then score (sql
+    engine), rebuild the display table and clear the covered change log (one
+    transaction). Reads are served from the display table, which only changes
+    in the last step.
+    
+    Args:
+        engine: "sql" or "sparse".
+    
+    Returns:
+        dict: Contains mode, engine and pruned_count, plus pair_count for the
+              sparse engine.
+    """
+    summary = {"mode": "full", "engine": engine}
+    with start_transaction() as transaction_context:
+        if engine == "sparse":
+            # Imported here so numpy/scipy are only needed when selected
+            from backend.app.services.recommend_engine import write_recommendations_sparse
+            written = write_recommendations_sparse(transaction_context)
+            epoch, max_change_id = written["epoch"], written["max_change_id"]
+            summary["pair_count"] = written["pair_count"]
+        else:
+            state = sql_read_recommendation_rebuild_state(transaction_context)
+            epoch, max_change_id = state["epoch"], state["max_change_id"]
+            sql_generate_recommendation_pairs(transaction_context, epoch)
+
+    summary["pruned_count"] = prune_stale_recommendations(epoch)
 
+    with start_transaction() as transaction_context:
+        if engine != "sparse":
+            sql_score_recommendations(transaction_context)
+        sql_refresh_recommendation_display(transaction_context)
+        if max_change_id is not None:
+            sql_delete_recommendation_change_log(transaction_context, max_change_id)
+    return summary
 
-def generate_recommendations() -> None:
+
+def generate_recommendations(
+    full: bool = False,
+    resume_run_id: str | None = None,
+    engine: str | None = None,
+) -> dict:
     """
-    Generate/refresh all faculty recommendations.
+    Generate/refresh faculty recommendations.
     
-    Creates recommendations for all registered users based on:
+    Creates recommendations for registered users based on:
     - Similar research interests (shared keywords)
     - Published in your research area
     - Holds a relevant grant
@@ -25,22 +132,71 @@ def generate_recommendations() -> None:
     - Shared grant funding
     - Works at the same institution
     
-    This is typically run by a scheduled event every 12 hours,
-    but can also be triggered manually.
+    By default only faculty affected by changes since the last run are
+    regenerated. This is typically run by the job scheduler every 12 hours,
+    with a weekly full rebuild (see services/scheduler.py), but can also be
+    triggered manually.
+    
+    Full rebuilds use the engine selected by RECOMMEND_ENGINE: "sql" runs the
+    steps of the generate_all_recommendations procedure, "sharded" regenerates
+    shards of faculty in parallel (see services/recommend_shards.py), "sparse"
+    computes every type with sparse matrix products (see
+    services/recommend_engine.py). The sql and sparse engines prune stale rows
+    in their own short transactions (see _generate_all_recommendations).
+    
+    Args:
+        full: Rebuild recommendations for every registered user instead of
+              only the faculty recorded in the change log.
+        resume_run_id: Resume a failed sharded run, regenerating only the shards
+                       that did not complete. Implies a full sharded rebuild.
+        engine: Engine for a full rebuild. Defaults to RECOMMEND_ENGINE.
+    
+    Returns:
+        dict: Contains mode ('full' or 'incremental'), plus changed_count and
+              regenerated_count for incremental runs, or engine (with pair_count
+              for the sparse engine, or run_id and progress for the sharded
+              engine) for full runs.
     """
+    engine = engine or Config.RECOMMEND_ENGINE
     try:
+        if resume_run_id is not None or (full and engine == "sharded"):
+            run = run_sharded_generation(resume_run_id=resume_run_id)
+            invalidate_recommendations_cache()
+            return {
+                "mode": "full",
+                "engine": "sharded",
+                "run_id": run["run_id"],
+                "status": run["status"],
+                "shard_count": run["shard_count"],
+                "completed_shards": int(run["completed_shards"]),
+                "source_count": int(run["source_count"]),
+            }
+
+        if full:
+            summary = _generate_all_recommendations(engine)
+            invalidate_recommendations_cache()
+            return summary
+
         with start_transaction() as transaction_context:
-            sql_generate_all_recommendations(transaction_context)
+            result = sql_generate_incremental_recommendations(transaction_context)
+            summary = {
+                "mode": "incremental",
+                "changed_count": result.get("changed_count", 0),
+                "regenerated_count": result.get("regenerated_count", 0),
+            }
+        # Transaction has committed; drop responses built from the old rows
+        invalidate_recommendations_cache()
+        return summary
     except Exception as e:
         raise Exception(f"Failed to generate recommendations: {str(e)}")
 
 
 def generate_recommendations_for_user(faculty_id: str) -> None:
     """
-    Generate recommendations for a single faculty member.
+    Generate recommendations for a single faculty member synchronously.
     
-    Called immediately after signup to provide instant recommendations
-    without waiting for the 12-hour event.
+    Request handlers should use enqueue_recommendation_refresh() from
+    services/recommend_refresh.py instead, which runs this work in the background.
     
     Args:
         faculty_id: UUID of the faculty member to generate recommendations for.
@@ -48,44 +204,145 @@ def generate_recommendations_for_user(faculty_id: str) -> None:
     try:
         with start_transaction() as transaction_context:
             sql_generate_recommendations_for_faculty(transaction_context, faculty_id)
+        invalidate_recommendations_cache(faculty_id)
     except Exception as e:
         # Log the error but don't fail signup if recommendations fail
         print(f"Warning: Failed to generate recommendations for {faculty_id}: {str(e)}")
 
 
-def get_recommendations_for_faculty(faculty_id: str) -> list[dict]:
+def get_recommendation_run_progress(run_id: str) -> dict | None:
+    """
+    Get the progress of a sharded regeneration run.
+    
+    Args:
+        run_id: UUID of the run (returned by a sharded full generation).
+    
+    Returns:
+        dict | None: Contains run_id, status, shard_count, completed_shards,
+                     source_count, started_at, finished_at and per-shard progress,
+                     or None if the run doesn't exist.
+    """
+    try:
+        run = get_recommendation_run(run_id)
+    except Exception as e:
+        raise Exception(f"Failed to get recommendation run: {str(e)}")
+    if run is None:
+        return None
+    run["completed_shards"] = int(run["completed_shards"])
+    run["source_count"] = int(run["source_count"])
+    return run
+
+
+def _encode_recommendation_cursor(rec: dict) -> str:
+    """Opaque cursor pointing just after rec in read order."""
+    raw = f"{rec['match_score']}|{rec['type_rank']}|{rec['faculty_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_recommendation_cursor(cursor: str) -> tuple[float, int, str]:
+    """
+    Decode a cursor from _encode_recommendation_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        score, type_rank, faculty_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return float(score), int(type_rank), faculty_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def get_recommendations_for_faculty(
+    faculty_id: str,
+    limit: int | None = None,
+    recommendation_type: str | None = None,
+    cursor: str | None = None,
+    compact: bool = False,
+) -> dict:
     """
-    Get personalized recommendations for a specific faculty member.
+    Get personalized recommendations for a specific faculty member, highest score first.
+    
+    Pages are read with keyset pagination: pass the returned next_cursor back
+    as cursor to continue after the last row. Responses are cached per faculty
+    member for RECOMMEND_CACHE_TTL_SECONDS and dropped whenever their
+    recommendations are regenerated in this process.
     
     Args:
         faculty_id: UUID of the faculty member to get recommendations for.
+        limit: Maximum number of recommendations to return. Defaults to the
+               number stored per faculty member (recommendation_top_k()).
+        recommendation_type: Only return recommendations with this primary type.
+        cursor: next_cursor from a previous page.
+        compact: Leave out biographies.
     
     Returns:
-        List of recommended faculty with:
-        - faculty_id, first_name, last_name, biography
-        - institution_name, department_name
-        - match_score (0.0 to 1.0)
-        - recommendation_type: ENUM value (e.g., 'shared_keyword')
-        - recommendation_text: Human-readable text (e.g., "Similar research interests")
+        dict: Contains:
+        - recommendations: List of recommended faculty with
+            - faculty_id, first_name, last_name, biography (first 300 characters,
+              omitted when compact)
+            - institution_name, department_name
+            - match_score (0.0 to 1.0)
+            - recommendation_type: ENUM value (e.g., 'shared_keyword')
+            - recommendation_reasons: Every reason for the match, highest priority first
+            - recommendation_text: Human-readable text (e.g., "Similar research interests")
+        - next_cursor: Cursor for the next page, or None on the last page
+    
+    Raises:
+        ValueError: If cursor is malformed.
     """
+    after = _decode_recommendation_cursor(cursor) if cursor else None
+    cache_key = (limit, recommendation_type, cursor, compact)
+
+    now = time.monotonic()
+    with _recommendations_cache_lock:
+        cached = _recommendations_cache.get(faculty_id, {}).get(cache_key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
     try:
         with start_transaction() as transaction_context:
+            # One extra row tells us whether another page follows
             recommendations = sql_read_recommendations_for_faculty(
                 transaction_context,
                 faculty_id,
+                limit + 1 if limit is not None else None,
+                recommendation_type,
+                after,
+                compact,
             )
-            
-            # Convert to list of dicts
-            processed = []
-            for rec in recommendations:
-                # Convert to dict if needed
-                if hasattr(rec, '_asdict'):
-                    rec = rec._asdict()
-                elif not isinstance(rec, dict):
-                    rec = dict(rec)
-                
-                processed.append(rec)
-            
-            return processed
     except Exception as e:
         raise Exception(f"Failed to get recommendations: {str(e)}")
+
+    next_cursor = None
+    if limit is not None and len(recommendations) > limit:
+        recommendations = recommendations[:limit]
+        next_cursor = _encode_recommendation_cursor(recommendations[-1])
+
+    for rec in recommendations:
+        # DECIMAL column; convert for JSON
+        if rec.get('match_score') is not None:
+            rec['match_score'] = float(rec['match_score'])
+        
+        # SET column read as a comma-separated string in priority order
+        reasons = rec.get('recommendation_reasons')
+        rec['recommendation_reasons'] = reasons.split(',') if reasons else []
+        
+        del rec['type_rank']
+        if compact:
+            del rec['biography']
+
+    page = {"recommendations": recommendations, "next_cursor": next_cursor}
+
+    ttl = Config.RECOMMEND_CACHE_TTL_SECONDS
+    if ttl > 0:
+        with _recommendations_cache_lock:
+            if len(_recommendations_cache) >= RECOMMENDATIONS_CACHE_SWEEP_SIZE:
+                for cached_id in list(_recommendations_cache):
+                    entries = _recommendations_cache[cached_id]
+                    for key in [k for k, (expires_at, _) in entries.items() if expires_at <= now]:
+                        del entries[key]
+                    if not entries:
+                        del _recommendations_cache[cached_id]
+            _recommendations_cache.setdefault(faculty_id, {})[cache_key] = (now + ttl, page)
+    return page
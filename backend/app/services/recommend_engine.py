@@ -0,0 +1,321 @@
+"""
+Author: Clayton Durepos
+"""
+
+"""
+Sparse-matrix recommendation engine.
+
+Alternative to the generate_recommendation_pairs stored procedure. Instead of one
+self-join per recommendation type, the relationship tables are loaded once as
+incidence matrices and every type is computed as a sparse matrix product:
+
+    FK  faculty x keyword              (faculty_researches_keyword)
+    FP  faculty x keyword              (keywords of publications they authored)
+    FG  faculty x grant                (grants_granted_to_faculty)
+    GK  grant x keyword                (grants_for_keyword)
+    FD  faculty x department           (faculty_department, normalized)
+    FGK = FG @ GK  faculty x keyword   (keywords of grants they hold)
+
+    shared_keyword          FK  @ FK.T
+    keyword_to_publication  FK  @ FP.T
+    publication_to_keyword  FP  @ FK.T
+    keyword_to_grant        FK  @ FGK.T
+    grant_to_keyword        FGK @ FK.T
+    grant_to_publication    FGK @ FP.T
+    publication_to_grant    FP  @ FGK.T
+    shared_grant            FG  @ FG.T
+    shared_department       FD  @ FD.T
+
+Each product is faculty x faculty; a non-zero entry (A, B) means A should be
+recommended B for that reason. Only registered users (faculty with credentials)
+are kept as sources. The products are summed into one bitmask per pair (bit
+i set for RECOMMENDATION_TYPES[i]), so each pair carries every reason and its
+highest-priority type is the lowest set bit.
+
+Every pair is then scored with the same weights as the recommendation_score()
+SQL function (cosine over research topics, Jaccard over grants, shared
+department) and only the top recommendation_top_k() pairs per source are kept,
+selected with a bounded heap.
+
+Requires numpy and scipy. Select it with RECOMMEND_ENGINE=sparse.
+"""
+import heapq
+
+import numpy as np
+import scipy.sparse as sp
+
+from backend.app.db.procedures import (
+    sql_read_recommendation_inputs,
+    sql_prune_stale_recommendations,
+    sql_refresh_recommendation_display,
+    sql_upsert_faculty_recommendations,
+    sql_delete_recommendation_change_log,
+)
+from backend.app.db.transaction_context import TransactionContext
+
+
+# Highest priority first; matches the faculty_recommended_to_faculty ENUM order
+RECOMMENDATION_TYPES = (
+    "shared_keyword",
+    "keyword_to_publication",
+    "publication_to_keyword",
+    "keyword_to_grant",
+    "grant_to_keyword",
+    "grant_to_publication",
+    "publication_to_grant",
+    "shared_grant",
+    "shared_department",
+)
+
+# Score weights; must match the recommendation_score() SQL function
+TOPIC_WEIGHT = 0.60
+GRANT_WEIGHT = 0.25
+DEPARTMENT_WEIGHT = 0.15
+
+# Used when the top_k input is missing; matches recommendation_top_k()
+DEFAULT_TOP_K = 50
+
+
+class _Index:
+    """Assigns consecutive matrix positions to ids as they are first seen."""
+
+    def __init__(self):
+        self.positions = {}
+        self.ids = []
+
+    def __call__(self, key) -> int:
+        position = self.positions.get(key)
+        if position is None:
+            position = len(self.ids)
+            self.positions[key] = position
+            self.ids.append(key)
+        return position
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _incidence(rows: list[dict], row_key: str, col_key: str, row_index: _Index, col_index: _Index):
+    """Collect (row, col) positions for a relationship table, skipping NULL values."""
+    row_positions, col_positions = [], []
+    for row in rows:
+        if row[row_key] is None or row[col_key] is None:
+            continue
+        row_positions.append(row_index(row[row_key]))
+        col_positions.append(col_index(row[col_key]))
+    return row_positions, col_positions
+
+
+def _to_csr(positions: tuple[list, list], shape: tuple[int, int]) -> sp.csr_matrix:
+    """Build a 0/1 CSR matrix; duplicate positions collapse to a single 1."""
+    row_positions, col_positions = positions
+    data = np.ones(len(row_positions), dtype=np.int32)
+    matrix = sp.csr_matrix((data, (row_positions, col_positions)), shape=shape)
+    matrix.data[:] = 1
+    return matrix
+
+
+def _pair_values(matrix: sp.csr_matrix, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Read matrix[rows[i], cols[i]] for every i as a flat array."""
+    return np.asarray(matrix[rows, cols]).ravel().astype(np.float64)
+
+
+def _score_pairs(rows, cols, S, topics, grants, departments) -> np.ndarray:
+    """Vectorized equivalent of recommendation_score() for each (row, col) pair."""
+    topic_counts = topics.getnnz(axis=1).astype(np.float64)
+    grant_counts = grants.getnnz(axis=1).astype(np.float64)
+
+    shared_topics = _pair_values((S @ topics) @ topics.T, rows, cols)
+    shared_grants = _pair_values((S @ grants) @ grants.T, rows, cols)
+    shared_department = _pair_values((S @ departments) @ departments.T, rows, cols) > 0
+
+    topic_norm = np.sqrt(topic_counts[rows] * topic_counts[cols])
+    topic_score = np.divide(shared_topics, topic_norm, out=np.zeros_like(shared_topics), where=topic_norm > 0)
+
+    grant_union = grant_counts[rows] + grant_counts[cols] - shared_grants
+    grant_score = np.divide(shared_grants, grant_union, out=np.zeros_like(shared_grants), where=grant_union > 0)
+
+    scores = (
+        TOPIC_WEIGHT * topic_score
+        + GRANT_WEIGHT * grant_score
+        + DEPARTMENT_WEIGHT * shared_department
+    )
+    return np.round(scores, 4)
+
+
+def _lowest_bit_rank(reasons: np.ndarray) -> np.ndarray:
+    """1-based position of the lowest set bit of each reason bitmask."""
+    return np.log2(reasons & -reasons).astype(np.int32) + 1
+
+
+def compute_recommendations(inputs: dict[str, list[dict]], source_ids=None) -> list[tuple[str, str, str, int, float]]:
+    """
+    Compute the top-scoring recommendations from the relationship tables.
+
+    Args:
+        inputs: Row lists as returned by sql_read_recommendation_inputs().
+        source_ids: Optional iterable of faculty_ids to limit sources to. Sources
+                    are always limited to faculty with credentials.
+
+    Returns:
+        list[tuple]: (source_faculty_id, target_faculty_id, recommendation_type,
+                     recommendation_reasons, match_score) rows carrying each pair's
+                     highest-priority type and the bitmask of every reason. At most
+                     top_k rows per source, ranked by score, then type priority,
+                     then target.
+    """
+    faculty = _Index()
+    keywords = _Index()
+    grants = _Index()
+    departments = _Index()
+
+    fk = _incidence(inputs["faculty_keyword"], "faculty_id", "keyword", faculty, keywords)
+    fp = _incidence(inputs["publication_keyword"], "faculty_id", "keyword", faculty, keywords)
+    fg = _incidence(inputs["faculty_grant"], "faculty_id", "grant_id", faculty, grants)
+    gk = _incidence(inputs["grant_keyword"], "grant_id", "keyword", grants, keywords)
+    fd = _incidence(inputs["faculty_department"], "faculty_id", "department", faculty, departments)
+
+    n_faculty, n_keywords, n_grants = len(faculty), len(keywords), len(grants)
+    if n_faculty == 0:
+        return []
+
+    FK = _to_csr(fk, (n_faculty, n_keywords))
+    FP = _to_csr(fp, (n_faculty, n_keywords))
+    FG = _to_csr(fg, (n_faculty, n_grants))
+    GK = _to_csr(gk, (n_grants, n_keywords))
+    FD = _to_csr(fd, (n_faculty, len(departments)))
+    FGK = FG @ GK
+
+    # Zero out rows for faculty that may not be sources before multiplying
+    allowed = {row["faculty_id"] for row in inputs["credentials"]}
+    if source_ids is not None:
+        allowed &= set(source_ids)
+    source_mask = np.zeros(n_faculty, dtype=np.int32)
+    for faculty_id in allowed:
+        position = faculty.positions.get(faculty_id)
+        if position is not None:
+            source_mask[position] = 1
+    if not source_mask.any():
+        return []
+    S = sp.diags(source_mask, format="csr", dtype=np.int32)
+
+    products = {
+        "shared_keyword": (FK, FK),
+        "keyword_to_publication": (FK, FP),
+        "publication_to_keyword": (FP, FK),
+        "keyword_to_grant": (FK, FGK),
+        "grant_to_keyword": (FGK, FK),
+        "grant_to_publication": (FGK, FP),
+        "publication_to_grant": (FP, FGK),
+        "shared_grant": (FG, FG),
+        "shared_department": (FD, FD),
+    }
+
+    # Each type contributes its own bit, so the sum is the bitwise OR of reasons
+    reasons = sp.csr_matrix((n_faculty, n_faculty), dtype=np.int32)
+    for bit, recommendation_type in enumerate(RECOMMENDATION_TYPES):
+        source_matrix, target_matrix = products[recommendation_type]
+        related = (S @ source_matrix) @ target_matrix.T
+        reasons = reasons + (related > 0).astype(np.int32) * (1 << bit)
+
+    reasons = reasons.tocoo()
+    keep = (reasons.row != reasons.col) & (reasons.data > 0)  # Never recommend faculty to themselves
+    rows, cols, bits = reasons.row[keep], reasons.col[keep], reasons.data[keep]
+    if len(rows) == 0:
+        return []
+    ranks = _lowest_bit_rank(bits)
+
+    # Research topics: keywords researched, published on, or funded by a grant
+    topics = ((FK + FP + FGK) > 0).astype(np.int32)
+    scores = _score_pairs(rows, cols, S, topics, FG, FD)
+
+    top_k = inputs["top_k"][0]["top_k"] if inputs.get("top_k") else DEFAULT_TOP_K
+
+    # Bounded heap per source: highest score, then type priority, then target id
+    ids = faculty.ids
+    order = np.argsort(rows, kind="stable")
+    boundaries = np.flatnonzero(np.diff(rows[order])) + 1
+    recommendations = []
+    for group in np.split(order, boundaries):
+        candidates = (
+            (-scores[i], ranks[i], ids[cols[i]], i)
+            for i in group.tolist()
+            if scores[i] > 0
+        )
+        for _, rank, target_id, i in heapq.nsmallest(top_k, candidates):
+            recommendations.append(
+                (ids[rows[i]], target_id, RECOMMENDATION_TYPES[rank - 1], int(bits[i]), float(scores[i]))
+            )
+    return recommendations
+
+
+def write_recommendations_sparse(transaction_context: TransactionContext, source_ids=None) -> dict:
+    """
+    Compute scored top-K recommendations with sparse products and upsert them,
+    stamped with a new generation epoch. Stale rows and the display table are
+    left alone (see generate_recommendations_sparse).
+
+    Args:
+        transaction_context: Transaction to read and write through.
+        source_ids: Optional iterable of faculty_ids to regenerate. Defaults to
+                    every registered user.
+
+    Returns:
+        dict: Contains pair_count (rows upserted), source_count (sources with
+              at least one recommendation), epoch (of the written rows) and
+              max_change_id (newest change log entry the inputs cover).
+    """
+    inputs = sql_read_recommendation_inputs(transaction_context)
+    recommendations = compute_recommendations(inputs, source_ids)
+    epoch = inputs["epoch"][0]["epoch"]
+    sql_upsert_faculty_recommendations(transaction_context, recommendations, epoch)
+    return {
+        "pair_count": len(recommendations),
+        "source_count": len({row[0] for row in recommendations}),
+        "epoch": epoch,
+        "max_change_id": inputs["max_change_id"][0]["change_id"] if inputs["max_change_id"] else None,
+    }
+
+
+def generate_recommendations_sparse(transaction_context: TransactionContext, source_ids=None) -> dict:
+    """
+    Compute scored top-K recommendations with sparse products and rewrite them.
+
+    Rows are stamped with a new generation epoch, then the regenerated sources'
+    rows from older epochs (pairs that no longer share anything or fell out of
+    the top K) are pruned and their display rows are rebuilt. When run for every
+    source, change log entries present at load time are cleared, as
+    generate_all_recommendations does.
+
+    Everything shares transaction_context. The backend's full rebuild instead
+    prunes between its own transactions (see services/recommend.py).
+
+    Args:
+        transaction_context: Transaction to read and write through.
+        source_ids: Optional iterable of faculty_ids to regenerate. Defaults to
+                    every registered user.
+
+    Returns:
+        dict: Contains pair_count (rows upserted), source_count (sources with
+              at least one recommendation) and pruned_count (stale rows deleted).
+    """
+    written = write_recommendations_sparse(transaction_context, source_ids)
+    epoch = written["epoch"]
+
+    if source_ids is None:
+        pruned_count = sql_prune_stale_recommendations(transaction_context, epoch)
+        sql_refresh_recommendation_display(transaction_context)
+    else:
+        pruned_count = 0
+        for faculty_id in set(source_ids):
+            pruned_count += sql_prune_stale_recommendations(transaction_context, epoch, faculty_id)
+            sql_refresh_recommendation_display(transaction_context, faculty_id)
+
+    if source_ids is None and written["max_change_id"] is not None:
+        sql_delete_recommendation_change_log(transaction_context, written["max_change_id"])
+
+    return {
+        "pair_count": written["pair_count"],
+        "source_count": written["source_count"],
+        "pruned_count": pruned_count,
+    }
@@ -0,0 +1,243 @@
+"""
+Author: Clayton Durepos
+"""
+
+"""
+Background recommendation refresh queue.
+
+Per-faculty recommendation generation is too slow to run inside an HTTP request,
+so profile changes enqueue the faculty_id here instead. Requests for the same
+faculty member that arrive within the refresh window are coalesced into a single
+run, and at most RECOMMEND_REFRESH_MAX_WORKERS runs execute at once.
+
+The queue lives in-process, so status is only visible to the worker process
+that accepted the edit.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import current_app
+
+from backend.app.db.procedures import sql_generate_recommendations_for_faculty
+from backend.app.db.transaction_context import start_transaction
+from backend.app.services.recommend import invalidate_recommendations_cache
+
+
+# Finished statuses are kept this long so clients have time to poll them
+STATUS_RETENTION_SECONDS = 60 * 60
+
+
+class RecommendationRefreshQueue:
+    """
+    Deduplicating, delayed work queue for per-faculty recommendation generation.
+
+    Status values reported for a faculty member:
+        - idle: Nothing has been requested (or the status has expired)
+        - queued: Waiting for the refresh window to close or for a free worker
+        - running: Recommendations are being generated
+        - complete: The last run finished successfully
+        - failed: The last run raised an error (see "error")
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._due = {}          # faculty_id -> monotonic time the run may start
+        self._running = set()   # faculty_ids currently being generated
+        self._status = {}       # faculty_id -> status dict
+        self._executor = None
+        self._dispatcher = None
+        self._max_workers = None
+        self._app = None
+
+    def enqueue(self, faculty_id: str, delay_seconds: float | None = None) -> dict:
+        """
+        Request a recommendation refresh for a faculty member.
+
+        If a refresh is already queued for this faculty member, the request is
+        merged into it. If one is currently running, exactly one more run is
+        scheduled after it so the latest edit is always reflected.
+
+        Must be called from within a Flask application context.
+
+        Args:
+            faculty_id: UUID of the faculty member to refresh.
+            delay_seconds: Coalescing window. Defaults to RECOMMEND_REFRESH_DELAY_SECONDS.
+
+        Returns:
+            dict: The current status for this faculty member.
+        """
+        app = current_app._get_current_object()
+        if delay_seconds is None:
+            delay_seconds = app.config.get("RECOMMEND_REFRESH_DELAY_SECONDS", 5)
+
+        with self._cond:
+            self._app = app
+            self._start(app.config.get("RECOMMEND_REFRESH_MAX_WORKERS", 2))
+
+            # Keep the earliest due time so a stream of edits cannot starve the run
+            self._due.setdefault(faculty_id, time.monotonic() + delay_seconds)
+
+            status = self._status.get(faculty_id, {})
+            self._status[faculty_id] = {
+                "status": "running" if faculty_id in self._running else "queued",
+                "requested_at": _now(),
+                "started_at": status.get("started_at") if faculty_id in self._running else None,
+                "finished_at": None,
+                "error": None,
+                "refresh_pending": faculty_id in self._running,
+            }
+            self._cond.notify()
+            return self._public_status(faculty_id)
+
+    def get_status(self, faculty_id: str) -> dict:
+        """
+        Get the refresh status for a faculty member.
+
+        Args:
+            faculty_id: UUID of the faculty member.
+
+        Returns:
+            dict: Contains faculty_id, status, requested_at, started_at,
+                  finished_at and error.
+        """
+        with self._cond:
+            return self._public_status(faculty_id)
+
+    def _public_status(self, faculty_id: str) -> dict:
+        status = self._status.get(faculty_id)
+        if status is None:
+            return {"faculty_id": faculty_id, "status": "idle"}
+        return {
+            "faculty_id": faculty_id,
+            "status": status["status"],
+            "requested_at": status["requested_at"],
+            "started_at": status["started_at"],
+            "finished_at": status["finished_at"],
+            "error": status["error"],
+        }
+
+    def _start(self, max_workers: int):
+        """Lazily start the worker pool and dispatcher thread. Caller holds the lock."""
+        if self._dispatcher is not None and self._dispatcher.is_alive():
+            return
+
+        self._max_workers = max(1, int(max_workers))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix="recommend-refresh",
+        )
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop,
+            name="recommend-refresh-dispatcher",
+            daemon=True,
+        )
+        self._dispatcher.start()
+
+    def _dispatch_loop(self):
+        """Hand due refreshes to the worker pool without exceeding max_workers."""
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                ready = [
+                    faculty_id for faculty_id, due in self._due.items()
+                    if due <= now and faculty_id not in self._running
+                ]
+                ready.sort(key=self._due.get)
+
+                for faculty_id in ready:
+                    if len(self._running) >= self._max_workers:
+                        break
+                    del self._due[faculty_id]
+                    self._running.add(faculty_id)
+                    self._status[faculty_id].update(
+                        status="running", started_at=_now(), refresh_pending=False
+                    )
+                    self._executor.submit(self._run, self._app, faculty_id)
+
+                self._prune_statuses()
+
+                # Sleep until the next refresh is due or a new request/completion arrives
+                waiting = [due for faculty_id, due in self._due.items() if faculty_id not in self._running]
+                timeout = max(0.0, min(waiting) - now) if waiting else None
+                if len(self._running) >= self._max_workers:
+                    timeout = None
+                self._cond.wait(timeout)
+
+    def _run(self, app, faculty_id: str):
+        error = None
+        try:
+            with app.app_context():
+                with start_transaction() as transaction_context:
+                    sql_generate_recommendations_for_faculty(transaction_context, faculty_id)
+            invalidate_recommendations_cache(faculty_id)
+        except Exception as e:
+            error = str(e)
+            print(f"Warning: Failed to generate recommendations for {faculty_id}: {error}")
+        finally:
+            with self._cond:
+                self._running.discard(faculty_id)
+                status = self._status[faculty_id]
+                if faculty_id in self._due:
+                    # Another edit arrived while running; the next run picks it up
+                    status.update(status="queued", started_at=None)
+                else:
+                    status.update(
+                        status="failed" if error else "complete",
+                        finished_at=_now(),
+                        error=error,
+                    )
+                self._cond.notify()
+
+    def _prune_statuses(self):
+        """Forget finished statuses once clients have had time to read them. Caller holds the lock."""
+        cutoff = time.time() - STATUS_RETENTION_SECONDS
+        expired = [
+            faculty_id for faculty_id, status in self._status.items()
+            if status["status"] in ("complete", "failed")
+            and status["finished_at"] is not None
+            and datetime.fromisoformat(status["finished_at"]).timestamp() < cutoff
+        ]
+        for faculty_id in expired:
+            del self._status[faculty_id]
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+# Module-level queue shared by all requests in this process
+_refresh_queue = RecommendationRefreshQueue()
+
+
+def enqueue_recommendation_refresh(faculty_id: str, delay_seconds: float | None = None) -> dict:
+    """
+    Queue a background recommendation refresh for a faculty member.
+
+    This is a convenience function that delegates to the module-level queue.
+
+    Args:
+        faculty_id: UUID of the faculty member to refresh.
+        delay_seconds: Optional coalescing window override.
+
+    Returns:
+        dict: The current refresh status for this faculty member.
+    """
+    return _refresh_queue.enqueue(faculty_id, delay_seconds)
+
+
+def get_recommendation_refresh_status(faculty_id: str) -> dict:
+    """
+    Get the background recommendation refresh status for a faculty member.
+
+    This is a convenience function that delegates to the module-level queue.
+
+    Args:
+        faculty_id: UUID of the faculty member.
+
+    Returns:
+        dict: Contains faculty_id and status ('idle', 'queued', 'running',
+              'complete' or 'failed'), plus timestamps and error when known.
+    """
+    return _refresh_queue.get_status(faculty_id)
@@ -0,0 +1,153 @@
+"""
+Author: Clayton Durepos
+"""
+
+"""
+Parallel sharded recommendation generation.
+
+generate_all_recommendations runs every recommendation type serially on one MySQL
+thread inside a single large transaction. This generator instead splits the
+registered users into shards (CRC32(faculty_id) % shard_count) and regenerates
+the shards concurrently, each on its own connection and in its own short
+transaction, so wall time scales down with the number of workers.
+
+Progress is stored in recommendation_run / recommendation_run_shard. A shard is
+marked complete in the same transaction that writes its recommendations, so a
+failed run can be resumed by re-running only the shards that did not finish.
+"""
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from flask import current_app
+
+from backend.app.config import Config
+from backend.app.db.procedures import (
+    sql_start_recommendation_run,
+    sql_generate_recommendations_for_shard,
+    sql_update_recommendation_run_shard,
+    sql_finish_recommendation_run,
+    sql_read_recommendation_run,
+)
+from backend.app.db.transaction_context import start_transaction
+
+
+# Attempts per shard before it is left failed for a later resume (covers deadlocks
+# between shards writing neighbouring rows)
+SHARD_ATTEMPTS = 2
+
+
+def _print_progress(run_id: str, shard_index: int, completed: int, total: int, detail: str):
+    print(f"Recommendation run {run_id}: shard {shard_index} {detail} ({completed}/{total} shards done)")
+
+
+def _run_shard(app, run_id: str, shard_index: int) -> dict:
+    """Regenerate one shard on its own connection, retrying once on failure."""
+    with app.app_context():
+        return _run_shard_attempts(run_id, shard_index)
+
+
+def _run_shard_attempts(run_id: str, shard_index: int) -> dict:
+    error = None
+    for _ in range(SHARD_ATTEMPTS):
+        try:
+            with start_transaction() as transaction_context:
+                sql_update_recommendation_run_shard(transaction_context, run_id, shard_index, "running")
+
+            started = time.perf_counter()
+            with start_transaction() as transaction_context:
+                summary = sql_generate_recommendations_for_shard(transaction_context, run_id, shard_index)
+            return {
+                "shard_index": shard_index,
+                "status": "complete",
+                "source_count": summary.get("source_count", 0),
+                "elapsed_seconds": round(time.perf_counter() - started, 3),
+            }
+        except Exception as e:
+            error = str(e)
+
+    try:
+        with start_transaction() as transaction_context:
+            sql_update_recommendation_run_shard(transaction_context, run_id, shard_index, "failed", error)
+    except Exception as e:
+        # The shard is still not complete, so a resume will pick it up
+        print(f"Warning: Failed to record failure of shard {shard_index} in run {run_id}: {str(e)}")
+    return {"shard_index": shard_index, "status": "failed", "error": error}
+
+
+def run_sharded_generation(
+    shard_count: int | None = None,
+    max_workers: int | None = None,
+    resume_run_id: str | None = None,
+    progress=_print_progress,
+) -> dict:
+    """
+    Regenerate all recommendations in parallel shards.
+
+    Must be called from within a Flask application context.
+
+    Args:
+        shard_count: Number of shards for a new run. Defaults to RECOMMEND_SHARD_COUNT.
+                     Ignored when resuming (the run keeps its original shard count).
+        max_workers: Shards processed concurrently. Defaults to RECOMMEND_SHARD_WORKERS.
+        resume_run_id: Resume this run, processing only shards that are not complete.
+        progress: Called as progress(run_id, shard_index, completed, total, detail)
+                  after each shard finishes. Pass None to disable.
+
+    Returns:
+        dict: The run as returned by read_recommendation_run (status, shard_count,
+              completed_shards, source_count, shards).
+
+    Raises:
+        Exception: If resume_run_id doesn't exist or has already completed.
+    """
+    app = current_app._get_current_object()
+    max_workers = max(1, max_workers or Config.RECOMMEND_SHARD_WORKERS)
+
+    if resume_run_id is None:
+        run_id = str(uuid.uuid4())
+        shard_count = max(1, shard_count or Config.RECOMMEND_SHARD_COUNT)
+        with start_transaction() as transaction_context:
+            sql_start_recommendation_run(transaction_context, run_id, shard_count)
+        pending = list(range(shard_count))
+    else:
+        run_id = resume_run_id
+        with start_transaction() as transaction_context:
+            run = sql_read_recommendation_run(transaction_context, run_id)
+        if run is None:
+            raise Exception(f"Recommendation run {run_id} not found")
+        if run["status"] == "complete":
+            raise Exception(f"Recommendation run {run_id} has already completed")
+        shard_count = run["shard_count"]
+        pending = [shard["shard_index"] for shard in run["shards"] if shard["status"] != "complete"]
+
+    completed = shard_count - len(pending)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="recommend-shard") as executor:
+        futures = [executor.submit(_run_shard, app, run_id, shard_index) for shard_index in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            if result["status"] == "complete":
+                completed += 1
+                detail = f"complete: {result['source_count']} sources in {result['elapsed_seconds']}s"
+            else:
+                detail = f"failed: {result['error']}"
+            if progress is not None:
+                progress(run_id, result["shard_index"], completed, shard_count, detail)
+
+    with start_transaction() as transaction_context:
+        sql_finish_recommendation_run(transaction_context, run_id)
+        return sql_read_recommendation_run(transaction_context, run_id)
+
+
+def get_recommendation_run(run_id: str) -> dict | None:
+    """
+    Get the progress of a sharded regeneration run.
+
+    Args:
+        run_id: UUID of the run.
+
+    Returns:
+        dict | None: The run with per-shard progress, or None if it doesn't exist.
+    """
+    with start_transaction() as transaction_context:
+        return sql_read_recommendation_run(transaction_context, run_id)
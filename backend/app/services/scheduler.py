@@ -0,0 +1,286 @@
+"""
+Author: Clayton Durepos
+"""
+
+"""
+Background job scheduler.
+
+Runs the maintenance jobs that used to be MySQL events (session cleanup,
+keyword generation cleanup, recommendation generation) from a separate Python
+process started with backend/run_scheduler.py, so heavy work can run on a
+dedicated worker instead of the database's event thread.
+
+- Single flight: a job only runs while its connection holds a MySQL advisory
+  lock (GET_LOCK), so overlapping runs are skipped across every node that
+  shares the database.
+- Jitter: each run starts a random delay after its scheduled time, so nodes
+  don't all wake at once.
+- Metrics: every run is recorded in scheduled_job_run with its duration, the
+  rows it affected and any error.
+
+Every job can also be run on demand with run_job().
+"""
+import random
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from backend.app.config import Config
+from backend.app.db.procedures import (
+    sql_acquire_job_lock,
+    sql_release_job_lock,
+    sql_clean_session,
+    sql_clean_faculty_generates_keyword,
+    sql_clean_keyword_generation_job,
+    sql_create_scheduled_job_run,
+    sql_update_scheduled_job_run,
+    sql_read_scheduled_job_runs,
+)
+from backend.app.db.transaction_context import start_transaction
+from backend.app.services.recommend import generate_recommendations
+
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+# Jitter never exceeds this fraction of a job's interval
+MAX_JITTER_FRACTION = 0.1
+
+
+class ScheduledJob:
+    """
+    A job that runs every interval_seconds.
+
+    Runs are aligned to UTC: a job is due offset_seconds after each multiple of
+    interval_seconds since the Unix epoch (a Thursday, 00:00 UTC).
+    """
+
+    def __init__(self, name: str, func, interval_seconds: int, offset_seconds: int = 0, description: str = ""):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.offset_seconds = offset_seconds
+        self.description = description
+
+    def next_run_after(self, now: float, jitter_seconds: float = 0) -> float:
+        """Unix time of the first scheduled run after now, plus a random jitter."""
+        elapsed = (now - self.offset_seconds) // self.interval_seconds
+        scheduled = (elapsed + 1) * self.interval_seconds + self.offset_seconds
+        jitter = min(jitter_seconds, self.interval_seconds * MAX_JITTER_FRACTION)
+        return scheduled + random.uniform(0, jitter)
+
+
+def _clean_session() -> int:
+    with start_transaction() as transaction_context:
+        return sql_clean_session(transaction_context)
+
+
+def _clean_faculty_generates_keyword() -> int:
+    # Rate limiting only looks back one hour
+    cutoff = datetime.now() - timedelta(hours=1)
+    with start_transaction() as transaction_context:
+        return sql_clean_faculty_generates_keyword(transaction_context, cutoff)
+
+
+def _clean_keyword_generation_job() -> int:
+    cutoff = datetime.now() - timedelta(hours=Config.KEYWORD_JOB_RETENTION_HOURS)
+    with start_transaction() as transaction_context:
+        return sql_clean_keyword_generation_job(transaction_context, cutoff)
+
+
+def _generate_recommendations() -> int | None:
+    return generate_recommendations().get("regenerated_count")
+
+
+def _rebuild_recommendations() -> int | None:
+    # Sharded by default: the sql and sparse engines score and rebuild the
+    # display table for every source in one transaction
+    summary = generate_recommendations(full=True, engine=Config.RECOMMEND_REBUILD_ENGINE)
+    return summary.get("source_count", summary.get("pair_count"))
+
+
+JOBS = {
+    job.name: job
+    for job in (
+        ScheduledJob(
+            "clean_faculty_generates_keyword",
+            _clean_faculty_generates_keyword,
+            HOUR,
+            description="Delete keyword generation records older than 1 hour (hourly)",
+        ),
+        ScheduledJob(
+            "clean_keyword_generation_job",
+            _clean_keyword_generation_job,
+            HOUR,
+            offset_seconds=30 * 60,
+            description="Delete keyword generation jobs past KEYWORD_JOB_RETENTION_HOURS (hourly, at half past)",
+        ),
+        ScheduledJob(
+            "clean_session",
+            _clean_session,
+            DAY,
+            offset_seconds=2 * HOUR,
+            description="Delete expired and old revoked sessions (daily, 2 AM UTC)",
+        ),
+        ScheduledJob(
+            "generate_recommendations",
+            _generate_recommendations,
+            12 * HOUR,
+            offset_seconds=2 * HOUR,
+            description="Incrementally regenerate recommendations (every 12 hours from 2 AM UTC)",
+        ),
+        ScheduledJob(
+            "rebuild_recommendations",
+            _rebuild_recommendations,
+            WEEK,
+            offset_seconds=3 * DAY + 4 * HOUR,
+            description="Fully rebuild recommendations (weekly, Sunday 4 AM UTC)",
+        ),
+    )
+}
+
+
+def _lock_name(job_name: str) -> str:
+    # Advisory locks are server-wide; scope them to this database
+    return f"{Config.DB_NAME}.job.{job_name}"[:64]
+
+
+def run_job(job_name: str, triggered_by: str = "manual") -> dict:
+    """
+    Run a job once, unless it is already running on any node.
+
+    Must be called from within a Flask application context.
+
+    Args:
+        job_name: Name of a job in JOBS.
+        triggered_by: 'schedule' or 'manual'.
+
+    Returns:
+        dict: Contains job_name and status ('complete', 'failed', or 'skipped'
+              when another run holds the lock), plus run_id, duration_ms,
+              row_count and error for runs that started.
+
+    Raises:
+        Exception: If job_name is not a known job.
+    """
+    job = JOBS.get(job_name)
+    if job is None:
+        raise Exception(f"Unknown job {job_name}")
+
+    lock_name = _lock_name(job_name)
+    lock_context = start_transaction()
+    try:
+        if not sql_acquire_job_lock(lock_context, lock_name):
+            return {"job_name": job_name, "status": "skipped"}
+
+        try:
+            run_id = str(uuid.uuid4())
+            with start_transaction() as transaction_context:
+                sql_create_scheduled_job_run(
+                    transaction_context, run_id, job_name, socket.gethostname(), triggered_by
+                )
+
+            started = time.perf_counter()
+            try:
+                row_count = job.func()
+                status, error = "complete", None
+            except Exception as e:
+                row_count, status, error = None, "failed", str(e)
+            duration_ms = int((time.perf_counter() - started) * 1000)
+
+            with start_transaction() as transaction_context:
+                sql_update_scheduled_job_run(
+                    transaction_context, run_id, status, duration_ms, row_count, error
+                )
+        finally:
+            sql_release_job_lock(lock_context, lock_name)
+    finally:
+        lock_context.close()
+
+    return {
+        "job_name": job_name,
+        "run_id": run_id,
+        "status": status,
+        "duration_ms": duration_ms,
+        "row_count": row_count,
+        "error": error,
+    }
+
+
+def get_job_runs(job_name: str | None = None, limit: int | None = None) -> list[dict]:
+    """
+    Get the most recent job runs, newest first.
+
+    Args:
+        job_name: Only return runs of this job.
+        limit: Maximum number of runs. Defaults to 20.
+
+    Returns:
+        list[dict]: Runs as returned by read_scheduled_job_runs.
+    """
+    with start_transaction() as transaction_context:
+        return sql_read_scheduled_job_runs(transaction_context, job_name, limit)
+
+
+def _job_loop(app, job: ScheduledJob, stop_event: threading.Event):
+    """Run one job on its schedule until stop_event is set."""
+    with app.app_context():
+        while True:
+            due = job.next_run_after(time.time(), Config.SCHEDULER_JITTER_SECONDS)
+            if stop_event.wait(max(0.0, due - time.time())):
+                return
+            try:
+                result = run_job(job.name, "schedule")
+                if result["status"] == "skipped":
+                    print(f"Job {job.name} skipped: already running")
+                else:
+                    print(
+                        f"Job {job.name} {result['status']} in {result['duration_ms']}ms "
+                        f"(rows: {result['row_count']})"
+                        + (f": {result['error']}" if result["error"] else "")
+                    )
+            except Exception as e:
+                # Keep the schedule alive; the next run may succeed
+                print(f"Warning: Job {job.name} could not run: {str(e)}")
+
+
+def start_scheduler(job_names: list[str] | None = None, stop_event: threading.Event | None = None) -> list[threading.Thread]:
+    """
+    Start one scheduling thread per job.
+
+    Must be called from within a Flask application context.
+
+    Args:
+        job_names: Jobs to schedule on this node. Defaults to SCHEDULER_JOBS,
+                   or every job when that is empty.
+        stop_event: Set to stop the threads; each returns before its next run.
+
+    Returns:
+        list[threading.Thread]: The started threads.
+
+    Raises:
+        Exception: If a job name is not a known job.
+    """
+    app = current_app._get_current_object()
+    job_names = job_names or Config.SCHEDULER_JOBS or list(JOBS)
+    unknown = [name for name in job_names if name not in JOBS]
+    if unknown:
+        raise Exception(f"Unknown jobs: {', '.join(unknown)}")
+
+    stop_event = stop_event or threading.Event()
+    threads = []
+    for name in job_names:
+        thread = threading.Thread(
+            target=_job_loop,
+            args=(app, JOBS[name], stop_event),
+            name=f"scheduler-{name}",
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+    return threads
@@ -7,6 +7,7 @@ Session service for managing refresh tokens and sessions.
 """
 import hashlib
 import secrets
+import time
 import uuid
 import datetime
 from backend.app.db.transaction_context import start_transaction
@@ -17,6 +18,20 @@ from backend.app.db.procedures import (
     sql_update_session,
 )
 from backend.app.config import Config
+from backend.app.utils.cache import MISSING, make_cache
+
+
+# Cache for refresh token lookups: token_hash -> {session_id, faculty_id,
+# expires_at, revoked}, or None for hashes with no active session. Entries are
+# tagged with faculty_id and dropped when sessions are revoked in this process;
+# the TTL bounds staleness after revocations made elsewhere when the cache is
+# not shared (SESSION_CACHE_REDIS_URL unset).
+_session_cache = make_cache(
+    "session",
+    Config.SESSION_CACHE_TTL_SECONDS,
+    Config.SESSION_CACHE_MAX_ENTRIES,
+    Config.SESSION_CACHE_REDIS_URL,
+)
 
 
 def generate_refresh_token() -> str:
@@ -42,6 +57,23 @@ def hash_token(token: str) -> str:
     return hashlib.sha256(token.encode('utf-8')).hexdigest()
 
 
+def session_expiration_days(remember_me: bool = False) -> int:
+    """
+    Number of days a new session lasts.
+    
+    Args:
+        remember_me: If True, use extended expiration (30 days), else use default (7 days)
+    
+    Returns:
+        int: Days until expiration
+    """
+    return (
+        30
+        if remember_me 
+        else 7
+    )
+
+
 def create_session(faculty_id: str, remember_me: bool = False) -> tuple:
     """
     Create a new session with a refresh token.
@@ -66,11 +98,7 @@ def create_session(faculty_id: str, remember_me: bool = False) -> tuple:
             session_id = str(uuid.uuid4())
             
             # Calculate expiration based on remember_me flag
-            expiration_days = (
-                30
-                if remember_me 
-                else 7
-            )
+            expiration_days = session_expiration_days(remember_me)
             expires_at = datetime.datetime.utcnow() + datetime.timedelta(days=expiration_days)
             
             # Create session record
@@ -94,21 +122,48 @@ def get_session_by_token_hash(token_hash: str) -> dict | None:
     """
     Retrieve a session by its token hash.
     
-    Only returns active (non-revoked, non-expired) sessions.
+    Only returns active (non-revoked, non-expired) sessions. Lookups are cached
+    for SESSION_CACHE_TTL_SECONDS, and unknown hashes for
+    SESSION_CACHE_NEGATIVE_TTL_SECONDS, so most refreshes skip the database.
     
     Args:
         token_hash: SHA-256 hash of the refresh token
     
     Returns:
-        dict | None: Session record with faculty_id, or None if not found/invalid
+        dict | None: Session with session_id, faculty_id, expires_at (Unix
+                     time) and revoked, or None if not found/invalid
     """
+    session = _session_cache.get(token_hash)
+    if session is not MISSING:
+        if session is None or session["revoked"] or session["expires_at"] <= time.time():
+            return None
+        return session
+
     try:
         with start_transaction() as transaction_context:
-            session = sql_read_session_by_token_hash(transaction_context, token_hash)
-            return session
+            record = sql_read_session_by_token_hash(transaction_context, token_hash)
     except Exception as e:
         raise e
 
+    if record is None:
+        _session_cache.set(token_hash, None, Config.SESSION_CACHE_NEGATIVE_TTL_SECONDS)
+        return None
+
+    # expires_at is stored as a naive UTC datetime
+    session = {
+        "session_id": record["session_id"],
+        "faculty_id": record["faculty_id"],
+        "expires_at": record["expires_at"].replace(tzinfo=datetime.timezone.utc).timestamp(),
+        "revoked": bool(record["revoked"]),
+    }
+    _session_cache.set(
+        token_hash,
+        session,
+        min(Config.SESSION_CACHE_TTL_SECONDS, session["expires_at"] - time.time()),
+        tag=session["faculty_id"],
+    )
+    return session
+
 
 def revoke_session(token_hash: str) -> bool:
     """
@@ -128,7 +183,8 @@ def revoke_session(token_hash: str) -> bool:
                 revoked=True
             )
             # Transaction commits automatically on success
-            return rows_affected > 0
+        _session_cache.delete(token_hash)
+        return rows_affected > 0
     except Exception as e:
         # Transaction already rolled back by context manager
         raise e
@@ -152,7 +208,8 @@ def revoke_all_sessions(faculty_id: str) -> int:
                 revoked=True
             )
             # Transaction commits automatically on success
-            return rows_affected
+        _session_cache.delete_tag(faculty_id)
+        return rows_affected
     except Exception as e:
         # Transaction already rolled back by context manager
         raise e
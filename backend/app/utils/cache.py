@@ -0,0 +1,170 @@
+"""
+Author: Clayton Durepos
+"""
+
+"""
+TTL caches for hot lookups.
+
+TTLCache keeps entries in process memory. RedisTTLCache keeps them in Redis so
+every backend node shares entries and invalidations (requires the redis
+package). make_cache() picks one depending on whether a Redis URL is set.
+
+Entries can be tagged (e.g. with the faculty_id that owns a session) so every
+entry for a tag can be dropped at once. Values may be None, which is useful for
+negative caching; get() returns MISSING for keys that are not cached.
+"""
+import json
+import threading
+import time
+
+
+# Returned by get() for keys that are not cached
+MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe in-memory cache with per-entry expiry."""
+
+    def __init__(self, max_ttl_seconds: float, max_entries: int = 10000):
+        self.max_ttl_seconds = max_ttl_seconds
+        self.max_entries = max_entries
+        self._entries = {}  # key -> (expires_at, value, tag)
+        self._tags = {}     # tag -> set of keys
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return MISSING
+            return entry[1]
+
+    def set(self, key: str, value, ttl_seconds: float, tag: str | None = None) -> None:
+        ttl_seconds = min(ttl_seconds, self.max_ttl_seconds)
+        if ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl_seconds, value, tag)
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+            if len(self._entries) > self.max_entries:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def delete_tag(self, tag: str) -> None:
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str) -> None:
+        # Caller holds the lock
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[2] is None:
+            return
+        keys = self._tags.get(entry[2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[entry[2]]
+
+    def _evict(self) -> None:
+        # Caller holds the lock. Drop expired entries, then the oldest inserted.
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry[0] <= now]:
+            self._remove(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+
+class RedisTTLCache:
+    """
+    Cache shared through Redis. Values must be JSON serializable.
+
+    Redis errors are treated as cache misses (and skipped writes) so lookups
+    fall back to the database; entry TTLs bound any staleness this causes.
+    """
+
+    def __init__(self, url: str, namespace: str, max_ttl_seconds: float):
+        # Imported here so redis is only needed when configured
+        import redis
+
+        self.max_ttl_seconds = max_ttl_seconds
+        self._redis = redis.Redis.from_url(url)
+        self._error = redis.RedisError
+        self._prefix = f"{namespace}:"
+
+    def get(self, key: str):
+        try:
+            raw = self._redis.get(self._prefix + key)
+        except self._error as e:
+            print(f"Warning: Cache read failed: {str(e)}")
+            return MISSING
+        return MISSING if raw is None else json.loads(raw)
+
+    def set(self, key: str, value, ttl_seconds: float, tag: str | None = None) -> None:
+        ttl_ms = int(min(ttl_seconds, self.max_ttl_seconds) * 1000)
+        if ttl_ms <= 0:
+            return
+        try:
+            pipe = self._redis.pipeline()
+            pipe.set(self._prefix + key, json.dumps(value), px=ttl_ms)
+            if tag is not None:
+                # Tag sets outlive every entry they list
+                tag_key = f"{self._prefix}tag:{tag}"
+                pipe.sadd(tag_key, key)
+                pipe.pexpire(tag_key, int(self.max_ttl_seconds * 1000))
+            pipe.execute()
+        except self._error as e:
+            print(f"Warning: Cache write failed: {str(e)}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self._redis.delete(self._prefix + key)
+        except self._error as e:
+            print(f"Warning: Cache delete failed: {str(e)}")
+
+    def delete_tag(self, tag: str) -> None:
+        tag_key = f"{self._prefix}tag:{tag}"
+        try:
+            keys = [self._prefix + key.decode() for key in self._redis.smembers(tag_key)]
+            self._redis.delete(tag_key, *keys)
+        except self._error as e:
+            print(f"Warning: Cache delete failed: {str(e)}")
+
+    def clear(self) -> None:
+        try:
+            keys = list(self._redis.scan_iter(match=f"{self._prefix}*"))
+            if keys:
+                self._redis.delete(*keys)
+        except self._error as e:
+            print(f"Warning: Cache clear failed: {str(e)}")
+
+
+def make_cache(namespace: str, max_ttl_seconds: float, max_entries: int = 10000, redis_url: str | None = None):
+    """
+    Create a shared Redis cache when redis_url is set, otherwise an in-memory one.
+
+    Args:
+        namespace: Key prefix for Redis entries.
+        max_ttl_seconds: Upper bound on any entry's TTL.
+        max_entries: Size bound of the in-memory cache.
+        redis_url: Optional Redis URL (e.g. redis://localhost:6379/0).
+
+    Returns:
+        TTLCache | RedisTTLCache
+    """
+    if redis_url:
+        return RedisTTLCache(redis_url, namespace, max_ttl_seconds)
+    return TTLCache(max_ttl_seconds, max_entries)
@@ -0,0 +1,199 @@
+"""
+Author: Clayton Durepos
+"""
+
+"""
+Rate limiting for routes.
+
+@rate_limit(limit, window_seconds, key=...) rejects requests with 429 before
+the route runs, so rejected clients never reach the database. Requests are
+counted with a sliding window: the estimate is this window's count plus the
+previous window's count weighted by how much of it still overlaps the last
+window_seconds. Rejected requests are counted too, so clients that keep
+retrying stay blocked, unless the route passes count_if to count only the
+responses it accepts.
+
+Counters live in process memory, or in Redis when RATE_LIMIT_REDIS_URL is set
+so every backend node shares them (requires the redis package). In-memory
+counters are per process and reset on restart, so with several workers each
+allows the full limit. Any object with the same hit() and peek() methods can
+be installed with set_rate_limit_store(), e.g. a local stand-in for tests.
+"""
+import math
+import threading
+import time
+from functools import wraps
+
+from flask import g, jsonify, make_response, request
+
+from backend.app.config import Config
+
+
+class MemoryRateLimitStore:
+    """In-process window counters."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._counters = {}  # key -> [window, current_count, previous_count, expires_at]
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, window: int, window_seconds: float) -> tuple[int, int]:
+        """
+        Count a request in the given window.
+
+        Returns:
+            tuple: (count in this window including this request, count in the previous window)
+        """
+        with self._lock:
+            entry = self._counters.get(key)
+            if entry is None or entry[0] < window - 1:
+                entry = [window, 0, 0, 0]
+            elif entry[0] == window - 1:
+                entry = [window, 0, entry[1], 0]
+            entry[1] += 1
+            entry[3] = (window + 2) * window_seconds  # Unused once both windows have passed
+            self._counters[key] = entry
+
+            if len(self._counters) > self.max_keys:
+                now = time.time()
+                for stale in [k for k, e in self._counters.items() if e[3] <= now]:
+                    del self._counters[stale]
+            return entry[1], entry[2]
+
+    def peek(self, key: str, window: int) -> tuple[int, int]:
+        """
+        Read the counts hit() would build on, without counting a request.
+
+        Returns:
+            tuple: (count in this window, count in the previous window)
+        """
+        with self._lock:
+            entry = self._counters.get(key)
+            if entry is None or entry[0] < window - 1:
+                return 0, 0
+            if entry[0] == window - 1:
+                return 0, entry[1]
+            return entry[1], entry[2]
+
+
+class RedisRateLimitStore:
+    """
+    Window counters shared through Redis.
+
+    Redis errors let the request through (with a warning) rather than failing
+    every limited route.
+    """
+
+    def __init__(self, url: str, namespace: str = "rate_limit"):
+        # Imported here so redis is only needed when configured
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._error = redis.RedisError
+        self._prefix = f"{namespace}:"
+
+    def hit(self, key: str, window: int, window_seconds: float) -> tuple[int, int]:
+        current_key = f"{self._prefix}{key}:{window}"
+        try:
+            pipe = self._redis.pipeline()
+            pipe.incr(current_key)
+            pipe.pexpire(current_key, int(2 * window_seconds * 1000))
+            pipe.get(f"{self._prefix}{key}:{window - 1}")
+            current, _, previous = pipe.execute()
+        except self._error as e:
+            print(f"Warning: Rate limit check failed: {str(e)}")
+            return 0, 0
+        return int(current), int(previous or 0)
+
+    def peek(self, key: str, window: int) -> tuple[int, int]:
+        try:
+            current, previous = self._redis.mget(
+                f"{self._prefix}{key}:{window}", f"{self._prefix}{key}:{window - 1}"
+            )
+        except self._error as e:
+            print(f"Warning: Rate limit check failed: {str(e)}")
+            return 0, 0
+        return int(current or 0), int(previous or 0)
+
+
+_store = (
+    RedisRateLimitStore(Config.RATE_LIMIT_REDIS_URL)
+    if Config.RATE_LIMIT_REDIS_URL
+    else MemoryRateLimitStore()
+)
+
+
+def set_rate_limit_store(store) -> None:
+    """Replace the counter store used by every rate-limited route."""
+    global _store
+    _store = store
+
+
+def _client_key(key) -> str:
+    if callable(key):
+        return str(key())
+    if key == "route":
+        return "all"
+    if key == "faculty_id" and getattr(g, "faculty_id", None):
+        return f"faculty:{g.faculty_id}"
+    # "ip", and "faculty_id" for unauthenticated requests
+    return f"ip:{request.remote_addr}"
+
+
+def rate_limit(limit: int, window_seconds: float, key="ip", count_if=None):
+    """
+    Decorator to limit how often a route can be called.
+
+    Place it below @require_auth when keying by faculty_id so g.faculty_id is set.
+
+    Args:
+        limit: Maximum requests per window_seconds.
+        window_seconds: Length of the sliding window.
+        key: What requests are counted by:
+            - "ip": the client address
+            - "faculty_id": the authenticated faculty member (the client
+              address when unauthenticated)
+            - "route": every client together
+            - a callable returning the key for the current request
+        count_if: Optional callable taking the route's response. When given,
+            a request is only counted if it returns True (e.g. for successful
+            responses), so rejected and failed requests leave the limit alone.
+
+    Returns:
+        Decorated function that responds 429 with a Retry-After header when
+        the limit is exceeded.
+    """
+    def decorator(func):
+        @wraps(func)
+        def decorated_function(*args, **kwargs):
+            if not Config.RATE_LIMIT_ENABLED:
+                return func(*args, **kwargs)
+
+            now = time.time()
+            window = int(now // window_seconds)
+            counter_key = f"{request.endpoint}:{_client_key(key)}"
+            if count_if is None:
+                current, previous = _store.hit(counter_key, window, window_seconds)
+            else:
+                # Counted after the route runs; check as if this request were counted
+                current, previous = _store.peek(counter_key, window)
+                current += 1
+
+            overlap = 1 - (now - window * window_seconds) / window_seconds
+            if current + previous * overlap > limit:
+                retry_after = math.ceil((window + 1) * window_seconds - now)
+                response = jsonify({
+                    "error": f"Rate limit exceeded. Try again in {retry_after} seconds."
+                })
+                response.status_code = 429
+                response.headers["Retry-After"] = str(retry_after)
+                return response
+
+            if count_if is None:
+                return func(*args, **kwargs)
+            response = make_response(func(*args, **kwargs))
+            if count_if(response):
+                _store.hit(counter_key, window, window_seconds)
+            return response
+        return decorated_function
+    return decorator
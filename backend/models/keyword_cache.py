@@ -0,0 +1,195 @@
+"""
+Author: Aidan Bell
+"""
+
+"""
+Persistent cache of generated keywords.
+
+Keywords are generated with greedy decoding, so the same prompt to the same
+model always gives the same keywords. Entries are keyed by a hash of the model
+name, the full chat messages (prompt template with the input text filled in)
+and the generation settings, so editing a prompt, switching models or asking
+for a different number of keywords never returns stale results.
+
+Entries are stored in a SQLite file that the backend and the scraping scripts
+can share. When it holds more than max_entries, the least recently used
+entries are evicted. SQLite errors (e.g. a locked file) are treated as misses
+and skipped writes, so generation never fails because of the cache.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class KeywordCache:
+    """SQLite-backed, size-bounded LRU cache of keyword lists."""
+
+    def __init__(self, path: str, max_entries: int = 100000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS keyword_cache (
+                cache_key    TEXT PRIMARY KEY,
+                keywords     TEXT NOT NULL,
+                created_at   REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_keyword_cache_last_used ON keyword_cache (last_used_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model_name: str, messages: list[dict], **settings) -> str:
+        """
+        Hash everything that determines the generated keywords.
+
+        Args:
+            model_name: Name of the model generating the keywords.
+            messages: The formatted chat messages sent to the model.
+            **settings: Generation settings such as num_keywords and max_new_tokens.
+
+        Returns:
+            str: Hex SHA-256 digest.
+        """
+        payload = json.dumps(
+            [model_name, messages, settings], sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> list[str] | None:
+        """Return the cached keywords for key, or None on a miss."""
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: list[str]) -> list[list[str] | None]:
+        """Return the cached keywords for each key (None for misses), in order."""
+        if not keys:
+            return []
+        found = {}
+        with self._lock:
+            try:
+                # Stay below SQLite's bound parameter limit
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT cache_key, keywords FROM keyword_cache "
+                        f"WHERE cache_key IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    found.update((key, json.loads(keywords)) for key, keywords in rows)
+
+                if found:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE keyword_cache SET last_used_at = ? WHERE cache_key = ?",
+                        [(now, key) for key in found],
+                    )
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"[WARNING] Keyword cache read failed: {e}")
+                self._conn.rollback()
+
+            results = [found.get(key) for key in keys]
+            hits = sum(result is not None for result in results)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return results
+
+    def set(self, key: str, keywords: list[str]) -> None:
+        """Cache keywords under key."""
+        self.set_many([(key, keywords)])
+
+    def set_many(self, items: list[tuple[str, list[str]]]) -> None:
+        """Cache several (key, keywords) pairs, then evict down to max_entries."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO keyword_cache (cache_key, keywords, created_at, last_used_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(key, json.dumps(keywords), now, now) for key, keywords in items],
+                )
+                count = self._conn.execute("SELECT COUNT(*) FROM keyword_cache").fetchone()[0]
+                if count > self.max_entries:
+                    # Evict a tenth extra so inserts do not evict on every call
+                    excess = count - int(self.max_entries * 0.9)
+                    cursor = self._conn.execute(
+                        "DELETE FROM keyword_cache WHERE cache_key IN ("
+                        "SELECT cache_key FROM keyword_cache ORDER BY last_used_at LIMIT ?)",
+                        (excess,),
+                    )
+                    self.evictions += cursor.rowcount
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"[WARNING] Keyword cache write failed: {e}")
+                self._conn.rollback()
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM keyword_cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """
+        Return cache statistics.
+
+        Returns:
+            dict: path, entries, max_entries, and this process's hits, misses,
+                hit_rate and evictions.
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM keyword_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+def make_keyword_cache() -> KeywordCache | None:
+    """
+    Create the keyword cache configured by the environment.
+
+    KEYWORD_CACHE_PATH sets the SQLite file (defaults to
+    ~/.cache/keyword_generation/keywords.sqlite; set it to an empty string to
+    disable caching). KEYWORD_CACHE_MAX_ENTRIES bounds its size (default 100000).
+
+    Returns:
+        KeywordCache | None: None when caching is disabled or the file cannot be opened.
+    """
+    path = os.getenv(
+        "KEYWORD_CACHE_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "keyword_generation", "keywords.sqlite"),
+    )
+    if not path:
+        return None
+    try:
+        return KeywordCache(path, int(os.getenv("KEYWORD_CACHE_MAX_ENTRIES", "100000")))
+    except (OSError, sqlite3.Error) as e:
+        print(f"[WARNING] Keyword cache disabled, could not open {path}: {e}")
+        return None
@@ -0,0 +1,304 @@
+"""
+Author: Aidan Bell
+"""
+
+"""
+Canonical keyword matching.
+
+Generated keywords are mapped onto the existing keyword vocabulary before they
+are inserted, so "Machine Learning", "machine-learning" and "ML methods" all
+become the one "machine learning" keyword instead of three near-duplicates.
+A candidate matches an existing keyword when:
+
+1. Their normalized forms are equal: lowercase, hyphens/slashes as spaces,
+   plural words lemmatized, trailing "methods"/"techniques" dropped.
+2. They differ only by connectives: "ethics of AI" / "ethics in AI", or
+   "ethics of AI" / "AI ethics", where the compound swaps the words around
+   its one connective. Other reorderings are different concepts ("learning
+   machines" is not "machine learning").
+3. The candidate is an acronym ("ML") of exactly one multi-word keyword.
+4. Their character trigrams are similar enough (Dice coefficient of at least
+   KEYWORD_MATCH_THRESHOLD, default 0.9), which catches spelling variants.
+
+Candidates that match nothing are kept as they are. canonicalize() also adds
+them to the vocabulary, so later candidates match them too; callers that may
+not save the keywords use match() (or canonicalize_many(learn=False)) and
+add() the keywords once they are saved.
+"""
+import math
+import os
+import re
+import threading
+from typing import Iterable
+
+# Words dropped from the start of a keyword
+LEADING_FILLER_WORDS = frozenset({"a", "an", "the"})
+
+# Words dropped from the end of a keyword, since they only say it is a method ("ML methods")
+TRAILING_FILLER_WORDS = frozenset({"method", "methodology", "technique"})
+
+# Connectives left out of acronyms and connective matching ("NLP" for "natural language processing")
+CONNECTIVE_WORDS = frozenset({"and", "for", "in", "of", "on", "the", "to", "with"})
+
+# Plurals the suffix rules get wrong
+IRREGULAR_LEMMAS = {
+    "analyses": "analysis",
+    "children": "child",
+    "criteria": "criterion",
+    "hypotheses": "hypothesis",
+    "indices": "index",
+    "matrices": "matrix",
+    "men": "man",
+    "mice": "mouse",
+    "phenomena": "phenomenon",
+    "theses": "thesis",
+    "vertices": "vertex",
+    "women": "woman",
+}
+
+# Endings of singular words that look plural ("bias", "process", "virus")
+SINGULAR_ENDINGS = ("ss", "us", "is", "as", "series", "species")
+
+_NON_WORD_PATTERN = re.compile(r"[^a-z0-9+#]+")
+_ACRONYM_PATTERN = re.compile(r"^[A-Z]{2,6}s?$")
+
+
+def lemmatize_word(word: str) -> str:
+    """Singular form of a lowercase English word (rule based; leaves short words alone)."""
+    if word in IRREGULAR_LEMMAS:
+        return IRREGULAR_LEMMAS[word]
+    if len(word) <= 3 or not word.endswith("s") or word.endswith(SINGULAR_ENDINGS):
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes", "ches", "shes", "zes")):
+        return word[:-2]
+    return word[:-1]
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    The form keywords are matched by: lowercase words separated by single
+    spaces, lemmatized, without articles at the start or method words at the end.
+    """
+    words = [
+        lemmatize_word(word)
+        for word in _NON_WORD_PATTERN.split(keyword.lower().replace("&", " and "))
+        if word
+    ]
+    start, end = 0, len(words)
+    while start < end and words[start] in LEADING_FILLER_WORDS:
+        start += 1
+    while end > start and words[end - 1] in TRAILING_FILLER_WORDS:
+        end -= 1
+    # A keyword made only of filler words keeps them
+    return " ".join(words[start:end] if end > start else words)
+
+
+def _trigrams(key: str) -> frozenset[str]:
+    padded = f" {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _connective_free_key(key: str) -> str:
+    """Words of a normalized keyword without connectives, in order ("ethic of ai" -> "ethic ai")."""
+    return " ".join(word for word in key.split() if word not in CONNECTIVE_WORDS)
+
+
+def _compound_key(key: str) -> str | None:
+    """
+    The compound a normalized keyword with one connective inside it reads as,
+    with the words around the connective swapped ("ethic of ai" -> "ai ethic").
+    """
+    words = key.split()
+    connectives = [i for i, word in enumerate(words) if word in CONNECTIVE_WORDS]
+    if len(connectives) != 1 or connectives[0] in (0, len(words) - 1):
+        return None
+    i = connectives[0]
+    return " ".join(words[i + 1:] + words[:i])
+
+
+def _acronym(key: str) -> str | None:
+    """Initials of a multi-word normalized keyword ("machine learning" -> "ml")."""
+    words = [word for word in key.split() if word not in CONNECTIVE_WORDS]
+    if len(words) < 2:
+        return None
+    return "".join(word[0] for word in words)
+
+
+class KeywordCanonicalizer:
+    """
+    In-memory index over the keyword vocabulary that maps candidate keywords
+    to existing ones. Safe to share between threads.
+    """
+
+    def __init__(self, vocabulary: Iterable[str] = (), threshold: float = 0.9):
+        """
+        Args:
+            vocabulary: Existing keyword names.
+            threshold: Minimum trigram Dice coefficient for a similarity match.
+        """
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._names = []  # Entry id -> keyword name
+        self._keys = []  # Entry id -> normalized form
+        self._grams = []  # Entry id -> trigrams of its normalized form
+        self._by_key = {}  # Normalized form -> entry id
+        self._by_connective_free = {}  # Normalized form without connectives -> entry ids
+        self._by_compound = {}  # Compound form of "X of Y" normalized forms -> entry ids
+        self._by_acronym = {}  # Acronym -> entry ids
+        self._postings = {}  # Trigram -> entry ids
+        for name in vocabulary:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str) -> str:
+        """
+        Add a keyword to the vocabulary.
+
+        Returns:
+            str: The name the vocabulary uses for it (an existing keyword with
+                the same normalized form keeps its name).
+        """
+        name = name.strip()
+        key = normalize_keyword(name)
+        if not key:
+            return name
+        with self._lock:
+            return self._add(name, key)
+
+    def _add(self, name: str, key: str) -> str:
+        if key in self._by_key:
+            return self._names[self._by_key[key]]
+
+        entry = len(self._names)
+        grams = _trigrams(key)
+        self._names.append(name)
+        self._keys.append(key)
+        self._grams.append(grams)
+        self._by_key[key] = entry
+        self._by_connective_free.setdefault(_connective_free_key(key), []).append(entry)
+        compound = _compound_key(key)
+        if compound:
+            self._by_compound.setdefault(compound, []).append(entry)
+        acronym = _acronym(key)
+        if acronym:
+            self._by_acronym.setdefault(acronym, []).append(entry)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(entry)
+        return name
+
+    def match(self, candidate: str) -> str | None:
+        """
+        Find the existing keyword a candidate means.
+
+        Returns:
+            str | None: The existing keyword's name, or None if nothing is close.
+        """
+        key = normalize_keyword(candidate)
+        if not key:
+            return None
+        with self._lock:
+            entry = self._match(candidate.strip(), key)
+            return self._names[entry] if entry is not None else None
+
+    def _match(self, candidate: str, key: str) -> int | None:
+        entry = self._by_key.get(key)
+        if entry is not None:
+            return entry
+
+        # "ethics in AI" for "ethics of AI", or "AI ethics" for either; only a
+        # match with exactly one keyword counts
+        entries = set(self._by_connective_free.get(_connective_free_key(key), ()))
+        compound = _compound_key(key)
+        if compound:
+            # The compound has no connectives, so only connective-free keywords have it as their form
+            if compound in self._by_key:
+                entries.add(self._by_key[compound])
+        elif _connective_free_key(key) == key:
+            entries.update(self._by_compound.get(key, ()))
+        if len(entries) == 1:
+            return entries.pop()
+
+        # "ML", "LLMs" or "ML methods": an acronym of exactly one keyword
+        words = candidate.split()
+        if " " not in key and words and _ACRONYM_PATTERN.match(words[0]):
+            entries = self._by_acronym.get(key, [])
+            if len(entries) == 1:
+                return entries[0]
+
+        return self._most_similar(key)
+
+    def _most_similar(self, key: str) -> int | None:
+        """
+        Entry with the highest trigram Dice coefficient at or above the threshold,
+        other than reorderings of the same words, which only match by connectives.
+        """
+        grams = _trigrams(key)
+        words = sorted(key.split())
+        # An entry reaching the threshold shares at least min_overlap trigrams,
+        # so it must share one of the (len - min_overlap + 1) rarest ones
+        min_overlap = math.ceil(self.threshold * len(grams) / (2 - self.threshold))
+        probe = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        probe = probe[:max(len(grams) - min_overlap + 1, 1)]
+
+        best_entry, best_score = None, self.threshold
+        seen = set()
+        for gram in probe:
+            for entry in self._postings.get(gram, ()):
+                if entry in seen:
+                    continue
+                seen.add(entry)
+                other = self._grams[entry]
+                score = 2 * len(grams & other) / (len(grams) + len(other))
+                if score >= best_score and sorted(self._keys[entry].split()) != words:
+                    best_entry, best_score = entry, score
+        return best_entry
+
+    def canonicalize(self, candidate: str) -> str:
+        """
+        The existing keyword a candidate means, or the candidate itself, which
+        is added to the vocabulary as a new keyword.
+        """
+        candidate = candidate.strip()
+        key = normalize_keyword(candidate)
+        if not key:
+            return candidate
+        with self._lock:
+            entry = self._match(candidate, key)
+            if entry is not None:
+                return self._names[entry]
+            return self._add(candidate, key)
+
+    def canonicalize_many(self, candidates: Iterable[str], learn: bool = True) -> list[str]:
+        """
+        Canonicalize each candidate, dropping ones that map to a keyword already in the list.
+
+        Args:
+            candidates: Candidate keywords.
+            learn: Add candidates that match nothing to the vocabulary. Pass
+                False when the keywords may not be saved, and add() them once
+                they are.
+        """
+        keywords = []
+        seen = set()
+        for candidate in candidates:
+            keyword = self.canonicalize(candidate) if learn else self.match(candidate) or candidate.strip()
+            if keyword and keyword.lower() not in seen:
+                seen.add(keyword.lower())
+                keywords.append(keyword)
+        return keywords
+
+
+def make_keyword_canonicalizer(vocabulary: Iterable[str]) -> KeywordCanonicalizer | None:
+    """
+    Build the canonicalizer configured by environment variables.
+
+    KEYWORD_CANONICALIZE: "false" (or "0") turns canonicalization off (returns None).
+    KEYWORD_MATCH_THRESHOLD: Minimum trigram similarity for a match (default 0.9).
+    """
+    if os.getenv("KEYWORD_CANONICALIZE", "true").lower() in ("0", "false", "no"):
+        return None
+    return KeywordCanonicalizer(vocabulary, float(os.getenv("KEYWORD_MATCH_THRESHOLD", "0.9")))
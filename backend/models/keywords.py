@@ -0,0 +1,134 @@
+"""
+Author: Aidan Bell
+"""
+
+"""
+Keyword engine selection.
+
+KEYWORD_ENGINE picks how keywords are generated:
+    qwen         Qwen LLM (default). See qwen.py.
+    statistical  TF-IDF weighted RAKE phrase scoring, no model. See statistical.py.
+
+Engine modules are imported on first use, so the statistical engine never
+imports torch or transformers.
+"""
+import os
+from typing import Callable
+
+KEYWORD_ENGINES = ("qwen", "statistical")
+
+
+def keyword_engine(engine: str | None = None) -> str:
+    """
+    Resolve the keyword engine.
+
+    Args:
+        engine: Engine name. Defaults to the KEYWORD_ENGINE environment variable, or "qwen".
+
+    Raises:
+        ValueError: If the engine is not one of KEYWORD_ENGINES.
+    """
+    engine = (engine or os.getenv("KEYWORD_ENGINE") or "qwen").strip().lower()
+    if engine not in KEYWORD_ENGINES:
+        raise ValueError(f"Unknown keyword engine '{engine}', expected one of {', '.join(KEYWORD_ENGINES)}")
+    return engine
+
+
+def generate_faculty_keywords(
+    biography: str, num_keywords: int = 5, biography_length_limit: int = 2000, engine: str | None = None
+) -> list[str]:
+    """Generate keywords for a faculty member's biography with the configured engine."""
+    if keyword_engine(engine) == "statistical":
+        from backend.models.statistical import generate_faculty_keywords_with_statistics
+        return generate_faculty_keywords_with_statistics(biography, num_keywords, biography_length_limit)
+
+    from backend.models.qwen import generate_faculty_keywords_with_qwen
+    return generate_faculty_keywords_with_qwen(biography, num_keywords, biography_length_limit)
+
+
+def generate_publication_keywords(
+    abstract: str, num_keywords: int = 5, abstract_length_limit: int = 2000, engine: str | None = None
+) -> list[str]:
+    """Generate keywords for a publication's abstract with the configured engine."""
+    if keyword_engine(engine) == "statistical":
+        from backend.models.statistical import generate_publication_keywords_with_statistics
+        return generate_publication_keywords_with_statistics(abstract, num_keywords, abstract_length_limit)
+
+    from backend.models.qwen import generate_publication_keywords_with_qwen
+    return generate_publication_keywords_with_qwen(abstract, num_keywords, abstract_length_limit)
+
+
+def generate_faculty_keywords_batch(
+    biographies: list[str],
+    num_keywords: int = 5,
+    biography_length_limit: int = 2000,
+    batch_size: int | None = None,
+    engine: str | None = None,
+    on_keywords: Callable[[int, list[str]], None] | None = None,
+) -> list[list[str]]:
+    """
+    Generate keywords for many faculty biographies with the configured engine, in input order.
+
+    on_keywords(biography_index, keywords) receives keywords while the Qwen
+    engine decodes them; the statistical engine returns everything at once.
+    """
+    if keyword_engine(engine) == "statistical":
+        from backend.models.statistical import generate_faculty_keywords_batch_with_statistics
+        return generate_faculty_keywords_batch_with_statistics(
+            biographies, num_keywords, biography_length_limit, batch_size
+        )
+
+    from backend.models.qwen import generate_faculty_keywords_batch_with_qwen
+    return generate_faculty_keywords_batch_with_qwen(
+        biographies, num_keywords, biography_length_limit, batch_size, on_keywords
+    )
+
+
+def generate_publication_keywords_batch(
+    abstracts: list[str],
+    num_keywords: int = 5,
+    abstract_length_limit: int = 2000,
+    batch_size: int | None = None,
+    engine: str | None = None,
+) -> list[list[str]]:
+    """Generate keywords for many publication abstracts with the configured engine, in input order."""
+    if keyword_engine(engine) == "statistical":
+        from backend.models.statistical import generate_publication_keywords_batch_with_statistics
+        return generate_publication_keywords_batch_with_statistics(
+            abstracts, num_keywords, abstract_length_limit, batch_size
+        )
+
+    from backend.models.qwen import generate_publication_keywords_batch_with_qwen
+    return generate_publication_keywords_batch_with_qwen(abstracts, num_keywords, abstract_length_limit, batch_size)
+
+
+def fit_keyword_corpus(
+    documents: list[str], known_keywords: list[str] | None = None, engine: str | None = None
+) -> None:
+    """
+    Give the engine the corpus the next documents belong to.
+
+    The statistical engine computes its TF-IDF statistics from it and prefers
+    known_keywords; the Qwen engine needs no corpus and ignores it.
+    """
+    if keyword_engine(engine) == "statistical":
+        from backend.models.statistical import fit_statistical_corpus
+        fit_statistical_corpus(documents, known_keywords)
+
+
+def keyword_cache_stats(engine: str | None = None) -> dict | None:
+    """Statistics of the engine's keyword cache, or None if it has none (or it is disabled)."""
+    if keyword_engine(engine) == "statistical":
+        return None
+
+    from backend.models.qwen import qwen_keyword_cache_stats
+    return qwen_keyword_cache_stats()
+
+
+def unload_keyword_model(engine: str | None = None) -> None:
+    """Free the engine's model, if it loaded one."""
+    if keyword_engine(engine) == "statistical":
+        return
+
+    from backend.models.qwen import unload_qwen_model
+    unload_qwen_model()
@@ -2,10 +2,106 @@
 Author: Aidan Bell
 """
 
+import copy
+import json
 import os
 import re
+import threading
+import urllib.error
+import urllib.request
+from typing import Callable
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
+from transformers import (
+    AutoTokenizer,
+    AutoModelForCausalLM,
+    DynamicCache,
+    StoppingCriteria,
+    StoppingCriteriaList,
+)
+
+from backend.models.keyword_cache import KeywordCache, make_keyword_cache
+
+# Characters that end a keyword in the model's output (see QwenModel._parse_keywords)
+KEYWORD_SEPARATORS = ",;|"
+
+# Stands in for the last message's content to find where the shared prompt prefix ends
+PROMPT_SUFFIX_MARKER = "\ue000"
+
+# Prompt prefixes whose KV caches are kept (they differ only by prompt type and num_keywords)
+MAX_PREFIX_CACHES = 8
+
+
+class KeywordStoppingCriteria(StoppingCriteria):
+    """
+    Stops each sequence once it has emitted num_keywords keywords, instead of
+    decoding up to max_new_tokens: after its num_keywords-th separator, or at
+    a line break once it has written anything.
+
+    Optionally reports each sequence's completed keywords while it decodes,
+    through on_keywords(row, keywords), so callers can show them progressively.
+    """
+
+    def __init__(
+        self,
+        tokenizer,
+        prompt_length: int,
+        num_keywords: int,
+        on_keywords: Callable[[int, list[str]], None] | None = None,
+    ):
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.num_keywords = num_keywords
+        self.on_keywords = on_keywords
+        self._token_texts = {}  # token id -> decoded text
+        self._separators = None  # Per sequence: separators emitted
+        self._started = None  # Per sequence: emitted anything but whitespace
+        self._done = None
+        self._reported = None  # Per sequence: keywords reported so far
+
+    def _token_text(self, token_id: int) -> str:
+        text = self._token_texts.get(token_id)
+        if text is None:
+            text = self.tokenizer.decode([token_id], skip_special_tokens=True)
+            self._token_texts[token_id] = text
+        return text
+
+    def _report(self, input_ids, row: int) -> None:
+        """Send the sequence's completed keywords to on_keywords if there are new ones."""
+        text = self.tokenizer.decode(input_ids[row, self.prompt_length:], skip_special_tokens=True)
+        # Text after the last separator is a keyword still being written
+        completed = re.split(r"[,;|\n]", text)[:-1]
+        keywords = [keyword for keyword in map(QwenModel._clean_keyword, completed) if keyword]
+        keywords = keywords[:self.num_keywords]
+        if len(keywords) > self._reported[row]:
+            self._reported[row] = len(keywords)
+            self.on_keywords(row, keywords)
+
+    def __call__(self, input_ids, scores, **kwargs):
+        batch_size = input_ids.shape[0]
+        if self._done is None:
+            self._separators = [0] * batch_size
+            self._started = [False] * batch_size
+            self._done = [False] * batch_size
+            self._reported = [0] * batch_size
+
+        for row, token_id in enumerate(input_ids[:, -1].tolist()):
+            if self._done[row]:
+                continue
+            separators = self._separators[row]
+            for char in self._token_text(token_id):
+                if char in KEYWORD_SEPARATORS:
+                    separators += 1
+                elif char == "\n" and self._started[row]:
+                    self._done[row] = True
+                elif not char.isspace():
+                    self._started[row] = True
+            if separators >= self.num_keywords:
+                self._done[row] = True
+            if self.on_keywords is not None and (separators > self._separators[row] or self._done[row]):
+                self._report(input_ids, row)
+            self._separators[row] = separators
+
+        return torch.tensor(self._done, dtype=torch.bool, device=input_ids.device)
 
 
 class QwenModel:
@@ -20,18 +116,82 @@ class QwenModel:
         self._load_failed = False
         self._warning_printed = False
         self._failure_reason = None
+        self._cache = None
+        self._cache_opened = False
+        self._prefix_caches = {}  # prompt prefix text -> (token ids, KV cache)
+        # generate() calls switch tokenizer.padding_side and share the prefix
+        # caches, so threads (e.g. API requests) take turns on the model
+        self._generate_lock = threading.RLock()
+
+    @staticmethod
+    def _device() -> str:
+        """
+        Device to run on, from QWEN_DEVICE: "cuda" (default), "cpu", or "auto"
+        (CUDA when available, otherwise CPU).
+        """
+        device = os.getenv("QWEN_DEVICE", "cuda").lower()
+        if device == "auto":
+            return "cuda" if torch.cuda.is_available() else "cpu"
+        return device
+
+    @staticmethod
+    def _model_name() -> str:
+        # CPU nodes default to a smaller model
+        if QwenModel._device() == "cpu":
+            return os.getenv("QWEN_CPU_MODEL_NAME", "Qwen/Qwen3-0.6B")
+        return os.getenv("QWEN_MODEL_NAME", "Qwen/Qwen3-1.7B")
+
+    @staticmethod
+    def _cpu_settings() -> tuple[str, str]:
+        """(quantization, backend) for CPU inference (see _load_cpu_model)."""
+        return (
+            os.getenv("QWEN_CPU_QUANTIZATION", "int8").lower(),
+            os.getenv("QWEN_CPU_BACKEND", "eager").lower(),
+        )
+
+    def _get_cache(self) -> KeywordCache | None:
+        """Open the keyword cache on first use (see make_keyword_cache)."""
+        if not self._cache_opened:
+            self._cache = make_keyword_cache()
+            self._cache_opened = True
+        return self._cache
+
+    def _cache_key(self, messages: list[dict], num_keywords: int, max_new_tokens: int) -> str:
+        model_id = self._model_name()
+        if self._device() == "cpu":
+            # Quantized CPU output can differ from the same model on GPU
+            quantization, backend = self._cpu_settings()
+            model_id = f"{model_id}:cpu-{'onnx' if backend == 'onnx' else quantization}"
+        return KeywordCache.make_key(
+            model_id,
+            messages,
+            num_keywords=num_keywords,
+            max_new_tokens=max_new_tokens,
+        )
+
+    def cache_stats(self) -> dict | None:
+        """Return keyword cache statistics, or None if caching is disabled."""
+        cache = self._get_cache()
+        return cache.stats() if cache is not None else None
 
     def _load_model(self) -> tuple[AutoModelForCausalLM | None, AutoTokenizer | None]:
         """
         Lazy load the Qwen model and tokenizer.
-        Only loads if CUDA is available.
-        Tries to load in 4-bit first, then 8-bit, then full precision.
+        On CUDA (only if available), tries to load in 4-bit first, then 8-bit,
+        then full precision. On CPU, see _load_cpu_model.
 
         Returns:
             tuple: (model, tokenizer) or (None, None) if loading fails
         """
+        # Threads arriving while the model loads wait for it instead of loading another copy
+        with self._generate_lock:
+            return self._load_model_locked()
+
+    def _load_model_locked(self) -> tuple[AutoModelForCausalLM | None, AutoTokenizer | None]:
+        device = self._device()
+
         # Check if CUDA is available
-        if not torch.cuda.is_available():
+        if device == "cuda" and not torch.cuda.is_available():
             if not self._load_failed:
                 self._load_failed = True
                 self._failure_reason = "cuda"
@@ -39,7 +199,7 @@ class QwenModel:
 
         if self._model is None or self._tokenizer is None:
             try:
-                model_name = os.getenv("QWEN_MODEL_NAME", "Qwen/Qwen3-1.7B")
+                model_name = self._model_name()
 
                 # Load tokenizer
                 self._tokenizer = AutoTokenizer.from_pretrained(model_name)
@@ -48,45 +208,49 @@ class QwenModel:
                 if self._tokenizer.pad_token_id is None:
                     self._tokenizer.pad_token_id = self._tokenizer.eos_token_id
 
-                # Try to load model with quantization (4-bit, then 8-bit, then full precision)
-                load_kwargs = {
-                    "torch_dtype": "auto",
-                    "device_map": "auto",
-                }
-
-                # Check if bitsandbytes is available for quantization
-                try:
-                    import bitsandbytes as bnb
+                if device == "cpu":
+                    self._model = self._load_cpu_model(model_name)
+                    self._load_failed = False  # Reset on successful load
+                else:
+                    # Try to load model with quantization (4-bit, then 8-bit, then full precision)
+                    load_kwargs = {
+                        "torch_dtype": "auto",
+                        "device_map": "auto",
+                    }
 
-                    # Try 4-bit first
+                    # Check if bitsandbytes is available for quantization
                     try:
-                        load_kwargs["load_in_4bit"] = True
-                        self._model = AutoModelForCausalLM.from_pretrained(
-                            model_name, **load_kwargs
+                        import bitsandbytes as bnb
+
+                        # Try 4-bit first
+                        try:
+                            load_kwargs["load_in_4bit"] = True
+                            self._model = AutoModelForCausalLM.from_pretrained(
+                                model_name, **load_kwargs
+                            )
+                            print("[INFO] Qwen model loaded in 4-bit quantization")
+                            self._load_failed = False  # Reset on successful load
+                        except Exception as e:
+                            print(f"[INFO] Failed to load in 4-bit: {e}. Trying 8-bit...")
+                            # Try 8-bit
+                            load_kwargs.pop("load_in_4bit", None)
+                            load_kwargs["load_in_8bit"] = True
+                            self._model = AutoModelForCausalLM.from_pretrained(
+                                model_name, **load_kwargs
+                            )
+                            print("[INFO] Qwen model loaded in 8-bit quantization")
+                            self._load_failed = False  # Reset on successful load
+
+                    except ImportError:
+                        # bitsandbytes not available, load in full precision
+                        print(
+                            "[INFO] bitsandbytes not available. Loading model in full precision."
                         )
-                        print("[INFO] Qwen model loaded in 4-bit quantization")
-                        self._load_failed = False  # Reset on successful load
-                    except Exception as e:
-                        print(f"[INFO] Failed to load in 4-bit: {e}. Trying 8-bit...")
-                        # Try 8-bit
-                        load_kwargs.pop("load_in_4bit", None)
-                        load_kwargs["load_in_8bit"] = True
                         self._model = AutoModelForCausalLM.from_pretrained(
                             model_name, **load_kwargs
                         )
-                        print("[INFO] Qwen model loaded in 8-bit quantization")
                         self._load_failed = False  # Reset on successful load
 
-                except ImportError:
-                    # bitsandbytes not available, load in full precision
-                    print(
-                        "[INFO] bitsandbytes not available. Loading model in full precision."
-                    )
-                    self._model = AutoModelForCausalLM.from_pretrained(
-                        model_name, **load_kwargs
-                    )
-                    self._load_failed = False  # Reset on successful load
-
             except Exception as e:
                 if not self._load_failed:
                     self._load_failed = True
@@ -95,21 +259,79 @@ class QwenModel:
 
         return self._model, self._tokenizer
 
+    @staticmethod
+    def _load_cpu_model(model_name: str):
+        """
+        Load the model for CPU inference.
+
+        Configured by:
+            QWEN_CPU_THREADS: Threads torch uses for inference (defaults to torch's choice).
+            QWEN_CPU_QUANTIZATION: "int8" (default) quantizes the Linear layers'
+                weights to int8 with dynamic activation quantization; "none"
+                keeps float32.
+            QWEN_CPU_BACKEND: "eager" (default); "compile" compiles the forward
+                pass with torch.compile; "onnx" exports the model to ONNX Runtime
+                (requires optimum[onnxruntime], runs in float32).
+
+        Returns:
+            The loaded model
+        """
+        threads = os.getenv("QWEN_CPU_THREADS")
+        if threads:
+            torch.set_num_threads(int(threads))
+
+        quantization, backend = QwenModel._cpu_settings()
+        if quantization not in ("int8", "none"):
+            raise ValueError(f"Unknown QWEN_CPU_QUANTIZATION: {quantization}")
+        if backend not in ("eager", "compile", "onnx"):
+            raise ValueError(f"Unknown QWEN_CPU_BACKEND: {backend}")
+
+        if backend == "onnx":
+            # Imported here so optimum is only needed when configured
+            from optimum.onnxruntime import ORTModelForCausalLM
+
+            model = ORTModelForCausalLM.from_pretrained(model_name, export=True)
+            print(f"[INFO] Qwen model {model_name} exported to ONNX Runtime on CPU")
+            return model
+
+        model = AutoModelForCausalLM.from_pretrained(model_name, torch_dtype=torch.float32)
+        model.eval()
+
+        if quantization == "int8":
+            torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+
+        if backend == "compile":
+            # generate() calls forward once per token; prompts vary in length
+            model.forward = torch.compile(model.forward, dynamic=True)
+
+        print(
+            f"[INFO] Qwen model {model_name} loaded on CPU "
+            f"({quantization} weights, {backend}, {torch.get_num_threads()} threads)"
+        )
+        return model
+
     def unload(self):
         """
         Unload the model and tokenizer from memory.
 
         This method deletes the model and tokenizer objects, clears PyTorch cache,
         and resets the instance variables to None. This should be called after
-        keyword generation is complete to free up memory.
+        keyword generation is complete to free up memory. Waits for a running
+        generation to finish.
         """
-        if self._model is not None:
-            del self._model
-            self._model = None
+        with self._generate_lock:
+            if self._model is not None:
+                del self._model
+                self._model = None
+
+            if self._tokenizer is not None:
+                del self._tokenizer
+                self._tokenizer = None
 
-        if self._tokenizer is not None:
-            del self._tokenizer
-            self._tokenizer = None
+            # Prefix KV caches belong to the unloaded model
+            self._prefix_caches = {}
 
         # Clear PyTorch cache if CUDA is available
         if torch.cuda.is_available():
@@ -120,6 +342,20 @@ class QwenModel:
 
         gc.collect()
 
+    def _warn_not_loaded(self):
+        """Print why keywords could not be generated (only once)."""
+        if not self._warning_printed:
+            if self._failure_reason == "cuda":
+                print(
+                    "[WARNING] CUDA is not available. Qwen model cannot be loaded. "
+                    "Set QWEN_DEVICE=cpu (or auto) to generate keywords on CPU."
+                )
+            else:
+                print(
+                    "[WARNING] Qwen model or tokenizer is not loaded. Keywords could not be generated."
+                )
+            self._warning_printed = True
+
     def generate_keywords(
         self,
         messages: list[dict],
@@ -141,7 +377,8 @@ class QwenModel:
                 For example, if a message content contains "{text}", pass text="some value".
 
         Returns:
-            list[str]: A list of keywords generated from the input.
+            list[str]: A list of keywords generated from the input. Results
+                for a prompt seen before are served from the keyword cache.
 
         Examples:
             custom_messages = [
@@ -158,66 +395,418 @@ class QwenModel:
         if not messages:
             return []
 
+        try:
+            for msg in messages:
+                # Format the content with provided kwargs
+                if kwargs:
+                    msg["content"] = msg["content"].format(**kwargs)
+        except KeyError as e:
+            raise ValueError(f"Missing format argument for message template: {e}")
+
+        # Skip the model (and loading it) for prompts already answered
+        cache = self._get_cache()
+        if cache is not None:
+            cache_key = self._cache_key(messages, num_keywords, max_new_tokens)
+            keywords = cache.get(cache_key)
+            if keywords is not None:
+                return keywords
+
         # Ensure model is loaded
         model, tokenizer = self._load_model()
         if model is None or tokenizer is None:
-            # Only print warning once
-            if not self._warning_printed:
-                if self._failure_reason == "cuda":
-                    print(
-                        "[WARNING] CUDA is not available. Qwen model cannot be loaded."
-                    )
-                else:
-                    print(
-                        "[WARNING] Qwen model or tokenizer is not loaded. Keywords could not be generated."
-                    )
-                self._warning_printed = True
+            self._warn_not_loaded()
             return []
 
         try:
-            for msg in messages:
-                # Format the content with provided kwargs
-                if kwargs:
-                    msg["content"] = msg["content"].format(**kwargs)
+            keywords_text = self._generate_one(model, tokenizer, messages, num_keywords, max_new_tokens)
 
-            # Apply chat template (thinking mode disabled)
-            text = tokenizer.apply_chat_template(
-                messages,
-                tokenize=False,
-                add_generation_prompt=True,
-                enable_thinking=False,
-            )
+            # Parse keywords from the response
+            keywords = self._parse_keywords(keywords_text, num_keywords)[:num_keywords]
+            if cache is not None and keywords:
+                cache.set(cache_key, keywords)
+            return keywords
 
-            # Tokenize the text
-            model_inputs = tokenizer([text], return_tensors="pt").to(model.device)
+        except Exception as e:
+            raise RuntimeError(f"Error generating keywords with Qwen: {str(e)}")
 
-            # Generate keywords
+    def _generate_one(
+        self,
+        model,
+        tokenizer,
+        messages: list[dict],
+        num_keywords: int,
+        max_new_tokens: int,
+    ) -> str:
+        """
+        Run generate() for one prompt and decode the new tokens. Generation
+        stops once num_keywords keywords are out (see KeywordStoppingCriteria).
+        """
+        # Apply chat template (thinking mode disabled)
+        text = tokenizer.apply_chat_template(
+            messages,
+            tokenize=False,
+            add_generation_prompt=True,
+            enable_thinking=False,
+        )
+        return self._generate_batch(
+            model,
+            tokenizer,
+            [text],
+            num_keywords,
+            max_new_tokens,
+            prefix_text=self._prompt_prefix_text(tokenizer, messages),
+        )[0]
+
+    def generate_keywords_batch(
+        self,
+        messages_list: list[list[dict]],
+        num_keywords: int = 5,
+        max_new_tokens: int = 50,
+        batch_size: int | None = None,
+        on_keywords: Callable[[int, list[str]], None] | None = None,
+    ) -> list[list[str]]:
+        """
+        Generate keywords for many prompts, running one generate() call per batch.
+
+        Prompts are sorted by token length and grouped into batches of similar
+        length, so little of each batch is padding. Each batch is left-padded
+        (so every prompt ends where generation starts) and decoded greedily, as
+        generate_keywords does. A batch that runs out of GPU memory is split in
+        half and retried. Each prompt stops generating once it has num_keywords
+        keywords. Prompts found in the keyword cache are not sent to the model,
+        and the model is not loaded when every prompt is cached.
+
+        Args:
+            messages_list (list[list[dict]]): One list of chat messages per prompt,
+                already formatted (see generate_keywords).
+            num_keywords (int): The number of keywords to return per prompt.
+            max_new_tokens (int): Maximum number of tokens to generate per prompt.
+            batch_size (int | None): Prompts per generate() call. Defaults to the
+                QWEN_BATCH_SIZE environment variable, or 16.
+            on_keywords: Called as on_keywords(prompt_index, keywords) with the
+                keywords a prompt has completed so far, while its batch decodes.
+
+        Returns:
+            list[list[str]]: Keywords for each prompt, in input order. Empty
+                lists if the model could not be loaded.
+        """
+        if not messages_list:
+            return []
+
+        cache = self._get_cache()
+        if cache is not None:
+            cache_keys = [
+                self._cache_key(messages, num_keywords, max_new_tokens)
+                for messages in messages_list
+            ]
+            cached = cache.get_many(cache_keys)
+        else:
+            cached = [None] * len(messages_list)
+        pending = [i for i, keywords in enumerate(cached) if keywords is None]
+        if not pending:
+            return cached
+
+        model, tokenizer = self._load_model()
+        if model is None or tokenizer is None:
+            self._warn_not_loaded()
+            return [keywords or [] for keywords in cached]
+
+        batch_size = batch_size or int(os.getenv("QWEN_BATCH_SIZE", "16"))
+
+        try:
+            texts = [
+                tokenizer.apply_chat_template(
+                    messages_list[i],
+                    tokenize=False,
+                    add_generation_prompt=True,
+                    enable_thinking=False,
+                )
+                for i in pending
+            ]
+            prefix_texts = [self._prompt_prefix_text(tokenizer, messages_list[i]) for i in pending]
+
+            # Bucket by prompt prefix, then length, so batches share a prefix
+            # cache and are padded as little as possible
+            lengths = [len(ids) for ids in tokenizer(texts)["input_ids"]]
+            order = sorted(range(len(texts)), key=lambda i: (prefix_texts[i] or "", lengths[i]))
+
+            results = [[] for _ in texts]
+            for start in range(0, len(order), batch_size):
+                indices = order[start:start + batch_size]
+                batch_prefixes = {prefix_texts[i] for i in indices}
+                outputs = self._generate_batch(
+                    model,
+                    tokenizer,
+                    [texts[i] for i in indices],
+                    num_keywords,
+                    max_new_tokens,
+                    on_keywords=(
+                        lambda row, keywords, indices=indices: on_keywords(pending[indices[row]], keywords)
+                    ) if on_keywords else None,
+                    prefix_text=batch_prefixes.pop() if len(batch_prefixes) == 1 else None,
+                )
+                for i, keywords_text in zip(indices, outputs):
+                    results[i] = self._parse_keywords(keywords_text, num_keywords)[:num_keywords]
+
+            if cache is not None:
+                cache.set_many(
+                    [(cache_keys[i], keywords) for i, keywords in zip(pending, results) if keywords]
+                )
+            for i, keywords in zip(pending, results):
+                cached[i] = keywords
+            return cached
+
+        except Exception as e:
+            raise RuntimeError(f"Error generating keywords with Qwen: {str(e)}")
+
+    def _generate_batch(
+        self,
+        model,
+        tokenizer,
+        texts: list[str],
+        num_keywords: int,
+        max_new_tokens: int,
+        on_keywords: Callable[[int, list[str]], None] | None = None,
+        prefix_text: str | None = None,
+    ) -> list[str]:
+        """
+        Run one generate() call and decode the new tokens of each row.
+
+        When every text starts with prefix_text, generation resumes from the
+        prefix's KV cache and only the rest of each prompt is prefilled (see
+        _prefixed_inputs); otherwise the batch is left-padded. Each row stops
+        once it has num_keywords keywords (see KeywordStoppingCriteria); the
+        batch ends when every row has. Splits the batch in half and retries if
+        it runs out of GPU memory.
+        """
+        with self._generate_lock:
+            return self._generate_batch_locked(
+                model, tokenizer, texts, num_keywords, max_new_tokens, on_keywords, prefix_text
+            )
+
+    def _generate_batch_locked(
+        self,
+        model,
+        tokenizer,
+        texts: list[str],
+        num_keywords: int,
+        max_new_tokens: int,
+        on_keywords: Callable[[int, list[str]], None] | None,
+        prefix_text: str | None,
+    ) -> list[str]:
+        padding_side = tokenizer.padding_side
+        tokenizer.padding_side = "left"
+        try:
+            prefixed = (
+                self._prefixed_inputs(model, tokenizer, texts, prefix_text)
+                if prefix_text and self._prefix_cache_enabled()
+                else None
+            )
+            if prefixed is not None:
+                model_inputs, past_key_values = prefixed
+            else:
+                model_inputs = tokenizer(texts, return_tensors="pt", padding=True).to(
+                    model.device
+                )
+                past_key_values = None
+            stopping_criteria = KeywordStoppingCriteria(
+                tokenizer, model_inputs["input_ids"].shape[-1], num_keywords, on_keywords
+            )
             with torch.no_grad():
                 generated_ids = model.generate(
                     **model_inputs,
+                    past_key_values=past_key_values,
                     eos_token_id=tokenizer.eos_token_id,
                     pad_token_id=tokenizer.pad_token_id,
                     max_new_tokens=max_new_tokens,
                     do_sample=False,
+                    stopping_criteria=StoppingCriteriaList([stopping_criteria]),
                 )
+        except torch.cuda.OutOfMemoryError:
+            if len(texts) == 1:
+                raise
+            torch.cuda.empty_cache()
+            middle = len(texts) // 2
+            return self._generate_batch(
+                model, tokenizer, texts[:middle], num_keywords, max_new_tokens, on_keywords, prefix_text
+            ) + self._generate_batch(
+                model,
+                tokenizer,
+                texts[middle:],
+                num_keywords,
+                max_new_tokens,
+                (lambda row, keywords: on_keywords(row + middle, keywords)) if on_keywords else None,
+                prefix_text,
+            )
+        finally:
+            tokenizer.padding_side = padding_side
+
+        # Either way every prompt ends at the same position
+        input_length = model_inputs["input_ids"].shape[-1]
+        return [
+            text.strip()
+            for text in tokenizer.batch_decode(
+                generated_ids[:, input_length:], skip_special_tokens=True
+            )
+        ]
 
-            # Extract only the newly generated tokens (excluding the input prompt)
-            input_length = model_inputs.input_ids.shape[-1]
-            output_ids = generated_ids[0][input_length:]
+    @staticmethod
+    def _prefix_cache_enabled() -> bool:
+        """Whether prompt prefixes are prefilled once and reused (QWEN_PREFIX_CACHE, on by default)."""
+        if os.getenv("QWEN_PREFIX_CACHE", "1").lower() in ("0", "false", "no"):
+            return False
+        # ONNX Runtime models keep their own cache format
+        return not (QwenModel._device() == "cpu" and QwenModel._cpu_settings()[1] == "onnx")
 
-            # Decode the generated content
-            keywords_text = tokenizer.decode(
-                output_ids, skip_special_tokens=True
-            ).strip()
+    @staticmethod
+    def _prompt_prefix_text(tokenizer, messages: list[dict]) -> str | None:
+        """
+        The chat-template text that comes before the last message's content,
+        e.g. the system prompt and few-shot example, which every faculty (or
+        publication) prompt with the same num_keywords shares.
+        """
+        if len(messages) < 2:
+            return None
+        marked = messages[:-1] + [dict(messages[-1], content=PROMPT_SUFFIX_MARKER)]
+        text = tokenizer.apply_chat_template(
+            marked,
+            tokenize=False,
+            add_generation_prompt=True,
+            enable_thinking=False,
+        )
+        index = text.find(PROMPT_SUFFIX_MARKER)
+        return text[:index] if index > 0 else None
+
+    def _prefix_cache(self, model, tokenizer, prefix_text: str) -> tuple[list[int], object]:
+        """Token ids and KV cache of a prompt prefix, prefilled on first use."""
+        entry = self._prefix_caches.get(prefix_text)
+        if entry is None:
+            prefix_ids = tokenizer([prefix_text])["input_ids"][0]
+            with torch.no_grad():
+                prefix_cache = model(
+                    input_ids=torch.tensor([prefix_ids], device=model.device),
+                    past_key_values=DynamicCache(),
+                    use_cache=True,
+                ).past_key_values
+            if len(self._prefix_caches) >= MAX_PREFIX_CACHES:
+                # Prefixes only vary with num_keywords; drop the oldest
+                self._prefix_caches.pop(next(iter(self._prefix_caches)))
+            entry = (prefix_ids, prefix_cache)
+            self._prefix_caches[prefix_text] = entry
+        return entry
+
+    def _prefixed_inputs(
+        self, model, tokenizer, texts: list[str], prefix_text: str
+    ) -> tuple[dict, object] | None:
+        """
+        Inputs that resume from the shared prefix's KV cache.
 
-            # Parse keywords from the response
-            keywords = self._parse_keywords(keywords_text, num_keywords)
-            return keywords[:num_keywords]
+        Each row is laid out as the prefix, then padding, then the row's own
+        tokens, so the prefix sits at the same positions in every row and one
+        cached copy of it (expanded to the batch) serves them all. The padding
+        is masked out, and positions follow the attention mask, so each row
+        sees the same tokens at the same positions as its unpadded prompt.
 
-        except KeyError as e:
-            raise ValueError(f"Missing format argument for message template: {e}")
-        except Exception as e:
-            raise RuntimeError(f"Error generating keywords with Qwen: {str(e)}")
+        Returns:
+            tuple: (model inputs, KV cache to pass to generate()), or None if a
+                text does not tokenize to the prefix's tokens followed by its own.
+        """
+        prefix_ids, prefix_cache = self._prefix_cache(model, tokenizer, prefix_text)
+        prefix_length = len(prefix_ids)
+        rows = tokenizer(texts)["input_ids"]
+        if any(row[:prefix_length] != prefix_ids or len(row) == prefix_length for row in rows):
+            return None
+
+        suffixes = [row[prefix_length:] for row in rows]
+        width = max(len(suffix) for suffix in suffixes)
+        input_ids = []
+        attention_mask = []
+        for suffix in suffixes:
+            padding = width - len(suffix)
+            input_ids.append(prefix_ids + [tokenizer.pad_token_id] * padding + suffix)
+            attention_mask.append([1] * prefix_length + [0] * padding + [1] * len(suffix))
+
+        # generate() extends the cache in place, so it gets a copy
+        past_key_values = copy.deepcopy(prefix_cache)
+        if len(texts) > 1:
+            past_key_values.batch_repeat_interleave(len(texts))
+        model_inputs = {
+            "input_ids": torch.tensor(input_ids, device=model.device),
+            "attention_mask": torch.tensor(attention_mask, device=model.device),
+        }
+        return model_inputs, past_key_values
+
+    def generate_faculty_keywords_batch(
+        self,
+        biographies: list[str],
+        num_keywords: int = 5,
+        biography_length_limit: int = 2000,
+        batch_size: int | None = None,
+        on_keywords: Callable[[int, list[str]], None] | None = None,
+    ) -> list[list[str]]:
+        """
+        Generate keywords for many faculty biographies using batched inference.
+
+        Args:
+            biographies (list[str]): The biographies of the faculty members.
+            num_keywords (int): The number of keywords to generate per biography.
+            biography_length_limit (int): The maximum length of each biography to use.
+            batch_size (int | None): Biographies per generate() call
+                (see generate_keywords_batch).
+            on_keywords: Called as on_keywords(biography_index, keywords) with the
+                keywords completed so far (see generate_keywords_batch).
+
+        Returns:
+            list[list[str]]: Keywords for each biography, in input order. Empty
+                biographies get an empty list.
+        """
+        return self._generate_batch_for_texts(
+            biographies, self._faculty_messages, num_keywords, biography_length_limit, batch_size, on_keywords
+        )
+
+    def generate_publication_keywords_batch(
+        self,
+        abstracts: list[str],
+        num_keywords: int = 5,
+        abstract_length_limit: int = 2000,
+        batch_size: int | None = None,
+        on_keywords: Callable[[int, list[str]], None] | None = None,
+    ) -> list[list[str]]:
+        """
+        Generate keywords for many publication abstracts using batched inference.
+
+        Args:
+            abstracts (list[str]): The abstracts of the publications.
+            num_keywords (int): The number of keywords to generate per abstract.
+            abstract_length_limit (int): The maximum length of each abstract to use.
+            batch_size (int | None): Abstracts per generate() call
+                (see generate_keywords_batch).
+            on_keywords: Called as on_keywords(abstract_index, keywords) with the
+                keywords completed so far (see generate_keywords_batch).
+
+        Returns:
+            list[list[str]]: Keywords for each abstract, in input order. Empty
+                abstracts get an empty list.
+        """
+        return self._generate_batch_for_texts(
+            abstracts, self._publication_messages, num_keywords, abstract_length_limit, batch_size, on_keywords
+        )
+
+    def _generate_batch_for_texts(
+        self, texts, build_messages, num_keywords, length_limit, batch_size, on_keywords=None
+    ) -> list[list[str]]:
+        """Build prompts for the non-empty texts and batch them; empty texts get []."""
+        results = [[] for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        keyword_lists = self.generate_keywords_batch(
+            [build_messages(texts[i][:length_limit], num_keywords) for i in indices],
+            num_keywords=num_keywords,
+            batch_size=batch_size,
+            on_keywords=(lambda prompt, keywords: on_keywords(indices[prompt], keywords)) if on_keywords else None,
+        )
+        for i, keywords in zip(indices, keyword_lists):
+            results[i] = keywords
+        return results
 
     def generate_faculty_keywords(
         self, biography: str, num_keywords: int = 5, biography_length_limit: int = 2000
@@ -236,9 +825,39 @@ class QwenModel:
         if not biography or not biography.strip():
             return []
 
-        biography = biography[:biography_length_limit]
+        messages = self._faculty_messages(
+            biography[:biography_length_limit], num_keywords
+        )
+
+        return self.generate_keywords(messages=messages, num_keywords=num_keywords)
+
+    def generate_publication_keywords(
+        self, abstract: str, num_keywords: int = 5, abstract_length_limit: int = 2000
+    ) -> list[str]:
+        """
+        Generate keywords for a publication using Qwen.
+
+        Args:
+            abstract (str): The abstract of the publication.
+            num_keywords (int): The number of keywords to generate.
+            abstract_length_limit (int): The maximum length of the abstract to use.
+
+        Returns:
+            list[str]: A list of keywords generated from the publication.
+        """
+        if not abstract or not abstract.strip():
+            return []
+
+        messages = self._publication_messages(
+            abstract[:abstract_length_limit], num_keywords
+        )
+
+        return self.generate_keywords(messages=messages, num_keywords=num_keywords)
 
-        messages = [
+    @staticmethod
+    def _faculty_messages(biography: str, num_keywords: int) -> list[dict]:
+        """Few-shot chat messages asking for keywords about a faculty biography."""
+        return [
             {
                 "role": "system",
                 "content": (
@@ -269,28 +888,10 @@ class QwenModel:
             },
         ]
 
-        return self.generate_keywords(messages=messages, num_keywords=num_keywords)
-
-    def generate_publication_keywords(
-        self, abstract: str, num_keywords: int = 5, abstract_length_limit: int = 2000
-    ) -> list[str]:
-        """
-        Generate keywords for a publication using Qwen.
-
-        Args:
-            abstract (str): The abstract of the publication.
-            num_keywords (int): The number of keywords to generate.
-            abstract_length_limit (int): The maximum length of the abstract to use.
-
-        Returns:
-            list[str]: A list of keywords generated from the publication.
-        """
-        if not abstract or not abstract.strip():
-            return []
-
-        abstract = abstract[:abstract_length_limit]
-
-        messages = [
+    @staticmethod
+    def _publication_messages(abstract: str, num_keywords: int) -> list[dict]:
+        """Few-shot chat messages asking for keywords about a publication abstract."""
+        return [
             {
                 "role": "system",
                 "content": (
@@ -322,7 +923,16 @@ class QwenModel:
             },
         ]
 
-        return self.generate_keywords(messages=messages, num_keywords=num_keywords)
+    @staticmethod
+    def _clean_keyword(keyword: str) -> str:
+        """Strip one keyword of whitespace, quotes and trailing punctuation ("" if too short to keep)."""
+        keyword = keyword.strip()
+        # Remove quotes, periods, and other punctuation at the end
+        keyword = re.sub(r'^["\']|["\']$', "", keyword)
+        keyword = keyword.rstrip(".,;!?")
+
+        # Ignore empty or single character keywords
+        return keyword if len(keyword) > 1 else ""
 
     @staticmethod
     def _parse_keywords(text: str, expected_count: int) -> list[str]:
@@ -351,14 +961,8 @@ class QwenModel:
         # Clean each keyword
         cleaned_keywords = []
         for keyword in keywords:
-            keyword = keyword.strip()
-            # Remove quotes, periods, and other punctuation at the end
-            keyword = re.sub(r'^["\']|["\']$', "", keyword)
-            keyword = keyword.rstrip(".,;!?")
-
-            if (
-                keyword and len(keyword) > 1
-            ):  # Ignore empty or single character keywords
+            keyword = QwenModel._clean_keyword(keyword)
+            if keyword:
                 cleaned_keywords.append(keyword)
 
         # If we got fewer keywords than expected, try to split by spaces as well
@@ -382,8 +986,108 @@ class QwenModel:
         return cleaned_keywords
 
 
-# Module-level instance for backward compatibility
+class RemoteQwenModel(QwenModel):
+    """
+    QwenModel that sends prompts to the local keyword generation server
+    (backend/models/server.py) instead of loading the model in this process.
+
+    Prompts are built here exactly as QwenModel builds them; the server batches
+    them with concurrent requests from other processes and applies the keyword
+    cache.
+    """
+
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url.rstrip("/")
+
+    def _request(self, path: str, body: dict | None = None) -> dict:
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(
+            self.url + path, data=data, headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(
+                request, timeout=float(os.getenv("QWEN_SERVER_TIMEOUT_SECONDS", "600"))
+            ) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", str(e))
+            except ValueError:
+                message = str(e)
+            raise RuntimeError(f"Error generating keywords with Qwen server: {message}")
+        except (urllib.error.URLError, OSError) as e:
+            raise RuntimeError(f"Qwen server at {self.url} is unavailable: {e}")
+
+    def generate_keywords(
+        self,
+        messages: list[dict],
+        num_keywords: int = 5,
+        max_new_tokens: int = 50,
+        **kwargs,
+    ) -> list[str]:
+        """See QwenModel.generate_keywords."""
+        if not messages:
+            return []
+        try:
+            for msg in messages:
+                if kwargs:
+                    msg["content"] = msg["content"].format(**kwargs)
+        except KeyError as e:
+            raise ValueError(f"Missing format argument for message template: {e}")
+        return self.generate_keywords_batch([messages], num_keywords, max_new_tokens)[0]
+
+    def generate_keywords_batch(
+        self,
+        messages_list: list[list[dict]],
+        num_keywords: int = 5,
+        max_new_tokens: int = 50,
+        batch_size: int | None = None,
+        on_keywords: Callable[[int, list[str]], None] | None = None,
+    ) -> list[list[str]]:
+        """
+        See QwenModel.generate_keywords_batch. The server chooses the batch size,
+        and returns whole results, so on_keywords receives each prompt's final keywords.
+        """
+        if not messages_list:
+            return []
+        response = self._request(
+            "/generate",
+            {
+                "messages_list": messages_list,
+                "num_keywords": num_keywords,
+                "max_new_tokens": max_new_tokens,
+            },
+        )
+        if on_keywords is not None:
+            for prompt, keywords in enumerate(response["keywords"]):
+                if keywords:
+                    on_keywords(prompt, keywords)
+        return response["keywords"]
+
+    def cache_stats(self) -> dict | None:
+        """Return the server's keyword cache statistics."""
+        return self._request("/health").get("cache")
+
+    def unload(self):
+        # The server keeps the model loaded for every client
+        pass
+
+
+# Module-level instances for backward compatibility
 _model_instance = QwenModel()
+_remote_instance = None
+
+
+def _get_model_instance() -> QwenModel:
+    """The keyword generation server's client when QWEN_SERVER_URL is set, otherwise the in-process model."""
+    global _remote_instance
+    url = os.getenv("QWEN_SERVER_URL")
+    if not url:
+        return _model_instance
+    if _remote_instance is None or _remote_instance.url != url.rstrip("/"):
+        _remote_instance = RemoteQwenModel(url)
+    return _remote_instance
 
 
 # Public API functions that delegate to the module-level instance
@@ -393,7 +1097,8 @@ def generate_keywords_with_qwen(
     """
     Generate keywords using Qwen with customizable messages.
 
-    This is a convenience function that delegates to the module-level QwenModel instance.
+    This is a convenience function that delegates to the module-level QwenModel instance,
+    or to the keyword generation server when QWEN_SERVER_URL is set.
 
     Args:
         messages (list[dict]): Messages to send to the model.
@@ -419,7 +1124,7 @@ def generate_keywords_with_qwen(
             text="Machine learning and data science..."
         )
     """
-    return _model_instance.generate_keywords(
+    return _get_model_instance().generate_keywords(
         messages=messages,
         num_keywords=num_keywords,
         max_new_tokens=max_new_tokens,
@@ -433,7 +1138,8 @@ def generate_faculty_keywords_with_qwen(
     """
     Generate keywords for a faculty member's biography using Qwen.
 
-    This is a convenience function that delegates to the module-level QwenModel instance.
+    This is a convenience function that delegates to the module-level QwenModel instance,
+    or to the keyword generation server when QWEN_SERVER_URL is set.
 
     Args:
         biography (str): The biography of the faculty member.
@@ -443,7 +1149,7 @@ def generate_faculty_keywords_with_qwen(
     Returns:
         list[str]: A list of keywords generated from the biography.
     """
-    return _model_instance.generate_faculty_keywords(
+    return _get_model_instance().generate_faculty_keywords(
         biography=biography,
         num_keywords=num_keywords,
         biography_length_limit=biography_length_limit,
@@ -456,7 +1162,8 @@ def generate_publication_keywords_with_qwen(
     """
     Generate keywords for a publication using Qwen.
 
-    This is a convenience function that delegates to the module-level QwenModel instance.
+    This is a convenience function that delegates to the module-level QwenModel instance,
+    or to the keyword generation server when QWEN_SERVER_URL is set.
 
     Args:
         abstract (str): The abstract of the publication.
@@ -466,21 +1173,100 @@ def generate_publication_keywords_with_qwen(
     Returns:
         list[str]: A list of keywords generated from the publication.
     """
-    return _model_instance.generate_publication_keywords(
+    return _get_model_instance().generate_publication_keywords(
         abstract=abstract,
         num_keywords=num_keywords,
         abstract_length_limit=abstract_length_limit,
     )
 
 
+def generate_faculty_keywords_batch_with_qwen(
+    biographies: list[str],
+    num_keywords: int = 5,
+    biography_length_limit: int = 2000,
+    batch_size: int | None = None,
+    on_keywords: Callable[[int, list[str]], None] | None = None,
+) -> list[list[str]]:
+    """
+    Generate keywords for many faculty biographies using batched Qwen inference.
+
+    This is a convenience function that delegates to the module-level QwenModel instance,
+    or to the keyword generation server when QWEN_SERVER_URL is set.
+
+    Args:
+        biographies (list[str]): The biographies of the faculty members.
+        num_keywords (int): The number of keywords to generate per biography.
+        biography_length_limit (int): The maximum length of each biography to use.
+        batch_size (int | None): Biographies per generate() call. Defaults to the
+            QWEN_BATCH_SIZE environment variable, or 16.
+        on_keywords: Called as on_keywords(biography_index, keywords) with the
+            keywords completed so far, while they decode.
+
+    Returns:
+        list[list[str]]: Keywords for each biography, in input order.
+    """
+    return _get_model_instance().generate_faculty_keywords_batch(
+        biographies=biographies,
+        num_keywords=num_keywords,
+        biography_length_limit=biography_length_limit,
+        batch_size=batch_size,
+        on_keywords=on_keywords,
+    )
+
+
+def generate_publication_keywords_batch_with_qwen(
+    abstracts: list[str],
+    num_keywords: int = 5,
+    abstract_length_limit: int = 2000,
+    batch_size: int | None = None,
+    on_keywords: Callable[[int, list[str]], None] | None = None,
+) -> list[list[str]]:
+    """
+    Generate keywords for many publication abstracts using batched Qwen inference.
+
+    This is a convenience function that delegates to the module-level QwenModel instance,
+    or to the keyword generation server when QWEN_SERVER_URL is set.
+
+    Args:
+        abstracts (list[str]): The abstracts of the publications.
+        num_keywords (int): The number of keywords to generate per abstract.
+        abstract_length_limit (int): The maximum length of each abstract to use.
+        batch_size (int | None): Abstracts per generate() call. Defaults to the
+            QWEN_BATCH_SIZE environment variable, or 16.
+        on_keywords: Called as on_keywords(abstract_index, keywords) with the
+            keywords completed so far, while they decode.
+
+    Returns:
+        list[list[str]]: Keywords for each abstract, in input order.
+    """
+    return _get_model_instance().generate_publication_keywords_batch(
+        abstracts=abstracts,
+        num_keywords=num_keywords,
+        abstract_length_limit=abstract_length_limit,
+        batch_size=batch_size,
+        on_keywords=on_keywords,
+    )
+
+
+def qwen_keyword_cache_stats() -> dict | None:
+    """
+    Return statistics of the keyword cache used by the module-level QwenModel instance.
+
+    Returns:
+        dict | None: Cache statistics (see KeywordCache.stats), or None if caching is disabled.
+    """
+    return _get_model_instance().cache_stats()
+
+
 def unload_qwen_model():
     """
     Unload the model and tokenizer from memory.
 
-    This is a convenience function that delegates to the module-level QwenModel instance.
+    This is a convenience function that delegates to the module-level QwenModel instance,
+    or to the keyword generation server when QWEN_SERVER_URL is set.
 
     This function deletes the model and tokenizer objects, clears PyTorch cache,
     and resets the instance variables to None. This should be called after
     keyword generation is complete to free up memory.
     """
-    _model_instance.unload()
+    _get_model_instance().unload()
@@ -0,0 +1,197 @@
+"""
+Author: Aidan Bell
+"""
+
+"""
+Local keyword generation server.
+
+Loads the Qwen model once and serves keyword generation over localhost HTTP,
+so every API worker, the keyword job worker and scraping/insert.py share one
+copy of the weights. When QWEN_SERVER_URL is set (e.g. http://127.0.0.1:8765),
+the generate_*_keywords_with_qwen functions in qwen.py send their prompts here
+instead of loading the model in their own process.
+
+Prompts are batched dynamically: prompts from concurrent requests that arrive
+within QWEN_SERVER_BATCH_WAIT_MS of the first (up to QWEN_SERVER_MAX_BATCH)
+run through one generate_keywords_batch call.
+
+Endpoints:
+    POST /generate  {"messages_list": [[...], ...], "num_keywords": 5, "max_new_tokens": 50}
+                    -> {"keywords": [[...], ...]}
+    GET  /health    -> {"status": "ok", "model_loaded": ..., "prompts": ..., "batches": ..., "cache": ...}
+"""
+import json
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.models.qwen import QwenModel
+
+
+class _PendingPrompt:
+    """One prompt waiting for the batcher."""
+
+    def __init__(self, messages: list[dict], num_keywords: int, max_new_tokens: int):
+        self.messages = messages
+        self.settings = (num_keywords, max_new_tokens)
+        self.keywords = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class KeywordBatcher:
+    """
+    Collects prompts from concurrent requests and generates them together on
+    a single thread, which is the only one that touches the model.
+    """
+
+    def __init__(self, model: QwenModel, max_batch: int, max_wait_seconds: float):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait_seconds = max_wait_seconds
+        self.prompts = 0
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="keyword-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self, messages_list: list[list[dict]], num_keywords: int, max_new_tokens: int
+    ) -> list[list[str]]:
+        """
+        Generate keywords for each prompt, waiting until they are done.
+
+        Raises:
+            RuntimeError: If generation failed for any prompt.
+        """
+        pending = [
+            _PendingPrompt(messages, num_keywords, max_new_tokens) for messages in messages_list
+        ]
+        for prompt in pending:
+            self._queue.put(prompt)
+        for prompt in pending:
+            prompt.done.wait()
+            if prompt.error is not None:
+                raise RuntimeError(prompt.error)
+        return [prompt.keywords for prompt in pending]
+
+    def _next_batch(self) -> list[_PendingPrompt]:
+        """Block for one prompt, then gather more until the batch is full or the wait is over."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+
+            # Prompts with different settings cannot share a generate() call
+            groups = {}
+            for prompt in batch:
+                groups.setdefault(prompt.settings, []).append(prompt)
+
+            for (num_keywords, max_new_tokens), prompts in groups.items():
+                try:
+                    keyword_lists = self.model.generate_keywords_batch(
+                        [prompt.messages for prompt in prompts],
+                        num_keywords=num_keywords,
+                        max_new_tokens=max_new_tokens,
+                    )
+                    for prompt, keywords in zip(prompts, keyword_lists):
+                        prompt.keywords = keywords
+                except Exception as e:
+                    for prompt in prompts:
+                        prompt.error = str(e)
+                self.batches += 1
+                self.prompts += len(prompts)
+                for prompt in prompts:
+                    prompt.done.set()
+
+
+def _make_handler(batcher: KeywordBatcher):
+    class KeywordRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, body: dict):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path != "/health":
+                self._send_json(404, {"error": "Not found"})
+                return
+            self._send_json(200, {
+                "status": "ok",
+                "model_loaded": batcher.model._model is not None,
+                "prompts": batcher.prompts,
+                "batches": batcher.batches,
+                "cache": batcher.model.cache_stats(),
+            })
+
+        def do_POST(self):
+            if self.path != "/generate":
+                self._send_json(404, {"error": "Not found"})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                messages_list = body["messages_list"]
+                num_keywords = int(body.get("num_keywords", 5))
+                max_new_tokens = int(body.get("max_new_tokens", 50))
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": f"Invalid request: {e}"})
+                return
+            try:
+                keywords = batcher.submit(messages_list, num_keywords, max_new_tokens)
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+                return
+            self._send_json(200, {"keywords": keywords})
+
+        def log_message(self, format, *args):
+            # One line per request would drown out the batch log
+            pass
+
+    return KeywordRequestHandler
+
+
+def serve(host: str | None = None, port: int | None = None) -> None:
+    """
+    Load the model and serve keyword generation until interrupted.
+
+    Args:
+        host: Address to bind. Defaults to QWEN_SERVER_HOST, or 127.0.0.1.
+        port: Port to bind. Defaults to QWEN_SERVER_PORT, or 8765.
+    """
+    host = host or os.getenv("QWEN_SERVER_HOST", "127.0.0.1")
+    port = port or int(os.getenv("QWEN_SERVER_PORT", "8765"))
+
+    model = QwenModel()
+    # Load up front so the first request isn't slow and load failures show now
+    loaded, _ = model._load_model()
+    if loaded is None:
+        model._warn_not_loaded()
+
+    batcher = KeywordBatcher(
+        model,
+        max_batch=int(os.getenv("QWEN_SERVER_MAX_BATCH", "64")),
+        max_wait_seconds=float(os.getenv("QWEN_SERVER_BATCH_WAIT_MS", "10")) / 1000,
+    )
+    server = ThreadingHTTPServer((host, port), _make_handler(batcher))
+    print(f"[INFO] Keyword generation server listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        model.unload()
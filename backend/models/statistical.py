@@ -0,0 +1,293 @@
+"""
+Author: Aidan Bell
+"""
+
+"""
+Statistical keyword extraction.
+
+Extracts keywords without a language model, fast enough for bulk ingestion
+and CPU-only nodes (thousands of documents per second on one core):
+
+1. Candidates are RAKE-style phrases: runs of up to four words between
+   stopwords and punctuation. Generic academic words ("professor",
+   "research", ...) are trimmed from the ends of a phrase, and phrases made
+   only of them are dropped.
+2. Each phrase is scored by the sum of its words' degree/frequency ratios
+   (RAKE), times its TF-IDF weight against the corpus the extractor was fit
+   on (all biographies, or all abstracts).
+3. Phrases that already exist as keywords are boosted, so the vocabulary
+   converges instead of growing a near-duplicate for every document.
+
+The module-level functions mirror generate_*_keywords_with_qwen.
+"""
+import math
+import re
+
+
+# Function words that separate candidate phrases
+STOPWORDS = frozenset("""
+a about above across after again against all almost along also although am among an and another any are as at
+be because been before being below between both but by can could did do does doing done down during each either
+etc even ever every for from further had has have having he her here hers herself him himself his how however i
+if in into is it its itself just least less many may me might more most much must my myself neither no nor not
+now of off often on once one only onto or other others our ours ourselves out over own per rather same several
+she should since so some such than that the their theirs them themselves then there these they this those
+though through throughout thus to too toward towards under until up upon us very via was we well were what when
+where whether which while who whom whose why will with within without would yet you your yours yourself
+""".split())
+
+# Words too generic to be a keyword on their own in a biography or abstract
+GENERIC_WORDS = frozenset("""
+academic address analysis approach approaches areas article assistant associate based best better certain chair
+college current currently department different director dr effect effects et example faculty field fields find
+findings first focus focused focuses focusing four further given good high include included includes including
+interest interested interests investigate investigates key lab laboratory labs large lecturer main member method methods new novel
+paper particular phd present presented presents previously professor program project projects propose proposed
+provide provides recent recently related research researcher researchers result results school science second
+several show shows significant significantly specific student students studied studies study studying teaches
+teaching three topics two university use used uses using various well work works
+""".split())
+
+MAX_PHRASE_WORDS = 4
+MAX_KEYWORD_LENGTH = 64  # keyword.name is VARCHAR(64)
+KNOWN_KEYWORD_BOOST = 2.0
+
+# Words (letters/digits, optionally hyphenated) and the punctuation that ends a phrase
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*|[.,;:!?()\[\]{}\"/|]")
+
+
+def _candidate_phrases(text: str) -> list[tuple[str, ...]]:
+    """Split text into candidate phrases (tuples of words)."""
+    phrases = []
+    current = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS or not token[0].isalpha() or len(token) == 1 and not token.isalnum():
+            # Stopwords, numbers and punctuation end the current phrase
+            if current:
+                phrases.append(current)
+                current = []
+        else:
+            current.append(token)
+    if current:
+        phrases.append(current)
+
+    candidates = []
+    for words in phrases:  # Parts of over-long phrases are appended and visited too
+        start, end = 0, len(words)
+        while start < end and words[start] in GENERIC_WORDS:
+            start += 1
+        while end > start and words[end - 1] in GENERIC_WORDS:
+            end -= 1
+        if end - start > MAX_PHRASE_WORDS:
+            # Too long to be one keyword; try its parts between generic words
+            parts = [[]]
+            for word in words[start:end]:
+                if word in GENERIC_WORDS:
+                    parts.append([])
+                else:
+                    parts[-1].append(word)
+            if len(parts) > 1:
+                phrases.extend(part for part in parts if part)
+        elif end > start:
+            phrase = tuple(words[start:end])
+            if len(phrase) > 1 or len(phrase[0]) > 2:
+                candidates.append(phrase)
+    return candidates
+
+
+class StatisticalKeywordExtractor:
+    """
+    RAKE phrase scoring weighted by TF-IDF against a fitted corpus.
+
+    An unfitted extractor scores with RAKE alone.
+    """
+
+    def __init__(self):
+        self._document_frequency = {}
+        self._document_count = 0
+        self._known_keywords = frozenset()
+
+    def fit(self, documents: list[str], known_keywords: list[str] | None = None) -> "StatisticalKeywordExtractor":
+        """
+        Compute phrase document frequencies over a corpus.
+
+        Args:
+            documents: The corpus (e.g. every biography, or every abstract).
+            known_keywords: Existing keywords to prefer (e.g. the keyword table).
+                Leaves the current ones in place when None.
+
+        Returns:
+            StatisticalKeywordExtractor: self
+        """
+        document_frequency = {}
+        document_count = 0
+        for document in documents:
+            if not document or not document.strip():
+                continue
+            document_count += 1
+            for phrase in set(_candidate_phrases(document)):
+                document_frequency[phrase] = document_frequency.get(phrase, 0) + 1
+
+        # Swap in complete statistics so concurrent extract() calls never see partial ones
+        self._document_frequency, self._document_count = document_frequency, document_count
+        if known_keywords is not None:
+            self.set_known_keywords(known_keywords)
+        return self
+
+    def set_known_keywords(self, known_keywords: list[str]) -> None:
+        """Replace the keywords that are preferred when they occur in a document."""
+        self._known_keywords = frozenset(
+            keyword.strip().lower() for keyword in known_keywords if keyword and keyword.strip()
+        )
+
+    def extract(self, text: str, num_keywords: int = 5) -> list[str]:
+        """
+        Extract the highest scoring keywords from a document.
+
+        Args:
+            text: The document.
+            num_keywords: Maximum number of keywords to return.
+
+        Returns:
+            list[str]: Lowercase keywords, best first. Phrases contained in a
+                better keyword (e.g. "learning" after "machine learning") are skipped.
+        """
+        if not text or not text.strip():
+            return []
+        candidates = _candidate_phrases(text)
+        if not candidates:
+            return []
+
+        word_frequency = {}
+        word_degree = {}
+        phrase_counts = {}
+        for phrase in candidates:
+            phrase_counts[phrase] = phrase_counts.get(phrase, 0) + 1
+            for word in phrase:
+                word_frequency[word] = word_frequency.get(word, 0) + 1
+                word_degree[word] = word_degree.get(word, 0) + len(phrase)
+
+        document_frequency = self._document_frequency
+        document_count = self._document_count
+        scored = []
+        for phrase, count in phrase_counts.items():
+            keyword = " ".join(phrase)
+            if len(keyword) > MAX_KEYWORD_LENGTH:
+                continue
+            score = sum(word_degree[word] / word_frequency[word] for word in phrase)
+            score *= 1 + math.log(count)
+            score *= math.log((1 + document_count) / (1 + document_frequency.get(phrase, 0))) + 1
+            if keyword in self._known_keywords:
+                score *= KNOWN_KEYWORD_BOOST
+            scored.append((score, keyword, frozenset(phrase)))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        keywords = []
+        chosen = []
+        for _, keyword, words in scored:
+            if any(words <= other for other in chosen):
+                continue
+            keywords.append(keyword)
+            chosen.append(words)
+            if len(keywords) >= num_keywords:
+                break
+        return keywords
+
+    def extract_batch(self, texts: list[str], num_keywords: int = 5) -> list[list[str]]:
+        """Extract keywords for each text, in order (empty texts get an empty list)."""
+        return [self.extract(text, num_keywords) for text in texts]
+
+
+# Module-level instance, fit by callers that have a corpus (see fit_statistical_corpus)
+_extractor = StatisticalKeywordExtractor()
+
+
+def fit_statistical_corpus(documents: list[str], known_keywords: list[str] | None = None) -> None:
+    """
+    Fit the module-level extractor's TF-IDF statistics on a corpus.
+
+    Args:
+        documents: The corpus (e.g. every biography, or every abstract).
+        known_keywords: Existing keywords to prefer. Leaves the current ones in place when None.
+    """
+    _extractor.fit(documents, known_keywords)
+
+
+def generate_faculty_keywords_with_statistics(
+    biography: str, num_keywords: int = 5, biography_length_limit: int = 2000
+) -> list[str]:
+    """
+    Extract keywords from a faculty member's biography without a language model.
+
+    Args:
+        biography (str): The biography of the faculty member.
+        num_keywords (int): The number of keywords to extract.
+        biography_length_limit (int): The maximum length of the biography to use.
+
+    Returns:
+        list[str]: A list of keywords extracted from the biography.
+    """
+    return _extractor.extract((biography or "")[:biography_length_limit], num_keywords)
+
+
+def generate_publication_keywords_with_statistics(
+    abstract: str, num_keywords: int = 5, abstract_length_limit: int = 2000
+) -> list[str]:
+    """
+    Extract keywords from a publication's abstract without a language model.
+
+    Args:
+        abstract (str): The abstract of the publication.
+        num_keywords (int): The number of keywords to extract.
+        abstract_length_limit (int): The maximum length of the abstract to use.
+
+    Returns:
+        list[str]: A list of keywords extracted from the abstract.
+    """
+    return _extractor.extract((abstract or "")[:abstract_length_limit], num_keywords)
+
+
+def generate_faculty_keywords_batch_with_statistics(
+    biographies: list[str],
+    num_keywords: int = 5,
+    biography_length_limit: int = 2000,
+    batch_size: int | None = None,
+) -> list[list[str]]:
+    """
+    Extract keywords from many faculty biographies.
+
+    Args:
+        biographies (list[str]): The biographies of the faculty members.
+        num_keywords (int): The number of keywords to extract per biography.
+        biography_length_limit (int): The maximum length of each biography to use.
+        batch_size (int | None): Unused; accepted for parity with the Qwen functions.
+
+    Returns:
+        list[list[str]]: Keywords for each biography, in input order.
+    """
+    return _extractor.extract_batch(
+        [(biography or "")[:biography_length_limit] for biography in biographies], num_keywords
+    )
+
+
+def generate_publication_keywords_batch_with_statistics(
+    abstracts: list[str],
+    num_keywords: int = 5,
+    abstract_length_limit: int = 2000,
+    batch_size: int | None = None,
+) -> list[list[str]]:
+    """
+    Extract keywords from many publication abstracts.
+
+    Args:
+        abstracts (list[str]): The abstracts of the publications.
+        num_keywords (int): The number of keywords to extract per abstract.
+        abstract_length_limit (int): The maximum length of each abstract to use.
+        batch_size (int | None): Unused; accepted for parity with the Qwen functions.
+
+    Returns:
+        list[list[str]]: Keywords for each abstract, in input order.
+    """
+    return _extractor.extract_batch(
+        [(abstract or "")[:abstract_length_limit] for abstract in abstracts], num_keywords
+    )
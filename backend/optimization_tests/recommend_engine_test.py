@@ -0,0 +1,220 @@
+"""
+Author: Clayton Durepos
+"""
+
+"""
+Recommendation Engine Performance Test Script
+
+This script compares the speed of a full recommendation rebuild using the SQL
+stored procedures (generate_all_recommendations) and the sparse-matrix engine
+(services/recommend_engine.py). Every run is rolled back, so both engines start
+from the same data and the database is left unchanged.
+
+After each run the contents of faculty_recommended_to_faculty are compared
+between the two engines to confirm they produce the same recommendations.
+Results are saved to a CSV file in the same folder.
+
+Usage:
+    python -m backend.optimization_tests.recommend_engine_test
+
+    Run from the project root directory (scholarsphere).
+"""
+
+import time
+import csv
+import os
+from datetime import datetime
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Number of times to run the test suite
+NUM_RUNS = 5
+
+# Engines to compare
+ENGINES = {
+    "sql": "Stored procedures (generate_all_recommendations)",
+    "sparse": "SciPy sparse products (recommend_engine.py)",
+}
+
+# Output file configuration
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+if not os.path.exists(OUTPUT_DIR):
+    os.mkdir(OUTPUT_DIR)
+OUTPUT_FILENAME = f"recommend_engine_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+from backend.app.db.procedures import sql_generate_all_recommendations
+from backend.app.db.transaction_context import start_transaction
+from backend.app.services.recommend_engine import generate_recommendations_sparse
+import mysql.connector
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load .env file from project root
+project_root = Path(__file__).resolve().parent.parent.parent
+env_path = project_root / ".env"
+load_dotenv(dotenv_path=env_path)
+
+
+# ============================================================================
+# TEST FUNCTIONS
+# ============================================================================
+
+def run_engine(engine: str) -> tuple[set, float]:
+    """
+    Run a full rebuild with one engine, then roll it back.
+
+    Args:
+        engine: "sql" or "sparse"
+
+    Returns:
+        Tuple of (set of resulting (source, target, type, reasons) rows, elapsed time in seconds)
+    """
+    conn = mysql.connector.connect(
+        host=os.getenv("DB_HOST"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASS"),
+        database=os.getenv("DB_NAME"),
+        autocommit=False,
+    )
+    transaction_context = start_transaction(conn)
+    try:
+        start_time = time.perf_counter()
+        if engine == "sql":
+            sql_generate_all_recommendations(transaction_context)
+        else:
+            generate_recommendations_sparse(transaction_context)
+        end_time = time.perf_counter()
+
+        cursor = transaction_context.cursor
+        cursor.execute(
+            "SELECT source_faculty_id, target_faculty_id, recommendation_type, "
+            "CAST(recommendation_reasons AS CHAR) AS recommendation_reasons "
+            "FROM faculty_recommended_to_faculty"
+        )
+        rows = {
+            (
+                row["source_faculty_id"],
+                row["target_faculty_id"],
+                row["recommendation_type"],
+                row["recommendation_reasons"],
+            )
+            for row in cursor.fetchall()
+        }
+    finally:
+        transaction_context.rollback()
+        transaction_context.close()
+
+    return rows, end_time - start_time
+
+
+def run_test_suite(engines: dict) -> tuple[dict[str, float], dict[str, int], bool]:
+    """
+    Run every engine once and return timing results.
+
+    Args:
+        engines: Dictionary of engine names to descriptions
+
+    Returns:
+        Tuple of (engine -> elapsed seconds, engine -> row count, whether all engines matched)
+    """
+    times = {}
+    counts = {}
+    outputs = []
+
+    for engine in engines:
+        rows, elapsed = run_engine(engine)
+        times[engine] = elapsed
+        counts[engine] = len(rows)
+        outputs.append(rows)
+
+    matched = all(rows == outputs[0] for rows in outputs)
+    return times, counts, matched
+
+
+def calculate_average(times: list[float]) -> float:
+    """Calculate average of a list of times."""
+    return sum(times) / len(times) if times else 0.0
+
+
+def write_results_to_csv(all_results: list[tuple], output_path: str, engines: dict):
+    """
+    Write timing results to CSV file.
+
+    Args:
+        all_results: List of (times, counts, matched) tuples, one per run
+        output_path: Path to output CSV file
+        engines: Engine configuration dictionary for column ordering
+    """
+    engine_names = list(engines.keys())
+    headers = ["Run"] + engine_names + ["Rows", "Match"]
+
+    with open(output_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(headers)
+
+        for i, (times, counts, matched) in enumerate(all_results, 1):
+            row = [f"r{i}"] + [f"{times[en]:.6f}" for en in engine_names]
+            row += [counts[engine_names[0]], "yes" if matched else "no"]
+            writer.writerow(row)
+
+        # Write average row
+        col_averages = [
+            calculate_average([times[en] for times, _, _ in all_results])
+            for en in engine_names
+        ]
+        writer.writerow(["avg"] + [f"{v:.6f}" for v in col_averages] + ["", ""])
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("RECOMMENDATION ENGINE PERFORMANCE TEST")
+    print("=" * 60)
+
+    for engine, description in ENGINES.items():
+        print(f"{engine}: {description}")
+
+    print(f"\nNumber of runs: {NUM_RUNS}")
+    print(f"Output directory: {OUTPUT_DIR}")
+
+    all_results = []
+
+    print("\n" + "-" * 60)
+    print("RUNNING TESTS...")
+    print("-" * 60)
+
+    for run_num in range(1, NUM_RUNS + 1):
+        print(f"\nRun {run_num}/{NUM_RUNS}...", end=" ", flush=True)
+
+        times, counts, matched = run_test_suite(ENGINES)
+        all_results.append((times, counts, matched))
+
+        print("results match" if matched else "RESULTS DIFFER")
+        for engine, t in times.items():
+            print(f"    {engine}: {t:.6f}s ({counts[engine]} rows)")
+
+    # Write results to CSV
+    output_path = os.path.join(OUTPUT_DIR, OUTPUT_FILENAME)
+    write_results_to_csv(all_results, output_path, ENGINES)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SUMMARY")
+    print("=" * 60)
+
+    averages = {
+        engine: calculate_average([times[engine] for times, _, _ in all_results])
+        for engine in ENGINES
+    }
+    for engine, avg_time in averages.items():
+        print(f"{engine} ({ENGINES[engine]}): {avg_time:.6f}s avg")
+
+    if averages.get("sparse"):
+        print(f"\nSpeedup (sql / sparse): {averages['sql'] / averages['sparse']:.2f}x")
+
+    print(f"\nResults saved to: {output_path}")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+"""
+Author: Clayton Durepos
+"""
+
+"""
+Recommendation Scale Benchmark Script
+
+This script measures how recommendation generation and reads behave beyond the
+size of the scraped data. For each configured scale it:
+
+    1. Recreates a separate benchmark database (BENCH_DB_NAME, never DB_NAME)
+       from db/init/001-005 using the mysql command line client.
+    2. Seeds synthetic faculty, keywords, publications, grants and departments.
+       Keyword use follows a Zipf distribution, so a few topics are shared by
+       many faculty and most by few, as in the scraped data.
+    3. Times a full rebuild with each engine, per-faculty generation for a
+       sample of registered users, and the read path for a sample of users.
+
+Results for every scale are written to a CSV file and a JSON file in the
+output folder, so runs from different commits can be compared.
+
+Usage:
+    python -m backend.optimization_tests.recommend_scale_test
+    python -m backend.optimization_tests.recommend_scale_test --scales 1000 10000
+
+    Run from the project root directory (scholarsphere). Requires the mysql
+    client on PATH and a user allowed to create databases.
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import statistics
+import subprocess
+import time
+import uuid
+from datetime import datetime
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Number of faculty to seed, one benchmark per scale
+SCALES = [1_000, 10_000, 100_000]
+
+# Database the benchmark recreates for every scale (dropped and rebuilt!)
+BENCH_DB_NAME = os.getenv("BENCH_DB_NAME", "scholarsphere_bench")
+
+# Random seed so every run seeds the same graph
+SEED = 42
+
+# Synthetic graph shape, per faculty member unless noted
+KEYWORDS_PER_SCALE = 0.5          # Keyword vocabulary size as a fraction of faculty
+ZIPF_EXPONENT = 1.1               # Keyword popularity skew (1.0 = classic Zipf)
+RESEARCH_KEYWORDS = (3, 12)       # Keywords researched (min, max)
+PUBLICATIONS = (0, 8)             # Publications authored (min, max)
+AUTHORS_PER_PUBLICATION = (1, 4)
+KEYWORDS_PER_PUBLICATION = (2, 6)
+GRANTS_PER_SCALE = 0.25           # Grants as a fraction of faculty
+HOLDERS_PER_GRANT = (1, 3)
+KEYWORDS_PER_GRANT = (1, 4)
+DEPARTMENT_COUNT = 60
+REGISTERED_FRACTION = 0.3         # Faculty with credentials receive recommendations
+
+# Samples for the per-faculty and read timings
+PER_FACULTY_SAMPLES = 25
+READ_SAMPLES = 200
+READ_LIMIT = 20
+
+# Full rebuild engines to time
+ENGINES = {
+    "sql": "Stored procedures (generate_all_recommendations)",
+    "sparse": "SciPy sparse products (recommend_engine.py)",
+}
+
+# Rows sent per multi-row INSERT while seeding
+INSERT_BATCH_SIZE = 5000
+
+# Output file configuration
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+if not os.path.exists(OUTPUT_DIR):
+    os.mkdir(OUTPUT_DIR)
+OUTPUT_BASENAME = f"recommend_scale_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+from backend.app.db.procedures import (
+    sql_generate_all_recommendations,
+    sql_generate_recommendations_for_faculty,
+    sql_read_recommendations_for_faculty,
+)
+from backend.app.db.transaction_context import start_transaction
+from backend.app.services.recommend_engine import generate_recommendations_sparse
+import mysql.connector
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load .env file from project root
+project_root = Path(__file__).resolve().parent.parent.parent
+env_path = project_root / ".env"
+load_dotenv(dotenv_path=env_path)
+
+INIT_DIR = project_root / "db" / "init"
+INIT_FILES = [
+    "001_init_schema.sql",
+    "002_init_procedures.sql",
+    "003_init_functions.sql",
+    "004_init_events.sql",
+    "005_init_triggers.sql",
+]
+
+# Department spellings seeded for the same department, to exercise normalization
+DEPARTMENT_VARIANTS = ["{}", "Department of {}", "{} Department", "Dept. of {}"]
+
+
+# ============================================================================
+# DATABASE SETUP
+# ============================================================================
+
+def connect(database: str | None = BENCH_DB_NAME):
+    """Open an autocommit-off connection to the benchmark database."""
+    return mysql.connector.connect(
+        host=os.getenv("DB_HOST"),
+        port=int(os.getenv("DB_PORT", "3306")),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASS"),
+        database=database,
+        autocommit=False,
+    )
+
+
+def recreate_database():
+    """
+    Drop and recreate BENCH_DB_NAME, then load the init scripts into it.
+
+    The init scripts use DELIMITER, which only the mysql client understands,
+    so they are piped through it rather than executed with the connector.
+
+    Raises:
+        Exception: If BENCH_DB_NAME is the application database.
+    """
+    if BENCH_DB_NAME == os.getenv("DB_NAME"):
+        raise Exception("BENCH_DB_NAME must not be the application database")
+
+    conn = connect(database=None)
+    cursor = conn.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{BENCH_DB_NAME}`")
+    cursor.execute(
+        f"CREATE DATABASE `{BENCH_DB_NAME}` "
+        "CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"
+    )
+    cursor.close()
+    conn.close()
+
+    env = {**os.environ, "MYSQL_PWD": os.getenv("DB_PASS", "")}
+    command = [
+        "mysql",
+        f"--host={os.getenv('DB_HOST')}",
+        f"--port={os.getenv('DB_PORT', '3306')}",
+        f"--user={os.getenv('DB_USER')}",
+        BENCH_DB_NAME,
+    ]
+    for filename in INIT_FILES:
+        with open(INIT_DIR / filename, "rb") as init_file:
+            subprocess.run(command, stdin=init_file, env=env, check=True)
+
+
+def insert_rows(cursor, table: str, columns: list[str], rows: list[tuple]):
+    """Insert rows in INSERT_BATCH_SIZE multi-row batches."""
+    query = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        cursor.executemany(query, rows[start:start + INSERT_BATCH_SIZE])
+
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+class ZipfSampler:
+    """Draws items with probability proportional to 1 / rank ** exponent."""
+
+    def __init__(self, items: list, exponent: float, rng: random.Random):
+        self.items = items
+        self.rng = rng
+        total = 0.0
+        self.cum_weights = []
+        for rank in range(1, len(items) + 1):
+            total += 1.0 / rank ** exponent
+            self.cum_weights.append(total)
+
+    def sample(self, count: int) -> set:
+        """Draw count distinct items (fewer if the vocabulary is smaller)."""
+        count = min(count, len(self.items))
+        chosen = set()
+        while len(chosen) < count:
+            chosen.update(self.rng.choices(self.items, cum_weights=self.cum_weights, k=count - len(chosen)))
+        return chosen
+
+
+def seed_database(faculty_count: int) -> dict:
+    """
+    Seed the benchmark database with a synthetic graph of faculty_count faculty.
+
+    Args:
+        faculty_count: Number of faculty to create
+
+    Returns:
+        Dictionary with row counts per table and the registered faculty ids
+    """
+    rng = random.Random(SEED + faculty_count)
+
+    faculty_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(faculty_count)]
+    registered_ids = rng.sample(faculty_ids, max(1, int(faculty_count * REGISTERED_FRACTION)))
+    keywords = [f"topic {i}" for i in range(max(10, int(faculty_count * KEYWORDS_PER_SCALE)))]
+    zipf = ZipfSampler(keywords, ZIPF_EXPONENT, rng)
+
+    rows = {table: [] for table in (
+        "faculty", "credentials", "keyword", "faculty_department", "faculty_researches_keyword",
+        "publication", "publication_authored_by_faculty", "publication_explores_keyword",
+        "grants", "grants_granted_to_faculty", "grants_for_keyword",
+    )}
+
+    rows["keyword"] = [(name,) for name in keywords]
+    for i, faculty_id in enumerate(faculty_ids):
+        rows["faculty"].append((faculty_id, f"First{i}", f"Last{i}", f"Synthetic biography for faculty {i}."))
+        department = f"Department Name {rng.randrange(DEPARTMENT_COUNT)}"
+        rows["faculty_department"].append((faculty_id, rng.choice(DEPARTMENT_VARIANTS).format(department)))
+        for name in zipf.sample(rng.randint(*RESEARCH_KEYWORDS)):
+            rows["faculty_researches_keyword"].append((name, faculty_id))
+    rows["credentials"] = [
+        (faculty_id, f"user_{faculty_id}", "benchmark", "benchmark") for faculty_id in registered_ids
+    ]
+
+    # Enough publications for the mean number authored per faculty member
+    publication_count = int(faculty_count * statistics.fmean(PUBLICATIONS) / statistics.fmean(AUTHORS_PER_PUBLICATION))
+    for i in range(publication_count):
+        publication_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        rows["publication"].append((publication_id, f"Synthetic publication {i}", 2000 + i % 25, "Benchmark"))
+        for faculty_id in rng.sample(faculty_ids, rng.randint(*AUTHORS_PER_PUBLICATION)):
+            rows["publication_authored_by_faculty"].append((faculty_id, publication_id))
+        for name in zipf.sample(rng.randint(*KEYWORDS_PER_PUBLICATION)):
+            rows["publication_explores_keyword"].append((publication_id, name))
+
+    for i in range(int(faculty_count * GRANTS_PER_SCALE)):
+        grant_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        rows["grants"].append((grant_id, f"Synthetic grant {i}", 100000, "2020-01-01"))
+        for faculty_id in rng.sample(faculty_ids, rng.randint(*HOLDERS_PER_GRANT)):
+            rows["grants_granted_to_faculty"].append((grant_id, faculty_id))
+        for name in zipf.sample(rng.randint(*KEYWORDS_PER_GRANT)):
+            rows["grants_for_keyword"].append((grant_id, name))
+
+    columns = {
+        "faculty": ["faculty_id", "first_name", "last_name", "biography"],
+        "credentials": ["faculty_id", "username", "password_hash", "password_salt"],
+        "keyword": ["name"],
+        "faculty_department": ["faculty_id", "department_name"],
+        "faculty_researches_keyword": ["name", "faculty_id"],
+        "publication": ["publication_id", "title", "year", "publisher"],
+        "publication_authored_by_faculty": ["faculty_id", "publication_id"],
+        "publication_explores_keyword": ["publication_id", "name"],
+        "grants": ["grant_id", "description", "amount", "start_date"],
+        "grants_granted_to_faculty": ["grant_id", "faculty_id"],
+        "grants_for_keyword": ["grant_id", "name"],
+    }
+
+    conn = connect()
+    cursor = conn.cursor()
+    for table, table_rows in rows.items():
+        insert_rows(cursor, table, columns[table], table_rows)
+    # Seeding fires the change log triggers; benchmarks start from a clean log
+    cursor.execute("DELETE FROM recommendation_change_log")
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+    counts = {table: len(table_rows) for table, table_rows in rows.items()}
+    return {"counts": counts, "registered_ids": registered_ids}
+
+
+# ============================================================================
+# TEST FUNCTIONS
+# ============================================================================
+
+def time_full_rebuild(engine: str) -> float:
+    """
+    Run a full rebuild with one engine and commit it.
+
+    Args:
+        engine: "sql" or "sparse"
+
+    Returns:
+        Elapsed time in seconds
+    """
+    with start_transaction(connect()) as transaction_context:
+        start_time = time.perf_counter()
+        if engine == "sql":
+            sql_generate_all_recommendations(transaction_context)
+        else:
+            generate_recommendations_sparse(transaction_context)
+        elapsed = time.perf_counter() - start_time
+    return elapsed
+
+
+def time_per_faculty(faculty_ids: list[str]) -> list[float]:
+    """Time generate_recommendations_for_faculty once per faculty member, committing each."""
+    times = []
+    for faculty_id in faculty_ids:
+        with start_transaction(connect()) as transaction_context:
+            start_time = time.perf_counter()
+            sql_generate_recommendations_for_faculty(transaction_context, faculty_id)
+            times.append(time.perf_counter() - start_time)
+    return times
+
+
+def time_reads(faculty_ids: list[str]) -> tuple[list[float], int]:
+    """
+    Time read_recommendations_for_faculty once per faculty member on one connection.
+
+    Returns:
+        Tuple of (elapsed times in seconds, total rows returned)
+    """
+    times = []
+    row_count = 0
+    with start_transaction(connect()) as transaction_context:
+        for faculty_id in faculty_ids:
+            start_time = time.perf_counter()
+            rows = sql_read_recommendations_for_faculty(transaction_context, faculty_id, READ_LIMIT)
+            times.append(time.perf_counter() - start_time)
+            row_count += len(rows)
+    return times, row_count
+
+
+def count_recommendations() -> int:
+    """Number of rows in faculty_recommended_to_faculty."""
+    with start_transaction(connect()) as transaction_context:
+        transaction_context.cursor.execute("SELECT COUNT(*) AS row_count FROM faculty_recommended_to_faculty")
+        return transaction_context.cursor.fetchone()["row_count"]
+
+
+def percentile(times: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of times."""
+    if not times:
+        return 0.0
+    ordered = sorted(times)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(times: list[float]) -> dict[str, float]:
+    """Mean, p50 and p95 of a list of times."""
+    return {
+        "mean": statistics.fmean(times) if times else 0.0,
+        "p50": percentile(times, 0.50),
+        "p95": percentile(times, 0.95),
+    }
+
+
+def run_scale(faculty_count: int) -> dict:
+    """
+    Seed one scale and run every timing against it.
+
+    Args:
+        faculty_count: Number of synthetic faculty
+
+    Returns:
+        Dictionary of results for this scale
+    """
+    print(f"\nScale {faculty_count:,} faculty")
+    print("    recreating database...", flush=True)
+    recreate_database()
+
+    print("    seeding...", end=" ", flush=True)
+    start_time = time.perf_counter()
+    seeded = seed_database(faculty_count)
+    seed_seconds = time.perf_counter() - start_time
+    print(f"{seed_seconds:.2f}s")
+
+    rng = random.Random(SEED)
+    registered_ids = seeded["registered_ids"]
+    per_faculty_ids = rng.sample(registered_ids, min(PER_FACULTY_SAMPLES, len(registered_ids)))
+    read_ids = rng.sample(registered_ids, min(READ_SAMPLES, len(registered_ids)))
+
+    result = {
+        "faculty_count": faculty_count,
+        "seed_seconds": seed_seconds,
+        "row_counts": seeded["counts"],
+        "full_rebuild_seconds": {},
+    }
+
+    # The last engine's rows are left in place for the per-faculty and read timings
+    for engine in ENGINES:
+        print(f"    full rebuild ({engine})...", end=" ", flush=True)
+        elapsed = time_full_rebuild(engine)
+        result["full_rebuild_seconds"][engine] = elapsed
+        print(f"{elapsed:.3f}s")
+    result["recommendation_count"] = count_recommendations()
+
+    print(f"    per-faculty generation ({len(per_faculty_ids)} faculty)...", end=" ", flush=True)
+    result["per_faculty_seconds"] = summarize(time_per_faculty(per_faculty_ids))
+    print(f"p50 {result['per_faculty_seconds']['p50']:.4f}s")
+
+    print(f"    reads ({len(read_ids)} faculty, limit {READ_LIMIT})...", end=" ", flush=True)
+    read_times, read_rows = time_reads(read_ids)
+    result["read_seconds"] = summarize(read_times)
+    result["read_rows"] = read_rows
+    print(f"p50 {result['read_seconds']['p50'] * 1000:.2f}ms")
+
+    return result
+
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def write_results_to_csv(results: list[dict], output_path: str):
+    """
+    Write one row per scale to a CSV file.
+
+    Args:
+        results: List of per-scale result dictionaries
+        output_path: Path to output CSV file
+    """
+    headers = (
+        ["faculty", "recommendations", "seed"]
+        + [f"full_{engine}" for engine in ENGINES]
+        + ["per_faculty_mean", "per_faculty_p50", "per_faculty_p95", "read_mean", "read_p50", "read_p95"]
+    )
+    with open(output_path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(headers)
+        for result in results:
+            row = [result["faculty_count"], result["recommendation_count"], f"{result['seed_seconds']:.6f}"]
+            row += [f"{result['full_rebuild_seconds'][engine]:.6f}" for engine in ENGINES]
+            row += [f"{result['per_faculty_seconds'][key]:.6f}" for key in ("mean", "p50", "p95")]
+            row += [f"{result['read_seconds'][key]:.6f}" for key in ("mean", "p50", "p95")]
+            writer.writerow(row)
+
+
+def write_results_to_json(results: list[dict], output_path: str):
+    """Write the full results, including configuration and row counts, to a JSON file."""
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "seed": SEED,
+            "zipf_exponent": ZIPF_EXPONENT,
+            "registered_fraction": REGISTERED_FRACTION,
+            "per_faculty_samples": PER_FACULTY_SAMPLES,
+            "read_samples": READ_SAMPLES,
+            "read_limit": READ_LIMIT,
+        },
+        "results": results,
+    }
+    with open(output_path, 'w') as jsonfile:
+        json.dump(report, jsonfile, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recommendation generation on synthetic data")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES, help="Faculty counts to benchmark")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("RECOMMENDATION SCALE BENCHMARK")
+    print("=" * 60)
+    print(f"Scales: {', '.join(f'{scale:,}' for scale in args.scales)}")
+    print(f"Benchmark database: {BENCH_DB_NAME} (recreated for every scale)")
+    print(f"Output directory: {OUTPUT_DIR}")
+
+    print("\n" + "-" * 60)
+    print("RUNNING BENCHMARKS...")
+    print("-" * 60)
+
+    results = [run_scale(scale) for scale in args.scales]
+
+    csv_path = os.path.join(OUTPUT_DIR, f"{OUTPUT_BASENAME}.csv")
+    json_path = os.path.join(OUTPUT_DIR, f"{OUTPUT_BASENAME}.json")
+    write_results_to_csv(results, csv_path)
+    write_results_to_json(results, json_path)
+
+    print("\n" + "=" * 60)
+    print("RESULTS SUMMARY")
+    print("=" * 60)
+    for result in results:
+        full = ", ".join(f"{engine} {result['full_rebuild_seconds'][engine]:.3f}s" for engine in ENGINES)
+        print(
+            f"{result['faculty_count']:>9,} faculty: full {full}; "
+            f"per-faculty p95 {result['per_faculty_seconds']['p95']:.4f}s; "
+            f"read p95 {result['read_seconds']['p95'] * 1000:.2f}ms"
+        )
+
+    print(f"\nResults saved to: {csv_path}")
+    print(f"                  {json_path}")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Written by Clayton Durepos
+
+Runs the keyword generation model worker (see backend/app/services/keyword_worker.py).
+Start one per machine that should run the model; API workers only queue jobs.
+
+    python backend/run_keyword_worker.py          # process jobs until interrupted
+    python backend/run_keyword_worker.py --once   # process one batch and exit
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path so "backend" module can be imported
+backend_dir = Path(__file__).resolve().parent
+project_root = backend_dir.parent
+if str(project_root) not in sys.path:
+  sys.path.insert(0, str(project_root))
+
+from backend.app import create_app
+from backend.app.services.keyword_worker import process_keyword_jobs, run_keyword_worker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ScholarSphere keyword generation worker")
+    parser.add_argument("--once", action="store_true", help="Process one batch of queued jobs and exit")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.once:
+            print(f"Processed {process_keyword_jobs()} jobs")
+            return 0
+
+        print("Keyword worker running")
+        try:
+            if not run_keyword_worker():
+                print("Another keyword worker is already running on this machine")
+                return 1
+        except KeyboardInterrupt:
+            # The worker releases its lock on the way out
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
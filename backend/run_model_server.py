@@ -0,0 +1,36 @@
+"""
+Written by Aidan Bell
+
+Runs the local keyword generation server (see backend/models/server.py), which
+loads the Qwen model once for every process on this machine. Point clients at
+it with QWEN_SERVER_URL=http://127.0.0.1:8765.
+
+    python backend/run_model_server.py
+    python backend/run_model_server.py --host 127.0.0.1 --port 8765
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path so "backend" module can be imported
+backend_dir = Path(__file__).resolve().parent
+project_root = backend_dir.parent
+if str(project_root) not in sys.path:
+  sys.path.insert(0, str(project_root))
+
+from backend.models.server import serve
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ScholarSphere keyword generation server")
+    parser.add_argument("--host", help="Address to bind (default: QWEN_SERVER_HOST or 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="Port to bind (default: QWEN_SERVER_PORT or 8765)")
+    args = parser.parse_args()
+
+    serve(args.host, args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
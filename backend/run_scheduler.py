@@ -0,0 +1,63 @@
+"""
+Written by Clayton Durepos
+
+Runs the background job scheduler (see backend/app/services/scheduler.py).
+
+    python backend/run_scheduler.py                      # schedule SCHEDULER_JOBS (default: all)
+    python backend/run_scheduler.py --jobs rebuild_recommendations generate_recommendations
+    python backend/run_scheduler.py --run clean_session  # run one job now and exit
+    python backend/run_scheduler.py --list               # jobs and their recent runs
+"""
+
+import argparse
+import sys
+import threading
+from pathlib import Path
+
+# Ensure project root is on sys.path so "backend" module can be imported
+backend_dir = Path(__file__).resolve().parent
+project_root = backend_dir.parent
+if str(project_root) not in sys.path:
+  sys.path.insert(0, str(project_root))
+
+from backend.app import create_app
+from backend.app.services.scheduler import JOBS, get_job_runs, run_job, start_scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run ScholarSphere background jobs")
+    parser.add_argument("--jobs", nargs="+", metavar="JOB", help="Jobs to schedule on this node (overrides SCHEDULER_JOBS)")
+    parser.add_argument("--run", metavar="JOB", help="Run one job now and exit")
+    parser.add_argument("--list", action="store_true", help="List jobs with their most recent runs and exit")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.list:
+            for job in JOBS.values():
+                print(f"{job.name}: {job.description}")
+                for run in get_job_runs(job.name, 5):
+                    print(
+                        f"  {run['started_at']} {run['status']:<8} {run['triggered_by']:<8} "
+                        f"{run['duration_ms']}ms rows={run['row_count']} host={run['host']}"
+                        + (f" error={run['error']}" if run["error"] else "")
+                    )
+            return 0
+
+        if args.run:
+            result = run_job(args.run, "manual")
+            print(result)
+            return 1 if result["status"] == "failed" else 0
+
+        stop_event = threading.Event()
+        threads = start_scheduler(args.jobs, stop_event)
+        print(f"Scheduling: {', '.join(thread.name.removeprefix('scheduler-') for thread in threads)}")
+        try:
+            stop_event.wait()
+        except KeyboardInterrupt:
+            stop_event.set()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -125,6 +125,39 @@ start_backend() {
     echo -e "${YELLOW}Backend logs: tail -f /tmp/scholarsphere_backend.log${NC}"
 }
 
+# Start background job scheduler (session cleanup, partition rotation, recommendation refresh)
+start_scheduler() {
+    echo -e "\n${YELLOW}Starting job scheduler...${NC}"
+
+    cd "$PROJECT_ROOT/backend"
+
+    python run_scheduler.py > /tmp/scholarsphere_scheduler.log 2>&1 &
+    SCHEDULER_PID=$!
+    echo $SCHEDULER_PID > /tmp/scholarsphere_scheduler.pid
+
+    echo -e "${GREEN}Job scheduler started (PID: $SCHEDULER_PID)${NC}"
+    echo -e "${YELLOW}Scheduler logs: tail -f /tmp/scholarsphere_scheduler.log${NC}"
+}
+
+# Start keyword generation worker (loads the model; API processes only queue jobs)
+start_keyword_worker() {
+    if [[ "${KEYWORD_ENGINE:-qwen}" == "statistical" ]]; then
+        # The statistical engine runs inside the backend and needs no worker
+        return
+    fi
+
+    echo -e "\n${YELLOW}Starting keyword worker...${NC}"
+
+    cd "$PROJECT_ROOT/backend"
+
+    python run_keyword_worker.py > /tmp/scholarsphere_keyword_worker.log 2>&1 &
+    KEYWORD_WORKER_PID=$!
+    echo $KEYWORD_WORKER_PID > /tmp/scholarsphere_keyword_worker.pid
+
+    echo -e "${GREEN}Keyword worker started (PID: $KEYWORD_WORKER_PID)${NC}"
+    echo -e "${YELLOW}Keyword worker logs: tail -f /tmp/scholarsphere_keyword_worker.log${NC}"
+}
+
 # Start frontend server
 start_frontend() {
     echo -e "\n${YELLOW}Starting frontend server...${NC}"
@@ -152,6 +185,24 @@ stop_servers() {
         fi
         rm -f /tmp/scholarsphere_backend.pid
     fi
+
+    if [[ -f /tmp/scholarsphere_scheduler.pid ]]; then
+        SCHEDULER_PID=$(cat /tmp/scholarsphere_scheduler.pid)
+        if kill -0 "$SCHEDULER_PID" 2>/dev/null; then
+            kill "$SCHEDULER_PID"
+            echo -e "${GREEN}Job scheduler stopped${NC}"
+        fi
+        rm -f /tmp/scholarsphere_scheduler.pid
+    fi
+
+    if [[ -f /tmp/scholarsphere_keyword_worker.pid ]]; then
+        KEYWORD_WORKER_PID=$(cat /tmp/scholarsphere_keyword_worker.pid)
+        if kill -0 "$KEYWORD_WORKER_PID" 2>/dev/null; then
+            kill "$KEYWORD_WORKER_PID"
+            echo -e "${GREEN}Keyword worker stopped${NC}"
+        fi
+        rm -f /tmp/scholarsphere_keyword_worker.pid
+    fi
     
     if [[ -f /tmp/scholarsphere_frontend.pid ]]; then
         FRONTEND_PID=$(cat /tmp/scholarsphere_frontend.pid)
@@ -210,6 +261,8 @@ main() {
     
     if [[ "$RUN_BACKEND" == true ]]; then
         start_backend
+        start_scheduler
+        start_keyword_worker
     fi
     
     if [[ "$RUN_FRONTEND" == true ]]; then
@@ -0,0 +1,14 @@
+-- Written by Clayton Durepos
+
+/**
+ * Events replaced by the backend job scheduler (backend/run_scheduler.py).
+ *
+ * Session cleanup, keyword generation cleanup and recommendation generation now
+ * run from the scheduler, which skips overlapping runs and records each run in
+ * scheduled_job_run. Drop the old events so existing databases don't run the
+ * same work twice.
+ */
+DROP EVENT IF EXISTS clean_session_event;
+DROP EVENT IF EXISTS clean_faculty_generates_keyword_event;
+DROP EVENT IF EXISTS generate_recommendations_event;
+DROP EVENT IF EXISTS rebuild_recommendations_event;
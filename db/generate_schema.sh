@@ -31,7 +31,11 @@ BASE_TABLES=(
     "keyword.sql"
     "publication.sql"
     "grants.sql"
-    "session.sql"
+    "session.sql"                 # partitioned, no foreign keys
+    "faculty_generates_keyword.sql" # partitioned, no foreign keys
+    "recommendation_change_log.sql"
+    "recommendation_run.sql"
+    "scheduled_job_run.sql"
 )
 
 # Tables that reference only one base table
@@ -40,16 +44,18 @@ SINGLE_REF_TABLES=(
     "equipment.sql"               # references institution
     "faculty_department.sql"      # references faculty
     "faculty_email.sql"           # references faculty
-    "faculty_generates_keyword.sql" # references faculty
     "faculty_phone.sql"           # references faculty
     "faculty_title.sql"           # references faculty
      "grants_organization.sql"    # references grants
+    "recommendation_run_shard.sql" # references recommendation_run
+    "keyword_generation_job.sql"   # references faculty
 )
 
 # Tables that reference multiple base tables or other relationship tables
 MULTI_REF_TABLES=(
     "faculty_follows_faculty.sql"           # references faculty (twice)
     "faculty_recommended_to_faculty.sql"     # references faculty (twice)
+    "faculty_recommendation_display.sql"     # references faculty (twice)
     "faculty_researches_keyword.sql"         # references faculty and keyword
     "faculty_works_at_institution.sql"       # references faculty and institution
     "grants_for_keyword.sql"                 # references grants and keyword
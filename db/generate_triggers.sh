@@ -0,0 +1,35 @@
+#!/bin/bash
+
+# Written by Clayton Durepos
+
+# Script to generate 005_init_triggers.sql from all files in the triggers directory
+# Ignores *.md files
+
+SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )"
+TRIGGERS_DIR="$SCRIPT_DIR/triggers"
+OUTPUT_FILE="$SCRIPT_DIR/init/005_init_triggers.sql"
+
+# Create init directory if it doesn't exist
+mkdir -p "$(dirname "$OUTPUT_FILE")"
+
+# Clear the output file
+> "$OUTPUT_FILE"
+
+# Add header comment
+cat >> "$OUTPUT_FILE" << 'HEADER'
+-- Auto-generated triggers file
+-- Generated by db/generate_triggers.sh
+-- DO NOT EDIT MANUALLY - This file is generated from db/triggers/*.sql files
+
+HEADER
+
+# Find all .sql files in triggers directory (excluding .md files), sort them, and concatenate
+find "$TRIGGERS_DIR" -maxdepth 1 -name "*.sql" -type f | sort | while read -r file; do
+    echo "-- Source: $(basename "$file")" >> "$OUTPUT_FILE"
+    echo "" >> "$OUTPUT_FILE"
+    cat "$file" >> "$OUTPUT_FILE"
+    echo "" >> "$OUTPUT_FILE"
+    echo "" >> "$OUTPUT_FILE"
+done
+
+echo "[OK] Generated $OUTPUT_FILE"
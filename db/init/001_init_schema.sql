@@ -1,11 +1,11 @@
--- Written by Clayton Durepos
-
 -- Auto-generated schema initialization file
 -- Generated by db/generate_schema.sh
 -- DO NOT EDIT MANUALLY - This file is generated from db/schema/*.sql files
 
 -- Source: faculty.sql
 
+-- Written by Aidan Bell
+
 CREATE TABLE IF NOT EXISTS faculty (
     faculty_id          CHAR(36)        PRIMARY KEY,
     
@@ -38,6 +38,8 @@ CREATE TABLE IF NOT EXISTS faculty (
 
 -- Source: institution.sql
 
+-- Written by Abby Pitcairn
+
 -- Institution schema
 CREATE TABLE IF NOT EXISTS institution (
     institution_id      CHAR(36)        PRIMARY KEY,
@@ -74,12 +76,16 @@ CREATE TABLE IF NOT EXISTS institution (
 
 -- Source: keyword.sql
 
+-- Written by Owen Leitzell
+
 CREATE TABLE keyword (
     name VARCHAR(64) PRIMARY KEY
 );
 
 -- Source: publication.sql
 
+-- Written by Owen Leitzell
+
 CREATE TABLE IF NOT EXISTS publication (
     publication_id  CHAR(36) NOT NULL PRIMARY KEY,
 
@@ -93,6 +99,8 @@ CREATE TABLE IF NOT EXISTS publication (
 
 -- Source: grants.sql
 
+-- Written by Clayton Durepos
+
 CREATE TABLE IF NOT EXISTS grants (
     grant_id    CHAR(36)        PRIMARY KEY,
     description VARCHAR(2048)   NULL,
@@ -104,18 +112,30 @@ CREATE TABLE IF NOT EXISTS grants (
 
 -- Source: session.sql
 
+-- Written by Clayton Durepos
+
 -- SESSION SCHEMA
 -- Stores hashed refresh tokens for long-term authentication sessions
+--
+-- Range partitioned by expires_at (one partition per day) so clean_session drops
+-- whole partitions of expired sessions instead of deleting rows. Partitions are
+-- created ahead of time by rotate_time_partitions; rows beyond the last one land
+-- in p_future.
+--
+-- Partitioned tables cannot have foreign keys, and every unique key must include
+-- expires_at. The faculty_delete_cascade triggers remove a faculty member's
+-- sessions, and token_hash (a random 256-bit token's hash) is indexed rather
+-- than unique.
 CREATE TABLE IF NOT EXISTS session (
-    -- Primary key
-    session_id              CHAR(36)        PRIMARY KEY,
+    -- Associated with expires_at as the primary key
+    session_id              CHAR(36)        NOT NULL,
     
     -- Associated faculty member
     faculty_id           CHAR(36)         NOT NULL,
     
     -- Hash of the refresh token (SHA-256)
     -- Never store the raw token, only the hash
-    token_hash           VARCHAR(64)      NOT NULL UNIQUE,
+    token_hash           VARCHAR(64)      NOT NULL,
     
     -- When this session was created
     created_at           DATETIME         NOT NULL DEFAULT CURRENT_TIMESTAMP,
@@ -126,11 +146,7 @@ CREATE TABLE IF NOT EXISTS session (
     -- Whether this session has been revoked
     revoked              BOOLEAN          NOT NULL DEFAULT FALSE,
     
-    -- Foreign key constraint
-    FOREIGN KEY (faculty_id)
-        REFERENCES faculty (faculty_id)
-        ON DELETE CASCADE
-        ON UPDATE CASCADE,
+    PRIMARY KEY (session_id, expires_at),
     
     -- Index for lookups by faculty_id
     INDEX idx_faculty_id (faculty_id),
@@ -140,12 +156,115 @@ CREATE TABLE IF NOT EXISTS session (
     
     -- Index for cleanup of expired tokens
     INDEX idx_expires_at (expires_at)
+)
+PARTITION BY RANGE COLUMNS (expires_at) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
 );
 
 
+-- Source: faculty_generates_keyword.sql
+
+-- Range partitioned by generated_at (one partition per hour) so
+-- clean_faculty_generates_keyword drops whole partitions of old records instead
+-- of deleting rows. Partitions are created ahead of time by
+-- rotate_time_partitions; rows beyond the last one land in p_future.
+--
+-- Partitioned tables cannot have foreign keys, and every unique key must include
+-- generated_at. The faculty_delete_cascade triggers remove a faculty member's
+-- records.
+CREATE TABLE IF NOT EXISTS faculty_generates_keyword (
+    generation_id    CHAR(36)        NOT NULL,
+    faculty_id       CHAR(36)        NOT NULL,
+    generated_at     DATETIME        NOT NULL,
+
+    PRIMARY KEY (generation_id, generated_at),
+
+    -- Rate limit lookups count one faculty member's recent generations
+    INDEX idx_faculty_generates_keyword_faculty_generated (faculty_id, generated_at)
+)
+PARTITION BY RANGE COLUMNS (generated_at) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+
+-- Source: recommendation_change_log.sql
+
+-- Written by Clayton Durepos
+
+-- RECOMMENDATION CHANGE LOG SCHEMA
+-- Records entities whose recommendation inputs changed since the last generation run.
+-- Populated by the triggers in db/triggers/ and drained by generate_incremental_recommendations.
+CREATE TABLE IF NOT EXISTS recommendation_change_log (
+    change_id       BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+
+    -- What changed. faculty/publication/grant IDs are UUIDs, keyword IDs are keyword names
+    entity_type     ENUM('faculty', 'keyword', 'publication', 'grant') NOT NULL,
+    entity_id       VARCHAR(64)     NOT NULL,
+
+    changed_at      DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    -- No foreign keys: the entity may already be deleted when the log is drained
+
+    INDEX idx_change_log_entity (entity_type, entity_id)
+);
+
+
+-- Source: recommendation_run.sql
+
+-- Written by Clayton Durepos
+
+-- RECOMMENDATION RUN SCHEMA
+-- Tracks sharded full regeneration runs (see services/recommend_shards.py).
+-- Source faculty are assigned to shards by CRC32(faculty_id) % shard_count,
+-- so a failed run can be resumed by re-running only its unfinished shards.
+CREATE TABLE IF NOT EXISTS recommendation_run (
+    run_id          CHAR(36)        PRIMARY KEY,
+
+    status          ENUM('running', 'complete', 'failed') NOT NULL DEFAULT 'running',
+    shard_count     INT UNSIGNED    NOT NULL,
+
+    -- Newest change log entry covered by this run; cleared when the run completes
+    max_change_id   BIGINT UNSIGNED,
+
+    started_at      DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at     DATETIME,
+
+    INDEX idx_recommendation_run_started_at (started_at)
+);
+
+
+-- Source: scheduled_job_run.sql
+
+-- Written by Clayton Durepos
+
+-- SCHEDULED JOB RUN SCHEMA
+-- One row per run of a backend scheduler job (see services/scheduler.py), so
+-- maintenance work that used to run as MySQL events reports its timing,
+-- affected rows and failures.
+CREATE TABLE IF NOT EXISTS scheduled_job_run (
+    run_id          CHAR(36)        PRIMARY KEY,
+
+    job_name        VARCHAR(64)     NOT NULL,
+    host            VARCHAR(255)    NOT NULL,
+    triggered_by    ENUM('schedule', 'manual') NOT NULL,
+    status          ENUM('running', 'complete', 'failed') NOT NULL DEFAULT 'running',
+
+    started_at      DATETIME(3)     NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    finished_at     DATETIME(3),
+    duration_ms     INT UNSIGNED,
+
+    -- Rows deleted or regenerated by the job, when it reports them
+    row_count       INT UNSIGNED,
+    error           VARCHAR(1024),
+
+    INDEX idx_scheduled_job_run_job_started (job_name, started_at)
+);
+
 
 -- Source: credentials.sql
 
+-- Written by Clayton Durepos
+
 -- USER CREDENTIALS SCHEMA
 CREATE TABLE IF NOT EXISTS credentials (
     -- ASSOCIATED USER ID
@@ -173,6 +292,8 @@ CREATE TABLE IF NOT EXISTS credentials (
 
 -- Source: equipment.sql
 
+-- Written by Abby Pitcairn
+
 -- EQUIPMENT SCH
 CREATE TABLE IF NOT EXISTS equipment (
     equipment_id            CHAR(36)        PRIMARY KEY,
@@ -207,9 +328,14 @@ CREATE TABLE IF NOT EXISTS equipment (
 
 -- Source: faculty_department.sql
 
+-- Written by Aidan Bell
+
 CREATE TABLE IF NOT EXISTS faculty_department (
     faculty_id      CHAR(36)        NOT NULL,
     department_name VARCHAR(128),
+    -- normalize_department_name(department_name), set by the
+    -- faculty_department_key triggers so joins and filters can use an index
+    department_key  VARCHAR(255),
 
     PRIMARY KEY (faculty_id, department_name),
 
@@ -219,11 +345,16 @@ CREATE TABLE IF NOT EXISTS faculty_department (
         ON UPDATE CASCADE,
 
     -- Index on department name for faster search functionality
-    INDEX idx_faculty_department_dept_name (department_name)
+    INDEX idx_faculty_department_dept_name (department_name),
+
+    -- Index on normalized department for shared-department recommendations
+    INDEX idx_faculty_department_dept_key (department_key, faculty_id)
 );
 
 -- Source: faculty_email.sql
 
+-- Written by Aidan Bell
+
 CREATE TABLE IF NOT EXISTS faculty_email (
     faculty_id  CHAR(36)        NOT NULL,
     email       VARCHAR(255),
@@ -239,23 +370,10 @@ CREATE TABLE IF NOT EXISTS faculty_email (
     CHECK (email IS NULL OR email LIKE '%_@__%.__%')
 );
 
--- Source: faculty_generates_keyword.sql
-
-CREATE TABLE IF NOT EXISTS faculty_generates_keyword (
-    generation_id    CHAR(36)        PRIMARY KEY,
-    faculty_id       CHAR(36)        NOT NULL,
-    generated_at     DATETIME        NOT NULL,
-
-    FOREIGN KEY (faculty_id)
-        REFERENCES faculty(faculty_id)
-        ON DELETE CASCADE
-        ON UPDATE CASCADE
-);
-
-
-
 -- Source: faculty_phone.sql
 
+-- Written by Aidan Bell
+
 CREATE TABLE IF NOT EXISTS faculty_phone (
     faculty_id  CHAR(36)        NOT NULL,
 
@@ -272,6 +390,8 @@ CREATE TABLE IF NOT EXISTS faculty_phone (
 
 -- Source: faculty_title.sql
 
+-- Written by Aidan Bell
+
 CREATE TABLE IF NOT EXISTS faculty_title (
     faculty_id  CHAR(36)        NOT NULL,
     title       VARCHAR(255),
@@ -285,6 +405,8 @@ CREATE TABLE IF NOT EXISTS faculty_title (
 
 -- Source: grants_organization.sql
 
+-- Written by Clayton Durepos
+
 -- GRANT ORG SCHEMA
 -- Not all organizations that fund a grant may be an educational or research institution
 -- We store the names of funding org's as a MV attribute of grants 
@@ -305,8 +427,70 @@ CREATE TABLE grants_organization (
 );
 
 
+-- Source: recommendation_run_shard.sql
+
+-- Written by Clayton Durepos
+
+-- RECOMMENDATION RUN SHARD SCHEMA
+-- Progress of each shard of a recommendation_run. A shard is marked complete in
+-- the same transaction that writes its recommendations.
+CREATE TABLE IF NOT EXISTS recommendation_run_shard (
+    run_id          CHAR(36)        NOT NULL,
+    shard_index     INT UNSIGNED    NOT NULL,
+
+    status          ENUM('pending', 'running', 'complete', 'failed') NOT NULL DEFAULT 'pending',
+    source_count    INT UNSIGNED    NOT NULL DEFAULT 0,
+    error           VARCHAR(2048),
+
+    started_at      DATETIME,
+    finished_at     DATETIME,
+
+    PRIMARY KEY (run_id, shard_index),
+
+    FOREIGN KEY (run_id)
+        REFERENCES recommendation_run (run_id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+
+-- Source: keyword_generation_job.sql
+
+-- Written by Clayton Durepos
+
+-- KEYWORD GENERATION JOB SCHEMA
+-- Queue of keyword generation requests. API workers insert queued jobs; the
+-- model worker (backend/run_keyword_worker.py) claims them in batches, runs
+-- the model and stores the keywords or the error for clients to poll.
+CREATE TABLE IF NOT EXISTS keyword_generation_job (
+    job_id          CHAR(36)        PRIMARY KEY,
+    faculty_id      CHAR(36)        NOT NULL,
+
+    status          ENUM('queued', 'running', 'complete', 'failed') NOT NULL DEFAULT 'queued',
+    attempts        TINYINT UNSIGNED NOT NULL DEFAULT 0,
+
+    -- Identifies the worker batch that claimed the job
+    claim_id        CHAR(36),
+
+    keywords        JSON,
+    error           VARCHAR(1024),
+
+    created_at      DATETIME(3)     NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    started_at      DATETIME(3),
+    finished_at     DATETIME(3),
+
+    -- The worker claims the oldest queued jobs
+    INDEX idx_keyword_generation_job_status_created (status, created_at),
+    INDEX idx_keyword_generation_job_claim (claim_id),
+
+    FOREIGN KEY (faculty_id) REFERENCES faculty(faculty_id) ON DELETE CASCADE
+);
+
+
 -- Source: faculty_follows_faculty.sql
 
+-- Written by Aidan Bell
+
 CREATE TABLE IF NOT EXISTS faculty_follows_faculty(
     follower_id     CHAR(36)    NOT NULL,
     followee_id     CHAR(36)    NOT NULL,
@@ -325,9 +509,17 @@ CREATE TABLE IF NOT EXISTS faculty_follows_faculty(
 
 -- Source: faculty_recommended_to_faculty.sql
 
+-- Written by Aidan Bell
+
 /**
  * Faculty-to-faculty recommendations.
- * ENUM order defines priority (first = highest).
+ * ENUM order defines priority (first = highest). recommendation_reasons holds
+ * every reason the pair was matched (same order); recommendation_type is the
+ * highest-priority one.
+ * match_score (0.0 to 1.0) ranks recommendations; only the top
+ * recommendation_top_k() per source are kept.
+ * generation_epoch identifies the run that last produced the row; rows from
+ * older epochs are pruned once a newer run finishes.
  */
 CREATE TABLE IF NOT EXISTS faculty_recommended_to_faculty (
     source_faculty_id   CHAR(36) NOT NULL,
@@ -343,6 +535,19 @@ CREATE TABLE IF NOT EXISTS faculty_recommended_to_faculty (
         'shared_grant',
         'shared_department'
     ) NOT NULL,
+    recommendation_reasons SET(
+        'shared_keyword',
+        'keyword_to_publication',
+        'publication_to_keyword',
+        'keyword_to_grant',
+        'grant_to_keyword',
+        'grant_to_publication',
+        'publication_to_grant',
+        'shared_grant',
+        'shared_department'
+    ) NOT NULL DEFAULT '',
+    match_score DECIMAL(5,4) NOT NULL DEFAULT 0,
+    generation_epoch BIGINT UNSIGNED NOT NULL DEFAULT 0,
     created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
 
@@ -357,12 +562,76 @@ CREATE TABLE IF NOT EXISTS faculty_recommended_to_faculty (
         ON DELETE CASCADE ON UPDATE CASCADE,
 
     INDEX idx_recommendations_source (source_faculty_id),
-    INDEX idx_recommendations_type (recommendation_type)
+    INDEX idx_recommendations_source_score (source_faculty_id, match_score),
+    INDEX idx_recommendations_type (recommendation_type),
+    INDEX idx_recommendations_epoch (generation_epoch)
+);
+
+
+-- Source: faculty_recommendation_display.sql
+
+-- Written by Clayton Durepos
+
+/**
+ * Denormalized read model for faculty_recommended_to_faculty.
+ * Rebuilt for a source faculty member whenever their recommendations are
+ * generated (see refresh_recommendation_display), so reading recommendations
+ * is a single range scan on source_faculty_id with no joins.
+ */
+CREATE TABLE IF NOT EXISTS faculty_recommendation_display (
+    source_faculty_id   CHAR(36)        NOT NULL,
+    target_faculty_id   CHAR(36)        NOT NULL,
+    first_name          VARCHAR(128)    NOT NULL,
+    last_name           VARCHAR(128),
+    biography_snippet   VARCHAR(300),
+    institution_name    VARCHAR(256),
+    department_name     VARCHAR(128),
+    recommendation_type ENUM(
+        'shared_keyword',
+        'keyword_to_publication',
+        'publication_to_keyword',
+        'keyword_to_grant',
+        'grant_to_keyword',
+        'grant_to_publication',
+        'publication_to_grant',
+        'shared_grant',
+        'shared_department'
+    ) NOT NULL,
+    recommendation_reasons SET(
+        'shared_keyword',
+        'keyword_to_publication',
+        'publication_to_keyword',
+        'keyword_to_grant',
+        'grant_to_keyword',
+        'grant_to_publication',
+        'publication_to_grant',
+        'shared_grant',
+        'shared_department'
+    ) NOT NULL DEFAULT '',
+    match_score         DECIMAL(5,4)    NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (source_faculty_id, target_faculty_id),
+
+    FOREIGN KEY (source_faculty_id)
+        REFERENCES faculty(faculty_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+
+    FOREIGN KEY (target_faculty_id)
+        REFERENCES faculty(faculty_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+
+    -- Read order: highest score first, then type priority
+    INDEX idx_recommendation_display_source_score (source_faculty_id, match_score DESC, recommendation_type),
+
+    -- Same read order within one recommendation_type (?type= filter)
+    INDEX idx_recommendation_display_source_type_score (source_faculty_id, recommendation_type, match_score DESC)
 );
 
 
 -- Source: faculty_researches_keyword.sql
 
+-- Written by Owen Leitzell
+
 CREATE TABLE faculty_researches_keyword (
     name        VARCHAR(64)     NOT NULL,
     faculty_id     CHAR(36)     NOT NULL,
@@ -386,6 +655,8 @@ CREATE TABLE faculty_researches_keyword (
 
 -- Source: faculty_works_at_institution.sql
 
+-- Written by Abby Pitcairn
+
 -- Represents the many-to-many relation between Faculty and Institution
 CREATE TABLE faculty_works_at_institution (
     faculty_id      CHAR(36)    NOT NULL,
@@ -415,6 +686,8 @@ CREATE TABLE faculty_works_at_institution (
 
 -- Source: grants_for_keyword.sql
 
+-- Written by Owen Leitzell
+
 CREATE TABLE grants_for_keyword (
     grant_id        CHAR(36)    NOT NULL,
     name            VARCHAR(64) NOT NULL,
@@ -434,6 +707,8 @@ CREATE TABLE grants_for_keyword (
 
 -- Source: grants_granted_to_faculty.sql
 
+-- Written by Clayton Durepos
+
 CREATE TABLE grants_granted_to_faculty (
     grant_id        CHAR(36)    NOT NULL,
     faculty_id      CHAR(36)    NOT NULL,
@@ -454,6 +729,8 @@ CREATE TABLE grants_granted_to_faculty (
 
 -- Source: publication_authored_by_faculty.sql
 
+-- Written by Owen Leitzell
+
 CREATE TABLE IF NOT EXISTS publication_authored_by_faculty (
     faculty_id         CHAR(36)    NOT NULL,
     publication_id  CHAR(36)    NOT NULL,
@@ -477,6 +754,8 @@ CREATE TABLE IF NOT EXISTS publication_authored_by_faculty (
 
 -- Source: publication_explores_keyword.sql
 
+-- Written by Owen Leitzell
+
 CREATE TABLE publication_explores_keyword (
     publication_id  CHAR(36)    NOT NULL,
     name            VARCHAR(64) NOT NULL,
@@ -1,5 +1,3 @@
--- Written by Clayton Durepos
-
 -- Auto-generated procedures file
 -- Generated by db/generate_procedures.sh
 -- DO NOT EDIT MANUALLY
@@ -8,8 +6,35 @@
 -- util
 -- ============================================================
 
+-- Source: util/next_recommendation_epoch.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Allocate a generation epoch for a recommendation run.
+ * 
+ * UUID_SHORT() increases monotonically on a server (including across restarts),
+ * so a later run always gets a larger epoch without a shared counter row that
+ * concurrent runs would have to lock.
+ */
+DROP FUNCTION IF EXISTS next_recommendation_epoch$$
+CREATE FUNCTION next_recommendation_epoch()
+RETURNS BIGINT UNSIGNED
+NOT DETERMINISTIC
+NO SQL
+BEGIN
+    RETURN UUID_SHORT();
+END $$
+
+DELIMITER ;
+
+
 -- Source: util/normalize_department_name.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -119,12 +144,88 @@ END $$
 DELIMITER ;
 
 
+-- Source: util/recommendation_score.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Similarity score (0.0 to 1.0) between a source and target faculty member.
+ * 
+ * Weighted combination of:
+ *   0.60 - Cosine similarity of research topics (keywords researched, published
+ *          on, or funded by a grant)
+ *   0.25 - Jaccard similarity of grants held
+ *   0.15 - Shared (normalized) department
+ * 
+ * The sparse recommendation engine (backend/app/services/recommend_engine.py)
+ * uses the same weights.
+ */
+DROP FUNCTION IF EXISTS recommendation_score$$
+CREATE FUNCTION recommendation_score(
+    p_shared_topics     INT,
+    p_source_topics     INT,
+    p_target_topics     INT,
+    p_shared_grants     INT,
+    p_source_grants     INT,
+    p_target_grants     INT,
+    p_shared_department BOOLEAN
+)
+RETURNS DECIMAL(5,4)
+DETERMINISTIC
+BEGIN
+    DECLARE v_topic_score DOUBLE DEFAULT 0;
+    DECLARE v_grant_score DOUBLE DEFAULT 0;
+
+    IF p_shared_topics > 0 AND p_source_topics > 0 AND p_target_topics > 0 THEN
+        SET v_topic_score = p_shared_topics / SQRT(p_source_topics * p_target_topics);
+    END IF;
+
+    IF p_shared_grants > 0 THEN
+        SET v_grant_score = p_shared_grants / (p_source_grants + p_target_grants - p_shared_grants);
+    END IF;
+
+    RETURN ROUND(
+        0.60 * v_topic_score
+        + 0.25 * v_grant_score
+        + 0.15 * IF(p_shared_department, 1, 0),
+        4
+    );
+END $$
+
+DELIMITER ;
+
+
+-- Source: util/recommendation_top_k.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Maximum number of recommendations stored per source faculty member.
+ * Lower-scoring recommendations are pruned by score_recommendations.
+ */
+DROP FUNCTION IF EXISTS recommendation_top_k$$
+CREATE FUNCTION recommendation_top_k()
+RETURNS INT
+DETERMINISTIC
+BEGIN
+    RETURN 50;
+END $$
+
+DELIMITER ;
+
+
 -- ============================================================
 -- create
 -- ============================================================
 
 -- Source: create/create_credentials.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -182,6 +283,8 @@ DELIMITER ;
 
 -- Source: create/create_equipment.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -230,6 +333,8 @@ DELIMITER ;
 
 -- Source: create/create_faculty.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -309,6 +414,8 @@ DELIMITER ;
 
 -- Source: create/create_faculty_department.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -355,6 +462,8 @@ DELIMITER ;
 
 -- Source: create/create_faculty_email.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -386,6 +495,8 @@ DELIMITER ;
 
 -- Source: create/create_faculty_follows_faculty.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -507,6 +618,8 @@ DELIMITER ;
 
 -- Source: create/create_faculty_phone.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -545,6 +658,8 @@ DELIMITER ;
 
 -- Source: create/create_faculty_researches_keyword.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -580,6 +695,8 @@ DELIMITER ;
 
 -- Source: create/create_faculty_title.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -618,6 +735,8 @@ DELIMITER ;
 
 -- Source: create/create_faculty_works_at_institution.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -668,6 +787,8 @@ DELIMITER ;
 
 -- Source: create/create_grants.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -708,6 +829,8 @@ DELIMITER ;
 
 -- Source: create/create_grants_for_keyword.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -742,6 +865,8 @@ DELIMITER ;
 
 -- Source: create/create_grants_granted_to_faculty.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -776,6 +901,8 @@ DELIMITER ;
 
 -- Source: create/create_institution.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -841,6 +968,8 @@ DELIMITER ;
 
 -- Source: create/create_keyword.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -866,8 +995,44 @@ END $$
 DELIMITER ;
 
 
+-- Source: create/create_keyword_generation_job.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Queues a keyword generation job for a faculty member.
+ * 
+ * @param p_job_id      Required UUID for the job
+ * @param p_faculty_id  Required UUID of the faculty member whose biography is used
+ * 
+ * @returns No result set. Use read_keyword_generation_job to follow the job.
+ * 
+ * @throws SQLSTATE '45000' if any parameter is NULL
+ */
+DROP PROCEDURE IF EXISTS create_keyword_generation_job$$
+CREATE PROCEDURE create_keyword_generation_job(
+    IN p_job_id CHAR(36),
+    IN p_faculty_id CHAR(36)
+)
+BEGIN
+    IF p_job_id IS NULL OR p_faculty_id IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'job_id and faculty_id are required for create_keyword_generation_job';
+    END IF;
+
+    INSERT INTO keyword_generation_job (job_id, faculty_id, status, created_at)
+    VALUES (p_job_id, p_faculty_id, 'queued', NOW(3));
+END $$
+
+DELIMITER ;
+
+
 -- Source: create/create_publication.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -913,6 +1078,8 @@ DELIMITER ;
 
 -- Source: create/create_publication_authored_by_faculty.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -959,6 +1126,8 @@ DELIMITER ;
 
 -- Source: create/create_publication_explores_keyword.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -992,8 +1161,48 @@ END $$
 DELIMITER ;
 
 
+-- Source: create/create_scheduled_job_run.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Records the start of a scheduler job run.
+ * 
+ * @param p_run_id        Required UUID for the run
+ * @param p_job_name      Required name of the job
+ * @param p_host          Required host running the job
+ * @param p_triggered_by  Required 'schedule' or 'manual'
+ * 
+ * @returns No result set. Use read_scheduled_job_runs to read runs.
+ * 
+ * @throws SQLSTATE '45000' if any parameter is NULL
+ */
+DROP PROCEDURE IF EXISTS create_scheduled_job_run$$
+CREATE PROCEDURE create_scheduled_job_run(
+    IN p_run_id CHAR(36),
+    IN p_job_name VARCHAR(64),
+    IN p_host VARCHAR(255),
+    IN p_triggered_by VARCHAR(16)
+)
+BEGIN
+    IF p_run_id IS NULL OR p_job_name IS NULL OR p_host IS NULL OR p_triggered_by IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'run_id, job_name, host and triggered_by are required';
+    END IF;
+
+    INSERT INTO scheduled_job_run (run_id, job_name, host, triggered_by, status, started_at)
+    VALUES (p_run_id, p_job_name, p_host, p_triggered_by, 'running', NOW(3));
+END $$
+
+DELIMITER ;
+
+
 -- Source: create/create_session.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1071,6 +1280,8 @@ DELIMITER ;
 
 -- Source: read/read_equipment.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -1111,6 +1322,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1145,8 +1358,109 @@ END $$
 DELIMITER ;
 
 
+-- Source: read/read_faculty_complete_optimized.sql
+
+DELIMITER $$
+
+/**
+ * Optimized procedure to retrieve complete faculty profile with all related data in a single query.
+ * 
+ * This procedure uses JOINs and GROUP_CONCAT to fetch all faculty information
+ * (emails, phones, departments, titles, institution) in one optimized query,
+ * significantly reducing database round trips compared to multiple separate queries.
+ * 
+ * Performance optimization:
+ * - Single query instead of 6-7 separate queries
+ * - Uses LEFT JOINs to avoid missing data
+ * - GROUP_CONCAT aggregates multi-valued fields efficiently
+ * - Subquery gets most recent institution relationship
+ * 
+ * @param p_faculty_id  Required UUID of the faculty member to retrieve
+ * 
+ * @returns Single row containing:
+ *   - All faculty base fields (faculty_id, first_name, last_name, biography, etc.)
+ *   - emails: Comma-separated list of email addresses (or NULL)
+ *   - phones: Comma-separated list of phone numbers (or NULL)
+ *   - departments: Comma-separated list of department names (or NULL)
+ *   - titles: Comma-separated list of titles (or NULL)
+ *   - institution_name: Name of the most recent institution (or NULL)
+ * 
+ * @throws SQLSTATE '45000' if faculty_id is NULL
+ * 
+ * Developer: Owen Leitzell
+ * Created for query optimization assignment
+ */
+DROP PROCEDURE IF EXISTS read_faculty_complete_optimized$$
+CREATE PROCEDURE read_faculty_complete_optimized (
+    IN p_faculty_id CHAR(36)
+)
+BEGIN
+    -- Validate that faculty_id is provided
+    IF p_faculty_id IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'faculty_id is required';
+    END IF;
+
+    -- Single optimized query using JOINs and GROUP_CONCAT
+    SELECT 
+        -- Base faculty fields
+        f.faculty_id,
+        f.first_name,
+        f.last_name,
+        f.biography,
+        f.orcid,
+        f.google_scholar_url,
+        f.research_gate_url,
+        f.scraped_from,
+        
+        -- Aggregated multi-valued fields using GROUP_CONCAT
+        -- DISTINCT removes duplicates, ORDER BY ensures consistent ordering
+        GROUP_CONCAT(DISTINCT fe.email ORDER BY fe.email SEPARATOR ',') AS emails,
+        GROUP_CONCAT(DISTINCT fp.phone_num ORDER BY fp.phone_num SEPARATOR ',') AS phones,
+        GROUP_CONCAT(DISTINCT fd.department_name ORDER BY fd.department_name SEPARATOR ',') AS departments,
+        GROUP_CONCAT(DISTINCT ft.title ORDER BY ft.title SEPARATOR ',') AS titles,
+        
+        -- Most recent institution name using subquery
+        -- Gets the institution name for the most recent start_date
+        (
+            SELECT i.name
+            FROM faculty_works_at_institution fwi
+            INNER JOIN institution i ON fwi.institution_id = i.institution_id
+            WHERE fwi.faculty_id = f.faculty_id
+            ORDER BY fwi.start_date DESC, fwi.end_date IS NULL DESC
+            LIMIT 1
+        ) AS institution_name
+        
+    FROM faculty f
+    
+    -- LEFT JOINs ensure we get faculty even if they have no related records
+    LEFT JOIN faculty_email fe ON f.faculty_id = fe.faculty_id
+    LEFT JOIN faculty_phone fp ON f.faculty_id = fp.faculty_id
+    LEFT JOIN faculty_department fd ON f.faculty_id = fd.faculty_id
+    LEFT JOIN faculty_title ft ON f.faculty_id = ft.faculty_id
+    
+    WHERE f.faculty_id = p_faculty_id
+    
+    -- GROUP BY is required when using aggregate functions
+    GROUP BY 
+        f.faculty_id,
+        f.first_name,
+        f.last_name,
+        f.biography,
+        f.orcid,
+        f.google_scholar_url,
+        f.research_gate_url,
+        f.scraped_from;
+END $$
+
+DELIMITER ;
+
+
+
 -- Source: read/read_faculty_department.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1174,6 +1488,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_department_by_faculty.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1215,6 +1531,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_email.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1242,6 +1560,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_email_by_faculty.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1275,6 +1595,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_follows_faculty.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1305,6 +1627,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_follows_faculty_by_followee.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1346,6 +1670,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_follows_faculty_by_follower.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1387,6 +1713,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_generates_keyword.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1444,6 +1772,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_phone.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1471,6 +1801,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_phone_by_faculty.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1504,6 +1836,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_researches_keyword_by_faculty.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -1539,6 +1873,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_title.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1566,6 +1902,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_title_by_faculty.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1598,6 +1936,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_works_at_institution.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -1626,6 +1966,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_works_at_institution_by_faculty.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -1667,6 +2009,8 @@ DELIMITER ;
 
 -- Source: read/read_faculty_works_at_institution_by_institution.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -1718,6 +2062,8 @@ DELIMITER ;
 
 -- Source: read/read_grants_by_organization.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1764,6 +2110,8 @@ DELIMITER ;
 
 -- Source: read/read_grants_granted_to_faculty_by_faculty.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -1811,6 +2159,8 @@ DELIMITER ;
 
 -- Source: read/read_grants_organization_by_grant.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -1846,6 +2196,8 @@ DELIMITER ;
 
 -- Source: read/read_institution.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -1882,8 +2234,94 @@ END $$
 DELIMITER ;
 
 
+-- Source: read/read_keyword_corpus.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Retrieves the keyword vocabulary, which generated keywords are matched
+ * against, and a sample of faculty biographies the statistical keyword
+ * engine is fit on.
+ *
+ * @param p_limit  Maximum number of biographies to return (0 returns none)
+ *
+ * @returns Two result sets:
+ *   1. name: Every keyword
+ *   2. document: Up to p_limit non-empty biographies
+ *
+ * @throws SQLSTATE '45000' if p_limit is NULL or negative
+ */
+DROP PROCEDURE IF EXISTS read_keyword_corpus$$
+CREATE PROCEDURE read_keyword_corpus(
+    IN p_limit INT
+)
+BEGIN
+    IF p_limit IS NULL OR p_limit < 0 THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'limit must be zero or positive for read_keyword_corpus';
+    END IF;
+
+    SELECT name FROM keyword;
+
+    SELECT f.biography AS document
+    FROM faculty f
+    WHERE f.biography IS NOT NULL AND f.biography <> ''
+    LIMIT p_limit;
+END $$
+
+DELIMITER ;
+
+
+-- Source: read/read_keyword_generation_job.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Retrieves a keyword generation job.
+ * 
+ * @param p_job_id  Required UUID of the job
+ * 
+ * @returns Result set with one row (none if the job doesn't exist):
+ *   - job_id, faculty_id, status, attempts
+ *   - keywords: JSON array of keywords once complete (so far, while running)
+ *   - error: Failure message once failed
+ *   - created_at, started_at, finished_at
+ *   - queue_position: Number of queued jobs ahead of this one (0 unless queued)
+ * 
+ * @throws SQLSTATE '45000' if p_job_id is NULL
+ */
+DROP PROCEDURE IF EXISTS read_keyword_generation_job$$
+CREATE PROCEDURE read_keyword_generation_job(
+    IN p_job_id CHAR(36)
+)
+BEGIN
+    IF p_job_id IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'job_id is required for read_keyword_generation_job';
+    END IF;
+
+    SELECT
+        j.job_id, j.faculty_id, j.status, j.attempts, j.keywords, j.error,
+        j.created_at, j.started_at, j.finished_at,
+        CASE WHEN j.status = 'queued' THEN (
+            SELECT COUNT(*) FROM keyword_generation_job q
+            WHERE q.status = 'queued' AND q.created_at < j.created_at
+        ) ELSE 0 END AS queue_position
+    FROM keyword_generation_job j
+    WHERE j.job_id = p_job_id;
+END $$
+
+DELIMITER ;
+
+
 -- Source: read/read_publication_authored_by_faculty_by_faculty.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -1928,6 +2366,8 @@ DELIMITER ;
 
 -- Source: read/read_publication_explores_keyword_by_publication.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -1961,27 +2401,100 @@ END $$
 DELIMITER ;
 
 
--- Source: read/read_recommendations_for_faculty.sql
+-- Source: read/read_recommendation_run.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Retrieve recommendations for a faculty member.
- * Ordered by recommendation_type (ENUM order = priority).
+ * Retrieve a sharded regeneration run and the progress of each shard.
+ * 
+ * @param p_run_id  Required UUID of the run
+ * 
+ * @returns Two result sets:
+ *   1. The recommendation_run row, with completed_shards and source_count totals
+ *   2. Every recommendation_run_shard row, ordered by shard_index
  */
-DROP PROCEDURE IF EXISTS read_recommendations_for_faculty$$
-CREATE PROCEDURE read_recommendations_for_faculty(IN p_faculty_id CHAR(36))
+DROP PROCEDURE IF EXISTS read_recommendation_run$$
+CREATE PROCEDURE read_recommendation_run(IN p_run_id CHAR(36))
 BEGIN
-    SELECT 
-        f.faculty_id,
-        f.first_name,
-        f.last_name,
-        f.biography,
-        i.name AS institution_name,
-        fd.department_name,
-        r.recommendation_type,
-        CASE r.recommendation_type
-            WHEN 'shared_keyword'           THEN 'Similar research interests'
+    SELECT
+        r.run_id,
+        r.status,
+        r.shard_count,
+        r.started_at,
+        r.finished_at,
+        COALESCE(SUM(s.status = 'complete'), 0) AS completed_shards,
+        COALESCE(SUM(s.source_count), 0) AS source_count
+    FROM recommendation_run r
+    LEFT JOIN recommendation_run_shard s ON s.run_id = r.run_id
+    WHERE r.run_id = p_run_id
+    GROUP BY r.run_id;
+
+    SELECT shard_index, status, source_count, error, started_at, finished_at
+    FROM recommendation_run_shard
+    WHERE run_id = p_run_id
+    ORDER BY shard_index;
+END $$
+
+DELIMITER ;
+
+
+-- Source: read/read_recommendations_for_faculty.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Retrieve recommendations for a faculty member.
+ * Ordered by match_score (highest first), then recommendation_type priority,
+ * then target faculty_id, so pages can continue from the last row returned.
+ * Returns at most p_limit rows (all stored rows when NULL).
+ * recommendation_reasons lists every reason for the match, comma separated in
+ * priority order; recommendation_text describes the primary one.
+ *
+ * Reads the denormalized faculty_recommendation_display table, which is
+ * rebuilt whenever the faculty member's recommendations are generated.
+ *
+ * @param p_faculty_id        Required UUID of the source faculty member
+ * @param p_limit             Optional maximum number of rows
+ * @param p_type              Optional recommendation_type to filter on (primary type)
+ * @param p_after_score       Optional match_score of the last row of the previous page
+ * @param p_after_type_rank   type_rank of the last row of the previous page
+ * @param p_after_faculty_id  faculty_id of the last row of the previous page
+ * @param p_compact           When TRUE, biography is returned as NULL
+ *
+ * @returns Result set containing the display columns plus type_rank
+ *   (recommendation_type priority, 1 = highest) for building the next cursor
+ */
+DROP PROCEDURE IF EXISTS read_recommendations_for_faculty$$
+CREATE PROCEDURE read_recommendations_for_faculty(
+    IN p_faculty_id CHAR(36),
+    IN p_limit INT,
+    IN p_type VARCHAR(32),
+    IN p_after_score DECIMAL(5,4),
+    IN p_after_type_rank TINYINT UNSIGNED,
+    IN p_after_faculty_id CHAR(36),
+    IN p_compact BOOLEAN
+)
+BEGIN
+    DECLARE v_limit INT DEFAULT COALESCE(p_limit, recommendation_top_k());
+
+    SELECT
+        d.target_faculty_id AS faculty_id,
+        d.first_name,
+        d.last_name,
+        IF(p_compact, NULL, d.biography_snippet) AS biography,
+        d.institution_name,
+        d.department_name,
+        d.match_score,
+        d.recommendation_type,
+        d.recommendation_type + 0 AS type_rank,
+        CAST(d.recommendation_reasons AS CHAR) AS recommendation_reasons,
+        CASE d.recommendation_type
+            WHEN 'shared_keyword'           THEN 'Similar research interests'
             WHEN 'keyword_to_publication'   THEN 'Published in your research area'
             WHEN 'publication_to_keyword'   THEN 'Researches your publication topics'
             WHEN 'keyword_to_grant'         THEN 'Has funding in your research area'
@@ -1992,17 +2505,55 @@ BEGIN
             WHEN 'shared_department'        THEN 'Same department'
             ELSE 'Potential collaborator'
         END AS recommendation_text
-    FROM faculty_recommended_to_faculty r
-    JOIN faculty f ON r.target_faculty_id = f.faculty_id
-    LEFT JOIN faculty_works_at_institution fwi ON f.faculty_id = fwi.faculty_id AND fwi.end_date IS NULL
-    LEFT JOIN institution i ON fwi.institution_id = i.institution_id
-    LEFT JOIN (
-        SELECT faculty_id, MIN(department_name) AS department_name
-        FROM faculty_department
-        GROUP BY faculty_id
-    ) fd ON f.faculty_id = fd.faculty_id
-    WHERE r.source_faculty_id = p_faculty_id
-    ORDER BY r.recommendation_type ASC;
+    FROM faculty_recommendation_display d
+    WHERE d.source_faculty_id = p_faculty_id
+      AND (p_type IS NULL OR d.recommendation_type = p_type)
+      -- Keyset: rows strictly after (p_after_score, p_after_type_rank, p_after_faculty_id)
+      AND (
+          p_after_score IS NULL
+          OR d.match_score < p_after_score
+          OR (d.match_score = p_after_score AND d.recommendation_type + 0 > p_after_type_rank)
+          OR (d.match_score = p_after_score AND d.recommendation_type + 0 = p_after_type_rank
+              AND d.target_faculty_id > p_after_faculty_id)
+      )
+    ORDER BY d.match_score DESC, d.recommendation_type ASC, d.target_faculty_id ASC
+    LIMIT v_limit;
+END $$
+
+DELIMITER ;
+
+
+-- Source: read/read_scheduled_job_runs.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Retrieves the most recent scheduler job runs, newest first.
+ * 
+ * @param p_job_name  Optional job name to filter on (all jobs when NULL)
+ * @param p_limit     Optional maximum number of runs (default 20)
+ * 
+ * @returns Result set containing:
+ *   - run_id, job_name, host, triggered_by, status
+ *   - started_at, finished_at, duration_ms, row_count, error
+ */
+DROP PROCEDURE IF EXISTS read_scheduled_job_runs$$
+CREATE PROCEDURE read_scheduled_job_runs(
+    IN p_job_name VARCHAR(64),
+    IN p_limit INT
+)
+BEGIN
+    DECLARE v_limit INT DEFAULT COALESCE(p_limit, 20);
+
+    SELECT
+        run_id, job_name, host, triggered_by, status,
+        started_at, finished_at, duration_ms, row_count, error
+    FROM scheduled_job_run
+    WHERE p_job_name IS NULL OR job_name = p_job_name
+    ORDER BY started_at DESC
+    LIMIT v_limit;
 END $$
 
 DELIMITER ;
@@ -2010,6 +2561,8 @@ DELIMITER ;
 
 -- Source: read/read_session.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -2047,6 +2600,8 @@ DELIMITER ;
 
 -- Source: read/read_session_by_faculty.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -2096,6 +2651,8 @@ DELIMITER ;
 
 -- Source: read/read_session_by_token_hash.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -2147,6 +2704,8 @@ DELIMITER ;
 
 -- Source: update/update_equipment.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -2224,6 +2783,8 @@ DELIMITER ;
 
 -- Source: update/update_faculty.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -2303,6 +2864,8 @@ DELIMITER ;
 
 -- Source: update/update_faculty_department.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -2363,8 +2926,51 @@ END $$
 
 DELIMITER ;
 
+-- Source: update/update_faculty_department_key.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Backfills faculty_department.department_key.
+ * 
+ * The faculty_department_key triggers set department_key on every insert and
+ * update. Run this once for rows written before the column existed, or after
+ * changing normalize_department_name, to recompute keys that are missing or
+ * out of date. Rows are updated in batches of 5,000.
+ * 
+ * @returns Result set containing:
+ *   - updated_count: Number of rows whose department_key was changed
+ */
+DROP PROCEDURE IF EXISTS update_faculty_department_key$$
+CREATE PROCEDURE update_faculty_department_key()
+BEGIN
+    DECLARE v_batch_size INT DEFAULT 5000;
+    DECLARE v_updated INT DEFAULT 0;
+    DECLARE v_updated_count INT DEFAULT 0;
+
+    REPEAT
+        -- The BEFORE UPDATE trigger recomputes the key from department_name
+        UPDATE faculty_department
+        SET department_key = normalize_department_name(department_name)
+        WHERE department_key IS NULL
+           OR department_key <> normalize_department_name(department_name)
+        LIMIT v_batch_size;
+        SET v_updated = ROW_COUNT();
+        SET v_updated_count = v_updated_count + v_updated;
+    UNTIL v_updated < v_batch_size END REPEAT;
+
+    SELECT v_updated_count AS updated_count;
+END $$
+
+DELIMITER ;
+
+
 -- Source: update/update_faculty_email.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -2413,6 +3019,8 @@ DELIMITER ;
 
 -- Source: update/update_faculty_generates_keyword.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -2470,6 +3078,8 @@ DELIMITER ;
 
 -- Source: update/update_faculty_phone.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -2526,6 +3136,8 @@ DELIMITER ;
 
 -- Source: update/update_faculty_title.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -2582,6 +3194,8 @@ DELIMITER ;
 
 -- Source: update/update_faculty_works_at_institution.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -2654,6 +3268,8 @@ DELIMITER ;
 
 -- Source: update/update_grants.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -2701,6 +3317,8 @@ DELIMITER ;
 
 -- Source: update/update_grants_organization.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -2738,6 +3356,8 @@ DELIMITER ;
 
 -- Source: update/update_institution.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -2813,6 +3433,8 @@ DELIMITER ;
 
 -- Source: update/update_keyword.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -2854,8 +3476,60 @@ END $$
 DELIMITER ;
 
 
+-- Source: update/update_keyword_generation_job.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Records the outcome of a claimed keyword generation job, or the keywords
+ * it has generated so far while it is still running.
+ * 
+ * Only the claim that is still current can update a job, so a worker that was
+ * presumed dead (and whose jobs were claimed again) cannot overwrite them.
+ * 
+ * @param p_job_id    Required UUID of the job
+ * @param p_claim_id  Required claim returned by claim_keyword_generation_jobs
+ * @param p_status    Required 'complete', 'failed', or 'running' (partial keywords)
+ * @param p_keywords  Optional JSON array of generated keywords
+ * @param p_error     Optional error message (truncated to 1024 characters)
+ * 
+ * @returns No result set.
+ * 
+ * @throws SQLSTATE '45000' if job_id, claim_id or status is NULL
+ */
+DROP PROCEDURE IF EXISTS update_keyword_generation_job$$
+CREATE PROCEDURE update_keyword_generation_job(
+    IN p_job_id CHAR(36),
+    IN p_claim_id CHAR(36),
+    IN p_status VARCHAR(16),
+    IN p_keywords JSON,
+    IN p_error TEXT
+)
+BEGIN
+    IF p_job_id IS NULL OR p_claim_id IS NULL OR p_status IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'job_id, claim_id and status are required for update_keyword_generation_job';
+    END IF;
+
+    UPDATE keyword_generation_job
+    SET status = p_status,
+        keywords = p_keywords,
+        error = LEFT(p_error, 1024),
+        finished_at = IF(p_status = 'running', NULL, NOW(3))
+    WHERE job_id = p_job_id
+      AND claim_id = p_claim_id
+      AND status = 'running';
+END $$
+
+DELIMITER ;
+
+
 -- Source: update/update_password.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -2919,6 +3593,8 @@ DELIMITER ;
 
 -- Source: update/update_publication.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -3001,8 +3677,60 @@ END $$
 DELIMITER ;
 
 
+-- Source: update/update_scheduled_job_run.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Records the outcome of a scheduler job run.
+ * 
+ * @param p_run_id       Required UUID of the run
+ * @param p_status       Required 'complete' or 'failed'
+ * @param p_duration_ms  Required wall time of the job in milliseconds
+ * @param p_row_count    Optional number of rows the job affected
+ * @param p_error        Optional error message (truncated to 1024 characters)
+ * 
+ * @returns No result set.
+ * 
+ * @throws SQLSTATE '45000' if run_id or status is NULL, or the run doesn't exist
+ */
+DROP PROCEDURE IF EXISTS update_scheduled_job_run$$
+CREATE PROCEDURE update_scheduled_job_run(
+    IN p_run_id CHAR(36),
+    IN p_status VARCHAR(16),
+    IN p_duration_ms INT UNSIGNED,
+    IN p_row_count INT UNSIGNED,
+    IN p_error TEXT
+)
+BEGIN
+    IF p_run_id IS NULL OR p_status IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'run_id and status are required';
+    END IF;
+
+    UPDATE scheduled_job_run
+    SET status = p_status,
+        finished_at = NOW(3),
+        duration_ms = p_duration_ms,
+        row_count = p_row_count,
+        error = LEFT(p_error, 1024)
+    WHERE run_id = p_run_id;
+
+    IF ROW_COUNT() = 0 THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Scheduled job run not found';
+    END IF;
+END $$
+
+DELIMITER ;
+
+
 -- Source: update/update_session.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -3066,6 +3794,8 @@ DELIMITER ;
 
 -- Source: delete/delete_equipment.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -3103,6 +3833,8 @@ DELIMITER ;
 
 -- Source: delete/delete_faculty.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -3134,6 +3866,8 @@ DELIMITER ;
 
 -- Source: delete/delete_faculty_department.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -3189,6 +3923,8 @@ DELIMITER ;
 
 -- Source: delete/delete_faculty_email.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -3221,6 +3957,8 @@ DELIMITER ;
 
 -- Source: delete/delete_faculty_follows_faculty.sql
 
+-- Written by Clayton Durepos, Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -3276,6 +4014,8 @@ DELIMITER ;
 
 -- Source: delete/delete_faculty_generates_keyword.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -3309,6 +4049,8 @@ DELIMITER ;
 
 -- Source: delete/delete_faculty_phone.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -3349,6 +4091,8 @@ DELIMITER ;
 
 -- Source: delete/delete_faculty_researches_keyword.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -3384,6 +4128,8 @@ DELIMITER ;
 
 -- Source: delete/delete_faculty_title.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -3423,6 +4169,8 @@ DELIMITER ;
 
 -- Source: delete/delete_faculty_works_at_institution.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -3474,6 +4222,8 @@ DELIMITER ;
 
 -- Source: delete/delete_faculty_works_at_institution_by_faculty.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -3516,6 +4266,8 @@ DELIMITER ;
 
 -- Source: delete/delete_grants.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -3549,6 +4301,8 @@ DELIMITER ;
 
 -- Source: delete/delete_institution.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -3587,6 +4341,8 @@ DELIMITER ;
 
 -- Source: delete/delete_keyword.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -3620,6 +4376,8 @@ DELIMITER ;
 
 -- Source: delete/delete_publication.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -3654,6 +4412,8 @@ DELIMITER ;
 
 -- Source: delete/delete_publication_authored_by_faculty.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -3688,6 +4448,8 @@ DELIMITER ;
 
 -- Source: delete/delete_publication_explores_keyword.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -3727,6 +4489,8 @@ DELIMITER ;
 
 -- Source: workflow/add_keyword_for_faculty.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -3805,6 +4569,8 @@ DELIMITER ;
 
 -- Source: workflow/add_keyword_for_publication.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -3884,6 +4650,8 @@ DELIMITER ;
 
 -- Source: workflow/add_publication_for_faculty.sql
 
+-- Written by Owen Leitzell
+
 DELIMITER $$
 
 /**
@@ -3956,8 +4724,79 @@ END $$
 DELIMITER ;
 
 
+-- Source: workflow/claim_keyword_generation_jobs.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Claims the oldest queued keyword generation jobs for one worker batch.
+ * 
+ * Claimed jobs are marked running under p_claim_id and returned with the
+ * faculty biography, so the worker needs no further reads. Jobs left running
+ * longer than p_stale_seconds (their worker stopped) are claimed again, and
+ * failed once they have been attempted p_max_attempts times.
+ * 
+ * @param p_claim_id       Required UUID identifying this batch
+ * @param p_limit          Required maximum number of jobs to claim
+ * @param p_stale_seconds  Required seconds after which a running job is presumed abandoned
+ * @param p_max_attempts   Required attempts after which an abandoned job fails
+ * 
+ * @returns Result set containing the claimed jobs, oldest first:
+ *   - job_id, faculty_id, biography
+ * 
+ * @throws SQLSTATE '45000' if any parameter is NULL
+ */
+DROP PROCEDURE IF EXISTS claim_keyword_generation_jobs$$
+CREATE PROCEDURE claim_keyword_generation_jobs(
+    IN p_claim_id CHAR(36),
+    IN p_limit INT,
+    IN p_stale_seconds INT,
+    IN p_max_attempts INT
+)
+BEGIN
+    DECLARE v_stale_before DATETIME(3);
+
+    IF p_claim_id IS NULL OR p_limit IS NULL OR p_stale_seconds IS NULL OR p_max_attempts IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'claim_id, limit, stale_seconds and max_attempts are required for claim_keyword_generation_jobs';
+    END IF;
+
+    SET v_stale_before = NOW(3) - INTERVAL p_stale_seconds SECOND;
+
+    UPDATE keyword_generation_job
+    SET status = 'failed',
+        error = 'Keyword generation did not finish',
+        finished_at = NOW(3)
+    WHERE status = 'running'
+      AND started_at < v_stale_before
+      AND attempts >= p_max_attempts;
+
+    UPDATE keyword_generation_job
+    SET status = 'running',
+        claim_id = p_claim_id,
+        attempts = attempts + 1,
+        started_at = NOW(3)
+    WHERE status = 'queued'
+       OR (status = 'running' AND started_at < v_stale_before)
+    ORDER BY created_at
+    LIMIT p_limit;
+
+    SELECT j.job_id, j.faculty_id, f.biography
+    FROM keyword_generation_job j
+    JOIN faculty f ON f.faculty_id = j.faculty_id
+    WHERE j.claim_id = p_claim_id
+    ORDER BY j.created_at;
+END $$
+
+DELIMITER ;
+
+
 -- Source: workflow/clean/clean_faculty_generates_keyword.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -3968,12 +4807,18 @@ DELIMITER $$
  * database by removing records that are no longer relevant for rate limiting
  * purposes (e.g., records older than 1 hour, 1 day, etc.).
  * 
+ * The table is partitioned by hour of generated_at, so whole partitions older
+ * than the cutoff are dropped and partitions for the next day are created
+ * (see rotate_time_partitions). Records in the hour straddling the cutoff are
+ * kept until the next run.
+ * 
  * @param p_cutoff_datetime  Required datetime threshold
- *                           All records with generated_at older than this
- *                           datetime will be deleted
+ *                           Records with generated_at older than this
+ *                           datetime are deleted
  * 
  * @returns Result set containing:
- *   - deleted_count: Number of records that were deleted
+ *   - deleted_count: Number of records that were deleted (estimated for
+ *     dropped partitions)
  *   - cutoff_datetime: The datetime threshold that was used
  *   - action: Status message ('cleaned')
  * 
@@ -3994,7 +4839,7 @@ CREATE PROCEDURE clean_faculty_generates_keyword(
     IN p_cutoff_datetime DATETIME
 )
 BEGIN
-    DECLARE v_deleted_count INT DEFAULT 0;
+    DECLARE v_deleted_count BIGINT DEFAULT 0;
 
     -- Validate that cutoff datetime is provided
     IF p_cutoff_datetime IS NULL THEN
@@ -4002,12 +4847,15 @@ BEGIN
             SET MESSAGE_TEXT = 'cutoff_datetime is required for clean_faculty_generates_keyword';
     END IF;
 
-    -- Delete records older than the cutoff datetime
-    DELETE FROM faculty_generates_keyword
-    WHERE generated_at < p_cutoff_datetime;
-
-    -- Get the count of deleted records
-    SET v_deleted_count = ROW_COUNT();
+    -- Drop hourly partitions older than the cutoff and create the next day's
+    CALL rotate_time_partitions(
+        'faculty_generates_keyword',
+        'generated_at',
+        1,
+        p_cutoff_datetime,
+        p_cutoff_datetime + INTERVAL 1 DAY,
+        v_deleted_count
+    );
 
     -- Return summary of the cleanup operation
     SELECT 
@@ -4020,8 +4868,59 @@ DELIMITER ;
 
 
 
+-- Source: workflow/clean/clean_keyword_generation_job.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Deletes old keyword generation jobs.
+ * 
+ * Finished jobs are kept for clients to read their result until the cutoff.
+ * Jobs still queued at the cutoff (no worker picked them up) are deleted too.
+ * 
+ * @param p_cutoff_datetime  Required datetime threshold. Jobs that finished,
+ *                           or were queued, before it are deleted
+ * 
+ * @returns Result set containing:
+ *   - deleted_count: Number of jobs deleted
+ *   - cutoff_datetime: The datetime threshold that was used
+ *   - action: Status message ('cleaned')
+ * 
+ * @throws SQLSTATE '45000' if p_cutoff_datetime is NULL
+ */
+DROP PROCEDURE IF EXISTS clean_keyword_generation_job$$
+CREATE PROCEDURE clean_keyword_generation_job(
+    IN p_cutoff_datetime DATETIME
+)
+BEGIN
+    DECLARE v_deleted_count BIGINT DEFAULT 0;
+
+    IF p_cutoff_datetime IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'cutoff_datetime is required for clean_keyword_generation_job';
+    END IF;
+
+    DELETE FROM keyword_generation_job
+    WHERE (status IN ('complete', 'failed') AND finished_at < p_cutoff_datetime)
+       OR (status = 'queued' AND created_at < p_cutoff_datetime);
+
+    SET v_deleted_count = ROW_COUNT();
+
+    SELECT
+        v_deleted_count AS deleted_count,
+        p_cutoff_datetime AS cutoff_datetime,
+        'cleaned' AS action;
+END $$
+
+DELIMITER ;
+
+
 -- Source: workflow/clean/clean_session.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -4029,62 +4928,219 @@ DELIMITER $$
  * 
  * Removes:
  *   - All sessions that have passed their expiration date
- *   - All revoked sessions older than 30 days (for audit trail retention)
+ *   - All revoked sessions older than 30 days (for audit trail retention).
+ *     Sessions last at most 30 days, so these have always expired as well.
+ * 
+ * The session table is partitioned by day of expires_at, so whole partitions
+ * of expired sessions are dropped and partitions for the next 35 days are
+ * created (see rotate_time_partitions). Sessions that expired earlier today
+ * are kept until the next run; reads already ignore them.
  * 
  * This is a maintenance procedure that should be run periodically.
  * 
  * @returns Result set containing:
- *   - deleted_count: Number of sessions deleted
+ *   - deleted_count: Number of sessions deleted (estimated for dropped partitions)
  */
 DROP PROCEDURE IF EXISTS clean_session$$
 CREATE PROCEDURE clean_session()
 BEGIN
-    DELETE FROM session
-    WHERE expires_at < UTC_TIMESTAMP()
-       OR (revoked = TRUE AND created_at < DATE_SUB(UTC_TIMESTAMP(), INTERVAL 30 DAY));
+    DECLARE v_deleted_count BIGINT DEFAULT 0;
+
+    CALL rotate_time_partitions(
+        'session',
+        'expires_at',
+        24,
+        UTC_TIMESTAMP(),
+        UTC_TIMESTAMP() + INTERVAL 35 DAY,
+        v_deleted_count
+    );
     
-    SELECT ROW_COUNT() AS deleted_count;
+    SELECT v_deleted_count AS deleted_count;
 END $$
 
 DELIMITER ;
 
 
+-- Source: workflow/clean/rotate_time_partitions.sql
 
--- Source: workflow/count_faculty_keyword_generations.sql
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Counts keyword generation records for a faculty member after a specified datetime.
- * 
- * This workflow procedure is used for rate limiting by checking how many times
- * a faculty member has requested keyword generation within a specific time period.
- * Returns the count of records where generated_at is greater than or equal to
- * the provided datetime threshold.
- * 
- * @param p_faculty_id      Required UUID of the faculty member to check
- * @param p_since_datetime  Required datetime threshold
- *                          Counts all records with generated_at >= this datetime
- * 
- * @returns Result set containing:
- *   - faculty_id: UUID of the faculty member
- *   - generation_count: Number of generation records since the datetime
- *   - since_datetime: The datetime threshold that was used
- * 
- * @throws SQLSTATE '45000' if p_faculty_id or p_since_datetime is NULL
- * 
- * Example usage:
- *   -- Count generations in the last hour
- *   CALL count_faculty_keyword_generations('faculty-uuid', DATE_SUB(NOW(), INTERVAL 1 HOUR));
- *   
- *   -- Count generations in the last 24 hours
- *   CALL count_faculty_keyword_generations('faculty-uuid', DATE_SUB(NOW(), INTERVAL 24 HOUR));
- *   
- *   -- Count generations since a specific date
- *   CALL count_faculty_keyword_generations('faculty-uuid', '2024-01-01 00:00:00');
- */
-CREATE PROCEDURE count_faculty_keyword_generations(
-    IN p_faculty_id CHAR(36),
+ * Drops expired partitions of a table range partitioned by a DATETIME column
+ * and creates the partitions for upcoming rows.
+ *
+ * The table must be partitioned with RANGE COLUMNS (p_column_name) and end in a
+ * p_future partition (VALUES LESS THAN MAXVALUE). Other partitions are named
+ * pYYYYMMDDHH after their upper bound and each covers p_step_hours.
+ *
+ *   1. Partitions whose upper bound is at or before p_drop_before hold only
+ *      older rows and are dropped (metadata only, no row scan).
+ *   2. Rows older than p_drop_before that landed in p_future while partitions
+ *      were missing are deleted.
+ *   3. p_future is split into new partitions up to p_create_until.
+ *
+ * Rows older than p_drop_before may remain in the partition that straddles it
+ * until a later run drops that partition; readers filter on the column anyway.
+ * Tables that are not partitioned fall back to deleting the old rows.
+ *
+ * ALTER TABLE commits the current transaction implicitly.
+ *
+ * @param p_table_name    Required table to rotate
+ * @param p_column_name   Required DATETIME partitioning column
+ * @param p_step_hours    Required hours covered by each partition (must divide 24)
+ * @param p_drop_before   Required cutoff; rows before it may be removed
+ * @param p_create_until  Required time up to which partitions must exist
+ * @param p_dropped_rows  OUT parameter that receives the number of rows removed.
+ *                        Rows in dropped partitions are counted from InnoDB
+ *                        statistics, so the total is an estimate.
+ *
+ * @throws SQLSTATE '45000' if a required parameter is NULL or invalid
+ */
+DROP PROCEDURE IF EXISTS rotate_time_partitions$$
+CREATE PROCEDURE rotate_time_partitions(
+    IN  p_table_name    VARCHAR(64),
+    IN  p_column_name   VARCHAR(64),
+    IN  p_step_hours    INT,
+    IN  p_drop_before   DATETIME,
+    IN  p_create_until  DATETIME,
+    OUT p_dropped_rows  BIGINT
+)
+BEGIN
+    DECLARE v_drop_list  TEXT;
+    DECLARE v_last_bound DATETIME;
+    DECLARE v_bound      DATETIME;
+    DECLARE v_add_list   TEXT DEFAULT '';
+
+    IF p_table_name IS NULL OR p_column_name IS NULL OR p_drop_before IS NULL OR p_create_until IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'table_name, column_name, drop_before and create_until are required for rotate_time_partitions';
+    END IF;
+
+    IF p_step_hours IS NULL OR p_step_hours <= 0 OR MOD(24, p_step_hours) <> 0 THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'step_hours must divide 24 for rotate_time_partitions';
+    END IF;
+
+    SET p_dropped_rows = 0;
+    SET @rotate_cutoff = p_drop_before;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = p_table_name
+          AND PARTITION_NAME = 'p_future'
+    ) THEN
+        -- Not partitioned (e.g. created before partitioning was added)
+        SET @rotate_sql = CONCAT('DELETE FROM `', p_table_name, '` WHERE `', p_column_name, '` < ?');
+        PREPARE rotate_stmt FROM @rotate_sql;
+        EXECUTE rotate_stmt USING @rotate_cutoff;
+        SET p_dropped_rows = ROW_COUNT();
+        DEALLOCATE PREPARE rotate_stmt;
+    ELSE
+        -- 1. Drop partitions that only hold rows before the cutoff
+        SET SESSION group_concat_max_len = 65535;
+        SELECT
+            GROUP_CONCAT(PARTITION_NAME ORDER BY PARTITION_ORDINAL_POSITION),
+            COALESCE(SUM(TABLE_ROWS), 0)
+        INTO v_drop_list, p_dropped_rows
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = p_table_name
+          AND PARTITION_NAME <> 'p_future'
+          AND CAST(TRIM(BOTH '''' FROM PARTITION_DESCRIPTION) AS DATETIME) <= p_drop_before;
+
+        IF v_drop_list IS NOT NULL THEN
+            SET @rotate_sql = CONCAT('ALTER TABLE `', p_table_name, '` DROP PARTITION ', v_drop_list);
+            PREPARE rotate_stmt FROM @rotate_sql;
+            EXECUTE rotate_stmt;
+            DEALLOCATE PREPARE rotate_stmt;
+        END IF;
+
+        -- 2. Old rows written to p_future while partitions were missing
+        SET @rotate_sql = CONCAT(
+            'DELETE FROM `', p_table_name, '` PARTITION (p_future) WHERE `', p_column_name, '` < ?'
+        );
+        PREPARE rotate_stmt FROM @rotate_sql;
+        EXECUTE rotate_stmt USING @rotate_cutoff;
+        SET p_dropped_rows = p_dropped_rows + ROW_COUNT();
+        DEALLOCATE PREPARE rotate_stmt;
+
+        -- 3. Split p_future up to p_create_until, continuing from the last bound
+        SELECT MAX(CAST(TRIM(BOTH '''' FROM PARTITION_DESCRIPTION) AS DATETIME))
+        INTO v_last_bound
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = p_table_name
+          AND PARTITION_NAME <> 'p_future';
+
+        SET v_bound = COALESCE(
+            v_last_bound,
+            TIMESTAMP(DATE(p_drop_before)) + INTERVAL (HOUR(p_drop_before) DIV p_step_hours * p_step_hours) HOUR
+        );
+
+        WHILE v_bound < p_create_until DO
+            SET v_bound = v_bound + INTERVAL p_step_hours HOUR;
+            SET v_add_list = CONCAT(
+                v_add_list,
+                'PARTITION p', DATE_FORMAT(v_bound, '%Y%m%d%H'),
+                ' VALUES LESS THAN (''', DATE_FORMAT(v_bound, '%Y-%m-%d %H:%i:%s'), '''), '
+            );
+        END WHILE;
+
+        IF v_add_list <> '' THEN
+            SET @rotate_sql = CONCAT(
+                'ALTER TABLE `', p_table_name, '` REORGANIZE PARTITION p_future INTO (',
+                v_add_list, 'PARTITION p_future VALUES LESS THAN (MAXVALUE))'
+            );
+            PREPARE rotate_stmt FROM @rotate_sql;
+            EXECUTE rotate_stmt;
+            DEALLOCATE PREPARE rotate_stmt;
+        END IF;
+    END IF;
+END $$
+
+DELIMITER ;
+
+
+-- Source: workflow/count_faculty_keyword_generations.sql
+
+-- Written by Aidan Bell
+
+DELIMITER $$
+
+/**
+ * Counts keyword generation records for a faculty member after a specified datetime.
+ * 
+ * This workflow procedure is used for rate limiting by checking how many times
+ * a faculty member has requested keyword generation within a specific time period.
+ * Returns the count of records where generated_at is greater than or equal to
+ * the provided datetime threshold.
+ * 
+ * @param p_faculty_id      Required UUID of the faculty member to check
+ * @param p_since_datetime  Required datetime threshold
+ *                          Counts all records with generated_at >= this datetime
+ * 
+ * @returns Result set containing:
+ *   - faculty_id: UUID of the faculty member
+ *   - generation_count: Number of generation records since the datetime
+ *   - since_datetime: The datetime threshold that was used
+ * 
+ * @throws SQLSTATE '45000' if p_faculty_id or p_since_datetime is NULL
+ * 
+ * Example usage:
+ *   -- Count generations in the last hour
+ *   CALL count_faculty_keyword_generations('faculty-uuid', DATE_SUB(NOW(), INTERVAL 1 HOUR));
+ *   
+ *   -- Count generations in the last 24 hours
+ *   CALL count_faculty_keyword_generations('faculty-uuid', DATE_SUB(NOW(), INTERVAL 24 HOUR));
+ *   
+ *   -- Count generations since a specific date
+ *   CALL count_faculty_keyword_generations('faculty-uuid', '2024-01-01 00:00:00');
+ */
+CREATE PROCEDURE count_faculty_keyword_generations(
+    IN p_faculty_id CHAR(36),
     IN p_since_datetime DATETIME,
     OUT p_generation_count INT
 )
@@ -4111,410 +5167,1038 @@ DELIMITER ;
 
 
 
--- Source: workflow/recommend/generate_all_recommendations.sql
+-- Source: workflow/login_and_create_session.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Generate recommendations for all registered users.
- * Runs lowest-to-highest priority so higher priority types overwrite.
- * 
- * Priority (ENUM order):
- *   1. shared_keyword          | 5. grant_to_keyword
- *   2. keyword_to_publication  | 6. grant_to_publication
- *   3. publication_to_keyword  | 7. publication_to_grant
- *   4. keyword_to_grant        | 8. shared_grant
- *                              | 9. shared_department
+ * Logs a user in with a single call: validates the credentials (updating
+ * last_login), creates the refresh token session and returns the faculty
+ * profile.
+ *
+ * Credentials are checked by validate_login. The session row is only created
+ * and the profile only returned when the login succeeds.
+ *
+ * @param p_username    Required username to authenticate
+ * @param p_password    Required password (plain text, will be hashed for comparison)
+ * @param p_session_id  Required UUID for the new session
+ * @param p_token_hash  Required SHA-256 hash of the new refresh token
+ * @param p_expires_at  Required session expiration (UTC)
+ * @param p_faculty_id  OUT parameter that receives the faculty_id if login succeeds
+ * @param p_status_code OUT parameter with the validate_login status code:
+ *                      0 = success, 1 = invalid password, 2 = username not found
+ *
+ * @returns On success, one row with a faculty JSON object holding the faculty
+ *   columns plus emails, phones, departments and titles arrays. No result set
+ *   otherwise.
+ *
+ * @throws SQLSTATE '45000' if a required parameter is NULL
  */
-DROP PROCEDURE IF EXISTS generate_all_recommendations$$
-CREATE PROCEDURE generate_all_recommendations()
+DROP PROCEDURE IF EXISTS login_and_create_session$$
+CREATE PROCEDURE login_and_create_session(
+    IN  p_username      VARCHAR(255),
+    IN  p_password      VARCHAR(255),
+    IN  p_session_id    CHAR(36),
+    IN  p_token_hash    VARCHAR(64),
+    IN  p_expires_at    DATETIME,
+    OUT p_faculty_id    CHAR(36),
+    OUT p_status_code   TINYINT
+)
 BEGIN
-    CALL recommend_by_shared_department();
-    CALL recommend_by_shared_grant();
-    CALL recommend_by_publication_to_grant();
-    CALL recommend_by_grant_to_publication();
-    CALL recommend_by_grant_to_keyword();
-    CALL recommend_by_keyword_to_grant();
-    CALL recommend_by_publication_to_keyword();
-    CALL recommend_by_keyword_to_publication();
-    CALL recommend_by_shared_keyword();
+    CALL validate_login(p_username, p_password, p_faculty_id, p_status_code);
+
+    IF p_status_code = 0 THEN
+        CALL create_session(p_session_id, p_faculty_id, p_token_hash, p_expires_at);
+
+        SELECT JSON_OBJECT(
+            'faculty_id',         f.faculty_id,
+            'first_name',         f.first_name,
+            'last_name',          f.last_name,
+            'biography',          f.biography,
+            'orcid',              f.orcid,
+            'google_scholar_url', f.google_scholar_url,
+            'research_gate_url',  f.research_gate_url,
+            'scraped_from',       f.scraped_from,
+            'emails', COALESCE(
+                (SELECT JSON_ARRAYAGG(e.email) FROM faculty_email e
+                 WHERE e.faculty_id = f.faculty_id AND e.email IS NOT NULL),
+                JSON_ARRAY()),
+            'phones', COALESCE(
+                (SELECT JSON_ARRAYAGG(p.phone_num) FROM faculty_phone p
+                 WHERE p.faculty_id = f.faculty_id AND p.phone_num IS NOT NULL),
+                JSON_ARRAY()),
+            'departments', COALESCE(
+                (SELECT JSON_ARRAYAGG(d.department_name) FROM faculty_department d
+                 WHERE d.faculty_id = f.faculty_id AND d.department_name IS NOT NULL),
+                JSON_ARRAY()),
+            'titles', COALESCE(
+                (SELECT JSON_ARRAYAGG(t.title) FROM faculty_title t
+                 WHERE t.faculty_id = f.faculty_id AND t.title IS NOT NULL),
+                JSON_ARRAY())
+        ) AS faculty
+        FROM faculty f
+        WHERE f.faculty_id = p_faculty_id;
+    END IF;
 END $$
 
 DELIMITER ;
 
 
--- Source: workflow/recommend/generate_recommendations_for_faculty.sql
+-- Source: workflow/recommend/finish_recommendation_run.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Generate recommendations for a single faculty member (called on signup).
+ * Close a sharded regeneration run.
+ * 
+ * Marks the run complete when every shard is complete and clears the change log
+ * entries the run covered; otherwise marks it failed so it can be resumed.
+ * 
+ * @param p_run_id  Required UUID of the run
+ * 
+ * @returns No result set. Use read_recommendation_run to read the outcome.
  */
-DROP PROCEDURE IF EXISTS generate_recommendations_for_faculty$$
-CREATE PROCEDURE generate_recommendations_for_faculty(IN p_faculty_id CHAR(36))
+DROP PROCEDURE IF EXISTS finish_recommendation_run$$
+CREATE PROCEDURE finish_recommendation_run(IN p_run_id CHAR(36))
 BEGIN
-    IF NOT EXISTS (SELECT 1 FROM credentials WHERE faculty_id = p_faculty_id) THEN
-        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Faculty must have credentials';
+    DECLARE v_unfinished INT;
+    DECLARE v_max_change_id BIGINT UNSIGNED;
+
+    SELECT COUNT(*) INTO v_unfinished
+    FROM recommendation_run_shard
+    WHERE run_id = p_run_id AND status <> 'complete';
+
+    SELECT max_change_id INTO v_max_change_id
+    FROM recommendation_run
+    WHERE run_id = p_run_id;
+
+    UPDATE recommendation_run
+    SET status = IF(v_unfinished = 0, 'complete', 'failed'),
+        finished_at = NOW()
+    WHERE run_id = p_run_id;
+
+    IF v_unfinished = 0 AND v_max_change_id IS NOT NULL THEN
+        DELETE FROM recommendation_change_log WHERE change_id <= v_max_change_id;
     END IF;
+END $$
 
-    INSERT INTO faculty_recommended_to_faculty (source_faculty_id, target_faculty_id, recommendation_type, created_at)
-    SELECT DISTINCT p_faculty_id, fd2.faculty_id, 'shared_department', NOW()
-    FROM faculty_department fd1
-    JOIN faculty_department fd2 ON normalize_department_name(fd1.department_name) = normalize_department_name(fd2.department_name)
-    WHERE fd1.faculty_id = p_faculty_id AND fd2.faculty_id <> p_faculty_id
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+DELIMITER ;
 
-    INSERT INTO faculty_recommended_to_faculty (source_faculty_id, target_faculty_id, recommendation_type, created_at)
-    SELECT DISTINCT p_faculty_id, ggf2.faculty_id, 'shared_grant', NOW()
-    FROM grants_granted_to_faculty ggf1
-    JOIN grants_granted_to_faculty ggf2 ON ggf1.grant_id = ggf2.grant_id
-    WHERE ggf1.faculty_id = p_faculty_id AND ggf2.faculty_id <> p_faculty_id
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
 
-    INSERT INTO faculty_recommended_to_faculty (source_faculty_id, target_faculty_id, recommendation_type, created_at)
-    SELECT DISTINCT p_faculty_id, ggf.faculty_id, 'publication_to_grant', NOW()
-    FROM publication_authored_by_faculty paf
-    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
-    JOIN grants_for_keyword gfk ON LOWER(TRIM(pek.name)) = LOWER(TRIM(gfk.name))
-    JOIN grants_granted_to_faculty ggf ON gfk.grant_id = ggf.grant_id
-    WHERE paf.faculty_id = p_faculty_id AND ggf.faculty_id <> p_faculty_id
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+-- Source: workflow/recommend/generate_all_recommendations.sql
 
-    INSERT INTO faculty_recommended_to_faculty (source_faculty_id, target_faculty_id, recommendation_type, created_at)
-    SELECT DISTINCT p_faculty_id, paf.faculty_id, 'grant_to_publication', NOW()
-    FROM grants_granted_to_faculty ggf
-    JOIN grants_for_keyword gfk ON ggf.grant_id = gfk.grant_id
-    JOIN publication_explores_keyword pek ON LOWER(TRIM(gfk.name)) = LOWER(TRIM(pek.name))
-    JOIN publication_authored_by_faculty paf ON pek.publication_id = paf.publication_id
-    WHERE ggf.faculty_id = p_faculty_id AND paf.faculty_id <> p_faculty_id
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+-- Written by Clayton Durepos
 
-    INSERT INTO faculty_recommended_to_faculty (source_faculty_id, target_faculty_id, recommendation_type, created_at)
-    SELECT DISTINCT p_faculty_id, frk.faculty_id, 'grant_to_keyword', NOW()
-    FROM grants_granted_to_faculty ggf
-    JOIN grants_for_keyword gfk ON ggf.grant_id = gfk.grant_id
-    JOIN faculty_researches_keyword frk ON LOWER(TRIM(gfk.name)) = LOWER(TRIM(frk.name))
-    WHERE ggf.faculty_id = p_faculty_id AND frk.faculty_id <> p_faculty_id
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+DELIMITER $$
 
-    INSERT INTO faculty_recommended_to_faculty (source_faculty_id, target_faculty_id, recommendation_type, created_at)
-    SELECT DISTINCT p_faculty_id, ggf.faculty_id, 'keyword_to_grant', NOW()
-    FROM faculty_researches_keyword frk
-    JOIN grants_for_keyword gfk ON LOWER(TRIM(frk.name)) = LOWER(TRIM(gfk.name))
-    JOIN grants_granted_to_faculty ggf ON gfk.grant_id = ggf.grant_id
-    WHERE frk.faculty_id = p_faculty_id AND ggf.faculty_id <> p_faculty_id
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+/**
+ * Generate recommendations for all registered users.
+ * Writes every pair once with all of its reasons (see
+ * generate_recommendation_pairs), then scores every pair, keeps the top K per
+ * source, and rebuilds the display table.
+ * 
+ * Every row written by this run is stamped with a new generation epoch. A row
+ * from an older epoch was not produced by this run, meaning the two faculty no
+ * longer share anything, so it is pruned in bounded batches afterwards.
+ * 
+ * Everything runs in the caller's transaction, so the pruned rows stay locked
+ * until it commits. The backend's full rebuild runs the same steps with the
+ * prune in its own short transactions instead (see services/recommend.py);
+ * this procedure is the single-call version for manual use and benchmarks.
+ * Change log entries present when the run starts are covered by the rebuild
+ * and are cleared afterwards.
+ */
+DROP PROCEDURE IF EXISTS generate_all_recommendations$$
+CREATE PROCEDURE generate_all_recommendations()
+BEGIN
+    DECLARE v_max_change_id BIGINT UNSIGNED;
+    DECLARE v_epoch BIGINT UNSIGNED DEFAULT next_recommendation_epoch();
+    DECLARE v_pruned_count INT;
 
-    INSERT INTO faculty_recommended_to_faculty (source_faculty_id, target_faculty_id, recommendation_type, created_at)
-    SELECT DISTINCT p_faculty_id, frk.faculty_id, 'publication_to_keyword', NOW()
-    FROM publication_authored_by_faculty paf
-    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
-    JOIN faculty_researches_keyword frk ON LOWER(TRIM(pek.name)) = LOWER(TRIM(frk.name))
-    WHERE paf.faculty_id = p_faculty_id AND frk.faculty_id <> p_faculty_id
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+    SELECT MAX(change_id) INTO v_max_change_id FROM recommendation_change_log;
 
-    INSERT INTO faculty_recommended_to_faculty (source_faculty_id, target_faculty_id, recommendation_type, created_at)
-    SELECT DISTINCT p_faculty_id, paf.faculty_id, 'keyword_to_publication', NOW()
-    FROM faculty_researches_keyword frk
-    JOIN publication_explores_keyword pek ON LOWER(TRIM(frk.name)) = LOWER(TRIM(pek.name))
-    JOIN publication_authored_by_faculty paf ON pek.publication_id = paf.publication_id
-    WHERE frk.faculty_id = p_faculty_id AND paf.faculty_id <> p_faculty_id
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+    CALL generate_recommendation_pairs(NULL, v_epoch);
+    CALL prune_stale_recommendations(v_epoch, NULL, NULL, v_pruned_count);
+    CALL score_recommendations(NULL);
+    CALL refresh_recommendation_display(NULL);
 
-    INSERT INTO faculty_recommended_to_faculty (source_faculty_id, target_faculty_id, recommendation_type, created_at)
-    SELECT DISTINCT p_faculty_id, frk2.faculty_id, 'shared_keyword', NOW()
-    FROM faculty_researches_keyword frk1
-    JOIN faculty_researches_keyword frk2 ON LOWER(TRIM(frk1.name)) = LOWER(TRIM(frk2.name))
-    WHERE frk1.faculty_id = p_faculty_id AND frk2.faculty_id <> p_faculty_id
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+    IF v_max_change_id IS NOT NULL THEN
+        DELETE FROM recommendation_change_log WHERE change_id <= v_max_change_id;
+    END IF;
 END $$
 
 DELIMITER ;
 
 
--- Source: workflow/recommend/recommend_by_grant_to_keyword.sql
+-- Source: workflow/recommend/generate_incremental_recommendations.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Recommend: source has grant for keyword X, target researches X.
- * Priority: 5 | UI: "Researches your grant topics"
+ * Regenerate recommendations only where inputs changed since the last run.
+ * 
+ * Drains recommendation_change_log up to the newest entry present when the run
+ * starts (changes logged during the run are left for the next one) and resolves
+ * every entry to the faculty whose inputs changed:
+ *   - faculty      -> the faculty member
+ *   - publication  -> its authors
+ *   - grant        -> its holders
+ *   - keyword      -> faculty linked to it directly, via publications, or via grants
+ * 
+ * Recommendations are directional, so a change to faculty C also affects the
+ * reverse edges S -> C. Affected sources are therefore:
+ *   - every changed faculty member
+ *   - faculty sharing a keyword, department, or grant with a changed faculty member
+ *   - faculty who currently recommend a changed faculty member
+ * Each affected source with credentials is regenerated with
+ * generate_recommendations_for_faculty.
+ * 
+ * @returns Result set containing:
+ *   - changed_count: Number of distinct faculty whose inputs changed
+ *   - regenerated_count: Number of source faculty regenerated
  */
-DROP PROCEDURE IF EXISTS recommend_by_grant_to_keyword$$
-CREATE PROCEDURE recommend_by_grant_to_keyword()
+DROP PROCEDURE IF EXISTS generate_incremental_recommendations$$
+CREATE PROCEDURE generate_incremental_recommendations()
 BEGIN
-    INSERT INTO faculty_recommended_to_faculty (
-        source_faculty_id, target_faculty_id, recommendation_type, created_at
-    )
-    SELECT DISTINCT
-        ggf.faculty_id, frk.faculty_id, 'grant_to_keyword', NOW()
-    FROM grants_granted_to_faculty ggf
-    JOIN grants_for_keyword gfk ON ggf.grant_id = gfk.grant_id
-    JOIN faculty_researches_keyword frk ON LOWER(TRIM(gfk.name)) = LOWER(TRIM(frk.name))
-    WHERE ggf.faculty_id <> frk.faculty_id
-      AND EXISTS (SELECT 1 FROM credentials c WHERE c.faculty_id = ggf.faculty_id)
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, 
-                                 VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+    DECLARE v_max_change_id BIGINT UNSIGNED;
+    DECLARE v_changed_count INT DEFAULT 0;
+    DECLARE v_regenerated_count INT DEFAULT 0;
+    DECLARE v_faculty_id CHAR(36);
+    DECLARE v_done BOOLEAN DEFAULT FALSE;
+    DECLARE affected_cursor CURSOR FOR SELECT faculty_id FROM tmp_affected_faculty;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_done = TRUE;
+
+    SELECT MAX(change_id) INTO v_max_change_id FROM recommendation_change_log;
+
+    IF v_max_change_id IS NOT NULL THEN
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_faculty;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_terms;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_departments;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_grants;
+        DROP TEMPORARY TABLE IF EXISTS tmp_affected_faculty;
+
+        CREATE TEMPORARY TABLE tmp_changed_faculty (faculty_id CHAR(36) PRIMARY KEY);
+        CREATE TEMPORARY TABLE tmp_changed_terms (term VARCHAR(64) PRIMARY KEY);
+        CREATE TEMPORARY TABLE tmp_changed_departments (department_key VARCHAR(255) PRIMARY KEY);
+        CREATE TEMPORARY TABLE tmp_changed_grants (grant_id CHAR(36) PRIMARY KEY);
+        CREATE TEMPORARY TABLE tmp_affected_faculty (faculty_id CHAR(36) PRIMARY KEY);
+
+        -- Resolve log entries to the faculty whose inputs changed
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT l.entity_id
+        FROM recommendation_change_log l
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'faculty';
+
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT paf.faculty_id
+        FROM recommendation_change_log l
+        JOIN publication_authored_by_faculty paf ON paf.publication_id = l.entity_id
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'publication';
+
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT ggf.faculty_id
+        FROM recommendation_change_log l
+        JOIN grants_granted_to_faculty ggf ON ggf.grant_id = l.entity_id
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'grant';
+
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT frk.faculty_id
+        FROM recommendation_change_log l
+        JOIN faculty_researches_keyword frk ON frk.name = l.entity_id
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'keyword';
+
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT paf.faculty_id
+        FROM recommendation_change_log l
+        JOIN publication_explores_keyword pek ON pek.name = l.entity_id
+        JOIN publication_authored_by_faculty paf ON paf.publication_id = pek.publication_id
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'keyword';
+
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT ggf.faculty_id
+        FROM recommendation_change_log l
+        JOIN grants_for_keyword gfk ON gfk.name = l.entity_id
+        JOIN grants_granted_to_faculty ggf ON ggf.grant_id = gfk.grant_id
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'keyword';
+
+        SELECT COUNT(*) INTO v_changed_count FROM tmp_changed_faculty;
+
+        -- Collect the current inputs of the changed faculty
+        INSERT IGNORE INTO tmp_changed_terms (term)
+        SELECT LOWER(TRIM(frk.name))
+        FROM tmp_changed_faculty c
+        JOIN faculty_researches_keyword frk ON frk.faculty_id = c.faculty_id;
+
+        INSERT IGNORE INTO tmp_changed_terms (term)
+        SELECT LOWER(TRIM(pek.name))
+        FROM tmp_changed_faculty c
+        JOIN publication_authored_by_faculty paf ON paf.faculty_id = c.faculty_id
+        JOIN publication_explores_keyword pek ON pek.publication_id = paf.publication_id;
+
+        INSERT IGNORE INTO tmp_changed_terms (term)
+        SELECT LOWER(TRIM(gfk.name))
+        FROM tmp_changed_faculty c
+        JOIN grants_granted_to_faculty ggf ON ggf.faculty_id = c.faculty_id
+        JOIN grants_for_keyword gfk ON gfk.grant_id = ggf.grant_id;
+
+        INSERT IGNORE INTO tmp_changed_departments (department_key)
+        SELECT fd.department_key
+        FROM tmp_changed_faculty c
+        JOIN faculty_department fd ON fd.faculty_id = c.faculty_id;
+
+        INSERT IGNORE INTO tmp_changed_grants (grant_id)
+        SELECT ggf.grant_id
+        FROM tmp_changed_faculty c
+        JOIN grants_granted_to_faculty ggf ON ggf.faculty_id = c.faculty_id;
+
+        -- Changed faculty are sources themselves
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT faculty_id FROM tmp_changed_faculty;
+
+        -- Reverse edges: faculty who may gain a recommendation to a changed faculty member
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT frk.faculty_id
+        FROM tmp_changed_terms t
+        JOIN faculty_researches_keyword frk ON LOWER(TRIM(frk.name)) = t.term;
+
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT paf.faculty_id
+        FROM tmp_changed_terms t
+        JOIN publication_explores_keyword pek ON LOWER(TRIM(pek.name)) = t.term
+        JOIN publication_authored_by_faculty paf ON paf.publication_id = pek.publication_id;
+
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT ggf.faculty_id
+        FROM tmp_changed_terms t
+        JOIN grants_for_keyword gfk ON LOWER(TRIM(gfk.name)) = t.term
+        JOIN grants_granted_to_faculty ggf ON ggf.grant_id = gfk.grant_id;
+
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT fd.faculty_id
+        FROM tmp_changed_departments d
+        JOIN faculty_department fd ON fd.department_key = d.department_key;
+
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT ggf.faculty_id
+        FROM tmp_changed_grants g
+        JOIN grants_granted_to_faculty ggf ON ggf.grant_id = g.grant_id;
+
+        -- Reverse edges: faculty who may lose a recommendation to a changed faculty member
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT r.source_faculty_id
+        FROM tmp_changed_faculty c
+        JOIN faculty_recommended_to_faculty r ON r.target_faculty_id = c.faculty_id;
+
+        -- Only registered users receive recommendations
+        DELETE a FROM tmp_affected_faculty a
+        LEFT JOIN credentials cr ON cr.faculty_id = a.faculty_id
+        WHERE cr.faculty_id IS NULL;
+
+        OPEN affected_cursor;
+        regenerate_loop: LOOP
+            FETCH affected_cursor INTO v_faculty_id;
+            IF v_done THEN
+                LEAVE regenerate_loop;
+            END IF;
+
+            CALL generate_recommendations_for_faculty(v_faculty_id);
+            SET v_regenerated_count = v_regenerated_count + 1;
+        END LOOP;
+        CLOSE affected_cursor;
+
+        DELETE FROM recommendation_change_log WHERE change_id <= v_max_change_id;
+
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_faculty;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_terms;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_departments;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_grants;
+        DROP TEMPORARY TABLE IF EXISTS tmp_affected_faculty;
+    END IF;
+
+    SELECT
+        v_changed_count AS changed_count,
+        v_regenerated_count AS regenerated_count;
 END $$
 
 DELIMITER ;
 
 
--- Source: workflow/recommend/recommend_by_grant_to_publication.sql
+-- Source: workflow/recommend/generate_recommendation_pairs.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Recommend: source has grant for keyword X, target published on X.
- * Priority: 6 | UI: "Published on your grant topics"
+ * Write every recommended pair for one source faculty member, or for every
+ * registered user when p_source_faculty_id is NULL, in a single pass.
+ *
+ * Each reason is collected into a temporary table first, then every pair is
+ * written once with all of its reasons in recommendation_reasons and the
+ * highest-priority one in recommendation_type (used for display and ranking).
+ * Rows are stamped with p_epoch; see generate_all_recommendations.
+ *
+ * Reasons (ENUM / SET order, 1 = highest priority):
+ *   1. shared_keyword          | 5. grant_to_keyword
+ *   2. keyword_to_publication  | 6. grant_to_publication
+ *   3. publication_to_keyword  | 7. publication_to_grant
+ *   4. keyword_to_grant        | 8. shared_grant
+ *                              | 9. shared_department
+ *
+ * @param p_source_faculty_id  Optional source faculty member (must have credentials)
+ * @param p_epoch              Generation epoch of the calling run
  */
-DROP PROCEDURE IF EXISTS recommend_by_grant_to_publication$$
-CREATE PROCEDURE recommend_by_grant_to_publication()
+DROP PROCEDURE IF EXISTS generate_recommendation_pairs$$
+CREATE PROCEDURE generate_recommendation_pairs(
+    IN p_source_faculty_id CHAR(36),
+    IN p_epoch BIGINT UNSIGNED
+)
 BEGIN
-    INSERT INTO faculty_recommended_to_faculty (
-        source_faculty_id, target_faculty_id, recommendation_type, created_at
-    )
-    SELECT DISTINCT
-        ggf.faculty_id, paf.faculty_id, 'grant_to_publication', NOW()
-    FROM grants_granted_to_faculty ggf
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_source;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_reason;
+
+    CREATE TEMPORARY TABLE tmp_rec_source (faculty_id CHAR(36) PRIMARY KEY);
+    CREATE TEMPORARY TABLE tmp_rec_reason (
+        source_faculty_id CHAR(36) NOT NULL,
+        target_faculty_id CHAR(36) NOT NULL,
+        reason            TINYINT UNSIGNED NOT NULL,
+        PRIMARY KEY (source_faculty_id, target_faculty_id, reason)
+    );
+
+    -- Only registered users receive recommendations
+    INSERT INTO tmp_rec_source (faculty_id)
+    SELECT faculty_id
+    FROM credentials
+    WHERE p_source_faculty_id IS NULL OR faculty_id = p_source_faculty_id;
+
+    -- 1. Source researches keyword X, target researches X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT frk1.faculty_id, frk2.faculty_id, 1
+    FROM tmp_rec_source s
+    JOIN faculty_researches_keyword frk1 ON frk1.faculty_id = s.faculty_id
+    JOIN faculty_researches_keyword frk2 ON LOWER(TRIM(frk1.name)) = LOWER(TRIM(frk2.name))
+    WHERE frk2.faculty_id <> frk1.faculty_id;
+
+    -- 2. Source researches keyword X, target published on X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT frk.faculty_id, paf.faculty_id, 2
+    FROM tmp_rec_source s
+    JOIN faculty_researches_keyword frk ON frk.faculty_id = s.faculty_id
+    JOIN publication_explores_keyword pek ON LOWER(TRIM(frk.name)) = LOWER(TRIM(pek.name))
+    JOIN publication_authored_by_faculty paf ON pek.publication_id = paf.publication_id
+    WHERE paf.faculty_id <> frk.faculty_id;
+
+    -- 3. Source published on X, target researches X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT paf.faculty_id, frk.faculty_id, 3
+    FROM tmp_rec_source s
+    JOIN publication_authored_by_faculty paf ON paf.faculty_id = s.faculty_id
+    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
+    JOIN faculty_researches_keyword frk ON LOWER(TRIM(pek.name)) = LOWER(TRIM(frk.name))
+    WHERE frk.faculty_id <> paf.faculty_id;
+
+    -- 4. Source researches X, target holds a grant for X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT frk.faculty_id, ggf.faculty_id, 4
+    FROM tmp_rec_source s
+    JOIN faculty_researches_keyword frk ON frk.faculty_id = s.faculty_id
+    JOIN grants_for_keyword gfk ON LOWER(TRIM(frk.name)) = LOWER(TRIM(gfk.name))
+    JOIN grants_granted_to_faculty ggf ON gfk.grant_id = ggf.grant_id
+    WHERE ggf.faculty_id <> frk.faculty_id;
+
+    -- 5. Source holds a grant for X, target researches X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT ggf.faculty_id, frk.faculty_id, 5
+    FROM tmp_rec_source s
+    JOIN grants_granted_to_faculty ggf ON ggf.faculty_id = s.faculty_id
+    JOIN grants_for_keyword gfk ON ggf.grant_id = gfk.grant_id
+    JOIN faculty_researches_keyword frk ON LOWER(TRIM(gfk.name)) = LOWER(TRIM(frk.name))
+    WHERE frk.faculty_id <> ggf.faculty_id;
+
+    -- 6. Source holds a grant for X, target published on X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT ggf.faculty_id, paf.faculty_id, 6
+    FROM tmp_rec_source s
+    JOIN grants_granted_to_faculty ggf ON ggf.faculty_id = s.faculty_id
     JOIN grants_for_keyword gfk ON ggf.grant_id = gfk.grant_id
     JOIN publication_explores_keyword pek ON LOWER(TRIM(gfk.name)) = LOWER(TRIM(pek.name))
     JOIN publication_authored_by_faculty paf ON pek.publication_id = paf.publication_id
-    WHERE ggf.faculty_id <> paf.faculty_id
-      AND EXISTS (SELECT 1 FROM credentials c WHERE c.faculty_id = ggf.faculty_id)
+    WHERE paf.faculty_id <> ggf.faculty_id;
+
+    -- 7. Source published on X, target holds a grant for X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT paf.faculty_id, ggf.faculty_id, 7
+    FROM tmp_rec_source s
+    JOIN publication_authored_by_faculty paf ON paf.faculty_id = s.faculty_id
+    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
+    JOIN grants_for_keyword gfk ON LOWER(TRIM(pek.name)) = LOWER(TRIM(gfk.name))
+    JOIN grants_granted_to_faculty ggf ON gfk.grant_id = ggf.grant_id
+    WHERE ggf.faculty_id <> paf.faculty_id;
+
+    -- 8. Both hold the same grant
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT ggf1.faculty_id, ggf2.faculty_id, 8
+    FROM tmp_rec_source s
+    JOIN grants_granted_to_faculty ggf1 ON ggf1.faculty_id = s.faculty_id
+    JOIN grants_granted_to_faculty ggf2 ON ggf1.grant_id = ggf2.grant_id
+    WHERE ggf2.faculty_id <> ggf1.faculty_id;
+
+    -- 9. Same (normalized) department
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT fd1.faculty_id, fd2.faculty_id, 9
+    FROM tmp_rec_source s
+    JOIN faculty_department fd1 ON fd1.faculty_id = s.faculty_id
+    JOIN faculty_department fd2 ON fd1.department_key = fd2.department_key
+    WHERE fd2.faculty_id <> fd1.faculty_id;
+
+    -- One write per pair. A number stored in an ENUM is its 1-based position and
+    -- a number stored in a SET is its bitmask, so the lowest reason is the
+    -- primary type and BIT_OR of the reason bits is the full set.
+    INSERT INTO faculty_recommended_to_faculty (
+        source_faculty_id, target_faculty_id,
+        recommendation_type, recommendation_reasons,
+        generation_epoch, created_at
+    )
+    SELECT
+        source_faculty_id,
+        target_faculty_id,
+        MIN(reason),
+        BIT_OR(1 << (reason - 1)),
+        p_epoch,
+        NOW()
+    FROM tmp_rec_reason
+    GROUP BY source_faculty_id, target_faculty_id
     ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, 
+        recommendation_type = IF(generation_epoch <= VALUES(generation_epoch),
                                  VALUES(recommendation_type), recommendation_type),
+        recommendation_reasons = IF(generation_epoch <= VALUES(generation_epoch),
+                                    VALUES(recommendation_reasons), recommendation_reasons),
+        generation_epoch = GREATEST(generation_epoch, VALUES(generation_epoch)),
         updated_at = NOW();
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_source;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_reason;
 END $$
 
 DELIMITER ;
 
 
--- Source: workflow/recommend/recommend_by_keyword_to_grant.sql
+-- Source: workflow/recommend/generate_recommendations_for_faculty.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Recommend: source researches keyword X, target has grant for X.
- * Priority: 4 | UI: "Has funding in your research area"
+ * Generate recommendations for a single faculty member (called on signup).
+ * Writes each recommended pair once with all of its reasons (see
+ * generate_recommendation_pairs), stamped with a new generation epoch; the
+ * faculty member's rows from older epochs no longer describe a live
+ * relationship and are pruned. Then scores the results, keeps the top K (see
+ * score_recommendations), and rebuilds the faculty member's display rows.
  */
-DROP PROCEDURE IF EXISTS recommend_by_keyword_to_grant$$
-CREATE PROCEDURE recommend_by_keyword_to_grant()
+DROP PROCEDURE IF EXISTS generate_recommendations_for_faculty$$
+CREATE PROCEDURE generate_recommendations_for_faculty(IN p_faculty_id CHAR(36))
 BEGIN
-    INSERT INTO faculty_recommended_to_faculty (
-        source_faculty_id, target_faculty_id, recommendation_type, created_at
-    )
-    SELECT DISTINCT
-        frk.faculty_id, ggf.faculty_id, 'keyword_to_grant', NOW()
-    FROM faculty_researches_keyword frk
-    JOIN grants_for_keyword gfk ON LOWER(TRIM(frk.name)) = LOWER(TRIM(gfk.name))
-    JOIN grants_granted_to_faculty ggf ON gfk.grant_id = ggf.grant_id
-    WHERE frk.faculty_id <> ggf.faculty_id
-      AND EXISTS (SELECT 1 FROM credentials c WHERE c.faculty_id = frk.faculty_id)
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, 
-                                 VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+    DECLARE v_epoch BIGINT UNSIGNED DEFAULT next_recommendation_epoch();
+    DECLARE v_pruned_count INT;
+
+    IF NOT EXISTS (SELECT 1 FROM credentials WHERE faculty_id = p_faculty_id) THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Faculty must have credentials';
+    END IF;
+
+    CALL generate_recommendation_pairs(p_faculty_id, v_epoch);
+    CALL prune_stale_recommendations(v_epoch, p_faculty_id, NULL, v_pruned_count);
+    CALL score_recommendations(p_faculty_id);
+    CALL refresh_recommendation_display(p_faculty_id);
 END $$
 
 DELIMITER ;
 
 
--- Source: workflow/recommend/recommend_by_keyword_to_publication.sql
+-- Source: workflow/recommend/generate_recommendations_for_shard.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Recommend: source researches keyword X, target published on X.
- * Priority: 2 | UI: "Published in your research area"
+ * Regenerate recommendations for every registered user in one shard of a run.
+ * 
+ * A source faculty member belongs to shard CRC32(faculty_id) % shard_count, so
+ * shard membership is stable across resumes. Each source is regenerated with
+ * generate_recommendations_for_faculty and the shard is marked complete in the
+ * same transaction, so a committed shard never needs to be redone.
+ * 
+ * @param p_run_id       Required UUID of the run
+ * @param p_shard_index  Required shard to process (0 to shard_count - 1)
+ * 
+ * @returns Result set containing:
+ *   - shard_index: The processed shard
+ *   - source_count: Number of source faculty regenerated
+ * 
+ * @throws SQLSTATE '45000' if the run or shard doesn't exist
  */
-DROP PROCEDURE IF EXISTS recommend_by_keyword_to_publication$$
-CREATE PROCEDURE recommend_by_keyword_to_publication()
+DROP PROCEDURE IF EXISTS generate_recommendations_for_shard$$
+CREATE PROCEDURE generate_recommendations_for_shard(
+    IN p_run_id CHAR(36),
+    IN p_shard_index INT
+)
 BEGIN
-    INSERT INTO faculty_recommended_to_faculty (
-        source_faculty_id, target_faculty_id, recommendation_type, created_at
-    )
-    SELECT DISTINCT
-        frk.faculty_id, paf.faculty_id, 'keyword_to_publication', NOW()
-    FROM faculty_researches_keyword frk
-    JOIN publication_explores_keyword pek ON LOWER(TRIM(frk.name)) = LOWER(TRIM(pek.name))
-    JOIN publication_authored_by_faculty paf ON pek.publication_id = paf.publication_id
-    WHERE frk.faculty_id <> paf.faculty_id
-      AND EXISTS (SELECT 1 FROM credentials c WHERE c.faculty_id = frk.faculty_id)
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, 
-                                 VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+    DECLARE v_shard_count INT;
+    DECLARE v_source_count INT DEFAULT 0;
+    DECLARE v_faculty_id CHAR(36);
+    DECLARE v_done BOOLEAN DEFAULT FALSE;
+    DECLARE source_cursor CURSOR FOR
+        SELECT faculty_id
+        FROM credentials
+        WHERE CRC32(faculty_id) % v_shard_count = p_shard_index;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_done = TRUE;
+
+    SELECT r.shard_count INTO v_shard_count
+    FROM recommendation_run r
+    JOIN recommendation_run_shard s ON s.run_id = r.run_id
+    WHERE r.run_id = p_run_id AND s.shard_index = p_shard_index;
+
+    IF v_shard_count IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Recommendation run shard not found';
+    END IF;
+
+    -- The NOT FOUND handler may have fired on the lookup above
+    SET v_done = FALSE;
+
+    OPEN source_cursor;
+    source_loop: LOOP
+        FETCH source_cursor INTO v_faculty_id;
+        IF v_done THEN
+            LEAVE source_loop;
+        END IF;
+
+        CALL generate_recommendations_for_faculty(v_faculty_id);
+        SET v_source_count = v_source_count + 1;
+    END LOOP;
+    CLOSE source_cursor;
+
+    UPDATE recommendation_run_shard
+    SET status = 'complete',
+        source_count = v_source_count,
+        error = NULL,
+        finished_at = NOW()
+    WHERE run_id = p_run_id AND shard_index = p_shard_index;
+
+    SELECT p_shard_index AS shard_index, v_source_count AS source_count;
 END $$
 
 DELIMITER ;
 
 
--- Source: workflow/recommend/recommend_by_publication_to_grant.sql
+-- Source: workflow/recommend/prune_stale_recommendations.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Recommend: source published on keyword X, target has grant for X.
- * Priority: 7 | UI: "Has funding for your publication topics"
+ * Delete recommendations from generation epochs older than p_epoch.
+ * 
+ * For every source, rows are deleted in batches so no single statement locks a
+ * large part of faculty_recommended_to_faculty. Batches only release their
+ * locks when their transaction commits, so the backend's full rebuild passes
+ * p_limit and calls this once per batch, each in its own transaction (see
+ * prune_stale_recommendations in services/recommend.py). With p_limit NULL
+ * every stale row is deleted in one call, in batches of 5,000 that share the
+ * caller's transaction.
+ * 
+ * @param p_epoch              Epoch of the run that just finished writing
+ * @param p_source_faculty_id  Optional source faculty member to limit pruning to
+ * @param p_limit              Maximum rows to delete when pruning every source (NULL for no limit)
+ * @param p_pruned_count       OUT number of stale rows deleted
  */
-DROP PROCEDURE IF EXISTS recommend_by_publication_to_grant$$
-CREATE PROCEDURE recommend_by_publication_to_grant()
+DROP PROCEDURE IF EXISTS prune_stale_recommendations$$
+CREATE PROCEDURE prune_stale_recommendations(
+    IN p_epoch BIGINT UNSIGNED,
+    IN p_source_faculty_id CHAR(36),
+    IN p_limit INT,
+    OUT p_pruned_count INT
+)
 BEGIN
-    INSERT INTO faculty_recommended_to_faculty (
-        source_faculty_id, target_faculty_id, recommendation_type, created_at
-    )
-    SELECT DISTINCT
-        paf.faculty_id, ggf.faculty_id, 'publication_to_grant', NOW()
-    FROM publication_authored_by_faculty paf
-    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
-    JOIN grants_for_keyword gfk ON LOWER(TRIM(pek.name)) = LOWER(TRIM(gfk.name))
-    JOIN grants_granted_to_faculty ggf ON gfk.grant_id = ggf.grant_id
-    WHERE paf.faculty_id <> ggf.faculty_id
-      AND EXISTS (SELECT 1 FROM credentials c WHERE c.faculty_id = paf.faculty_id)
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, 
-                                 VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+    DECLARE v_batch_size INT DEFAULT 5000;
+    DECLARE v_deleted INT DEFAULT 0;
+
+    SET p_pruned_count = 0;
+
+    IF p_source_faculty_id IS NOT NULL THEN
+        -- One source holds at most a few hundred rows; a single range delete on the primary key
+        DELETE FROM faculty_recommended_to_faculty
+        WHERE source_faculty_id = p_source_faculty_id
+          AND generation_epoch < p_epoch;
+        SET p_pruned_count = ROW_COUNT();
+    ELSEIF p_limit IS NOT NULL THEN
+        DELETE FROM faculty_recommended_to_faculty
+        WHERE generation_epoch < p_epoch
+        LIMIT p_limit;
+        SET p_pruned_count = ROW_COUNT();
+    ELSE
+        REPEAT
+            DELETE FROM faculty_recommended_to_faculty
+            WHERE generation_epoch < p_epoch
+            LIMIT v_batch_size;
+            SET v_deleted = ROW_COUNT();
+            SET p_pruned_count = p_pruned_count + v_deleted;
+        UNTIL v_deleted < v_batch_size END REPEAT;
+    END IF;
 END $$
 
 DELIMITER ;
 
 
--- Source: workflow/recommend/recommend_by_publication_to_keyword.sql
+-- Source: workflow/recommend/refresh_recommendation_display.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Recommend: source published on keyword X, target researches X.
- * Priority: 3 | UI: "Researches your publication topics"
+ * Rebuild faculty_recommendation_display for one source faculty member, or for
+ * every source when p_source_faculty_id is NULL.
+ *
+ * Copies each recommendation with the target's name, a biography snippet, their
+ * primary institution (the open affiliation that started most recently) and
+ * primary department (alphabetically first), so reads need no joins.
  */
-DROP PROCEDURE IF EXISTS recommend_by_publication_to_keyword$$
-CREATE PROCEDURE recommend_by_publication_to_keyword()
+DROP PROCEDURE IF EXISTS refresh_recommendation_display$$
+CREATE PROCEDURE refresh_recommendation_display(IN p_source_faculty_id CHAR(36))
 BEGIN
-    INSERT INTO faculty_recommended_to_faculty (
-        source_faculty_id, target_faculty_id, recommendation_type, created_at
+    DELETE FROM faculty_recommendation_display
+    WHERE p_source_faculty_id IS NULL OR source_faculty_id = p_source_faculty_id;
+
+    INSERT INTO faculty_recommendation_display (
+        source_faculty_id, target_faculty_id,
+        first_name, last_name, biography_snippet,
+        institution_name, department_name,
+        recommendation_type, recommendation_reasons, match_score
     )
-    SELECT DISTINCT
-        paf.faculty_id, frk.faculty_id, 'publication_to_keyword', NOW()
-    FROM publication_authored_by_faculty paf
-    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
-    JOIN faculty_researches_keyword frk ON LOWER(TRIM(pek.name)) = LOWER(TRIM(frk.name))
-    WHERE paf.faculty_id <> frk.faculty_id
-      AND EXISTS (SELECT 1 FROM credentials c WHERE c.faculty_id = paf.faculty_id)
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, 
-                                 VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+    SELECT
+        r.source_faculty_id,
+        r.target_faculty_id,
+        f.first_name,
+        f.last_name,
+        LEFT(f.biography, 300),
+        (
+            SELECT i.name
+            FROM faculty_works_at_institution fwi
+            JOIN institution i ON fwi.institution_id = i.institution_id
+            WHERE fwi.faculty_id = f.faculty_id AND fwi.end_date IS NULL
+            ORDER BY fwi.start_date DESC, i.name ASC
+            LIMIT 1
+        ),
+        (
+            SELECT MIN(fd.department_name)
+            FROM faculty_department fd
+            WHERE fd.faculty_id = f.faculty_id
+        ),
+        r.recommendation_type,
+        r.recommendation_reasons,
+        r.match_score
+    FROM faculty_recommended_to_faculty r
+    JOIN faculty f ON r.target_faculty_id = f.faculty_id
+    WHERE p_source_faculty_id IS NULL OR r.source_faculty_id = p_source_faculty_id;
 END $$
 
 DELIMITER ;
 
 
--- Source: workflow/recommend/recommend_by_shared_department.sql
+-- Source: workflow/recommend/score_recommendations.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Recommend faculty in the same department (normalized comparison).
- * Priority: 9 | UI: "Same department"
+ * Score recommendations and keep only the top K per source faculty member.
+ *
+ * For each recommendation of the given source (or every source when
+ * p_source_faculty_id is NULL), computes match_score with recommendation_score()
+ * from the research topics, grants and departments the two faculty share.
+ * Pairs that no longer share anything score 0 and are removed, then only the
+ * recommendation_top_k() highest-scoring rows per source are kept.
+ *
+ * Research topics are the union of keywords a faculty member researches,
+ * publishes on, and holds grants for.
+ *
+ * Ties are broken by recommendation_type priority, then target_faculty_id.
  */
-DROP PROCEDURE IF EXISTS recommend_by_shared_department$$
-CREATE PROCEDURE recommend_by_shared_department()
+DROP PROCEDURE IF EXISTS score_recommendations$$
+CREATE PROCEDURE score_recommendations(IN p_source_faculty_id CHAR(36))
 BEGIN
-    INSERT INTO faculty_recommended_to_faculty (
-        source_faculty_id, target_faculty_id, recommendation_type, created_at
-    )
-    SELECT DISTINCT
-        fd1.faculty_id, fd2.faculty_id, 'shared_department', NOW()
-    FROM faculty_department fd1
-    JOIN faculty_department fd2 
-        ON normalize_department_name(fd1.department_name) = normalize_department_name(fd2.department_name)
-    WHERE fd1.faculty_id <> fd2.faculty_id
-      AND EXISTS (SELECT 1 FROM credentials c WHERE c.faculty_id = fd1.faculty_id)
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, 
-                                 VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+    DECLARE v_top_k INT DEFAULT recommendation_top_k();
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_scope;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_source_topic;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_target_topic;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_prune;
+
+    CREATE TEMPORARY TABLE tmp_rec_scope (
+        source_faculty_id   CHAR(36) NOT NULL,
+        target_faculty_id   CHAR(36) NOT NULL,
+        recommendation_type TINYINT UNSIGNED NOT NULL,
+        shared_topics       INT NOT NULL DEFAULT 0,
+        source_topics       INT NOT NULL DEFAULT 0,
+        target_topics       INT NOT NULL DEFAULT 0,
+        shared_grants       INT NOT NULL DEFAULT 0,
+        source_grants       INT NOT NULL DEFAULT 0,
+        target_grants       INT NOT NULL DEFAULT 0,
+        shared_department   BOOLEAN NOT NULL DEFAULT FALSE,
+        match_score         DECIMAL(5,4) NOT NULL DEFAULT 0,
+        PRIMARY KEY (source_faculty_id, target_faculty_id)
+    );
+    CREATE TEMPORARY TABLE tmp_rec_source_topic (
+        faculty_id CHAR(36) NOT NULL,
+        keyword    VARCHAR(64) NOT NULL,
+        PRIMARY KEY (faculty_id, keyword)
+    );
+    CREATE TEMPORARY TABLE tmp_rec_target_topic (
+        faculty_id CHAR(36) NOT NULL,
+        keyword    VARCHAR(64) NOT NULL,
+        PRIMARY KEY (faculty_id, keyword)
+    );
+    CREATE TEMPORARY TABLE tmp_rec_prune (
+        source_faculty_id CHAR(36) NOT NULL,
+        target_faculty_id CHAR(36) NOT NULL,
+        PRIMARY KEY (source_faculty_id, target_faculty_id)
+    );
+
+    -- ENUM values compare by position; + 0 stores the priority as a number
+    INSERT INTO tmp_rec_scope (source_faculty_id, target_faculty_id, recommendation_type)
+    SELECT source_faculty_id, target_faculty_id, recommendation_type + 0
+    FROM faculty_recommended_to_faculty
+    WHERE p_source_faculty_id IS NULL OR source_faculty_id = p_source_faculty_id;
+
+    -- Topics for sources in scope
+    INSERT IGNORE INTO tmp_rec_source_topic (faculty_id, keyword)
+    SELECT frk.faculty_id, LOWER(TRIM(frk.name))
+    FROM faculty_researches_keyword frk
+    WHERE p_source_faculty_id IS NULL OR frk.faculty_id = p_source_faculty_id;
+
+    INSERT IGNORE INTO tmp_rec_source_topic (faculty_id, keyword)
+    SELECT paf.faculty_id, LOWER(TRIM(pek.name))
+    FROM publication_authored_by_faculty paf
+    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
+    WHERE p_source_faculty_id IS NULL OR paf.faculty_id = p_source_faculty_id;
+
+    INSERT IGNORE INTO tmp_rec_source_topic (faculty_id, keyword)
+    SELECT ggf.faculty_id, LOWER(TRIM(gfk.name))
+    FROM grants_granted_to_faculty ggf
+    JOIN grants_for_keyword gfk ON ggf.grant_id = gfk.grant_id
+    WHERE p_source_faculty_id IS NULL OR ggf.faculty_id = p_source_faculty_id;
+
+    -- Topics for targets in scope
+    INSERT IGNORE INTO tmp_rec_target_topic (faculty_id, keyword)
+    SELECT frk.faculty_id, LOWER(TRIM(frk.name))
+    FROM faculty_researches_keyword frk
+    WHERE frk.faculty_id IN (SELECT target_faculty_id FROM tmp_rec_scope);
+
+    INSERT IGNORE INTO tmp_rec_target_topic (faculty_id, keyword)
+    SELECT paf.faculty_id, LOWER(TRIM(pek.name))
+    FROM publication_authored_by_faculty paf
+    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
+    WHERE paf.faculty_id IN (SELECT target_faculty_id FROM tmp_rec_scope);
+
+    INSERT IGNORE INTO tmp_rec_target_topic (faculty_id, keyword)
+    SELECT ggf.faculty_id, LOWER(TRIM(gfk.name))
+    FROM grants_granted_to_faculty ggf
+    JOIN grants_for_keyword gfk ON ggf.grant_id = gfk.grant_id
+    WHERE ggf.faculty_id IN (SELECT target_faculty_id FROM tmp_rec_scope);
+
+    -- Overlap counts (each temporary table is referenced once per statement)
+    UPDATE tmp_rec_scope s
+    JOIN (
+        SELECT faculty_id, COUNT(*) AS topic_count
+        FROM tmp_rec_source_topic
+        GROUP BY faculty_id
+    ) t ON t.faculty_id = s.source_faculty_id
+    SET s.source_topics = t.topic_count;
+
+    UPDATE tmp_rec_scope s
+    JOIN (
+        SELECT faculty_id, COUNT(*) AS topic_count
+        FROM tmp_rec_target_topic
+        GROUP BY faculty_id
+    ) t ON t.faculty_id = s.target_faculty_id
+    SET s.target_topics = t.topic_count;
+
+    UPDATE tmp_rec_scope s
+    SET
+        s.shared_topics = (
+            SELECT COUNT(*)
+            FROM tmp_rec_source_topic st
+            JOIN tmp_rec_target_topic tt ON tt.keyword = st.keyword
+            WHERE st.faculty_id = s.source_faculty_id
+              AND tt.faculty_id = s.target_faculty_id
+        ),
+        s.source_grants = (
+            SELECT COUNT(*) FROM grants_granted_to_faculty ggf
+            WHERE ggf.faculty_id = s.source_faculty_id
+        ),
+        s.target_grants = (
+            SELECT COUNT(*) FROM grants_granted_to_faculty ggf
+            WHERE ggf.faculty_id = s.target_faculty_id
+        ),
+        s.shared_grants = (
+            SELECT COUNT(*)
+            FROM grants_granted_to_faculty ggf1
+            JOIN grants_granted_to_faculty ggf2 ON ggf1.grant_id = ggf2.grant_id
+            WHERE ggf1.faculty_id = s.source_faculty_id
+              AND ggf2.faculty_id = s.target_faculty_id
+        ),
+        s.shared_department = EXISTS (
+            SELECT 1
+            FROM faculty_department fd1
+            JOIN faculty_department fd2
+                ON fd1.department_key = fd2.department_key
+            WHERE fd1.faculty_id = s.source_faculty_id
+              AND fd2.faculty_id = s.target_faculty_id
+        );
+
+    UPDATE tmp_rec_scope
+    SET match_score = recommendation_score(
+        shared_topics, source_topics, target_topics,
+        shared_grants, source_grants, target_grants,
+        shared_department
+    );
+
+    -- Keep the top K scoring pairs per source; everything else is pruned
+    INSERT INTO tmp_rec_prune (source_faculty_id, target_faculty_id)
+    SELECT ranked.source_faculty_id, ranked.target_faculty_id
+    FROM (
+        SELECT
+            source_faculty_id,
+            target_faculty_id,
+            match_score,
+            ROW_NUMBER() OVER (
+                PARTITION BY source_faculty_id
+                ORDER BY match_score DESC, recommendation_type ASC, target_faculty_id ASC
+            ) AS score_rank
+        FROM tmp_rec_scope
+    ) ranked
+    WHERE ranked.match_score = 0 OR ranked.score_rank > v_top_k;
+
+    DELETE r
+    FROM faculty_recommended_to_faculty r
+    JOIN tmp_rec_prune p
+        ON p.source_faculty_id = r.source_faculty_id
+       AND p.target_faculty_id = r.target_faculty_id;
+
+    UPDATE faculty_recommended_to_faculty r
+    JOIN tmp_rec_scope s
+        ON s.source_faculty_id = r.source_faculty_id
+       AND s.target_faculty_id = r.target_faculty_id
+    SET r.match_score = s.match_score;
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_scope;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_source_topic;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_target_topic;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_prune;
 END $$
 
 DELIMITER ;
 
 
--- Source: workflow/recommend/recommend_by_shared_grant.sql
+-- Source: workflow/recommend/start_recommendation_run.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Recommend faculty who share a grant.
- * Priority: 8 | UI: "Co-funded by same grant"
+ * Start a sharded full regeneration run.
+ * 
+ * Records the run with the newest recommendation_change_log entry it covers and
+ * creates p_shard_count pending shards. Shards are processed independently by
+ * generate_recommendations_for_shard.
+ * 
+ * @param p_run_id       Required UUID for the run
+ * @param p_shard_count  Required number of shards (at least 1)
+ * 
+ * @returns No result set. Use read_recommendation_run to read progress.
  */
-DROP PROCEDURE IF EXISTS recommend_by_shared_grant$$
-CREATE PROCEDURE recommend_by_shared_grant()
+DROP PROCEDURE IF EXISTS start_recommendation_run$$
+CREATE PROCEDURE start_recommendation_run(
+    IN p_run_id CHAR(36),
+    IN p_shard_count INT
+)
 BEGIN
-    INSERT INTO faculty_recommended_to_faculty (
-        source_faculty_id, target_faculty_id, recommendation_type, created_at
-    )
-    SELECT DISTINCT
-        ggf1.faculty_id, ggf2.faculty_id, 'shared_grant', NOW()
-    FROM grants_granted_to_faculty ggf1
-    JOIN grants_granted_to_faculty ggf2 ON ggf1.grant_id = ggf2.grant_id
-    WHERE ggf1.faculty_id <> ggf2.faculty_id
-      AND EXISTS (SELECT 1 FROM credentials c WHERE c.faculty_id = ggf1.faculty_id)
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, 
-                                 VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+    DECLARE v_shard_index INT DEFAULT 0;
+
+    IF p_run_id IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'run_id is required';
+    END IF;
+
+    IF p_shard_count IS NULL OR p_shard_count < 1 THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'shard_count must be at least 1';
+    END IF;
+
+    INSERT INTO recommendation_run (run_id, status, shard_count, max_change_id, started_at)
+    SELECT p_run_id, 'running', p_shard_count, MAX(change_id), NOW()
+    FROM recommendation_change_log;
+
+    WHILE v_shard_index < p_shard_count DO
+        INSERT INTO recommendation_run_shard (run_id, shard_index, status)
+        VALUES (p_run_id, v_shard_index, 'pending');
+        SET v_shard_index = v_shard_index + 1;
+    END WHILE;
 END $$
 
 DELIMITER ;
 
 
--- Source: workflow/recommend/recommend_by_shared_keyword.sql
+-- Source: workflow/recommend/update_recommendation_run_shard.sql
+
+-- Written by Clayton Durepos
 
 DELIMITER $$
 
 /**
- * Recommend faculty who share research keywords.
- * Priority: 1 (highest) | UI: "Similar research interests"
+ * Record a shard starting or failing.
+ * 
+ * Completion is recorded by generate_recommendations_for_shard itself so that it
+ * commits together with the shard's recommendations.
+ * 
+ * @param p_run_id       Required UUID of the run
+ * @param p_shard_index  Required shard index
+ * @param p_status       Required new status ('running' or 'failed')
+ * @param p_error        Optional error message for failed shards
+ * 
+ * @returns No result set. Use read_recommendation_run to read progress.
  */
-DROP PROCEDURE IF EXISTS recommend_by_shared_keyword$$
-CREATE PROCEDURE recommend_by_shared_keyword()
+DROP PROCEDURE IF EXISTS update_recommendation_run_shard$$
+CREATE PROCEDURE update_recommendation_run_shard(
+    IN p_run_id CHAR(36),
+    IN p_shard_index INT,
+    IN p_status VARCHAR(16),
+    IN p_error VARCHAR(2048)
+)
 BEGIN
-    INSERT INTO faculty_recommended_to_faculty (
-        source_faculty_id, target_faculty_id, recommendation_type, created_at
-    )
-    SELECT DISTINCT
-        frk1.faculty_id, frk2.faculty_id, 'shared_keyword', NOW()
-    FROM faculty_researches_keyword frk1
-    JOIN faculty_researches_keyword frk2 ON LOWER(TRIM(frk1.name)) = LOWER(TRIM(frk2.name))
-    WHERE frk1.faculty_id <> frk2.faculty_id
-      AND EXISTS (SELECT 1 FROM credentials c WHERE c.faculty_id = frk1.faculty_id)
-    ON DUPLICATE KEY UPDATE
-        recommendation_type = IF(VALUES(recommendation_type) < recommendation_type, 
-                                 VALUES(recommendation_type), recommendation_type),
-        updated_at = NOW();
+    IF p_status NOT IN ('running', 'failed') THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'status must be running or failed';
+    END IF;
+
+    UPDATE recommendation_run_shard
+    SET status = p_status,
+        error = IF(p_status = 'failed', p_error, NULL),
+        started_at = IF(p_status = 'running', NOW(), started_at),
+        finished_at = IF(p_status = 'failed', NOW(), NULL)
+    WHERE run_id = p_run_id AND shard_index = p_shard_index;
 END $$
 
 DELIMITER ;
@@ -4522,6 +6206,8 @@ DELIMITER ;
 
 -- Source: workflow/search/batch_get_faculty_keywords.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -4614,6 +6300,8 @@ DELIMITER ;
 
 -- Source: workflow/search/search_existing_faculty.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -4668,6 +6356,8 @@ DELIMITER ;
 
 -- Source: workflow/search/search_faculty.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -4680,7 +6370,9 @@ DELIMITER $$
  * 
  * @param p_first_name    Optional first name to search for (partial match)
  * @param p_last_name     Optional last name to search for (partial match)
- * @param p_department    Optional department name to search for (partial match)
+ * @param p_department    Optional department name to search for (partial match,
+ *                        compared after normalize_department_name so "Dept. of
+ *                        History" also finds "History Department")
  * @param p_institution   Optional institution name to search for (partial match)
  * 
  * @returns Result set containing:
@@ -4718,7 +6410,7 @@ BEGIN
         -- CONCAT(value, '%') creates a pattern for partial matching (starts with)
         (p_first_name  IS NULL OR f.first_name      LIKE CONCAT(p_first_name, '%'))
         OR (p_last_name IS NULL OR f.last_name      LIKE CONCAT(p_last_name, '%'))
-        OR (p_department IS NULL OR d.department_name LIKE CONCAT(p_department, '%'))
+        OR (p_department IS NULL OR d.department_key LIKE CONCAT(normalize_department_name(p_department), '%'))
         OR (p_institution IS NULL OR i.name            LIKE CONCAT(p_institution, '%'));
 END $$
 DELIMITER ;
@@ -4727,6 +6419,8 @@ DELIMITER ;
 
 -- Source: workflow/search/search_faculty_by_keyword.sql
 
+-- Written by Aidan Bell
+
 DELIMITER $$
 
 /**
@@ -4852,6 +6546,8 @@ DELIMITER ;
 
 -- Source: workflow/search/search_keywords.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -4891,6 +6587,8 @@ DELIMITER ;
 
 -- Source: workflow/validate_login.sql
 
+-- Written by Clayton Durepos
+
 DELIMITER $$
 
 /**
@@ -0,0 +1,330 @@
+-- Auto-generated triggers file
+-- Generated by db/generate_triggers.sh
+-- DO NOT EDIT MANUALLY - This file is generated from db/triggers/*.sql files
+
+-- Source: credentials_change_log.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Newly registered faculty become recommendation sources.
+ */
+DROP TRIGGER IF EXISTS credentials_after_insert_change_log$$
+CREATE TRIGGER credentials_after_insert_change_log
+AFTER INSERT ON credentials
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', NEW.faculty_id);
+END $$
+
+DELIMITER ;
+
+
+-- Source: faculty_delete_cascade.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Cascade faculty deletes and faculty_id updates to the partitioned session and
+ * faculty_generates_keyword tables, which cannot have foreign keys.
+ */
+DROP TRIGGER IF EXISTS faculty_after_delete_cascade$$
+CREATE TRIGGER faculty_after_delete_cascade
+AFTER DELETE ON faculty
+FOR EACH ROW
+BEGIN
+    DELETE FROM session WHERE faculty_id = OLD.faculty_id;
+    DELETE FROM faculty_generates_keyword WHERE faculty_id = OLD.faculty_id;
+END $$
+
+DROP TRIGGER IF EXISTS faculty_after_update_cascade$$
+CREATE TRIGGER faculty_after_update_cascade
+AFTER UPDATE ON faculty
+FOR EACH ROW
+BEGIN
+    IF NEW.faculty_id <> OLD.faculty_id THEN
+        UPDATE session SET faculty_id = NEW.faculty_id WHERE faculty_id = OLD.faculty_id;
+        UPDATE faculty_generates_keyword SET faculty_id = NEW.faculty_id WHERE faculty_id = OLD.faculty_id;
+    END IF;
+END $$
+
+DELIMITER ;
+
+
+-- Source: faculty_department_change_log.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * A faculty member's departments changed.
+ */
+DROP TRIGGER IF EXISTS faculty_department_after_insert_change_log$$
+CREATE TRIGGER faculty_department_after_insert_change_log
+AFTER INSERT ON faculty_department
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', NEW.faculty_id);
+END $$
+
+DROP TRIGGER IF EXISTS faculty_department_after_update_change_log$$
+CREATE TRIGGER faculty_department_after_update_change_log
+AFTER UPDATE ON faculty_department
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', NEW.faculty_id);
+END $$
+
+DROP TRIGGER IF EXISTS faculty_department_after_delete_change_log$$
+CREATE TRIGGER faculty_department_after_delete_change_log
+AFTER DELETE ON faculty_department
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', OLD.faculty_id);
+END $$
+
+DELIMITER ;
+
+
+-- Source: faculty_department_department_key.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Keep faculty_department.department_key equal to
+ * normalize_department_name(department_name), so the normalization runs once
+ * per write instead of on both sides of every department join.
+ */
+DROP TRIGGER IF EXISTS faculty_department_before_insert_department_key$$
+CREATE TRIGGER faculty_department_before_insert_department_key
+BEFORE INSERT ON faculty_department
+FOR EACH ROW
+BEGIN
+    SET NEW.department_key = normalize_department_name(NEW.department_name);
+END $$
+
+DROP TRIGGER IF EXISTS faculty_department_before_update_department_key$$
+CREATE TRIGGER faculty_department_before_update_department_key
+BEFORE UPDATE ON faculty_department
+FOR EACH ROW
+BEGIN
+    SET NEW.department_key = normalize_department_name(NEW.department_name);
+END $$
+
+DELIMITER ;
+
+
+-- Source: faculty_researches_keyword_change_log.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * A faculty member's research keywords changed.
+ */
+DROP TRIGGER IF EXISTS faculty_researches_keyword_after_insert_change_log$$
+CREATE TRIGGER faculty_researches_keyword_after_insert_change_log
+AFTER INSERT ON faculty_researches_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', NEW.faculty_id);
+END $$
+
+DROP TRIGGER IF EXISTS faculty_researches_keyword_after_delete_change_log$$
+CREATE TRIGGER faculty_researches_keyword_after_delete_change_log
+AFTER DELETE ON faculty_researches_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', OLD.faculty_id);
+END $$
+
+DELIMITER ;
+
+
+-- Source: grants_for_keyword_change_log.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * A grant's topics changed; resolved to the grant's holders when the log is drained.
+ */
+DROP TRIGGER IF EXISTS grants_for_keyword_after_insert_change_log$$
+CREATE TRIGGER grants_for_keyword_after_insert_change_log
+AFTER INSERT ON grants_for_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('grant', NEW.grant_id);
+END $$
+
+DROP TRIGGER IF EXISTS grants_for_keyword_after_delete_change_log$$
+CREATE TRIGGER grants_for_keyword_after_delete_change_log
+AFTER DELETE ON grants_for_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('grant', OLD.grant_id);
+END $$
+
+DELIMITER ;
+
+
+-- Source: grants_granted_to_faculty_change_log.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * A faculty member gained or lost a grant.
+ */
+DROP TRIGGER IF EXISTS grants_granted_to_faculty_after_insert_change_log$$
+CREATE TRIGGER grants_granted_to_faculty_after_insert_change_log
+AFTER INSERT ON grants_granted_to_faculty
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', NEW.faculty_id);
+END $$
+
+DROP TRIGGER IF EXISTS grants_granted_to_faculty_after_delete_change_log$$
+CREATE TRIGGER grants_granted_to_faculty_after_delete_change_log
+AFTER DELETE ON grants_granted_to_faculty
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', OLD.faculty_id);
+END $$
+
+DELIMITER ;
+
+
+-- Source: keyword_change_log.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * 
+ * Renaming or deleting a keyword cascades into the join tables, and MySQL does
+ * not fire triggers for cascaded changes. Renames are logged by keyword name and
+ * resolved through the (already updated) join tables when the log is drained.
+ * Deletes must resolve the affected faculty up front, before the links are gone.
+ */
+DROP TRIGGER IF EXISTS keyword_after_update_change_log$$
+CREATE TRIGGER keyword_after_update_change_log
+AFTER UPDATE ON keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('keyword', NEW.name);
+END $$
+
+DROP TRIGGER IF EXISTS keyword_before_delete_change_log$$
+CREATE TRIGGER keyword_before_delete_change_log
+BEFORE DELETE ON keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    SELECT 'faculty', frk.faculty_id
+    FROM faculty_researches_keyword frk
+    WHERE frk.name = OLD.name
+    UNION
+    SELECT 'faculty', paf.faculty_id
+    FROM publication_explores_keyword pek
+    JOIN publication_authored_by_faculty paf ON pek.publication_id = paf.publication_id
+    WHERE pek.name = OLD.name
+    UNION
+    SELECT 'faculty', ggf.faculty_id
+    FROM grants_for_keyword gfk
+    JOIN grants_granted_to_faculty ggf ON gfk.grant_id = ggf.grant_id
+    WHERE gfk.name = OLD.name;
+END $$
+
+DELIMITER ;
+
+
+-- Source: publication_authored_by_faculty_change_log.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * A faculty member gained or lost a publication.
+ */
+DROP TRIGGER IF EXISTS publication_authored_by_faculty_after_insert_change_log$$
+CREATE TRIGGER publication_authored_by_faculty_after_insert_change_log
+AFTER INSERT ON publication_authored_by_faculty
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', NEW.faculty_id);
+END $$
+
+DROP TRIGGER IF EXISTS publication_authored_by_faculty_after_delete_change_log$$
+CREATE TRIGGER publication_authored_by_faculty_after_delete_change_log
+AFTER DELETE ON publication_authored_by_faculty
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', OLD.faculty_id);
+END $$
+
+DELIMITER ;
+
+
+-- Source: publication_explores_keyword_change_log.sql
+
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * A publication's topics changed; resolved to its authors when the log is drained.
+ */
+DROP TRIGGER IF EXISTS publication_explores_keyword_after_insert_change_log$$
+CREATE TRIGGER publication_explores_keyword_after_insert_change_log
+AFTER INSERT ON publication_explores_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('publication', NEW.publication_id);
+END $$
+
+DROP TRIGGER IF EXISTS publication_explores_keyword_after_delete_change_log$$
+CREATE TRIGGER publication_explores_keyword_after_delete_change_log
+AFTER DELETE ON publication_explores_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('publication', OLD.publication_id);
+END $$
+
+DELIMITER ;
+
+
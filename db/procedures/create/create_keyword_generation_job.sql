@@ -0,0 +1,30 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Queues a keyword generation job for a faculty member.
+ * 
+ * @param p_job_id      Required UUID for the job
+ * @param p_faculty_id  Required UUID of the faculty member whose biography is used
+ * 
+ * @returns No result set. Use read_keyword_generation_job to follow the job.
+ * 
+ * @throws SQLSTATE '45000' if any parameter is NULL
+ */
+DROP PROCEDURE IF EXISTS create_keyword_generation_job$$
+CREATE PROCEDURE create_keyword_generation_job(
+    IN p_job_id CHAR(36),
+    IN p_faculty_id CHAR(36)
+)
+BEGIN
+    IF p_job_id IS NULL OR p_faculty_id IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'job_id and faculty_id are required for create_keyword_generation_job';
+    END IF;
+
+    INSERT INTO keyword_generation_job (job_id, faculty_id, status, created_at)
+    VALUES (p_job_id, p_faculty_id, 'queued', NOW(3));
+END $$
+
+DELIMITER ;
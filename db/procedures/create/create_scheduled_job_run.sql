@@ -0,0 +1,34 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Records the start of a scheduler job run.
+ * 
+ * @param p_run_id        Required UUID for the run
+ * @param p_job_name      Required name of the job
+ * @param p_host          Required host running the job
+ * @param p_triggered_by  Required 'schedule' or 'manual'
+ * 
+ * @returns No result set. Use read_scheduled_job_runs to read runs.
+ * 
+ * @throws SQLSTATE '45000' if any parameter is NULL
+ */
+DROP PROCEDURE IF EXISTS create_scheduled_job_run$$
+CREATE PROCEDURE create_scheduled_job_run(
+    IN p_run_id CHAR(36),
+    IN p_job_name VARCHAR(64),
+    IN p_host VARCHAR(255),
+    IN p_triggered_by VARCHAR(16)
+)
+BEGIN
+    IF p_run_id IS NULL OR p_job_name IS NULL OR p_host IS NULL OR p_triggered_by IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'run_id, job_name, host and triggered_by are required';
+    END IF;
+
+    INSERT INTO scheduled_job_run (run_id, job_name, host, triggered_by, status, started_at)
+    VALUES (p_run_id, p_job_name, p_host, p_triggered_by, 'running', NOW(3));
+END $$
+
+DELIMITER ;
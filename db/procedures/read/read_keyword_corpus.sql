@@ -0,0 +1,36 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Retrieves the keyword vocabulary, which generated keywords are matched
+ * against, and a sample of faculty biographies the statistical keyword
+ * engine is fit on.
+ *
+ * @param p_limit  Maximum number of biographies to return (0 returns none)
+ *
+ * @returns Two result sets:
+ *   1. name: Every keyword
+ *   2. document: Up to p_limit non-empty biographies
+ *
+ * @throws SQLSTATE '45000' if p_limit is NULL or negative
+ */
+DROP PROCEDURE IF EXISTS read_keyword_corpus$$
+CREATE PROCEDURE read_keyword_corpus(
+    IN p_limit INT
+)
+BEGIN
+    IF p_limit IS NULL OR p_limit < 0 THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'limit must be zero or positive for read_keyword_corpus';
+    END IF;
+
+    SELECT name FROM keyword;
+
+    SELECT f.biography AS document
+    FROM faculty f
+    WHERE f.biography IS NOT NULL AND f.biography <> ''
+    LIMIT p_limit;
+END $$
+
+DELIMITER ;
@@ -0,0 +1,40 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Retrieves a keyword generation job.
+ * 
+ * @param p_job_id  Required UUID of the job
+ * 
+ * @returns Result set with one row (none if the job doesn't exist):
+ *   - job_id, faculty_id, status, attempts
+ *   - keywords: JSON array of keywords once complete (so far, while running)
+ *   - error: Failure message once failed
+ *   - created_at, started_at, finished_at
+ *   - queue_position: Number of queued jobs ahead of this one (0 unless queued)
+ * 
+ * @throws SQLSTATE '45000' if p_job_id is NULL
+ */
+DROP PROCEDURE IF EXISTS read_keyword_generation_job$$
+CREATE PROCEDURE read_keyword_generation_job(
+    IN p_job_id CHAR(36)
+)
+BEGIN
+    IF p_job_id IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'job_id is required for read_keyword_generation_job';
+    END IF;
+
+    SELECT
+        j.job_id, j.faculty_id, j.status, j.attempts, j.keywords, j.error,
+        j.created_at, j.started_at, j.finished_at,
+        CASE WHEN j.status = 'queued' THEN (
+            SELECT COUNT(*) FROM keyword_generation_job q
+            WHERE q.status = 'queued' AND q.created_at < j.created_at
+        ) ELSE 0 END AS queue_position
+    FROM keyword_generation_job j
+    WHERE j.job_id = p_job_id;
+END $$
+
+DELIMITER ;
@@ -0,0 +1,36 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Retrieve a sharded regeneration run and the progress of each shard.
+ * 
+ * @param p_run_id  Required UUID of the run
+ * 
+ * @returns Two result sets:
+ *   1. The recommendation_run row, with completed_shards and source_count totals
+ *   2. Every recommendation_run_shard row, ordered by shard_index
+ */
+DROP PROCEDURE IF EXISTS read_recommendation_run$$
+CREATE PROCEDURE read_recommendation_run(IN p_run_id CHAR(36))
+BEGIN
+    SELECT
+        r.run_id,
+        r.status,
+        r.shard_count,
+        r.started_at,
+        r.finished_at,
+        COALESCE(SUM(s.status = 'complete'), 0) AS completed_shards,
+        COALESCE(SUM(s.source_count), 0) AS source_count
+    FROM recommendation_run r
+    LEFT JOIN recommendation_run_shard s ON s.run_id = r.run_id
+    WHERE r.run_id = p_run_id
+    GROUP BY r.run_id;
+
+    SELECT shard_index, status, source_count, error, started_at, finished_at
+    FROM recommendation_run_shard
+    WHERE run_id = p_run_id
+    ORDER BY shard_index;
+END $$
+
+DELIMITER ;
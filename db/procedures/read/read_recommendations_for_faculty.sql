@@ -4,20 +4,51 @@ DELIMITER $$
 
 /**
  * Retrieve recommendations for a faculty member.
- * Ordered by recommendation_type (ENUM order = priority).
+ * Ordered by match_score (highest first), then recommendation_type priority,
+ * then target faculty_id, so pages can continue from the last row returned.
+ * Returns at most p_limit rows (all stored rows when NULL).
+ * recommendation_reasons lists every reason for the match, comma separated in
+ * priority order; recommendation_text describes the primary one.
+ *
+ * Reads the denormalized faculty_recommendation_display table, which is
+ * rebuilt whenever the faculty member's recommendations are generated.
+ *
+ * @param p_faculty_id        Required UUID of the source faculty member
+ * @param p_limit             Optional maximum number of rows
+ * @param p_type              Optional recommendation_type to filter on (primary type)
+ * @param p_after_score       Optional match_score of the last row of the previous page
+ * @param p_after_type_rank   type_rank of the last row of the previous page
+ * @param p_after_faculty_id  faculty_id of the last row of the previous page
+ * @param p_compact           When TRUE, biography is returned as NULL
+ *
+ * @returns Result set containing the display columns plus type_rank
+ *   (recommendation_type priority, 1 = highest) for building the next cursor
  */
 DROP PROCEDURE IF EXISTS read_recommendations_for_faculty$$
-CREATE PROCEDURE read_recommendations_for_faculty(IN p_faculty_id CHAR(36))
+CREATE PROCEDURE read_recommendations_for_faculty(
+    IN p_faculty_id CHAR(36),
+    IN p_limit INT,
+    IN p_type VARCHAR(32),
+    IN p_after_score DECIMAL(5,4),
+    IN p_after_type_rank TINYINT UNSIGNED,
+    IN p_after_faculty_id CHAR(36),
+    IN p_compact BOOLEAN
+)
 BEGIN
-    SELECT 
-        f.faculty_id,
-        f.first_name,
-        f.last_name,
-        f.biography,
-        i.name AS institution_name,
-        fd.department_name,
-        r.recommendation_type,
-        CASE r.recommendation_type
+    DECLARE v_limit INT DEFAULT COALESCE(p_limit, recommendation_top_k());
+
+    SELECT
+        d.target_faculty_id AS faculty_id,
+        d.first_name,
+        d.last_name,
+        IF(p_compact, NULL, d.biography_snippet) AS biography,
+        d.institution_name,
+        d.department_name,
+        d.match_score,
+        d.recommendation_type,
+        d.recommendation_type + 0 AS type_rank,
+        CAST(d.recommendation_reasons AS CHAR) AS recommendation_reasons,
+        CASE d.recommendation_type
             WHEN 'shared_keyword'           THEN 'Similar research interests'
             WHEN 'keyword_to_publication'   THEN 'Published in your research area'
             WHEN 'publication_to_keyword'   THEN 'Researches your publication topics'
@@ -29,17 +60,19 @@ BEGIN
             WHEN 'shared_department'        THEN 'Same department'
             ELSE 'Potential collaborator'
         END AS recommendation_text
-    FROM faculty_recommended_to_faculty r
-    JOIN faculty f ON r.target_faculty_id = f.faculty_id
-    LEFT JOIN faculty_works_at_institution fwi ON f.faculty_id = fwi.faculty_id AND fwi.end_date IS NULL
-    LEFT JOIN institution i ON fwi.institution_id = i.institution_id
-    LEFT JOIN (
-        SELECT faculty_id, MIN(department_name) AS department_name
-        FROM faculty_department
-        GROUP BY faculty_id
-    ) fd ON f.faculty_id = fd.faculty_id
-    WHERE r.source_faculty_id = p_faculty_id
-    ORDER BY r.recommendation_type ASC;
+    FROM faculty_recommendation_display d
+    WHERE d.source_faculty_id = p_faculty_id
+      AND (p_type IS NULL OR d.recommendation_type = p_type)
+      -- Keyset: rows strictly after (p_after_score, p_after_type_rank, p_after_faculty_id)
+      AND (
+          p_after_score IS NULL
+          OR d.match_score < p_after_score
+          OR (d.match_score = p_after_score AND d.recommendation_type + 0 > p_after_type_rank)
+          OR (d.match_score = p_after_score AND d.recommendation_type + 0 = p_after_type_rank
+              AND d.target_faculty_id > p_after_faculty_id)
+      )
+    ORDER BY d.match_score DESC, d.recommendation_type ASC, d.target_faculty_id ASC
+    LIMIT v_limit;
 END $$
 
 DELIMITER ;
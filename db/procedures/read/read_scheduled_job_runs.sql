@@ -0,0 +1,32 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Retrieves the most recent scheduler job runs, newest first.
+ * 
+ * @param p_job_name  Optional job name to filter on (all jobs when NULL)
+ * @param p_limit     Optional maximum number of runs (default 20)
+ * 
+ * @returns Result set containing:
+ *   - run_id, job_name, host, triggered_by, status
+ *   - started_at, finished_at, duration_ms, row_count, error
+ */
+DROP PROCEDURE IF EXISTS read_scheduled_job_runs$$
+CREATE PROCEDURE read_scheduled_job_runs(
+    IN p_job_name VARCHAR(64),
+    IN p_limit INT
+)
+BEGIN
+    DECLARE v_limit INT DEFAULT COALESCE(p_limit, 20);
+
+    SELECT
+        run_id, job_name, host, triggered_by, status,
+        started_at, finished_at, duration_ms, row_count, error
+    FROM scheduled_job_run
+    WHERE p_job_name IS NULL OR job_name = p_job_name
+    ORDER BY started_at DESC
+    LIMIT v_limit;
+END $$
+
+DELIMITER ;
@@ -0,0 +1,37 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Backfills faculty_department.department_key.
+ * 
+ * The faculty_department_key triggers set department_key on every insert and
+ * update. Run this once for rows written before the column existed, or after
+ * changing normalize_department_name, to recompute keys that are missing or
+ * out of date. Rows are updated in batches of 5,000.
+ * 
+ * @returns Result set containing:
+ *   - updated_count: Number of rows whose department_key was changed
+ */
+DROP PROCEDURE IF EXISTS update_faculty_department_key$$
+CREATE PROCEDURE update_faculty_department_key()
+BEGIN
+    DECLARE v_batch_size INT DEFAULT 5000;
+    DECLARE v_updated INT DEFAULT 0;
+    DECLARE v_updated_count INT DEFAULT 0;
+
+    REPEAT
+        -- The BEFORE UPDATE trigger recomputes the key from department_name
+        UPDATE faculty_department
+        SET department_key = normalize_department_name(department_name)
+        WHERE department_key IS NULL
+           OR department_key <> normalize_department_name(department_name)
+        LIMIT v_batch_size;
+        SET v_updated = ROW_COUNT();
+        SET v_updated_count = v_updated_count + v_updated;
+    UNTIL v_updated < v_batch_size END REPEAT;
+
+    SELECT v_updated_count AS updated_count;
+END $$
+
+DELIMITER ;
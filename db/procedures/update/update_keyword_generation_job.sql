@@ -0,0 +1,46 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Records the outcome of a claimed keyword generation job, or the keywords
+ * it has generated so far while it is still running.
+ * 
+ * Only the claim that is still current can update a job, so a worker that was
+ * presumed dead (and whose jobs were claimed again) cannot overwrite them.
+ * 
+ * @param p_job_id    Required UUID of the job
+ * @param p_claim_id  Required claim returned by claim_keyword_generation_jobs
+ * @param p_status    Required 'complete', 'failed', or 'running' (partial keywords)
+ * @param p_keywords  Optional JSON array of generated keywords
+ * @param p_error     Optional error message (truncated to 1024 characters)
+ * 
+ * @returns No result set.
+ * 
+ * @throws SQLSTATE '45000' if job_id, claim_id or status is NULL
+ */
+DROP PROCEDURE IF EXISTS update_keyword_generation_job$$
+CREATE PROCEDURE update_keyword_generation_job(
+    IN p_job_id CHAR(36),
+    IN p_claim_id CHAR(36),
+    IN p_status VARCHAR(16),
+    IN p_keywords JSON,
+    IN p_error TEXT
+)
+BEGIN
+    IF p_job_id IS NULL OR p_claim_id IS NULL OR p_status IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'job_id, claim_id and status are required for update_keyword_generation_job';
+    END IF;
+
+    UPDATE keyword_generation_job
+    SET status = p_status,
+        keywords = p_keywords,
+        error = LEFT(p_error, 1024),
+        finished_at = IF(p_status = 'running', NULL, NOW(3))
+    WHERE job_id = p_job_id
+      AND claim_id = p_claim_id
+      AND status = 'running';
+END $$
+
+DELIMITER ;
@@ -0,0 +1,46 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Records the outcome of a scheduler job run.
+ * 
+ * @param p_run_id       Required UUID of the run
+ * @param p_status       Required 'complete' or 'failed'
+ * @param p_duration_ms  Required wall time of the job in milliseconds
+ * @param p_row_count    Optional number of rows the job affected
+ * @param p_error        Optional error message (truncated to 1024 characters)
+ * 
+ * @returns No result set.
+ * 
+ * @throws SQLSTATE '45000' if run_id or status is NULL, or the run doesn't exist
+ */
+DROP PROCEDURE IF EXISTS update_scheduled_job_run$$
+CREATE PROCEDURE update_scheduled_job_run(
+    IN p_run_id CHAR(36),
+    IN p_status VARCHAR(16),
+    IN p_duration_ms INT UNSIGNED,
+    IN p_row_count INT UNSIGNED,
+    IN p_error TEXT
+)
+BEGIN
+    IF p_run_id IS NULL OR p_status IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'run_id and status are required';
+    END IF;
+
+    UPDATE scheduled_job_run
+    SET status = p_status,
+        finished_at = NOW(3),
+        duration_ms = p_duration_ms,
+        row_count = p_row_count,
+        error = LEFT(p_error, 1024)
+    WHERE run_id = p_run_id;
+
+    IF ROW_COUNT() = 0 THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Scheduled job run not found';
+    END IF;
+END $$
+
+DELIMITER ;
@@ -0,0 +1,21 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Allocate a generation epoch for a recommendation run.
+ * 
+ * UUID_SHORT() increases monotonically on a server (including across restarts),
+ * so a later run always gets a larger epoch without a shared counter row that
+ * concurrent runs would have to lock.
+ */
+DROP FUNCTION IF EXISTS next_recommendation_epoch$$
+CREATE FUNCTION next_recommendation_epoch()
+RETURNS BIGINT UNSIGNED
+NOT DETERMINISTIC
+NO SQL
+BEGIN
+    RETURN UUID_SHORT();
+END $$
+
+DELIMITER ;
@@ -0,0 +1,49 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Similarity score (0.0 to 1.0) between a source and target faculty member.
+ * 
+ * Weighted combination of:
+ *   0.60 - Cosine similarity of research topics (keywords researched, published
+ *          on, or funded by a grant)
+ *   0.25 - Jaccard similarity of grants held
+ *   0.15 - Shared (normalized) department
+ * 
+ * The sparse recommendation engine (backend/app/services/recommend_engine.py)
+ * uses the same weights.
+ */
+DROP FUNCTION IF EXISTS recommendation_score$$
+CREATE FUNCTION recommendation_score(
+    p_shared_topics     INT,
+    p_source_topics     INT,
+    p_target_topics     INT,
+    p_shared_grants     INT,
+    p_source_grants     INT,
+    p_target_grants     INT,
+    p_shared_department BOOLEAN
+)
+RETURNS DECIMAL(5,4)
+DETERMINISTIC
+BEGIN
+    DECLARE v_topic_score DOUBLE DEFAULT 0;
+    DECLARE v_grant_score DOUBLE DEFAULT 0;
+
+    IF p_shared_topics > 0 AND p_source_topics > 0 AND p_target_topics > 0 THEN
+        SET v_topic_score = p_shared_topics / SQRT(p_source_topics * p_target_topics);
+    END IF;
+
+    IF p_shared_grants > 0 THEN
+        SET v_grant_score = p_shared_grants / (p_source_grants + p_target_grants - p_shared_grants);
+    END IF;
+
+    RETURN ROUND(
+        0.60 * v_topic_score
+        + 0.25 * v_grant_score
+        + 0.15 * IF(p_shared_department, 1, 0),
+        4
+    );
+END $$
+
+DELIMITER ;
@@ -0,0 +1,17 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Maximum number of recommendations stored per source faculty member.
+ * Lower-scoring recommendations are pruned by score_recommendations.
+ */
+DROP FUNCTION IF EXISTS recommendation_top_k$$
+CREATE FUNCTION recommendation_top_k()
+RETURNS INT
+DETERMINISTIC
+BEGIN
+    RETURN 50;
+END $$
+
+DELIMITER ;
@@ -0,0 +1,65 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Claims the oldest queued keyword generation jobs for one worker batch.
+ * 
+ * Claimed jobs are marked running under p_claim_id and returned with the
+ * faculty biography, so the worker needs no further reads. Jobs left running
+ * longer than p_stale_seconds (their worker stopped) are claimed again, and
+ * failed once they have been attempted p_max_attempts times.
+ * 
+ * @param p_claim_id       Required UUID identifying this batch
+ * @param p_limit          Required maximum number of jobs to claim
+ * @param p_stale_seconds  Required seconds after which a running job is presumed abandoned
+ * @param p_max_attempts   Required attempts after which an abandoned job fails
+ * 
+ * @returns Result set containing the claimed jobs, oldest first:
+ *   - job_id, faculty_id, biography
+ * 
+ * @throws SQLSTATE '45000' if any parameter is NULL
+ */
+DROP PROCEDURE IF EXISTS claim_keyword_generation_jobs$$
+CREATE PROCEDURE claim_keyword_generation_jobs(
+    IN p_claim_id CHAR(36),
+    IN p_limit INT,
+    IN p_stale_seconds INT,
+    IN p_max_attempts INT
+)
+BEGIN
+    DECLARE v_stale_before DATETIME(3);
+
+    IF p_claim_id IS NULL OR p_limit IS NULL OR p_stale_seconds IS NULL OR p_max_attempts IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'claim_id, limit, stale_seconds and max_attempts are required for claim_keyword_generation_jobs';
+    END IF;
+
+    SET v_stale_before = NOW(3) - INTERVAL p_stale_seconds SECOND;
+
+    UPDATE keyword_generation_job
+    SET status = 'failed',
+        error = 'Keyword generation did not finish',
+        finished_at = NOW(3)
+    WHERE status = 'running'
+      AND started_at < v_stale_before
+      AND attempts >= p_max_attempts;
+
+    UPDATE keyword_generation_job
+    SET status = 'running',
+        claim_id = p_claim_id,
+        attempts = attempts + 1,
+        started_at = NOW(3)
+    WHERE status = 'queued'
+       OR (status = 'running' AND started_at < v_stale_before)
+    ORDER BY created_at
+    LIMIT p_limit;
+
+    SELECT j.job_id, j.faculty_id, f.biography
+    FROM keyword_generation_job j
+    JOIN faculty f ON f.faculty_id = j.faculty_id
+    WHERE j.claim_id = p_claim_id
+    ORDER BY j.created_at;
+END $$
+
+DELIMITER ;
@@ -10,12 +10,18 @@ DELIMITER $$
  * database by removing records that are no longer relevant for rate limiting
  * purposes (e.g., records older than 1 hour, 1 day, etc.).
  * 
+ * The table is partitioned by hour of generated_at, so whole partitions older
+ * than the cutoff are dropped and partitions for the next day are created
+ * (see rotate_time_partitions). Records in the hour straddling the cutoff are
+ * kept until the next run.
+ * 
  * @param p_cutoff_datetime  Required datetime threshold
- *                           All records with generated_at older than this
- *                           datetime will be deleted
+ *                           Records with generated_at older than this
+ *                           datetime are deleted
  * 
  * @returns Result set containing:
- *   - deleted_count: Number of records that were deleted
+ *   - deleted_count: Number of records that were deleted (estimated for
+ *     dropped partitions)
  *   - cutoff_datetime: The datetime threshold that was used
  *   - action: Status message ('cleaned')
  * 
@@ -36,7 +42,7 @@ CREATE PROCEDURE clean_faculty_generates_keyword(
     IN p_cutoff_datetime DATETIME
 )
 BEGIN
-    DECLARE v_deleted_count INT DEFAULT 0;
+    DECLARE v_deleted_count BIGINT DEFAULT 0;
 
     -- Validate that cutoff datetime is provided
     IF p_cutoff_datetime IS NULL THEN
@@ -44,12 +50,15 @@ BEGIN
             SET MESSAGE_TEXT = 'cutoff_datetime is required for clean_faculty_generates_keyword';
     END IF;
 
-    -- Delete records older than the cutoff datetime
-    DELETE FROM faculty_generates_keyword
-    WHERE generated_at < p_cutoff_datetime;
-
-    -- Get the count of deleted records
-    SET v_deleted_count = ROW_COUNT();
+    -- Drop hourly partitions older than the cutoff and create the next day's
+    CALL rotate_time_partitions(
+        'faculty_generates_keyword',
+        'generated_at',
+        1,
+        p_cutoff_datetime,
+        p_cutoff_datetime + INTERVAL 1 DAY,
+        v_deleted_count
+    );
 
     -- Return summary of the cleanup operation
     SELECT 
@@ -0,0 +1,45 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Deletes old keyword generation jobs.
+ * 
+ * Finished jobs are kept for clients to read their result until the cutoff.
+ * Jobs still queued at the cutoff (no worker picked them up) are deleted too.
+ * 
+ * @param p_cutoff_datetime  Required datetime threshold. Jobs that finished,
+ *                           or were queued, before it are deleted
+ * 
+ * @returns Result set containing:
+ *   - deleted_count: Number of jobs deleted
+ *   - cutoff_datetime: The datetime threshold that was used
+ *   - action: Status message ('cleaned')
+ * 
+ * @throws SQLSTATE '45000' if p_cutoff_datetime is NULL
+ */
+DROP PROCEDURE IF EXISTS clean_keyword_generation_job$$
+CREATE PROCEDURE clean_keyword_generation_job(
+    IN p_cutoff_datetime DATETIME
+)
+BEGIN
+    DECLARE v_deleted_count BIGINT DEFAULT 0;
+
+    IF p_cutoff_datetime IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'cutoff_datetime is required for clean_keyword_generation_job';
+    END IF;
+
+    DELETE FROM keyword_generation_job
+    WHERE (status IN ('complete', 'failed') AND finished_at < p_cutoff_datetime)
+       OR (status = 'queued' AND created_at < p_cutoff_datetime);
+
+    SET v_deleted_count = ROW_COUNT();
+
+    SELECT
+        v_deleted_count AS deleted_count,
+        p_cutoff_datetime AS cutoff_datetime,
+        'cleaned' AS action;
+END $$
+
+DELIMITER ;
@@ -7,22 +7,34 @@ DELIMITER $$
  * 
  * Removes:
  *   - All sessions that have passed their expiration date
- *   - All revoked sessions older than 30 days (for audit trail retention)
+ *   - All revoked sessions older than 30 days (for audit trail retention).
+ *     Sessions last at most 30 days, so these have always expired as well.
+ * 
+ * The session table is partitioned by day of expires_at, so whole partitions
+ * of expired sessions are dropped and partitions for the next 35 days are
+ * created (see rotate_time_partitions). Sessions that expired earlier today
+ * are kept until the next run; reads already ignore them.
  * 
  * This is a maintenance procedure that should be run periodically.
  * 
  * @returns Result set containing:
- *   - deleted_count: Number of sessions deleted
+ *   - deleted_count: Number of sessions deleted (estimated for dropped partitions)
  */
 DROP PROCEDURE IF EXISTS clean_session$$
 CREATE PROCEDURE clean_session()
 BEGIN
-    DELETE FROM session
-    WHERE expires_at < UTC_TIMESTAMP()
-       OR (revoked = TRUE AND created_at < DATE_SUB(UTC_TIMESTAMP(), INTERVAL 30 DAY));
+    DECLARE v_deleted_count BIGINT DEFAULT 0;
+
+    CALL rotate_time_partitions(
+        'session',
+        'expires_at',
+        24,
+        UTC_TIMESTAMP(),
+        UTC_TIMESTAMP() + INTERVAL 35 DAY,
+        v_deleted_count
+    );
     
-    SELECT ROW_COUNT() AS deleted_count;
+    SELECT v_deleted_count AS deleted_count;
 END $$
 
 DELIMITER ;
-
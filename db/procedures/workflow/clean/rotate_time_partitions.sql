@@ -0,0 +1,139 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Drops expired partitions of a table range partitioned by a DATETIME column
+ * and creates the partitions for upcoming rows.
+ *
+ * The table must be partitioned with RANGE COLUMNS (p_column_name) and end in a
+ * p_future partition (VALUES LESS THAN MAXVALUE). Other partitions are named
+ * pYYYYMMDDHH after their upper bound and each covers p_step_hours.
+ *
+ *   1. Partitions whose upper bound is at or before p_drop_before hold only
+ *      older rows and are dropped (metadata only, no row scan).
+ *   2. Rows older than p_drop_before that landed in p_future while partitions
+ *      were missing are deleted.
+ *   3. p_future is split into new partitions up to p_create_until.
+ *
+ * Rows older than p_drop_before may remain in the partition that straddles it
+ * until a later run drops that partition; readers filter on the column anyway.
+ * Tables that are not partitioned fall back to deleting the old rows.
+ *
+ * ALTER TABLE commits the current transaction implicitly.
+ *
+ * @param p_table_name    Required table to rotate
+ * @param p_column_name   Required DATETIME partitioning column
+ * @param p_step_hours    Required hours covered by each partition (must divide 24)
+ * @param p_drop_before   Required cutoff; rows before it may be removed
+ * @param p_create_until  Required time up to which partitions must exist
+ * @param p_dropped_rows  OUT parameter that receives the number of rows removed.
+ *                        Rows in dropped partitions are counted from InnoDB
+ *                        statistics, so the total is an estimate.
+ *
+ * @throws SQLSTATE '45000' if a required parameter is NULL or invalid
+ */
+DROP PROCEDURE IF EXISTS rotate_time_partitions$$
+CREATE PROCEDURE rotate_time_partitions(
+    IN  p_table_name    VARCHAR(64),
+    IN  p_column_name   VARCHAR(64),
+    IN  p_step_hours    INT,
+    IN  p_drop_before   DATETIME,
+    IN  p_create_until  DATETIME,
+    OUT p_dropped_rows  BIGINT
+)
+BEGIN
+    DECLARE v_drop_list  TEXT;
+    DECLARE v_last_bound DATETIME;
+    DECLARE v_bound      DATETIME;
+    DECLARE v_add_list   TEXT DEFAULT '';
+
+    IF p_table_name IS NULL OR p_column_name IS NULL OR p_drop_before IS NULL OR p_create_until IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'table_name, column_name, drop_before and create_until are required for rotate_time_partitions';
+    END IF;
+
+    IF p_step_hours IS NULL OR p_step_hours <= 0 OR MOD(24, p_step_hours) <> 0 THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'step_hours must divide 24 for rotate_time_partitions';
+    END IF;
+
+    SET p_dropped_rows = 0;
+    SET @rotate_cutoff = p_drop_before;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = p_table_name
+          AND PARTITION_NAME = 'p_future'
+    ) THEN
+        -- Not partitioned (e.g. created before partitioning was added)
+        SET @rotate_sql = CONCAT('DELETE FROM `', p_table_name, '` WHERE `', p_column_name, '` < ?');
+        PREPARE rotate_stmt FROM @rotate_sql;
+        EXECUTE rotate_stmt USING @rotate_cutoff;
+        SET p_dropped_rows = ROW_COUNT();
+        DEALLOCATE PREPARE rotate_stmt;
+    ELSE
+        -- 1. Drop partitions that only hold rows before the cutoff
+        SET SESSION group_concat_max_len = 65535;
+        SELECT
+            GROUP_CONCAT(PARTITION_NAME ORDER BY PARTITION_ORDINAL_POSITION),
+            COALESCE(SUM(TABLE_ROWS), 0)
+        INTO v_drop_list, p_dropped_rows
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = p_table_name
+          AND PARTITION_NAME <> 'p_future'
+          AND CAST(TRIM(BOTH '''' FROM PARTITION_DESCRIPTION) AS DATETIME) <= p_drop_before;
+
+        IF v_drop_list IS NOT NULL THEN
+            SET @rotate_sql = CONCAT('ALTER TABLE `', p_table_name, '` DROP PARTITION ', v_drop_list);
+            PREPARE rotate_stmt FROM @rotate_sql;
+            EXECUTE rotate_stmt;
+            DEALLOCATE PREPARE rotate_stmt;
+        END IF;
+
+        -- 2. Old rows written to p_future while partitions were missing
+        SET @rotate_sql = CONCAT(
+            'DELETE FROM `', p_table_name, '` PARTITION (p_future) WHERE `', p_column_name, '` < ?'
+        );
+        PREPARE rotate_stmt FROM @rotate_sql;
+        EXECUTE rotate_stmt USING @rotate_cutoff;
+        SET p_dropped_rows = p_dropped_rows + ROW_COUNT();
+        DEALLOCATE PREPARE rotate_stmt;
+
+        -- 3. Split p_future up to p_create_until, continuing from the last bound
+        SELECT MAX(CAST(TRIM(BOTH '''' FROM PARTITION_DESCRIPTION) AS DATETIME))
+        INTO v_last_bound
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = p_table_name
+          AND PARTITION_NAME <> 'p_future';
+
+        SET v_bound = COALESCE(
+            v_last_bound,
+            TIMESTAMP(DATE(p_drop_before)) + INTERVAL (HOUR(p_drop_before) DIV p_step_hours * p_step_hours) HOUR
+        );
+
+        WHILE v_bound < p_create_until DO
+            SET v_bound = v_bound + INTERVAL p_step_hours HOUR;
+            SET v_add_list = CONCAT(
+                v_add_list,
+                'PARTITION p', DATE_FORMAT(v_bound, '%Y%m%d%H'),
+                ' VALUES LESS THAN (''', DATE_FORMAT(v_bound, '%Y-%m-%d %H:%i:%s'), '''), '
+            );
+        END WHILE;
+
+        IF v_add_list <> '' THEN
+            SET @rotate_sql = CONCAT(
+                'ALTER TABLE `', p_table_name, '` REORGANIZE PARTITION p_future INTO (',
+                v_add_list, 'PARTITION p_future VALUES LESS THAN (MAXVALUE))'
+            );
+            PREPARE rotate_stmt FROM @rotate_sql;
+            EXECUTE rotate_stmt;
+            DEALLOCATE PREPARE rotate_stmt;
+        END IF;
+    END IF;
+END $$
+
+DELIMITER ;
@@ -0,0 +1,75 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Logs a user in with a single call: validates the credentials (updating
+ * last_login), creates the refresh token session and returns the faculty
+ * profile.
+ *
+ * Credentials are checked by validate_login. The session row is only created
+ * and the profile only returned when the login succeeds.
+ *
+ * @param p_username    Required username to authenticate
+ * @param p_password    Required password (plain text, will be hashed for comparison)
+ * @param p_session_id  Required UUID for the new session
+ * @param p_token_hash  Required SHA-256 hash of the new refresh token
+ * @param p_expires_at  Required session expiration (UTC)
+ * @param p_faculty_id  OUT parameter that receives the faculty_id if login succeeds
+ * @param p_status_code OUT parameter with the validate_login status code:
+ *                      0 = success, 1 = invalid password, 2 = username not found
+ *
+ * @returns On success, one row with a faculty JSON object holding the faculty
+ *   columns plus emails, phones, departments and titles arrays. No result set
+ *   otherwise.
+ *
+ * @throws SQLSTATE '45000' if a required parameter is NULL
+ */
+DROP PROCEDURE IF EXISTS login_and_create_session$$
+CREATE PROCEDURE login_and_create_session(
+    IN  p_username      VARCHAR(255),
+    IN  p_password      VARCHAR(255),
+    IN  p_session_id    CHAR(36),
+    IN  p_token_hash    VARCHAR(64),
+    IN  p_expires_at    DATETIME,
+    OUT p_faculty_id    CHAR(36),
+    OUT p_status_code   TINYINT
+)
+BEGIN
+    CALL validate_login(p_username, p_password, p_faculty_id, p_status_code);
+
+    IF p_status_code = 0 THEN
+        CALL create_session(p_session_id, p_faculty_id, p_token_hash, p_expires_at);
+
+        SELECT JSON_OBJECT(
+            'faculty_id',         f.faculty_id,
+            'first_name',         f.first_name,
+            'last_name',          f.last_name,
+            'biography',          f.biography,
+            'orcid',              f.orcid,
+            'google_scholar_url', f.google_scholar_url,
+            'research_gate_url',  f.research_gate_url,
+            'scraped_from',       f.scraped_from,
+            'emails', COALESCE(
+                (SELECT JSON_ARRAYAGG(e.email) FROM faculty_email e
+                 WHERE e.faculty_id = f.faculty_id AND e.email IS NOT NULL),
+                JSON_ARRAY()),
+            'phones', COALESCE(
+                (SELECT JSON_ARRAYAGG(p.phone_num) FROM faculty_phone p
+                 WHERE p.faculty_id = f.faculty_id AND p.phone_num IS NOT NULL),
+                JSON_ARRAY()),
+            'departments', COALESCE(
+                (SELECT JSON_ARRAYAGG(d.department_name) FROM faculty_department d
+                 WHERE d.faculty_id = f.faculty_id AND d.department_name IS NOT NULL),
+                JSON_ARRAY()),
+            'titles', COALESCE(
+                (SELECT JSON_ARRAYAGG(t.title) FROM faculty_title t
+                 WHERE t.faculty_id = f.faculty_id AND t.title IS NOT NULL),
+                JSON_ARRAY())
+        ) AS faculty
+        FROM faculty f
+        WHERE f.faculty_id = p_faculty_id;
+    END IF;
+END $$
+
+DELIMITER ;
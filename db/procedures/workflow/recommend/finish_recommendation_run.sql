@@ -0,0 +1,39 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Close a sharded regeneration run.
+ * 
+ * Marks the run complete when every shard is complete and clears the change log
+ * entries the run covered; otherwise marks it failed so it can be resumed.
+ * 
+ * @param p_run_id  Required UUID of the run
+ * 
+ * @returns No result set. Use read_recommendation_run to read the outcome.
+ */
+DROP PROCEDURE IF EXISTS finish_recommendation_run$$
+CREATE PROCEDURE finish_recommendation_run(IN p_run_id CHAR(36))
+BEGIN
+    DECLARE v_unfinished INT;
+    DECLARE v_max_change_id BIGINT UNSIGNED;
+
+    SELECT COUNT(*) INTO v_unfinished
+    FROM recommendation_run_shard
+    WHERE run_id = p_run_id AND status <> 'complete';
+
+    SELECT max_change_id INTO v_max_change_id
+    FROM recommendation_run
+    WHERE run_id = p_run_id;
+
+    UPDATE recommendation_run
+    SET status = IF(v_unfinished = 0, 'complete', 'failed'),
+        finished_at = NOW()
+    WHERE run_id = p_run_id;
+
+    IF v_unfinished = 0 AND v_max_change_id IS NOT NULL THEN
+        DELETE FROM recommendation_change_log WHERE change_id <= v_max_change_id;
+    END IF;
+END $$
+
+DELIMITER ;
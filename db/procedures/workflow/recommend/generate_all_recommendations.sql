@@ -4,27 +4,38 @@ DELIMITER $$
 
 /**
  * Generate recommendations for all registered users.
- * Runs lowest-to-highest priority so higher priority types overwrite.
+ * Writes every pair once with all of its reasons (see
+ * generate_recommendation_pairs), then scores every pair, keeps the top K per
+ * source, and rebuilds the display table.
  * 
- * Priority (ENUM order):
- *   1. shared_keyword          | 5. grant_to_keyword
- *   2. keyword_to_publication  | 6. grant_to_publication
- *   3. publication_to_keyword  | 7. publication_to_grant
- *   4. keyword_to_grant        | 8. shared_grant
- *                              | 9. shared_department
+ * Every row written by this run is stamped with a new generation epoch. A row
+ * from an older epoch was not produced by this run, meaning the two faculty no
+ * longer share anything, so it is pruned in bounded batches afterwards.
+ * 
+ * Everything runs in the caller's transaction, so the pruned rows stay locked
+ * until it commits. The backend's full rebuild runs the same steps with the
+ * prune in its own short transactions instead (see services/recommend.py);
+ * this procedure is the single-call version for manual use and benchmarks.
+ * Change log entries present when the run starts are covered by the rebuild
+ * and are cleared afterwards.
  */
 DROP PROCEDURE IF EXISTS generate_all_recommendations$$
 CREATE PROCEDURE generate_all_recommendations()
 BEGIN
-    CALL recommend_by_shared_department();
-    CALL recommend_by_shared_grant();
-    CALL recommend_by_publication_to_grant();
-    CALL recommend_by_grant_to_publication();
-    CALL recommend_by_grant_to_keyword();
-    CALL recommend_by_keyword_to_grant();
-    CALL recommend_by_publication_to_keyword();
-    CALL recommend_by_keyword_to_publication();
-    CALL recommend_by_shared_keyword();
+    DECLARE v_max_change_id BIGINT UNSIGNED;
+    DECLARE v_epoch BIGINT UNSIGNED DEFAULT next_recommendation_epoch();
+    DECLARE v_pruned_count INT;
+
+    SELECT MAX(change_id) INTO v_max_change_id FROM recommendation_change_log;
+
+    CALL generate_recommendation_pairs(NULL, v_epoch);
+    CALL prune_stale_recommendations(v_epoch, NULL, NULL, v_pruned_count);
+    CALL score_recommendations(NULL);
+    CALL refresh_recommendation_display(NULL);
+
+    IF v_max_change_id IS NOT NULL THEN
+        DELETE FROM recommendation_change_log WHERE change_id <= v_max_change_id;
+    END IF;
 END $$
 
 DELIMITER ;
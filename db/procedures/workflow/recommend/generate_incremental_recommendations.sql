@@ -0,0 +1,191 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Regenerate recommendations only where inputs changed since the last run.
+ * 
+ * Drains recommendation_change_log up to the newest entry present when the run
+ * starts (changes logged during the run are left for the next one) and resolves
+ * every entry to the faculty whose inputs changed:
+ *   - faculty      -> the faculty member
+ *   - publication  -> its authors
+ *   - grant        -> its holders
+ *   - keyword      -> faculty linked to it directly, via publications, or via grants
+ * 
+ * Recommendations are directional, so a change to faculty C also affects the
+ * reverse edges S -> C. Affected sources are therefore:
+ *   - every changed faculty member
+ *   - faculty sharing a keyword, department, or grant with a changed faculty member
+ *   - faculty who currently recommend a changed faculty member
+ * Each affected source with credentials is regenerated with
+ * generate_recommendations_for_faculty.
+ * 
+ * @returns Result set containing:
+ *   - changed_count: Number of distinct faculty whose inputs changed
+ *   - regenerated_count: Number of source faculty regenerated
+ */
+DROP PROCEDURE IF EXISTS generate_incremental_recommendations$$
+CREATE PROCEDURE generate_incremental_recommendations()
+BEGIN
+    DECLARE v_max_change_id BIGINT UNSIGNED;
+    DECLARE v_changed_count INT DEFAULT 0;
+    DECLARE v_regenerated_count INT DEFAULT 0;
+    DECLARE v_faculty_id CHAR(36);
+    DECLARE v_done BOOLEAN DEFAULT FALSE;
+    DECLARE affected_cursor CURSOR FOR SELECT faculty_id FROM tmp_affected_faculty;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_done = TRUE;
+
+    SELECT MAX(change_id) INTO v_max_change_id FROM recommendation_change_log;
+
+    IF v_max_change_id IS NOT NULL THEN
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_faculty;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_terms;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_departments;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_grants;
+        DROP TEMPORARY TABLE IF EXISTS tmp_affected_faculty;
+
+        CREATE TEMPORARY TABLE tmp_changed_faculty (faculty_id CHAR(36) PRIMARY KEY);
+        CREATE TEMPORARY TABLE tmp_changed_terms (term VARCHAR(64) PRIMARY KEY);
+        CREATE TEMPORARY TABLE tmp_changed_departments (department_key VARCHAR(255) PRIMARY KEY);
+        CREATE TEMPORARY TABLE tmp_changed_grants (grant_id CHAR(36) PRIMARY KEY);
+        CREATE TEMPORARY TABLE tmp_affected_faculty (faculty_id CHAR(36) PRIMARY KEY);
+
+        -- Resolve log entries to the faculty whose inputs changed
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT l.entity_id
+        FROM recommendation_change_log l
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'faculty';
+
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT paf.faculty_id
+        FROM recommendation_change_log l
+        JOIN publication_authored_by_faculty paf ON paf.publication_id = l.entity_id
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'publication';
+
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT ggf.faculty_id
+        FROM recommendation_change_log l
+        JOIN grants_granted_to_faculty ggf ON ggf.grant_id = l.entity_id
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'grant';
+
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT frk.faculty_id
+        FROM recommendation_change_log l
+        JOIN faculty_researches_keyword frk ON frk.name = l.entity_id
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'keyword';
+
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT paf.faculty_id
+        FROM recommendation_change_log l
+        JOIN publication_explores_keyword pek ON pek.name = l.entity_id
+        JOIN publication_authored_by_faculty paf ON paf.publication_id = pek.publication_id
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'keyword';
+
+        INSERT IGNORE INTO tmp_changed_faculty (faculty_id)
+        SELECT ggf.faculty_id
+        FROM recommendation_change_log l
+        JOIN grants_for_keyword gfk ON gfk.name = l.entity_id
+        JOIN grants_granted_to_faculty ggf ON ggf.grant_id = gfk.grant_id
+        WHERE l.change_id <= v_max_change_id AND l.entity_type = 'keyword';
+
+        SELECT COUNT(*) INTO v_changed_count FROM tmp_changed_faculty;
+
+        -- Collect the current inputs of the changed faculty
+        INSERT IGNORE INTO tmp_changed_terms (term)
+        SELECT LOWER(TRIM(frk.name))
+        FROM tmp_changed_faculty c
+        JOIN faculty_researches_keyword frk ON frk.faculty_id = c.faculty_id;
+
+        INSERT IGNORE INTO tmp_changed_terms (term)
+        SELECT LOWER(TRIM(pek.name))
+        FROM tmp_changed_faculty c
+        JOIN publication_authored_by_faculty paf ON paf.faculty_id = c.faculty_id
+        JOIN publication_explores_keyword pek ON pek.publication_id = paf.publication_id;
+
+        INSERT IGNORE INTO tmp_changed_terms (term)
+        SELECT LOWER(TRIM(gfk.name))
+        FROM tmp_changed_faculty c
+        JOIN grants_granted_to_faculty ggf ON ggf.faculty_id = c.faculty_id
+        JOIN grants_for_keyword gfk ON gfk.grant_id = ggf.grant_id;
+
+        INSERT IGNORE INTO tmp_changed_departments (department_key)
+        SELECT fd.department_key
+        FROM tmp_changed_faculty c
+        JOIN faculty_department fd ON fd.faculty_id = c.faculty_id;
+
+        INSERT IGNORE INTO tmp_changed_grants (grant_id)
+        SELECT ggf.grant_id
+        FROM tmp_changed_faculty c
+        JOIN grants_granted_to_faculty ggf ON ggf.faculty_id = c.faculty_id;
+
+        -- Changed faculty are sources themselves
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT faculty_id FROM tmp_changed_faculty;
+
+        -- Reverse edges: faculty who may gain a recommendation to a changed faculty member
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT frk.faculty_id
+        FROM tmp_changed_terms t
+        JOIN faculty_researches_keyword frk ON LOWER(TRIM(frk.name)) = t.term;
+
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT paf.faculty_id
+        FROM tmp_changed_terms t
+        JOIN publication_explores_keyword pek ON LOWER(TRIM(pek.name)) = t.term
+        JOIN publication_authored_by_faculty paf ON paf.publication_id = pek.publication_id;
+
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT ggf.faculty_id
+        FROM tmp_changed_terms t
+        JOIN grants_for_keyword gfk ON LOWER(TRIM(gfk.name)) = t.term
+        JOIN grants_granted_to_faculty ggf ON ggf.grant_id = gfk.grant_id;
+
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT fd.faculty_id
+        FROM tmp_changed_departments d
+        JOIN faculty_department fd ON fd.department_key = d.department_key;
+
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT ggf.faculty_id
+        FROM tmp_changed_grants g
+        JOIN grants_granted_to_faculty ggf ON ggf.grant_id = g.grant_id;
+
+        -- Reverse edges: faculty who may lose a recommendation to a changed faculty member
+        INSERT IGNORE INTO tmp_affected_faculty (faculty_id)
+        SELECT r.source_faculty_id
+        FROM tmp_changed_faculty c
+        JOIN faculty_recommended_to_faculty r ON r.target_faculty_id = c.faculty_id;
+
+        -- Only registered users receive recommendations
+        DELETE a FROM tmp_affected_faculty a
+        LEFT JOIN credentials cr ON cr.faculty_id = a.faculty_id
+        WHERE cr.faculty_id IS NULL;
+
+        OPEN affected_cursor;
+        regenerate_loop: LOOP
+            FETCH affected_cursor INTO v_faculty_id;
+            IF v_done THEN
+                LEAVE regenerate_loop;
+            END IF;
+
+            CALL generate_recommendations_for_faculty(v_faculty_id);
+            SET v_regenerated_count = v_regenerated_count + 1;
+        END LOOP;
+        CLOSE affected_cursor;
+
+        DELETE FROM recommendation_change_log WHERE change_id <= v_max_change_id;
+
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_faculty;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_terms;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_departments;
+        DROP TEMPORARY TABLE IF EXISTS tmp_changed_grants;
+        DROP TEMPORARY TABLE IF EXISTS tmp_affected_faculty;
+    END IF;
+
+    SELECT
+        v_changed_count AS changed_count,
+        v_regenerated_count AS regenerated_count;
+END $$
+
+DELIMITER ;
@@ -0,0 +1,156 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Write every recommended pair for one source faculty member, or for every
+ * registered user when p_source_faculty_id is NULL, in a single pass.
+ *
+ * Each reason is collected into a temporary table first, then every pair is
+ * written once with all of its reasons in recommendation_reasons and the
+ * highest-priority one in recommendation_type (used for display and ranking).
+ * Rows are stamped with p_epoch; see generate_all_recommendations.
+ *
+ * Reasons (ENUM / SET order, 1 = highest priority):
+ *   1. shared_keyword          | 5. grant_to_keyword
+ *   2. keyword_to_publication  | 6. grant_to_publication
+ *   3. publication_to_keyword  | 7. publication_to_grant
+ *   4. keyword_to_grant        | 8. shared_grant
+ *                              | 9. shared_department
+ *
+ * @param p_source_faculty_id  Optional source faculty member (must have credentials)
+ * @param p_epoch              Generation epoch of the calling run
+ */
+DROP PROCEDURE IF EXISTS generate_recommendation_pairs$$
+CREATE PROCEDURE generate_recommendation_pairs(
+    IN p_source_faculty_id CHAR(36),
+    IN p_epoch BIGINT UNSIGNED
+)
+BEGIN
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_source;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_reason;
+
+    CREATE TEMPORARY TABLE tmp_rec_source (faculty_id CHAR(36) PRIMARY KEY);
+    CREATE TEMPORARY TABLE tmp_rec_reason (
+        source_faculty_id CHAR(36) NOT NULL,
+        target_faculty_id CHAR(36) NOT NULL,
+        reason            TINYINT UNSIGNED NOT NULL,
+        PRIMARY KEY (source_faculty_id, target_faculty_id, reason)
+    );
+
+    -- Only registered users receive recommendations
+    INSERT INTO tmp_rec_source (faculty_id)
+    SELECT faculty_id
+    FROM credentials
+    WHERE p_source_faculty_id IS NULL OR faculty_id = p_source_faculty_id;
+
+    -- 1. Source researches keyword X, target researches X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT frk1.faculty_id, frk2.faculty_id, 1
+    FROM tmp_rec_source s
+    JOIN faculty_researches_keyword frk1 ON frk1.faculty_id = s.faculty_id
+    JOIN faculty_researches_keyword frk2 ON LOWER(TRIM(frk1.name)) = LOWER(TRIM(frk2.name))
+    WHERE frk2.faculty_id <> frk1.faculty_id;
+
+    -- 2. Source researches keyword X, target published on X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT frk.faculty_id, paf.faculty_id, 2
+    FROM tmp_rec_source s
+    JOIN faculty_researches_keyword frk ON frk.faculty_id = s.faculty_id
+    JOIN publication_explores_keyword pek ON LOWER(TRIM(frk.name)) = LOWER(TRIM(pek.name))
+    JOIN publication_authored_by_faculty paf ON pek.publication_id = paf.publication_id
+    WHERE paf.faculty_id <> frk.faculty_id;
+
+    -- 3. Source published on X, target researches X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT paf.faculty_id, frk.faculty_id, 3
+    FROM tmp_rec_source s
+    JOIN publication_authored_by_faculty paf ON paf.faculty_id = s.faculty_id
+    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
+    JOIN faculty_researches_keyword frk ON LOWER(TRIM(pek.name)) = LOWER(TRIM(frk.name))
+    WHERE frk.faculty_id <> paf.faculty_id;
+
+    -- 4. Source researches X, target holds a grant for X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT frk.faculty_id, ggf.faculty_id, 4
+    FROM tmp_rec_source s
+    JOIN faculty_researches_keyword frk ON frk.faculty_id = s.faculty_id
+    JOIN grants_for_keyword gfk ON LOWER(TRIM(frk.name)) = LOWER(TRIM(gfk.name))
+    JOIN grants_granted_to_faculty ggf ON gfk.grant_id = ggf.grant_id
+    WHERE ggf.faculty_id <> frk.faculty_id;
+
+    -- 5. Source holds a grant for X, target researches X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT ggf.faculty_id, frk.faculty_id, 5
+    FROM tmp_rec_source s
+    JOIN grants_granted_to_faculty ggf ON ggf.faculty_id = s.faculty_id
+    JOIN grants_for_keyword gfk ON ggf.grant_id = gfk.grant_id
+    JOIN faculty_researches_keyword frk ON LOWER(TRIM(gfk.name)) = LOWER(TRIM(frk.name))
+    WHERE frk.faculty_id <> ggf.faculty_id;
+
+    -- 6. Source holds a grant for X, target published on X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT ggf.faculty_id, paf.faculty_id, 6
+    FROM tmp_rec_source s
+    JOIN grants_granted_to_faculty ggf ON ggf.faculty_id = s.faculty_id
+    JOIN grants_for_keyword gfk ON ggf.grant_id = gfk.grant_id
+    JOIN publication_explores_keyword pek ON LOWER(TRIM(gfk.name)) = LOWER(TRIM(pek.name))
+    JOIN publication_authored_by_faculty paf ON pek.publication_id = paf.publication_id
+    WHERE paf.faculty_id <> ggf.faculty_id;
+
+    -- 7. Source published on X, target holds a grant for X
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT paf.faculty_id, ggf.faculty_id, 7
+    FROM tmp_rec_source s
+    JOIN publication_authored_by_faculty paf ON paf.faculty_id = s.faculty_id
+    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
+    JOIN grants_for_keyword gfk ON LOWER(TRIM(pek.name)) = LOWER(TRIM(gfk.name))
+    JOIN grants_granted_to_faculty ggf ON gfk.grant_id = ggf.grant_id
+    WHERE ggf.faculty_id <> paf.faculty_id;
+
+    -- 8. Both hold the same grant
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT ggf1.faculty_id, ggf2.faculty_id, 8
+    FROM tmp_rec_source s
+    JOIN grants_granted_to_faculty ggf1 ON ggf1.faculty_id = s.faculty_id
+    JOIN grants_granted_to_faculty ggf2 ON ggf1.grant_id = ggf2.grant_id
+    WHERE ggf2.faculty_id <> ggf1.faculty_id;
+
+    -- 9. Same (normalized) department
+    INSERT IGNORE INTO tmp_rec_reason (source_faculty_id, target_faculty_id, reason)
+    SELECT fd1.faculty_id, fd2.faculty_id, 9
+    FROM tmp_rec_source s
+    JOIN faculty_department fd1 ON fd1.faculty_id = s.faculty_id
+    JOIN faculty_department fd2 ON fd1.department_key = fd2.department_key
+    WHERE fd2.faculty_id <> fd1.faculty_id;
+
+    -- One write per pair. A number stored in an ENUM is its 1-based position and
+    -- a number stored in a SET is its bitmask, so the lowest reason is the
+    -- primary type and BIT_OR of the reason bits is the full set.
+    INSERT INTO faculty_recommended_to_faculty (
+        source_faculty_id, target_faculty_id,
+        recommendation_type, recommendation_reasons,
+        generation_epoch, created_at
+    )
+    SELECT
+        source_faculty_id,
+        target_faculty_id,
+        MIN(reason),
+        BIT_OR(1 << (reason - 1)),
+        p_epoch,
+        NOW()
+    FROM tmp_rec_reason
+    GROUP BY source_faculty_id, target_faculty_id
+    ON DUPLICATE KEY UPDATE
+        recommendation_type = IF(generation_epoch <= VALUES(generation_epoch),
+                                 VALUES(recommendation_type), recommendation_type),
+        recommendation_reasons = IF(generation_epoch <= VALUES(generation_epoch),
+                                    VALUES(recommendation_reasons), recommendation_reasons),
+        generation_epoch = GREATEST(generation_epoch, VALUES(generation_epoch)),
+        updated_at = NOW();
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_source;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_reason;
+END $$
+
+DELIMITER ;
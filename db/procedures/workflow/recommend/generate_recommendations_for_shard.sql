@@ -0,0 +1,73 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Regenerate recommendations for every registered user in one shard of a run.
+ * 
+ * A source faculty member belongs to shard CRC32(faculty_id) % shard_count, so
+ * shard membership is stable across resumes. Each source is regenerated with
+ * generate_recommendations_for_faculty and the shard is marked complete in the
+ * same transaction, so a committed shard never needs to be redone.
+ * 
+ * @param p_run_id       Required UUID of the run
+ * @param p_shard_index  Required shard to process (0 to shard_count - 1)
+ * 
+ * @returns Result set containing:
+ *   - shard_index: The processed shard
+ *   - source_count: Number of source faculty regenerated
+ * 
+ * @throws SQLSTATE '45000' if the run or shard doesn't exist
+ */
+DROP PROCEDURE IF EXISTS generate_recommendations_for_shard$$
+CREATE PROCEDURE generate_recommendations_for_shard(
+    IN p_run_id CHAR(36),
+    IN p_shard_index INT
+)
+BEGIN
+    DECLARE v_shard_count INT;
+    DECLARE v_source_count INT DEFAULT 0;
+    DECLARE v_faculty_id CHAR(36);
+    DECLARE v_done BOOLEAN DEFAULT FALSE;
+    DECLARE source_cursor CURSOR FOR
+        SELECT faculty_id
+        FROM credentials
+        WHERE CRC32(faculty_id) % v_shard_count = p_shard_index;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_done = TRUE;
+
+    SELECT r.shard_count INTO v_shard_count
+    FROM recommendation_run r
+    JOIN recommendation_run_shard s ON s.run_id = r.run_id
+    WHERE r.run_id = p_run_id AND s.shard_index = p_shard_index;
+
+    IF v_shard_count IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Recommendation run shard not found';
+    END IF;
+
+    -- The NOT FOUND handler may have fired on the lookup above
+    SET v_done = FALSE;
+
+    OPEN source_cursor;
+    source_loop: LOOP
+        FETCH source_cursor INTO v_faculty_id;
+        IF v_done THEN
+            LEAVE source_loop;
+        END IF;
+
+        CALL generate_recommendations_for_faculty(v_faculty_id);
+        SET v_source_count = v_source_count + 1;
+    END LOOP;
+    CLOSE source_cursor;
+
+    UPDATE recommendation_run_shard
+    SET status = 'complete',
+        source_count = v_source_count,
+        error = NULL,
+        finished_at = NOW()
+    WHERE run_id = p_run_id AND shard_index = p_shard_index;
+
+    SELECT p_shard_index AS shard_index, v_source_count AS source_count;
+END $$
+
+DELIMITER ;
@@ -0,0 +1,56 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Delete recommendations from generation epochs older than p_epoch.
+ * 
+ * For every source, rows are deleted in batches so no single statement locks a
+ * large part of faculty_recommended_to_faculty. Batches only release their
+ * locks when their transaction commits, so the backend's full rebuild passes
+ * p_limit and calls this once per batch, each in its own transaction (see
+ * prune_stale_recommendations in services/recommend.py). With p_limit NULL
+ * every stale row is deleted in one call, in batches of 5,000 that share the
+ * caller's transaction.
+ * 
+ * @param p_epoch              Epoch of the run that just finished writing
+ * @param p_source_faculty_id  Optional source faculty member to limit pruning to
+ * @param p_limit              Maximum rows to delete when pruning every source (NULL for no limit)
+ * @param p_pruned_count       OUT number of stale rows deleted
+ */
+DROP PROCEDURE IF EXISTS prune_stale_recommendations$$
+CREATE PROCEDURE prune_stale_recommendations(
+    IN p_epoch BIGINT UNSIGNED,
+    IN p_source_faculty_id CHAR(36),
+    IN p_limit INT,
+    OUT p_pruned_count INT
+)
+BEGIN
+    DECLARE v_batch_size INT DEFAULT 5000;
+    DECLARE v_deleted INT DEFAULT 0;
+
+    SET p_pruned_count = 0;
+
+    IF p_source_faculty_id IS NOT NULL THEN
+        -- One source holds at most a few hundred rows; a single range delete on the primary key
+        DELETE FROM faculty_recommended_to_faculty
+        WHERE source_faculty_id = p_source_faculty_id
+          AND generation_epoch < p_epoch;
+        SET p_pruned_count = ROW_COUNT();
+    ELSEIF p_limit IS NOT NULL THEN
+        DELETE FROM faculty_recommended_to_faculty
+        WHERE generation_epoch < p_epoch
+        LIMIT p_limit;
+        SET p_pruned_count = ROW_COUNT();
+    ELSE
+        REPEAT
+            DELETE FROM faculty_recommended_to_faculty
+            WHERE generation_epoch < p_epoch
+            LIMIT v_batch_size;
+            SET v_deleted = ROW_COUNT();
+            SET p_pruned_count = p_pruned_count + v_deleted;
+        UNTIL v_deleted < v_batch_size END REPEAT;
+    END IF;
+END $$
+
+DELIMITER ;
@@ -0,0 +1,52 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Rebuild faculty_recommendation_display for one source faculty member, or for
+ * every source when p_source_faculty_id is NULL.
+ *
+ * Copies each recommendation with the target's name, a biography snippet, their
+ * primary institution (the open affiliation that started most recently) and
+ * primary department (alphabetically first), so reads need no joins.
+ */
+DROP PROCEDURE IF EXISTS refresh_recommendation_display$$
+CREATE PROCEDURE refresh_recommendation_display(IN p_source_faculty_id CHAR(36))
+BEGIN
+    DELETE FROM faculty_recommendation_display
+    WHERE p_source_faculty_id IS NULL OR source_faculty_id = p_source_faculty_id;
+
+    INSERT INTO faculty_recommendation_display (
+        source_faculty_id, target_faculty_id,
+        first_name, last_name, biography_snippet,
+        institution_name, department_name,
+        recommendation_type, recommendation_reasons, match_score
+    )
+    SELECT
+        r.source_faculty_id,
+        r.target_faculty_id,
+        f.first_name,
+        f.last_name,
+        LEFT(f.biography, 300),
+        (
+            SELECT i.name
+            FROM faculty_works_at_institution fwi
+            JOIN institution i ON fwi.institution_id = i.institution_id
+            WHERE fwi.faculty_id = f.faculty_id AND fwi.end_date IS NULL
+            ORDER BY fwi.start_date DESC, i.name ASC
+            LIMIT 1
+        ),
+        (
+            SELECT MIN(fd.department_name)
+            FROM faculty_department fd
+            WHERE fd.faculty_id = f.faculty_id
+        ),
+        r.recommendation_type,
+        r.recommendation_reasons,
+        r.match_score
+    FROM faculty_recommended_to_faculty r
+    JOIN faculty f ON r.target_faculty_id = f.faculty_id
+    WHERE p_source_faculty_id IS NULL OR r.source_faculty_id = p_source_faculty_id;
+END $$
+
+DELIMITER ;
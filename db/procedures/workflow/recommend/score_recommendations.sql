@@ -0,0 +1,192 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Score recommendations and keep only the top K per source faculty member.
+ *
+ * For each recommendation of the given source (or every source when
+ * p_source_faculty_id is NULL), computes match_score with recommendation_score()
+ * from the research topics, grants and departments the two faculty share.
+ * Pairs that no longer share anything score 0 and are removed, then only the
+ * recommendation_top_k() highest-scoring rows per source are kept.
+ *
+ * Research topics are the union of keywords a faculty member researches,
+ * publishes on, and holds grants for.
+ *
+ * Ties are broken by recommendation_type priority, then target_faculty_id.
+ */
+DROP PROCEDURE IF EXISTS score_recommendations$$
+CREATE PROCEDURE score_recommendations(IN p_source_faculty_id CHAR(36))
+BEGIN
+    DECLARE v_top_k INT DEFAULT recommendation_top_k();
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_scope;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_source_topic;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_target_topic;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_prune;
+
+    CREATE TEMPORARY TABLE tmp_rec_scope (
+        source_faculty_id   CHAR(36) NOT NULL,
+        target_faculty_id   CHAR(36) NOT NULL,
+        recommendation_type TINYINT UNSIGNED NOT NULL,
+        shared_topics       INT NOT NULL DEFAULT 0,
+        source_topics       INT NOT NULL DEFAULT 0,
+        target_topics       INT NOT NULL DEFAULT 0,
+        shared_grants       INT NOT NULL DEFAULT 0,
+        source_grants       INT NOT NULL DEFAULT 0,
+        target_grants       INT NOT NULL DEFAULT 0,
+        shared_department   BOOLEAN NOT NULL DEFAULT FALSE,
+        match_score         DECIMAL(5,4) NOT NULL DEFAULT 0,
+        PRIMARY KEY (source_faculty_id, target_faculty_id)
+    );
+    CREATE TEMPORARY TABLE tmp_rec_source_topic (
+        faculty_id CHAR(36) NOT NULL,
+        keyword    VARCHAR(64) NOT NULL,
+        PRIMARY KEY (faculty_id, keyword)
+    );
+    CREATE TEMPORARY TABLE tmp_rec_target_topic (
+        faculty_id CHAR(36) NOT NULL,
+        keyword    VARCHAR(64) NOT NULL,
+        PRIMARY KEY (faculty_id, keyword)
+    );
+    CREATE TEMPORARY TABLE tmp_rec_prune (
+        source_faculty_id CHAR(36) NOT NULL,
+        target_faculty_id CHAR(36) NOT NULL,
+        PRIMARY KEY (source_faculty_id, target_faculty_id)
+    );
+
+    -- ENUM values compare by position; + 0 stores the priority as a number
+    INSERT INTO tmp_rec_scope (source_faculty_id, target_faculty_id, recommendation_type)
+    SELECT source_faculty_id, target_faculty_id, recommendation_type + 0
+    FROM faculty_recommended_to_faculty
+    WHERE p_source_faculty_id IS NULL OR source_faculty_id = p_source_faculty_id;
+
+    -- Topics for sources in scope
+    INSERT IGNORE INTO tmp_rec_source_topic (faculty_id, keyword)
+    SELECT frk.faculty_id, LOWER(TRIM(frk.name))
+    FROM faculty_researches_keyword frk
+    WHERE p_source_faculty_id IS NULL OR frk.faculty_id = p_source_faculty_id;
+
+    INSERT IGNORE INTO tmp_rec_source_topic (faculty_id, keyword)
+    SELECT paf.faculty_id, LOWER(TRIM(pek.name))
+    FROM publication_authored_by_faculty paf
+    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
+    WHERE p_source_faculty_id IS NULL OR paf.faculty_id = p_source_faculty_id;
+
+    INSERT IGNORE INTO tmp_rec_source_topic (faculty_id, keyword)
+    SELECT ggf.faculty_id, LOWER(TRIM(gfk.name))
+    FROM grants_granted_to_faculty ggf
+    JOIN grants_for_keyword gfk ON ggf.grant_id = gfk.grant_id
+    WHERE p_source_faculty_id IS NULL OR ggf.faculty_id = p_source_faculty_id;
+
+    -- Topics for targets in scope
+    INSERT IGNORE INTO tmp_rec_target_topic (faculty_id, keyword)
+    SELECT frk.faculty_id, LOWER(TRIM(frk.name))
+    FROM faculty_researches_keyword frk
+    WHERE frk.faculty_id IN (SELECT target_faculty_id FROM tmp_rec_scope);
+
+    INSERT IGNORE INTO tmp_rec_target_topic (faculty_id, keyword)
+    SELECT paf.faculty_id, LOWER(TRIM(pek.name))
+    FROM publication_authored_by_faculty paf
+    JOIN publication_explores_keyword pek ON paf.publication_id = pek.publication_id
+    WHERE paf.faculty_id IN (SELECT target_faculty_id FROM tmp_rec_scope);
+
+    INSERT IGNORE INTO tmp_rec_target_topic (faculty_id, keyword)
+    SELECT ggf.faculty_id, LOWER(TRIM(gfk.name))
+    FROM grants_granted_to_faculty ggf
+    JOIN grants_for_keyword gfk ON ggf.grant_id = gfk.grant_id
+    WHERE ggf.faculty_id IN (SELECT target_faculty_id FROM tmp_rec_scope);
+
+    -- Overlap counts (each temporary table is referenced once per statement)
+    UPDATE tmp_rec_scope s
+    JOIN (
+        SELECT faculty_id, COUNT(*) AS topic_count
+        FROM tmp_rec_source_topic
+        GROUP BY faculty_id
+    ) t ON t.faculty_id = s.source_faculty_id
+    SET s.source_topics = t.topic_count;
+
+    UPDATE tmp_rec_scope s
+    JOIN (
+        SELECT faculty_id, COUNT(*) AS topic_count
+        FROM tmp_rec_target_topic
+        GROUP BY faculty_id
+    ) t ON t.faculty_id = s.target_faculty_id
+    SET s.target_topics = t.topic_count;
+
+    UPDATE tmp_rec_scope s
+    SET
+        s.shared_topics = (
+            SELECT COUNT(*)
+            FROM tmp_rec_source_topic st
+            JOIN tmp_rec_target_topic tt ON tt.keyword = st.keyword
+            WHERE st.faculty_id = s.source_faculty_id
+              AND tt.faculty_id = s.target_faculty_id
+        ),
+        s.source_grants = (
+            SELECT COUNT(*) FROM grants_granted_to_faculty ggf
+            WHERE ggf.faculty_id = s.source_faculty_id
+        ),
+        s.target_grants = (
+            SELECT COUNT(*) FROM grants_granted_to_faculty ggf
+            WHERE ggf.faculty_id = s.target_faculty_id
+        ),
+        s.shared_grants = (
+            SELECT COUNT(*)
+            FROM grants_granted_to_faculty ggf1
+            JOIN grants_granted_to_faculty ggf2 ON ggf1.grant_id = ggf2.grant_id
+            WHERE ggf1.faculty_id = s.source_faculty_id
+              AND ggf2.faculty_id = s.target_faculty_id
+        ),
+        s.shared_department = EXISTS (
+            SELECT 1
+            FROM faculty_department fd1
+            JOIN faculty_department fd2
+                ON fd1.department_key = fd2.department_key
+            WHERE fd1.faculty_id = s.source_faculty_id
+              AND fd2.faculty_id = s.target_faculty_id
+        );
+
+    UPDATE tmp_rec_scope
+    SET match_score = recommendation_score(
+        shared_topics, source_topics, target_topics,
+        shared_grants, source_grants, target_grants,
+        shared_department
+    );
+
+    -- Keep the top K scoring pairs per source; everything else is pruned
+    INSERT INTO tmp_rec_prune (source_faculty_id, target_faculty_id)
+    SELECT ranked.source_faculty_id, ranked.target_faculty_id
+    FROM (
+        SELECT
+            source_faculty_id,
+            target_faculty_id,
+            match_score,
+            ROW_NUMBER() OVER (
+                PARTITION BY source_faculty_id
+                ORDER BY match_score DESC, recommendation_type ASC, target_faculty_id ASC
+            ) AS score_rank
+        FROM tmp_rec_scope
+    ) ranked
+    WHERE ranked.match_score = 0 OR ranked.score_rank > v_top_k;
+
+    DELETE r
+    FROM faculty_recommended_to_faculty r
+    JOIN tmp_rec_prune p
+        ON p.source_faculty_id = r.source_faculty_id
+       AND p.target_faculty_id = r.target_faculty_id;
+
+    UPDATE faculty_recommended_to_faculty r
+    JOIN tmp_rec_scope s
+        ON s.source_faculty_id = r.source_faculty_id
+       AND s.target_faculty_id = r.target_faculty_id
+    SET r.match_score = s.match_score;
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_scope;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_source_topic;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_target_topic;
+    DROP TEMPORARY TABLE IF EXISTS tmp_rec_prune;
+END $$
+
+DELIMITER ;
@@ -0,0 +1,46 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Start a sharded full regeneration run.
+ * 
+ * Records the run with the newest recommendation_change_log entry it covers and
+ * creates p_shard_count pending shards. Shards are processed independently by
+ * generate_recommendations_for_shard.
+ * 
+ * @param p_run_id       Required UUID for the run
+ * @param p_shard_count  Required number of shards (at least 1)
+ * 
+ * @returns No result set. Use read_recommendation_run to read progress.
+ */
+DROP PROCEDURE IF EXISTS start_recommendation_run$$
+CREATE PROCEDURE start_recommendation_run(
+    IN p_run_id CHAR(36),
+    IN p_shard_count INT
+)
+BEGIN
+    DECLARE v_shard_index INT DEFAULT 0;
+
+    IF p_run_id IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'run_id is required';
+    END IF;
+
+    IF p_shard_count IS NULL OR p_shard_count < 1 THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'shard_count must be at least 1';
+    END IF;
+
+    INSERT INTO recommendation_run (run_id, status, shard_count, max_change_id, started_at)
+    SELECT p_run_id, 'running', p_shard_count, MAX(change_id), NOW()
+    FROM recommendation_change_log;
+
+    WHILE v_shard_index < p_shard_count DO
+        INSERT INTO recommendation_run_shard (run_id, shard_index, status)
+        VALUES (p_run_id, v_shard_index, 'pending');
+        SET v_shard_index = v_shard_index + 1;
+    END WHILE;
+END $$
+
+DELIMITER ;
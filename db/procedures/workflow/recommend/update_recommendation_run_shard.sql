@@ -0,0 +1,39 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Record a shard starting or failing.
+ * 
+ * Completion is recorded by generate_recommendations_for_shard itself so that it
+ * commits together with the shard's recommendations.
+ * 
+ * @param p_run_id       Required UUID of the run
+ * @param p_shard_index  Required shard index
+ * @param p_status       Required new status ('running' or 'failed')
+ * @param p_error        Optional error message for failed shards
+ * 
+ * @returns No result set. Use read_recommendation_run to read progress.
+ */
+DROP PROCEDURE IF EXISTS update_recommendation_run_shard$$
+CREATE PROCEDURE update_recommendation_run_shard(
+    IN p_run_id CHAR(36),
+    IN p_shard_index INT,
+    IN p_status VARCHAR(16),
+    IN p_error VARCHAR(2048)
+)
+BEGIN
+    IF p_status NOT IN ('running', 'failed') THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'status must be running or failed';
+    END IF;
+
+    UPDATE recommendation_run_shard
+    SET status = p_status,
+        error = IF(p_status = 'failed', p_error, NULL),
+        started_at = IF(p_status = 'running', NOW(), started_at),
+        finished_at = IF(p_status = 'failed', NOW(), NULL)
+    WHERE run_id = p_run_id AND shard_index = p_shard_index;
+END $$
+
+DELIMITER ;
@@ -12,7 +12,9 @@ DELIMITER $$
  * 
  * @param p_first_name    Optional first name to search for (partial match)
  * @param p_last_name     Optional last name to search for (partial match)
- * @param p_department    Optional department name to search for (partial match)
+ * @param p_department    Optional department name to search for (partial match,
+ *                        compared after normalize_department_name so "Dept. of
+ *                        History" also finds "History Department")
  * @param p_institution   Optional institution name to search for (partial match)
  * 
  * @returns Result set containing:
@@ -50,7 +52,7 @@ BEGIN
         -- CONCAT(value, '%') creates a pattern for partial matching (starts with)
         (p_first_name  IS NULL OR f.first_name      LIKE CONCAT(p_first_name, '%'))
         OR (p_last_name IS NULL OR f.last_name      LIKE CONCAT(p_last_name, '%'))
-        OR (p_department IS NULL OR d.department_name LIKE CONCAT(p_department, '%'))
+        OR (p_department IS NULL OR d.department_key LIKE CONCAT(normalize_department_name(p_department), '%'))
         OR (p_institution IS NULL OR i.name            LIKE CONCAT(p_institution, '%'));
 END $$
 DELIMITER ;
@@ -3,6 +3,9 @@
 CREATE TABLE IF NOT EXISTS faculty_department (
     faculty_id      CHAR(36)        NOT NULL,
     department_name VARCHAR(128),
+    -- normalize_department_name(department_name), set by the
+    -- faculty_department_key triggers so joins and filters can use an index
+    department_key  VARCHAR(255),
 
     PRIMARY KEY (faculty_id, department_name),
 
@@ -12,5 +15,8 @@ CREATE TABLE IF NOT EXISTS faculty_department (
         ON UPDATE CASCADE,
 
     -- Index on department name for faster search functionality
-    INDEX idx_faculty_department_dept_name (department_name)
+    INDEX idx_faculty_department_dept_name (department_name),
+
+    -- Index on normalized department for shared-department recommendations
+    INDEX idx_faculty_department_dept_key (department_key, faculty_id)
 );
\ No newline at end of file
@@ -1,11 +1,21 @@
+-- Range partitioned by generated_at (one partition per hour) so
+-- clean_faculty_generates_keyword drops whole partitions of old records instead
+-- of deleting rows. Partitions are created ahead of time by
+-- rotate_time_partitions; rows beyond the last one land in p_future.
+--
+-- Partitioned tables cannot have foreign keys, and every unique key must include
+-- generated_at. The faculty_delete_cascade triggers remove a faculty member's
+-- records.
 CREATE TABLE IF NOT EXISTS faculty_generates_keyword (
-    generation_id    CHAR(36)        PRIMARY KEY,
+    generation_id    CHAR(36)        NOT NULL,
     faculty_id       CHAR(36)        NOT NULL,
     generated_at     DATETIME        NOT NULL,
 
-    FOREIGN KEY (faculty_id)
-        REFERENCES faculty(faculty_id)
-        ON DELETE CASCADE
-        ON UPDATE CASCADE
-);
+    PRIMARY KEY (generation_id, generated_at),
 
+    -- Rate limit lookups count one faculty member's recent generations
+    INDEX idx_faculty_generates_keyword_faculty_generated (faculty_id, generated_at)
+)
+PARTITION BY RANGE COLUMNS (generated_at) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
@@ -0,0 +1,56 @@
+-- Written by Clayton Durepos
+
+/**
+ * Denormalized read model for faculty_recommended_to_faculty.
+ * Rebuilt for a source faculty member whenever their recommendations are
+ * generated (see refresh_recommendation_display), so reading recommendations
+ * is a single range scan on source_faculty_id with no joins.
+ */
+CREATE TABLE IF NOT EXISTS faculty_recommendation_display (
+    source_faculty_id   CHAR(36)        NOT NULL,
+    target_faculty_id   CHAR(36)        NOT NULL,
+    first_name          VARCHAR(128)    NOT NULL,
+    last_name           VARCHAR(128),
+    biography_snippet   VARCHAR(300),
+    institution_name    VARCHAR(256),
+    department_name     VARCHAR(128),
+    recommendation_type ENUM(
+        'shared_keyword',
+        'keyword_to_publication',
+        'publication_to_keyword',
+        'keyword_to_grant',
+        'grant_to_keyword',
+        'grant_to_publication',
+        'publication_to_grant',
+        'shared_grant',
+        'shared_department'
+    ) NOT NULL,
+    recommendation_reasons SET(
+        'shared_keyword',
+        'keyword_to_publication',
+        'publication_to_keyword',
+        'keyword_to_grant',
+        'grant_to_keyword',
+        'grant_to_publication',
+        'publication_to_grant',
+        'shared_grant',
+        'shared_department'
+    ) NOT NULL DEFAULT '',
+    match_score         DECIMAL(5,4)    NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (source_faculty_id, target_faculty_id),
+
+    FOREIGN KEY (source_faculty_id)
+        REFERENCES faculty(faculty_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+
+    FOREIGN KEY (target_faculty_id)
+        REFERENCES faculty(faculty_id)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+
+    -- Read order: highest score first, then type priority
+    INDEX idx_recommendation_display_source_score (source_faculty_id, match_score DESC, recommendation_type),
+
+    -- Same read order within one recommendation_type (?type= filter)
+    INDEX idx_recommendation_display_source_type_score (source_faculty_id, recommendation_type, match_score DESC)
+);
@@ -2,7 +2,13 @@
 
 /**
  * Faculty-to-faculty recommendations.
- * ENUM order defines priority (first = highest).
+ * ENUM order defines priority (first = highest). recommendation_reasons holds
+ * every reason the pair was matched (same order); recommendation_type is the
+ * highest-priority one.
+ * match_score (0.0 to 1.0) ranks recommendations; only the top
+ * recommendation_top_k() per source are kept.
+ * generation_epoch identifies the run that last produced the row; rows from
+ * older epochs are pruned once a newer run finishes.
  */
 CREATE TABLE IF NOT EXISTS faculty_recommended_to_faculty (
     source_faculty_id   CHAR(36) NOT NULL,
@@ -18,6 +24,19 @@ CREATE TABLE IF NOT EXISTS faculty_recommended_to_faculty (
         'shared_grant',
         'shared_department'
     ) NOT NULL,
+    recommendation_reasons SET(
+        'shared_keyword',
+        'keyword_to_publication',
+        'publication_to_keyword',
+        'keyword_to_grant',
+        'grant_to_keyword',
+        'grant_to_publication',
+        'publication_to_grant',
+        'shared_grant',
+        'shared_department'
+    ) NOT NULL DEFAULT '',
+    match_score DECIMAL(5,4) NOT NULL DEFAULT 0,
+    generation_epoch BIGINT UNSIGNED NOT NULL DEFAULT 0,
     created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
 
@@ -32,5 +51,7 @@ CREATE TABLE IF NOT EXISTS faculty_recommended_to_faculty (
         ON DELETE CASCADE ON UPDATE CASCADE,
 
     INDEX idx_recommendations_source (source_faculty_id),
-    INDEX idx_recommendations_type (recommendation_type)
+    INDEX idx_recommendations_source_score (source_faculty_id, match_score),
+    INDEX idx_recommendations_type (recommendation_type),
+    INDEX idx_recommendations_epoch (generation_epoch)
 );
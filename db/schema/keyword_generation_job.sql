@@ -0,0 +1,29 @@
+-- Written by Clayton Durepos
+
+-- KEYWORD GENERATION JOB SCHEMA
+-- Queue of keyword generation requests. API workers insert queued jobs; the
+-- model worker (backend/run_keyword_worker.py) claims them in batches, runs
+-- the model and stores the keywords or the error for clients to poll.
+CREATE TABLE IF NOT EXISTS keyword_generation_job (
+    job_id          CHAR(36)        PRIMARY KEY,
+    faculty_id      CHAR(36)        NOT NULL,
+
+    status          ENUM('queued', 'running', 'complete', 'failed') NOT NULL DEFAULT 'queued',
+    attempts        TINYINT UNSIGNED NOT NULL DEFAULT 0,
+
+    -- Identifies the worker batch that claimed the job
+    claim_id        CHAR(36),
+
+    keywords        JSON,
+    error           VARCHAR(1024),
+
+    created_at      DATETIME(3)     NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    started_at      DATETIME(3),
+    finished_at     DATETIME(3),
+
+    -- The worker claims the oldest queued jobs
+    INDEX idx_keyword_generation_job_status_created (status, created_at),
+    INDEX idx_keyword_generation_job_claim (claim_id),
+
+    FOREIGN KEY (faculty_id) REFERENCES faculty(faculty_id) ON DELETE CASCADE
+);
@@ -0,0 +1,18 @@
+-- Written by Clayton Durepos
+
+-- RECOMMENDATION CHANGE LOG SCHEMA
+-- Records entities whose recommendation inputs changed since the last generation run.
+-- Populated by the triggers in db/triggers/ and drained by generate_incremental_recommendations.
+CREATE TABLE IF NOT EXISTS recommendation_change_log (
+    change_id       BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+
+    -- What changed. faculty/publication/grant IDs are UUIDs, keyword IDs are keyword names
+    entity_type     ENUM('faculty', 'keyword', 'publication', 'grant') NOT NULL,
+    entity_id       VARCHAR(64)     NOT NULL,
+
+    changed_at      DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    -- No foreign keys: the entity may already be deleted when the log is drained
+
+    INDEX idx_change_log_entity (entity_type, entity_id)
+);
@@ -0,0 +1,20 @@
+-- Written by Clayton Durepos
+
+-- RECOMMENDATION RUN SCHEMA
+-- Tracks sharded full regeneration runs (see services/recommend_shards.py).
+-- Source faculty are assigned to shards by CRC32(faculty_id) % shard_count,
+-- so a failed run can be resumed by re-running only its unfinished shards.
+CREATE TABLE IF NOT EXISTS recommendation_run (
+    run_id          CHAR(36)        PRIMARY KEY,
+
+    status          ENUM('running', 'complete', 'failed') NOT NULL DEFAULT 'running',
+    shard_count     INT UNSIGNED    NOT NULL,
+
+    -- Newest change log entry covered by this run; cleared when the run completes
+    max_change_id   BIGINT UNSIGNED,
+
+    started_at      DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at     DATETIME,
+
+    INDEX idx_recommendation_run_started_at (started_at)
+);
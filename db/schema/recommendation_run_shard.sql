@@ -0,0 +1,23 @@
+-- Written by Clayton Durepos
+
+-- RECOMMENDATION RUN SHARD SCHEMA
+-- Progress of each shard of a recommendation_run. A shard is marked complete in
+-- the same transaction that writes its recommendations.
+CREATE TABLE IF NOT EXISTS recommendation_run_shard (
+    run_id          CHAR(36)        NOT NULL,
+    shard_index     INT UNSIGNED    NOT NULL,
+
+    status          ENUM('pending', 'running', 'complete', 'failed') NOT NULL DEFAULT 'pending',
+    source_count    INT UNSIGNED    NOT NULL DEFAULT 0,
+    error           VARCHAR(2048),
+
+    started_at      DATETIME,
+    finished_at     DATETIME,
+
+    PRIMARY KEY (run_id, shard_index),
+
+    FOREIGN KEY (run_id)
+        REFERENCES recommendation_run (run_id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
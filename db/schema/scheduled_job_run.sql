@@ -0,0 +1,24 @@
+-- Written by Clayton Durepos
+
+-- SCHEDULED JOB RUN SCHEMA
+-- One row per run of a backend scheduler job (see services/scheduler.py), so
+-- maintenance work that used to run as MySQL events reports its timing,
+-- affected rows and failures.
+CREATE TABLE IF NOT EXISTS scheduled_job_run (
+    run_id          CHAR(36)        PRIMARY KEY,
+
+    job_name        VARCHAR(64)     NOT NULL,
+    host            VARCHAR(255)    NOT NULL,
+    triggered_by    ENUM('schedule', 'manual') NOT NULL,
+    status          ENUM('running', 'complete', 'failed') NOT NULL DEFAULT 'running',
+
+    started_at      DATETIME(3)     NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    finished_at     DATETIME(3),
+    duration_ms     INT UNSIGNED,
+
+    -- Rows deleted or regenerated by the job, when it reports them
+    row_count       INT UNSIGNED,
+    error           VARCHAR(1024),
+
+    INDEX idx_scheduled_job_run_job_started (job_name, started_at)
+);
@@ -2,16 +2,26 @@
 
 -- SESSION SCHEMA
 -- Stores hashed refresh tokens for long-term authentication sessions
+--
+-- Range partitioned by expires_at (one partition per day) so clean_session drops
+-- whole partitions of expired sessions instead of deleting rows. Partitions are
+-- created ahead of time by rotate_time_partitions; rows beyond the last one land
+-- in p_future.
+--
+-- Partitioned tables cannot have foreign keys, and every unique key must include
+-- expires_at. The faculty_delete_cascade triggers remove a faculty member's
+-- sessions, and token_hash (a random 256-bit token's hash) is indexed rather
+-- than unique.
 CREATE TABLE IF NOT EXISTS session (
-    -- Primary key
-    session_id              CHAR(36)        PRIMARY KEY,
+    -- Associated with expires_at as the primary key
+    session_id              CHAR(36)        NOT NULL,
     
     -- Associated faculty member
     faculty_id           CHAR(36)         NOT NULL,
     
     -- Hash of the refresh token (SHA-256)
     -- Never store the raw token, only the hash
-    token_hash           VARCHAR(64)      NOT NULL UNIQUE,
+    token_hash           VARCHAR(64)      NOT NULL,
     
     -- When this session was created
     created_at           DATETIME         NOT NULL DEFAULT CURRENT_TIMESTAMP,
@@ -22,11 +32,7 @@ CREATE TABLE IF NOT EXISTS session (
     -- Whether this session has been revoked
     revoked              BOOLEAN          NOT NULL DEFAULT FALSE,
     
-    -- Foreign key constraint
-    FOREIGN KEY (faculty_id)
-        REFERENCES faculty (faculty_id)
-        ON DELETE CASCADE
-        ON UPDATE CASCADE,
+    PRIMARY KEY (session_id, expires_at),
     
     -- Index for lookups by faculty_id
     INDEX idx_faculty_id (faculty_id),
@@ -36,5 +42,7 @@ CREATE TABLE IF NOT EXISTS session (
     
     -- Index for cleanup of expired tokens
     INDEX idx_expires_at (expires_at)
+)
+PARTITION BY RANGE COLUMNS (expires_at) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
 );
-
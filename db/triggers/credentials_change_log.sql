@@ -0,0 +1,17 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Newly registered faculty become recommendation sources.
+ */
+DROP TRIGGER IF EXISTS credentials_after_insert_change_log$$
+CREATE TRIGGER credentials_after_insert_change_log
+AFTER INSERT ON credentials
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', NEW.faculty_id);
+END $$
+
+DELIMITER ;
@@ -0,0 +1,29 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Cascade faculty deletes and faculty_id updates to the partitioned session and
+ * faculty_generates_keyword tables, which cannot have foreign keys.
+ */
+DROP TRIGGER IF EXISTS faculty_after_delete_cascade$$
+CREATE TRIGGER faculty_after_delete_cascade
+AFTER DELETE ON faculty
+FOR EACH ROW
+BEGIN
+    DELETE FROM session WHERE faculty_id = OLD.faculty_id;
+    DELETE FROM faculty_generates_keyword WHERE faculty_id = OLD.faculty_id;
+END $$
+
+DROP TRIGGER IF EXISTS faculty_after_update_cascade$$
+CREATE TRIGGER faculty_after_update_cascade
+AFTER UPDATE ON faculty
+FOR EACH ROW
+BEGIN
+    IF NEW.faculty_id <> OLD.faculty_id THEN
+        UPDATE session SET faculty_id = NEW.faculty_id WHERE faculty_id = OLD.faculty_id;
+        UPDATE faculty_generates_keyword SET faculty_id = NEW.faculty_id WHERE faculty_id = OLD.faculty_id;
+    END IF;
+END $$
+
+DELIMITER ;
@@ -0,0 +1,36 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * A faculty member's departments changed.
+ */
+DROP TRIGGER IF EXISTS faculty_department_after_insert_change_log$$
+CREATE TRIGGER faculty_department_after_insert_change_log
+AFTER INSERT ON faculty_department
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', NEW.faculty_id);
+END $$
+
+DROP TRIGGER IF EXISTS faculty_department_after_update_change_log$$
+CREATE TRIGGER faculty_department_after_update_change_log
+AFTER UPDATE ON faculty_department
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', NEW.faculty_id);
+END $$
+
+DROP TRIGGER IF EXISTS faculty_department_after_delete_change_log$$
+CREATE TRIGGER faculty_department_after_delete_change_log
+AFTER DELETE ON faculty_department
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', OLD.faculty_id);
+END $$
+
+DELIMITER ;
@@ -0,0 +1,26 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Keep faculty_department.department_key equal to
+ * normalize_department_name(department_name), so the normalization runs once
+ * per write instead of on both sides of every department join.
+ */
+DROP TRIGGER IF EXISTS faculty_department_before_insert_department_key$$
+CREATE TRIGGER faculty_department_before_insert_department_key
+BEFORE INSERT ON faculty_department
+FOR EACH ROW
+BEGIN
+    SET NEW.department_key = normalize_department_name(NEW.department_name);
+END $$
+
+DROP TRIGGER IF EXISTS faculty_department_before_update_department_key$$
+CREATE TRIGGER faculty_department_before_update_department_key
+BEFORE UPDATE ON faculty_department
+FOR EACH ROW
+BEGIN
+    SET NEW.department_key = normalize_department_name(NEW.department_name);
+END $$
+
+DELIMITER ;
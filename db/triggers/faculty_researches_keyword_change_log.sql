@@ -0,0 +1,27 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * A faculty member's research keywords changed.
+ */
+DROP TRIGGER IF EXISTS faculty_researches_keyword_after_insert_change_log$$
+CREATE TRIGGER faculty_researches_keyword_after_insert_change_log
+AFTER INSERT ON faculty_researches_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', NEW.faculty_id);
+END $$
+
+DROP TRIGGER IF EXISTS faculty_researches_keyword_after_delete_change_log$$
+CREATE TRIGGER faculty_researches_keyword_after_delete_change_log
+AFTER DELETE ON faculty_researches_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', OLD.faculty_id);
+END $$
+
+DELIMITER ;
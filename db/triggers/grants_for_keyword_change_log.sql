@@ -0,0 +1,27 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * A grant's topics changed; resolved to the grant's holders when the log is drained.
+ */
+DROP TRIGGER IF EXISTS grants_for_keyword_after_insert_change_log$$
+CREATE TRIGGER grants_for_keyword_after_insert_change_log
+AFTER INSERT ON grants_for_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('grant', NEW.grant_id);
+END $$
+
+DROP TRIGGER IF EXISTS grants_for_keyword_after_delete_change_log$$
+CREATE TRIGGER grants_for_keyword_after_delete_change_log
+AFTER DELETE ON grants_for_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('grant', OLD.grant_id);
+END $$
+
+DELIMITER ;
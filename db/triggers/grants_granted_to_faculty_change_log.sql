@@ -0,0 +1,27 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * A faculty member gained or lost a grant.
+ */
+DROP TRIGGER IF EXISTS grants_granted_to_faculty_after_insert_change_log$$
+CREATE TRIGGER grants_granted_to_faculty_after_insert_change_log
+AFTER INSERT ON grants_granted_to_faculty
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', NEW.faculty_id);
+END $$
+
+DROP TRIGGER IF EXISTS grants_granted_to_faculty_after_delete_change_log$$
+CREATE TRIGGER grants_granted_to_faculty_after_delete_change_log
+AFTER DELETE ON grants_granted_to_faculty
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('faculty', OLD.faculty_id);
+END $$
+
+DELIMITER ;
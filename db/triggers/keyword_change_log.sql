@@ -0,0 +1,43 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * 
+ * Renaming or deleting a keyword cascades into the join tables, and MySQL does
+ * not fire triggers for cascaded changes. Renames are logged by keyword name and
+ * resolved through the (already updated) join tables when the log is drained.
+ * Deletes must resolve the affected faculty up front, before the links are gone.
+ */
+DROP TRIGGER IF EXISTS keyword_after_update_change_log$$
+CREATE TRIGGER keyword_after_update_change_log
+AFTER UPDATE ON keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('keyword', NEW.name);
+END $$
+
+DROP TRIGGER IF EXISTS keyword_before_delete_change_log$$
+CREATE TRIGGER keyword_before_delete_change_log
+BEFORE DELETE ON keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    SELECT 'faculty', frk.faculty_id
+    FROM faculty_researches_keyword frk
+    WHERE frk.name = OLD.name
+    UNION
+    SELECT 'faculty', paf.faculty_id
+    FROM publication_explores_keyword pek
+    JOIN publication_authored_by_faculty paf ON pek.publication_id = paf.publication_id
+    WHERE pek.name = OLD.name
+    UNION
+    SELECT 'faculty', ggf.faculty_id
+    FROM grants_for_keyword gfk
+    JOIN grants_granted_to_faculty ggf ON gfk.grant_id = ggf.grant_id
+    WHERE gfk.name = OLD.name;
+END $$
+
+DELIMITER ;
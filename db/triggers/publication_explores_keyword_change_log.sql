@@ -0,0 +1,27 @@
+-- Written by Clayton Durepos
+
+DELIMITER $$
+
+/**
+ * Change log triggers for incremental recommendation generation.
+ * A publication's topics changed; resolved to its authors when the log is drained.
+ */
+DROP TRIGGER IF EXISTS publication_explores_keyword_after_insert_change_log$$
+CREATE TRIGGER publication_explores_keyword_after_insert_change_log
+AFTER INSERT ON publication_explores_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('publication', NEW.publication_id);
+END $$
+
+DROP TRIGGER IF EXISTS publication_explores_keyword_after_delete_change_log$$
+CREATE TRIGGER publication_explores_keyword_after_delete_change_log
+AFTER DELETE ON publication_explores_keyword
+FOR EACH ROW
+BEGIN
+    INSERT INTO recommendation_change_log (entity_type, entity_id)
+    VALUES ('publication', OLD.publication_id);
+END $$
+
+DELIMITER ;
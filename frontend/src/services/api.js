@@ -736,6 +736,7 @@ export const checkCredentialsExist = async (faculty_id) => {
  *     "department_name": "Computer Science",
  *     "match_score": 0.85,
  *     "recommendation_type": "shared_keyword",
+ *     "recommendation_reasons": ["shared_keyword", "shared_department"],
  *     "recommendation_text": "Similar research interests"
  *   },
  *   ...
@@ -765,6 +766,40 @@ export const getRecommendations = async (faculty_id) => {
   return response.json();
 };
 
+/**
+ * Get the status of the background recommendation refresh for a user
+ * 
+ * Keyword updates and registration return before recommendations are
+ * regenerated; poll this until the status is "complete" or "failed".
+ * 
+ * @param {string} faculty_id - UUID of the faculty member
+ * 
+ * @returns {Promise<Object>} Status object
+ * 
+ * Example response:
+ * {
+ *   "faculty_id": "uuid",
+ *   "status": "running",
+ *   "requested_at": "2025-11-25T14:03:11",
+ *   "started_at": "2025-11-25T14:03:16",
+ *   "finished_at": null,
+ *   "error": null
+ * }
+ */
+export const getRecommendationStatus = async (faculty_id) => {
+  const response = await fetch(`${API_BASE_URL}/recommend/${faculty_id}/status`, {
+    method: 'GET',
+    headers: { 'Content-Type': 'application/json' },
+  });
+  
+  if (!response.ok) {
+    const error = await response.json();
+    throw new Error(error.error || 'Failed to get recommendation status');
+  }
+  
+  return response.json();
+};
+
 // ============================================================================
 // KEYWORD API FUNCTIONS
 // ============================================================================
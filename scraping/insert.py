@@ -22,11 +22,17 @@ from pathlib import Path
 # Add parent directory to path for imports (must be before backend imports)
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from backend.models.qwen import (
-    generate_faculty_keywords_with_qwen,
-    generate_publication_keywords_with_qwen,
-    unload_qwen_model,
+from backend.models.keywords import (
+    keyword_engine,
+    generate_faculty_keywords,
+    generate_publication_keywords,
+    generate_faculty_keywords_batch,
+    generate_publication_keywords_batch,
+    fit_keyword_corpus,
+    keyword_cache_stats,
+    unload_keyword_model,
 )
+from backend.models.keyword_canonicalizer import KeywordCanonicalizer, make_keyword_canonicalizer
 
 import json
 import uuid
@@ -553,7 +559,10 @@ def insert_publication_record(
 
 
 def insert_faculty_researches_keyword(
-    faculty_record: Dict[str, Any], db: DatabaseConnection
+    faculty_record: Dict[str, Any],
+    db: DatabaseConnection,
+    keywords: Optional[List[str]] = None,
+    canonicalizer: Optional[KeywordCanonicalizer] = None,
 ) -> Optional[str]:
     """
     Given a faculty record, generate a list of keywords from the biography and insert them 
@@ -562,19 +571,24 @@ def insert_faculty_researches_keyword(
     Args:
         faculty_record: Faculty dictionary
         db: DatabaseConnection instance
+        keywords: Keywords already generated for the biography (e.g. in a batch).
+            Generated here when None.
+        canonicalizer: Maps the keywords onto existing keywords before insertion
 
     Returns:
         True if insertion is successful, else False
     """
 
-    keywords = []
     try:
         if faculty_record.get("faculty_id") is None or faculty_record.get("faculty_id").strip() == "":
             raise ValueError(f"At keyword insertion time, faculty ID is None for faculty: {faculty_record}")
         if not isinstance(faculty_record.get("faculty_id"), str):
             raise ValueError(f"At keyword insertion time, faculty ID is not a string for faculty: {faculty_record}")
-        biography = faculty_record.get("biography")
-        keywords = generate_faculty_keywords_with_qwen(biography, num_keywords=5)
+        if keywords is None:
+            biography = faculty_record.get("biography")
+            keywords = generate_faculty_keywords(biography, num_keywords=5)
+        if canonicalizer is not None:
+            keywords = canonicalizer.canonicalize_many(keywords, learn=False)
 
     except Exception as e:
         print(f"[ERROR] Failed to generate keywords for faculty {faculty_record.get('first_name')} {faculty_record.get('last_name')}: {str(e)}")
@@ -590,6 +604,10 @@ def insert_faculty_researches_keyword(
             db.call_procedure(cursor, "add_keyword_for_faculty", (faculty_record["faculty_id"], keyword))
 
         conn.commit()
+        if canonicalizer is not None:
+            # Saved now, so later records reuse them
+            for keyword in keywords:
+                canonicalizer.add(keyword)
 
     except Exception as e:
         if conn and conn.in_transaction:
@@ -607,7 +625,11 @@ def insert_faculty_researches_keyword(
 
 
 def insert_publication_explores_keyword(
-    publication_id: str, abstract: str, db: DatabaseConnection
+    publication_id: str,
+    abstract: str,
+    db: DatabaseConnection,
+    keywords: Optional[List[str]] = None,
+    canonicalizer: Optional[KeywordCanonicalizer] = None,
 ) -> bool:
     """
     Given a publication, generate a list of keywords from the abstract and insert them
@@ -617,6 +639,9 @@ def insert_publication_explores_keyword(
         publication_id: The UUID of the publication
         abstract: The abstract of the publication
         db: DatabaseConnection instance
+        keywords: Keywords already generated for the abstract (e.g. in a batch).
+            Generated here when None.
+        canonicalizer: Maps the keywords onto existing keywords before insertion
 
     Returns:
         True if insertion is successful, else False
@@ -629,9 +654,11 @@ def insert_publication_explores_keyword(
         # No abstract means no keywords to generate
         return True
 
-    keywords = []
     try:
-        keywords = generate_publication_keywords_with_qwen(abstract, num_keywords=5)
+        if keywords is None:
+            keywords = generate_publication_keywords(abstract, num_keywords=5)
+        if canonicalizer is not None:
+            keywords = canonicalizer.canonicalize_many(keywords, learn=False)
     except Exception as e:
         print(f"[ERROR] Failed to generate keywords for publication {publication_id}: {str(e)}")
         return False
@@ -659,6 +686,10 @@ def insert_publication_explores_keyword(
                 pass
 
         conn.commit()
+        if canonicalizer is not None:
+            # Saved now, so later publications reuse them
+            for keyword in keywords:
+                canonicalizer.add(keyword)
 
     except Exception as e:
         if conn and conn.in_transaction:
@@ -675,6 +706,114 @@ def insert_publication_explores_keyword(
     return True
 
 
+# Prompts handed to the batched keyword generator at a time. The model batches
+# within each chunk; chunking bounds how much work a failure loses.
+KEYWORD_CHUNK_SIZE = 256
+
+
+def read_known_keywords(db: DatabaseConnection) -> List[str]:
+    """
+    Read every keyword already in the database. Generated keywords are matched
+    against them, and the statistical keyword engine prefers them.
+
+    Args:
+        db: DatabaseConnection instance
+
+    Returns:
+        Keyword names (empty if they could not be read)
+    """
+    conn = None
+    cursor = None
+    try:
+        conn = db.get_connection()
+        cursor = conn.cursor()
+        cursor.callproc("read_keyword_corpus", (0,))
+        results = [result.fetchall() for result in cursor.stored_results()]
+        return [row[0] for row in results[0]] if results else []
+    except Exception as e:
+        print(f"[WARN] Failed to read existing keywords: {str(e)}")
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+
+def insert_faculty_keywords_batch(
+    faculty_records: List[Dict[str, Any]],
+    db: DatabaseConnection,
+    canonicalizer: Optional[KeywordCanonicalizer] = None,
+) -> int:
+    """
+    Generate keywords for many faculty biographies with batched inference, then
+    insert each faculty member's keywords (see insert_faculty_researches_keyword).
+
+    Args:
+        faculty_records: Inserted faculty dictionaries (with faculty_id and biography)
+        db: DatabaseConnection instance
+        canonicalizer: Maps the keywords onto existing keywords before insertion
+
+    Returns:
+        Number of faculty members whose keywords could not be generated or inserted
+    """
+    failed = 0
+    for start in tqdm(range(0, len(faculty_records), KEYWORD_CHUNK_SIZE), desc="Generating faculty keywords"):
+        chunk = faculty_records[start:start + KEYWORD_CHUNK_SIZE]
+        try:
+            keyword_lists = generate_faculty_keywords_batch(
+                [record.get("biography") for record in chunk], num_keywords=5
+            )
+        except Exception as e:
+            print(f"[ERROR] Failed to generate keywords for {len(chunk)} faculty: {str(e)}")
+            failed += len(chunk)
+            continue
+
+        for record, keywords in zip(chunk, keyword_lists):
+            if not insert_faculty_researches_keyword(record, db, keywords, canonicalizer):
+                print(f"[WARN] Failed to insert keywords for faculty {record.get('first_name')} {record.get('last_name')}")
+                failed += 1
+    return failed
+
+
+def insert_publication_keywords_batch(
+    publications: List[Tuple[str, Dict[str, Any]]],
+    db: DatabaseConnection,
+    canonicalizer: Optional[KeywordCanonicalizer] = None,
+) -> int:
+    """
+    Generate keywords for many publication abstracts with batched inference, then
+    insert each publication's keywords (see insert_publication_explores_keyword).
+
+    Args:
+        publications: (publication_id, publication dictionary) pairs of inserted publications
+        db: DatabaseConnection instance
+        canonicalizer: Maps the keywords onto existing keywords before insertion
+
+    Returns:
+        Number of publications whose keywords could not be generated or inserted
+    """
+    failed = 0
+    for start in tqdm(range(0, len(publications), KEYWORD_CHUNK_SIZE), desc="Generating publication keywords"):
+        chunk = publications[start:start + KEYWORD_CHUNK_SIZE]
+        try:
+            keyword_lists = generate_publication_keywords_batch(
+                [publication.get("abstract") for _, publication in chunk], num_keywords=5
+            )
+        except Exception as e:
+            print(f"[ERROR] Failed to generate keywords for {len(chunk)} publications: {str(e)}")
+            failed += len(chunk)
+            continue
+
+        for (publication_id, publication), keywords in zip(chunk, keyword_lists):
+            if not insert_publication_explores_keyword(
+                publication_id, publication.get("abstract"), db, keywords, canonicalizer
+            ):
+                print(f"[WARN] Failed to insert keywords for publication {publication.get('title')}")
+                failed += 1
+    return failed
+
+
 def insert_equipment_record(
     record: Dict[str, Any], db: DatabaseConnection
 ) -> bool:
@@ -864,6 +1003,7 @@ def main():
         "failed": 0,
     }
 
+    faculty_with_biography = []
     for faculty_file in faculty_files:
         if not os.path.exists(faculty_file):
             print(f"[WARN] File not found: {faculty_file}")
@@ -878,12 +1018,10 @@ def main():
                 success = insert_faculty_record(record, db)
                 if success:
                     total_stats["successful"] += 1
-                    # Insert keywords for this faculty member
+                    # Keywords are generated in batches once all faculty are inserted
                     biography = record.get("biography")
                     if biography and biography.strip() != "":
-                        keyword_success = insert_faculty_researches_keyword(record, db)
-                        if not keyword_success:
-                            print(f"[WARN] Failed to insert keywords for faculty {record.get('first_name')} {record.get('last_name')}")
+                        faculty_with_biography.append(record)
                 else:
                     total_stats["failed"] += 1
 
@@ -901,6 +1039,22 @@ def main():
             if "records" in locals():
                 total_stats["failed"] += len(records)
 
+    engine = keyword_engine()
+    known_keywords = read_known_keywords(db)
+    # Generated keywords reuse existing keywords (and ones inserted earlier in
+    # this run) instead of inserting near-duplicates
+    canonicalizer = make_keyword_canonicalizer(known_keywords)
+    # The statistical engine scores phrases against the corpus they come from
+    fit_keyword_corpus(
+        [record.get("biography") for record in faculty_with_biography],
+        known_keywords if engine == "statistical" else None,
+    )
+
+    print(f"\n[INFO] Generating keywords for {len(faculty_with_biography)} faculty biographies ({engine})...")
+    keyword_failures = insert_faculty_keywords_batch(faculty_with_biography, db, canonicalizer)
+    if keyword_failures:
+        print(f"[WARN] Keywords failed for {keyword_failures} faculty members")
+
     print("\n" + "=" * 60)
     print("Insertion Summary")
     print("=" * 60)
@@ -919,6 +1073,7 @@ def main():
     print("=" * 60)
 
     publications_inserted = 0
+    publications_with_abstract = []
     for pub_file in publication_files:
         if not os.path.exists(pub_file):
             print(f"[WARN] File not found: {pub_file}")
@@ -932,24 +1087,40 @@ def main():
                 publication_id = insert_publication_record(publication, db)
                 if publication_id:
                     publications_inserted += 1
-                    # Insert keywords for this publication
+                    # Keywords are generated in batches once all publications are inserted
                     abstract = publication.get("abstract")
                     if abstract and abstract.strip():
-                        keyword_success = insert_publication_explores_keyword(
-                            publication_id, abstract, db
-                        )
-                        if not keyword_success:
-                            print(f"[WARN] Failed to insert keywords for publication {publication.get('title')}")
+                        publications_with_abstract.append((publication_id, publication))
         except Exception as e:
             print(f"[ERROR] Failed to process {pub_file}: {e}")
             import traceback
 
             traceback.print_exc()
 
+    fit_keyword_corpus(
+        [publication.get("abstract") for _, publication in publications_with_abstract],
+        read_known_keywords(db) if engine == "statistical" else None,
+    )
+
+    print(f"\n[INFO] Generating keywords for {len(publications_with_abstract)} publication abstracts ({engine})...")
+    keyword_failures = insert_publication_keywords_batch(publications_with_abstract, db, canonicalizer)
+    if keyword_failures:
+        print(f"[WARN] Keywords failed for {keyword_failures} publications")
+
+    if canonicalizer is not None:
+        print(f"[INFO] Keyword vocabulary: {len(known_keywords)} existing, {len(canonicalizer)} after canonical matching")
+
+    cache_stats = keyword_cache_stats()
+    if cache_stats:
+        print(
+            f"[INFO] Keyword cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+            f"{cache_stats['entries']} entries ({cache_stats['path']})"
+        )
+
     # Unload model after all keywords (faculty + publication) have been generated
     print("\n[INFO] Unloading model from memory...")
     try:
-        unload_qwen_model()
+        unload_keyword_model()
         print("[OK] Model unloaded successfully")
     except Exception as e:
         print(f"[WARN] Failed to unload model: {str(e)}")